@@ -77,7 +77,7 @@ export const GalleryImageCard = memo(function GalleryImageCard({
         {/* Skeleton placeholder while face data loads */}
         {!photoFacesLoaded && <div className="absolute inset-0 bg-muted animate-pulse z-5" />}
         <Image
-          src={image.image_url || "/placeholder.svg"}
+          src={image.thumb_url || image.image_url || "/placeholder.svg"}
           alt={image.original_filename}
           fill
           className={`object-cover transition-opacity duration-300 ${
@@ -65,10 +65,11 @@ export function GalleryView({ gallery }: GalleryViewProps) {
   // Photos for react-photo-album
   const photos = useMemo(() => {
     return sortedImages.map((img) => ({
-      src: img.image_url || "/placeholder.svg",
+      src: img.grid_url || img.image_url || "/placeholder.svg",
       width: img.width || 1200,
       height: img.height || 800,
       key: img.id,
+      srcset: img.srcset,
       // Custom data for rendering
       people: img.people || [],
     }))
@@ -77,7 +78,7 @@ export function GalleryView({ gallery }: GalleryViewProps) {
   const lightboxImages = sortedImages.map((img, index) => ({
     id: img.id,
     slug: img.slug,
-    url: img.image_url,
+    url: img.lightbox_url || img.image_url,
     originalUrl: img.original_url,
     alt: `${gallery.title} - изображение ${index + 1}`,
     filename: img.original_filename || `image-${index + 1}.jpg`,
@@ -127,6 +128,8 @@ export function GalleryView({ gallery }: GalleryViewProps) {
       >
         <img
           src={photo.src}
+          srcSet={photo.srcset}
+          sizes={`${Math.ceil(width)}px`}
           alt=""
           className="w-full h-full object-cover transition-transform duration-300 group-hover:scale-105"
           loading="lazy"
@@ -51,6 +51,12 @@ export interface GalleryImage {
   /** Admin-only field, not returned in public gallery responses */
   has_been_processed?: boolean
   created_at: string
+  /** Resized copies (absent until the photo is processed) - fall back to image_url */
+  thumb_url?: string
+  grid_url?: string
+  lightbox_url?: string
+  /** srcset of thumb/grid/lightbox ("url 320w, url 960w, ...") */
+  srcset?: string
   /**
    * Verified people on this image (populated when full=true)
    * Added by backend: python/routers/galleries.py
@@ -0,0 +1,14 @@
+-- Migration: Add image derivatives manifest to gallery_images
+-- Date: 2026-10-18
+-- Purpose: Resized copies (thumb/grid/lightbox/detection) generated after upload
+-- and stored in MinIO under photos/derived/{photo_id}/{size}.{webp|jpg|avif}.
+-- The gallery UI loads derivatives instead of multi-MB originals;
+-- face detection runs on the detection-size derivative.
+
+ALTER TABLE gallery_images
+ADD COLUMN IF NOT EXISTS derivatives JSONB;
+
+COMMENT ON COLUMN gallery_images.derivatives IS
+'Derivatives manifest: {"version": 1, "source": {"width", "height"},
+"sizes": {"thumb"|"grid"|"lightbox": {"width", "height", "webp", "jpeg", "avif"?},
+"detection": {"width", "height", "jpeg"}}}. NULL = not generated yet (original only).';
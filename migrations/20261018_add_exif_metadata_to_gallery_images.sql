@@ -0,0 +1,18 @@
+-- Migration: Add EXIF metadata columns to gallery_images
+-- Date: 2026-10-18
+-- Purpose: Header-only metadata probe (ranged GET of the first KBs) at batch-add
+-- and POST /api/images/backfill-metadata fills dimensions, EXIF orientation
+-- and capture timestamp without downloading or decoding the image.
+
+ALTER TABLE gallery_images
+ADD COLUMN IF NOT EXISTS exif_orientation SMALLINT;
+
+ALTER TABLE gallery_images
+ADD COLUMN IF NOT EXISTS taken_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN gallery_images.exif_orientation IS
+'EXIF orientation (1-8) from the file header. width/height are already display
+dimensions (swapped for orientations 5-8).';
+
+COMMENT ON COLUMN gallery_images.taken_at IS
+'EXIF DateTimeOriginal (camera local time, no timezone in EXIF). NULL if absent.';
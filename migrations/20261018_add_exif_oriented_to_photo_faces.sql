@@ -0,0 +1,21 @@
+-- Migration: Add exif_oriented to photo_faces
+-- Date: 2026-10-18
+-- Description: Frame of stored face coordinates (insightface_bbox,
+-- insightface_kps). Faces detected before EXIF-aware decoding were stored in
+-- raw sensor orientation; for EXIF-rotated photos those coordinates don't
+-- match the upright image. Existing rows are marked false, new rows default
+-- to true. Descriptor regeneration decodes the photo in the matching frame.
+
+-- ============================================
+-- Add column (existing rows -> false)
+-- ============================================
+
+ALTER TABLE photo_faces
+    ADD COLUMN IF NOT EXISTS exif_oriented BOOLEAN NOT NULL DEFAULT false;
+
+-- New rows: coordinates follow EXIF orientation
+ALTER TABLE photo_faces
+    ALTER COLUMN exif_oriented SET DEFAULT true;
+
+COMMENT ON COLUMN photo_faces.exif_oriented IS
+    'true: bbox/kps in EXIF-oriented (upright) frame; false: raw orientation (faces stored before EXIF-aware decoding)';
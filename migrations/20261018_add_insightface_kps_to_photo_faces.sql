@@ -0,0 +1,13 @@
+-- Migration: Add insightface_kps column to photo_faces
+-- Date: 2026-10-18
+-- Purpose: Store 5-point landmarks from detection so descriptors can be
+-- regenerated with the recognition model only (no full-image detection)
+
+-- Format: [[x, y], [x, y], [x, y], [x, y], [x, y]] in original image pixels
+-- (left eye, right eye, nose, left mouth corner, right mouth corner)
+ALTER TABLE photo_faces
+ADD COLUMN IF NOT EXISTS insightface_kps JSONB;
+
+COMMENT ON COLUMN photo_faces.insightface_kps IS
+'5-point face landmarks from InsightFace detection. NULL for faces detected before 2026-10
+or drawn manually - regeneration falls back to detection inside the padded bbox region.';
@@ -0,0 +1,34 @@
+-- Migration: Keep people.updated_at current
+-- Date: 2026-10-18
+-- Description: Trigger that sets people.updated_at on every UPDATE, plus an
+-- index on updated_at. The backend's in-memory people directory refreshes by
+-- delta (updated_at >= last seen), so every change must bump updated_at,
+-- including updates that don't set it explicitly.
+
+-- ============================================
+-- Trigger function
+-- ============================================
+
+CREATE OR REPLACE FUNCTION people_set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION people_set_updated_at() IS
+    'BEFORE UPDATE trigger on people: sets updated_at = NOW()';
+
+DROP TRIGGER IF EXISTS trg_people_set_updated_at ON people;
+
+CREATE TRIGGER trg_people_set_updated_at
+    BEFORE UPDATE ON people
+    FOR EACH ROW
+    EXECUTE FUNCTION people_set_updated_at();
+
+-- ============================================
+-- Index for delta reads
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_people_updated_at ON people (updated_at);
@@ -0,0 +1,23 @@
+-- Migration: Add perceptual hash / near-duplicate columns to gallery_images
+-- Date: 2026-10-18
+-- Purpose: Near-duplicate detection at ingest (bursts, duplicate exports).
+-- Background processing computes a dHash per photo; photos within a few bits
+-- of an already processed photo in the same gallery reuse its detections.
+
+-- 64-bit dHash as 16-char hex. Set only after the photo was processed.
+ALTER TABLE gallery_images
+ADD COLUMN IF NOT EXISTS perceptual_hash TEXT;
+
+-- Original photo this one near-duplicates (detections were copied from it)
+ALTER TABLE gallery_images
+ADD COLUMN IF NOT EXISTS duplicate_of UUID REFERENCES gallery_images(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_gallery_images_gallery_hash
+    ON gallery_images(gallery_id) WHERE perceptual_hash IS NOT NULL;
+
+COMMENT ON COLUMN gallery_images.perceptual_hash IS
+'dHash (64 bit, hex) of the photo. NULL = not processed by background queue yet.';
+
+COMMENT ON COLUMN gallery_images.duplicate_of IS
+'Near-duplicate of this gallery photo (faces copied from it). Admin can hide duplicates
+via GET /api/images/gallery/{id}?hide_duplicates=true';
@@ -0,0 +1,43 @@
+-- Migration: Create photo_processing_queue table
+-- Date: 2026-10-18
+-- Description: Persistent work queue for background face detection/recognition.
+-- /images/batch-add enqueues inserted photos; the in-process worker detects faces,
+-- runs recognition and stores results as unverified photo_faces.
+
+-- ============================================
+-- Create photo_processing_queue table
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS photo_processing_queue (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    photo_id UUID NOT NULL REFERENCES gallery_images(id) ON DELETE CASCADE,
+
+    -- Job state: pending -> processing -> done | failed
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    faces_count INTEGER,
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- One job per photo (re-enqueue resets the existing row)
+    CONSTRAINT unique_photo_processing_job UNIQUE (photo_id)
+);
+
+-- Index for worker polling (oldest pending first)
+CREATE INDEX IF NOT EXISTS idx_photo_processing_queue_pending
+    ON photo_processing_queue(created_at) WHERE status = 'pending';
+
+COMMENT ON TABLE photo_processing_queue IS
+'Background detection/recognition jobs for uploaded photos. Rows in status processing
+are reset to pending on worker start (crash recovery).';
+
+-- ============================================
+-- Verification queries (run manually after migration)
+-- ============================================
+
+-- Queue status:
+-- SELECT status, COUNT(*) FROM photo_processing_queue GROUP BY status;
@@ -0,0 +1,45 @@
+-- Migration: Create storage_objects table (content-addressed storage)
+-- Date: 2026-10-18
+-- Description: sha256 of file content -> stored MinIO object.
+-- Re-uploads of identical files reuse the stored object (and its detections);
+-- objects no photo references anymore are deleted (ref_count = 0).
+
+-- ============================================
+-- Create storage_objects table
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS storage_objects (
+    sha256 TEXT PRIMARY KEY,
+    bucket TEXT NOT NULL,
+    object_name TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    size BIGINT,
+
+    -- Number of gallery_images with this content_hash (recomputed by the backend)
+    ref_count INTEGER NOT NULL DEFAULT 0,
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Index for orphan cleanup
+CREATE INDEX IF NOT EXISTS idx_storage_objects_orphans
+    ON storage_objects(updated_at) WHERE ref_count = 0;
+
+-- ============================================
+-- Content hash on gallery_images
+-- ============================================
+
+ALTER TABLE gallery_images
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_gallery_images_content_hash
+    ON gallery_images(content_hash) WHERE content_hash IS NOT NULL;
+
+COMMENT ON TABLE storage_objects IS
+'Content-addressed registry of stored photo objects (sha256 -> MinIO object)';
+
+COMMENT ON COLUMN gallery_images.content_hash IS
+'sha256 of the photo file (storage_objects.sha256). NULL = not hashed yet
+(presigned uploads are hashed by background processing).';
@@ -0,0 +1,32 @@
+-- Migration: Create update_gallery_images_order function
+-- Date: 2026-10-18
+-- Description: Bulk reorder of gallery photos in one statement.
+-- Called by PATCH /api/images/gallery/{gallery_id}/sort-order via RPC
+-- (one round trip instead of one UPDATE per photo).
+
+-- ============================================
+-- Create function
+-- ============================================
+
+CREATE OR REPLACE FUNCTION update_gallery_images_order(
+    p_gallery_id UUID,
+    p_ids UUID[],
+    p_orders INTEGER[]
+)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE gallery_images gi
+    SET display_order = o.display_order
+    FROM unnest(p_ids, p_orders) AS o(id, display_order)
+    WHERE gi.id = o.id
+      AND gi.gallery_id = p_gallery_id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION update_gallery_images_order(UUID, UUID[], INTEGER[]) IS
+    'Set display_order of many photos of one gallery (ids[i] -> orders[i]), returns updated count';
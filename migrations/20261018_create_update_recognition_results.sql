@@ -0,0 +1,40 @@
+-- Migration: Create update_recognition_results function
+-- Date: 2026-10-18
+-- Description: Bulk write of recognition results (person_id, confidence,
+-- optional verified flags) in one statement. Called via RPC by the backend's
+-- RecognitionResultWriter (recognize-unknown, batch recognition) and
+-- process-photo. UPDATE only: faces deleted or rejected meanwhile are skipped
+-- (an upsert would re-create them without bbox/descriptor).
+
+-- ============================================
+-- Create function
+-- ============================================
+
+CREATE OR REPLACE FUNCTION update_recognition_results(
+    p_ids UUID[],
+    p_person_ids UUID[],
+    p_confidences DOUBLE PRECISION[],
+    p_verified BOOLEAN[],
+    p_verified_at TIMESTAMPTZ[]
+)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE photo_faces pf
+    SET person_id = u.person_id,
+        recognition_confidence = u.confidence,
+        -- NULL verified = keep stored verification
+        verified = COALESCE(u.verified, pf.verified),
+        verified_at = CASE WHEN u.verified IS NULL THEN pf.verified_at ELSE u.verified_at END
+    FROM unnest(p_ids, p_person_ids, p_confidences, p_verified, p_verified_at)
+        AS u(id, person_id, confidence, verified, verified_at)
+    WHERE pf.id = u.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION update_recognition_results(UUID[], UUID[], DOUBLE PRECISION[], BOOLEAN[], TIMESTAMPTZ[]) IS
+    'Set person_id/recognition_confidence (and verified/verified_at when not NULL) of many existing photo_faces, returns updated count';
@@ -54,6 +54,68 @@ class Settings:
     cache_dir: str = "data/cache"
     uploads_dir: str = "uploads"
     
+    # === ONNX Runtime ===
+    # Execution provider: "cpu" or "openvino" (Intel CPUs, needs onnxruntime-openvino)
+    onnx_execution_provider: str = "cpu"
+    # 0 = use all available cores
+    onnx_intra_op_threads: int = 0
+    onnx_inter_op_threads: int = 1
+    # Optimized model cache (defaults to {cache_dir}/onnx)
+    onnx_cache_dir: Optional[str] = None
+    
+    # === Startup ===
+    # "full" - all endpoints; "readonly" - read-only API (gallery/people reads),
+    # ML routers not registered, models never imported or loaded
+    api_profile: str = "full"
+    # Load models + index at boot (readiness gate /ready); False = lazy on first request
+    warmup_on_startup: bool = True
+    
+    # === Background photo processing (photo_processing_queue) ===
+    photo_queue_enabled: bool = True
+    photo_queue_batch_size: int = 10
+    photo_queue_poll_seconds: float = 15.0
+    photo_queue_max_attempts: int = 3
+    # Jobs in processing not renewed for this long are returned to pending
+    photo_queue_lease_seconds: float = 600.0
+    # Max dHash Hamming distance (of 64 bits) to treat photos as near-duplicates
+    duplicate_hash_distance: int = 6
+    
+    # === Image derivatives (thumb/grid/lightbox/detection sizes in MinIO) ===
+    derivatives_enabled: bool = True
+    derivative_workers: int = 2
+    
+    # === Spectator filtering (services/rejected_faces_index.py) ===
+    # Faces matching a rejected cluster are dropped by automatic detection
+    reject_spectators_enabled: bool = True
+    rejected_face_threshold: float = 0.85
+    
+    # === Content-addressed storage (storage_objects: sha256 -> MinIO object) ===
+    content_dedup_enabled: bool = True
+    # Unreferenced objects younger than this are kept (uploaded, batch-add pending)
+    orphan_grace_hours: float = 24.0
+    
+    # === Supabase data access (services/supabase/aio.py) ===
+    # Per-call timeout (seconds) and max concurrent PostgREST calls per worker
+    supabase_timeout: float = 15.0
+    supabase_concurrency: int = 32
+    
+    # === Activity log (write-behind buffer, services/activity_log.py) ===
+    activity_flush_size: int = 100
+    activity_flush_seconds: float = 2.0
+    # Rows that couldn't be written (DB unavailable) are spilled here and replayed
+    activity_journal_path: str = "data/activity_journal.jsonl"
+    
+    # === Image downloads (shared pooled client) ===
+    download_max_connections: int = 32
+    download_concurrency: int = 16
+    
+    # === Photo cache (stored in {cache_dir}/photos) ===
+    photo_cache_max_mb: int = 4096
+    
+    # === Detection cache ===
+    # Raw detections keyed by image hash (stored in {cache_dir}/detections)
+    detection_cache_max_mb: int = 2048
+    
     # === JWT (for auth) ===
     jwt_secret: Optional[str] = None
     jwt_algorithm: str = "HS256"
@@ -62,6 +124,11 @@ class Settings:
     # === Telegram ===
     telegram_bot_token: Optional[str] = None
 
+    @property
+    def is_readonly_profile(self) -> bool:
+        """Read-only API profile (no ML imports, write methods rejected)."""
+        return self.api_profile == "readonly"
+    
     @property
     def cors_origins(self) -> List[str]:
         """Parse ALLOWED_ORIGINS into list."""
@@ -84,6 +151,33 @@ class Settings:
             models_dir=os.getenv("MODELS_DIR", "/home/nickr/python/models"),
             cache_dir=os.getenv("CACHE_DIR", "data/cache"),
             uploads_dir=os.getenv("UPLOADS_DIR", "uploads"),
+            onnx_execution_provider=os.getenv("ONNX_EXECUTION_PROVIDER", "cpu").lower(),
+            onnx_intra_op_threads=int(os.getenv("ONNX_INTRA_OP_THREADS", "0")),
+            onnx_inter_op_threads=int(os.getenv("ONNX_INTER_OP_THREADS", "1")),
+            onnx_cache_dir=os.getenv("ONNX_CACHE_DIR"),
+            api_profile=os.getenv("API_PROFILE", "full").lower(),
+            warmup_on_startup=os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("true", "1", "yes"),
+            photo_queue_enabled=os.getenv("PHOTO_QUEUE_ENABLED", "true").lower() in ("true", "1", "yes"),
+            photo_queue_batch_size=int(os.getenv("PHOTO_QUEUE_BATCH_SIZE", "10")),
+            photo_queue_poll_seconds=float(os.getenv("PHOTO_QUEUE_POLL_SECONDS", "15")),
+            photo_queue_max_attempts=int(os.getenv("PHOTO_QUEUE_MAX_ATTEMPTS", "3")),
+            photo_queue_lease_seconds=float(os.getenv("PHOTO_QUEUE_LEASE_SECONDS", "600")),
+            duplicate_hash_distance=int(os.getenv("DUPLICATE_HASH_DISTANCE", "6")),
+            derivatives_enabled=os.getenv("DERIVATIVES_ENABLED", "true").lower() in ("true", "1", "yes"),
+            derivative_workers=int(os.getenv("DERIVATIVE_WORKERS", "2")),
+            reject_spectators_enabled=os.getenv("REJECT_SPECTATORS_ENABLED", "true").lower() in ("true", "1", "yes"),
+            rejected_face_threshold=float(os.getenv("REJECTED_FACE_THRESHOLD", "0.85")),
+            content_dedup_enabled=os.getenv("CONTENT_DEDUP_ENABLED", "true").lower() in ("true", "1", "yes"),
+            orphan_grace_hours=float(os.getenv("ORPHAN_GRACE_HOURS", "24")),
+            supabase_timeout=float(os.getenv("SUPABASE_TIMEOUT", "15")),
+            supabase_concurrency=int(os.getenv("SUPABASE_CONCURRENCY", "32")),
+            activity_flush_size=int(os.getenv("ACTIVITY_FLUSH_SIZE", "100")),
+            activity_flush_seconds=float(os.getenv("ACTIVITY_FLUSH_SECONDS", "2")),
+            activity_journal_path=os.getenv("ACTIVITY_JOURNAL_PATH", "data/activity_journal.jsonl"),
+            download_max_connections=int(os.getenv("DOWNLOAD_MAX_CONNECTIONS", "32")),
+            download_concurrency=int(os.getenv("DOWNLOAD_CONCURRENCY", "16")),
+            photo_cache_max_mb=int(os.getenv("PHOTO_CACHE_MAX_MB", "4096")),
+            detection_cache_max_mb=int(os.getenv("DETECTION_CACHE_MAX_MB", "2048")),
             jwt_secret=os.getenv("JWT_SECRET"),
             jwt_algorithm=os.getenv("JWT_ALGORITHM", "HS256"),
             jwt_expiration_hours=int(os.getenv("JWT_EXPIRATION_HOURS", "24")),
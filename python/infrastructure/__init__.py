@@ -3,7 +3,11 @@ Infrastructure package - external dependencies and integrations.
 
 Modules:
 - supabase.py - Unified Supabase client
-- storage.py - File storage operations
+- storage.py - File storage operations, PhotoCache
+- disk_cache.py - Size-bounded LRU disk cache
+- http_client.py - Shared pooled image downloader (MinIO direct read)
+- detection_cache.py - Raw detection cache (by image hash)
+- image_header.py - Image format/dimensions from header bytes (no decode)
 """
 
 from infrastructure.supabase import SupabaseClient, get_supabase_client
@@ -0,0 +1,128 @@
+"""
+Detection result cache.
+Stores raw face detections (before quality filtering) on disk,
+keyed by image content hash + model version.
+
+Changing quality filters (min_face_size, min_blur_score, ...) only
+re-filters cached detections - no inference on repeat requests.
+"""
+
+import os
+import hashlib
+from typing import Optional, Dict, List, Any
+
+import numpy as np
+
+from core.config import settings
+from core.logging import get_logger
+from infrastructure.disk_cache import DiskLRUCache
+
+logger = get_logger(__name__)
+
+EMBEDDING_DIM = 512
+
+
+class DetectionCache:
+    """
+    Disk cache of raw detections with size-based LRU eviction.
+
+    One .npz file per image: bboxes (N,4), kps (N,5,2), det_scores (N,),
+    embeddings (N,512), blur_scores (N,). Detections of a downscaled
+    derivative also keep original_blur_scores (N,) once measured.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self._store = DiskLRUCache(
+            cache_dir or os.path.join(settings.cache_dir, "detections"),
+            max_bytes if max_bytes is not None else settings.detection_cache_max_mb * 1024 * 1024,
+            name="DetectionCache"
+        )
+
+    @staticmethod
+    def make_key(image_bytes, model_version: str) -> str:
+        """Cache key: sha256 of image bytes + model version."""
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        version = hashlib.sha1(model_version.encode()).hexdigest()[:8]
+        return f"{digest}_{version}"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached raw detections.
+
+        Returns:
+            List of dicts (bbox, kps, det_score, embedding, blur_score
+            [, original_blur_score]) or None on miss
+        """
+        path = self._store.lookup(f"{key}.npz")
+        if path is None:
+            return None
+
+        try:
+            with np.load(path) as data:
+                bboxes = data["bboxes"]
+                kps = data["kps"]
+                det_scores = data["det_scores"]
+                embeddings = data["embeddings"]
+                blur_scores = data["blur_scores"]
+                original_blur_scores = data["original_blur_scores"] if "original_blur_scores" in data else None
+        except Exception as e:
+            logger.warning(f"DetectionCache: unreadable entry {key[:12]}: {e}")
+            self._store.remove(f"{key}.npz")
+            return None
+
+        detections = [
+            {
+                "bbox": bboxes[i],
+                "kps": kps[i] if not np.isnan(kps[i]).any() else None,
+                "det_score": det_scores[i],
+                "embedding": embeddings[i],
+                "blur_score": float(blur_scores[i]),
+            }
+            for i in range(len(bboxes))
+        ]
+        if original_blur_scores is not None:
+            for det, score in zip(detections, original_blur_scores):
+                det["original_blur_score"] = float(score)
+        return detections
+
+    def put(self, key: str, detections: List[Dict[str, Any]]):
+        """Store raw detections (atomic write, evicts if over budget)."""
+        n = len(detections)
+        bboxes = np.zeros((n, 4), dtype=np.float32)
+        kps = np.full((n, 5, 2), np.nan, dtype=np.float32)
+        det_scores = np.zeros(n, dtype=np.float32)
+        embeddings = np.zeros((n, EMBEDDING_DIM), dtype=np.float32)
+        blur_scores = np.zeros(n, dtype=np.float32)
+
+        for i, det in enumerate(detections):
+            bboxes[i] = det["bbox"]
+            if det.get("kps") is not None:
+                kps[i] = det["kps"]
+            det_scores[i] = det["det_score"]
+            embeddings[i] = det["embedding"]
+            blur_scores[i] = det["blur_score"]
+
+        arrays = dict(bboxes=bboxes, kps=kps, det_scores=det_scores,
+                      embeddings=embeddings, blur_scores=blur_scores)
+        if n and all("original_blur_score" in det for det in detections):
+            arrays["original_blur_scores"] = np.array(
+                [det["original_blur_score"] for det in detections], dtype=np.float32
+            )
+
+        self._store.write_with(f"{key}.npz", lambda f: np.savez(f, **arrays))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        return self._store.get_stats()
+
+
+# Global instance
+_detection_cache: Optional[DetectionCache] = None
+
+
+def get_detection_cache() -> DetectionCache:
+    """Get singleton DetectionCache instance."""
+    global _detection_cache
+    if _detection_cache is None:
+        _detection_cache = DetectionCache()
+    return _detection_cache
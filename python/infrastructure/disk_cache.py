@@ -0,0 +1,197 @@
+"""
+Size-bounded LRU disk cache.
+Shared storage layer for PhotoCache and DetectionCache.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, BinaryIO
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskLRUCache:
+    """
+    Flat directory of cache files with an in-memory LRU index.
+
+    - Byte budget: least recently used files are evicted when exceeded
+    - Atomic writes: temp file + os.replace (no partial files on crash)
+    - Index rebuilt from disk on startup (order by mtime, refreshed on access)
+    - Hit/miss counters
+    """
+
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(self, cache_dir: str, max_bytes: int, name: str = "DiskCache"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.name = name
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, LRU first
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._scan()
+        logger.info(f"{self.name} initialized at {self.cache_dir} "
+                    f"({len(self._index)} files, {self._total_bytes / 1024 / 1024:.1f} MB, "
+                    f"budget {self.max_bytes / 1024 / 1024:.0f} MB)")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _scan(self):
+        """Build index from files on disk (oldest access first)."""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(self.TMP_SUFFIX):
+                # Leftover from interrupted write
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Get file path for key and mark it as recently used.
+
+        Returns:
+            Path to cached file or None on miss
+        """
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # File removed externally
+            self.remove(key)
+            return None
+        return path
+
+    def read_bytes(self, key: str) -> Optional[bytes]:
+        """Read cached bytes (None on miss)."""
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            self.remove(key)
+            return None
+
+    def write(self, key: str, data: bytes) -> Optional[str]:
+        """Store bytes under key. Returns path or None on failure."""
+        return self.write_with(key, lambda f: f.write(data))
+
+    def write_with(self, key: str, writer: Callable[[BinaryIO], Any]) -> Optional[str]:
+        """
+        Atomically store file produced by writer(file_obj).
+
+        Returns:
+            Path to stored file or None on failure
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{self.TMP_SUFFIX}"
+
+        try:
+            with open(tmp_path, "wb") as f:
+                writer(f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"{self.name}: failed to write {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._total_bytes += size
+
+        self._evict()
+        return path
+
+    def remove(self, key: str):
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used files until under budget."""
+        victims = []
+        with self._lock:
+            total = self._total_bytes
+            for key, size in self._index.items():
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+
+        for key in victims:
+            self.remove(key)
+
+        if victims:
+            logger.info(f"{self.name}: evicted {len(victims)} files "
+                        f"({self._total_bytes / 1024 / 1024:.1f} MB used)")
+
+    def clear_older_than(self, max_age_seconds: float) -> int:
+        """Remove files not accessed for max_age_seconds."""
+        now = time.time()
+        with self._lock:
+            keys = list(self._index.keys())
+
+        removed = 0
+        for key in keys:
+            try:
+                age = now - os.path.getmtime(self._path(key))
+            except OSError:
+                age = max_age_seconds + 1
+            if age > max_age_seconds:
+                self.remove(key)
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "files": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,174 @@
+"""
+Shared image download service.
+
+One application-scoped httpx.AsyncClient (keep-alive, HTTP/2, pooled
+connections) instead of a fresh client per image. URLs under
+MINIO_PUBLIC_URL are read directly from MinIO (same host) without
+going through the public HTTPS endpoint.
+"""
+
+import asyncio
+from typing import Mapping, Optional, Tuple
+
+import httpx
+
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_total_size(headers: Mapping[str, str]) -> Optional[int]:
+    """
+    Total object size from response headers of a (ranged) GET:
+    Content-Range "bytes 0-65535/1234567", else Content-Length of a full response.
+    """
+    content_range = headers.get("content-range") or headers.get("Content-Range")
+    if content_range:
+        total = content_range.rpartition("/")[2].strip()
+        return int(total) if total.isdigit() else None
+    length = headers.get("content-length") or headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+class ImageDownloader:
+    """
+    Pooled downloader for photos/avatars.
+
+    - Connection pool with keep-alive (and HTTP/2 if h2 is installed)
+    - Concurrency limit for simultaneous downloads
+    - MinIO shortcut: get_object() for our own storage URLs
+    - fetch_head(): ranged GET of the first bytes + total size (metadata probes)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = None,
+        max_concurrency: int = None,
+        timeout: float = 30.0
+    ):
+        self.max_connections = max_connections or settings.download_max_connections
+        self.max_concurrency = max_concurrency or settings.download_concurrency
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazily created shared AsyncClient."""
+        if self._client is None or self._client.is_closed:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0
+                )
+            )
+            logger.info(f"ImageDownloader client created (http2={http2}, "
+                        f"max_connections={self.max_connections})")
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Download bytes from URL.
+
+        Raises:
+            httpx.HTTPError: If HTTP download fails
+        """
+        async with self.semaphore:
+            image_bytes = await self._fetch_from_minio(url)
+            if image_bytes is not None:
+                return image_bytes
+
+            response = await self.client.get(url)
+            response.raise_for_status()
+            return response.content
+
+    async def fetch_head(self, url: str, length: int) -> Tuple[bytes, Optional[int]]:
+        """
+        Download only the first `length` bytes (ranged GET).
+
+        Servers that ignore Range are read as a stream and cut off,
+        so at most ~length bytes are transferred either way.
+
+        Returns:
+            (first bytes, total object size or None if the server doesn't say)
+
+        Raises:
+            httpx.HTTPError: If HTTP download fails
+        """
+        async with self.semaphore:
+            head = await self._fetch_from_minio(url, length, with_size=True)
+            if head is not None:
+                return head
+
+            buffer = bytearray()
+            async with self.client.stream(
+                "GET", url, headers={"Range": f"bytes=0-{length - 1}"}
+            ) as response:
+                response.raise_for_status()
+                size = content_total_size(response.headers)
+                async for chunk in response.aiter_bytes():
+                    buffer += chunk
+                    if len(buffer) >= length:
+                        break
+            return bytes(buffer[:length]), size
+
+    async def _fetch_from_minio(self, url: str, length: int = 0, with_size: bool = False):
+        """
+        Read object (or its first `length` bytes) directly from MinIO if URL
+        points to our storage; with_size returns (head, total size).
+        """
+        from infrastructure.minio_storage import get_minio_storage
+
+        try:
+            minio = get_minio_storage()
+        except Exception as e:
+            logger.debug(f"MinIO unavailable, using HTTP: {e}")
+            return None
+
+        location = minio.parse_url(url)
+        if not location:
+            return None
+
+        bucket, object_name = location
+        try:
+            if with_size:
+                return await asyncio.to_thread(minio.get_object_head, bucket, object_name, length)
+            return await asyncio.to_thread(minio.get_object_bytes, bucket, object_name, length)
+        except Exception as e:
+            logger.warning(f"MinIO direct read failed for {bucket}/{object_name}, using HTTP: {e}")
+            return None
+
+    async def close(self):
+        """Close pooled connections (on application shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+# Global instance
+_image_downloader: Optional[ImageDownloader] = None
+
+
+def get_image_downloader() -> ImageDownloader:
+    """Get singleton ImageDownloader instance."""
+    global _image_downloader
+    if _image_downloader is None:
+        _image_downloader = ImageDownloader()
+    return _image_downloader
@@ -0,0 +1,266 @@
+"""
+Image header probing.
+
+Reads format, dimensions, EXIF orientation and capture timestamp from the
+first bytes of a file (no decode), so metadata is known while the file is
+still streaming or from a ranged GET of a stored object.
+Supported: JPEG (+EXIF), PNG, WebP, GIF, HEIC/HEIF/AVIF.
+
+width/height are display dimensions: swapped when EXIF orientation
+(or HEIF irot) rotates the image by 90 degrees, matching decode_image().
+"""
+
+import struct
+from typing import Optional, Dict, Any, Tuple
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Usually enough: JPEG SOF / HEIF meta box are within the first KBs
+HEADER_PREFIX_BYTES = 64 * 1024
+# Enough for JPEG headers with large EXIF thumbnails/ICC segments before SOF
+HEADER_PROBE_BYTES = 256 * 1024
+
+# JPEG SOF markers (baseline, progressive, lossless...) - not DHT/JPG/DAC
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# EXIF tags
+_TAG_ORIENTATION = 0x0112
+_TAG_DATETIME = 0x0132
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATETIME_ORIGINAL = 0x9003
+
+_HEIF_BRANDS = {b"heic", b"heix", b"heim", b"heis", b"hevc", b"hevx", b"mif1", b"msf1", b"avif", b"avis"}
+
+
+def probe_header(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse image header.
+
+    Args:
+        data: First bytes of the file (HEADER_PROBE_BYTES is enough)
+
+    Returns:
+        {"format": "jpeg"|"png"|"webp"|"gif"|"heic"|"avif",
+         "width": int, "height": int,
+         "orientation": int (EXIF 1-8) or None,
+         "taken_at": ISO datetime string (EXIF DateTimeOriginal) or None}
+        or None if format is unknown or header is truncated
+    """
+    try:
+        if data[:3] == b"\xff\xd8\xff":
+            result = _probe_jpeg(data)
+        elif data[:8] == b"\x89PNG\r\n\x1a\n":
+            result = _probe_png(data)
+        elif data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            result = _probe_webp(data)
+        elif data[:6] in (b"GIF87a", b"GIF89a"):
+            width, height = struct.unpack("<HH", data[6:10])
+            result = {"format": "gif", "width": width, "height": height}
+        elif data[4:8] == b"ftyp" and data[8:12] in _HEIF_BRANDS:
+            result = _probe_heif(data)
+        else:
+            result = None
+    except (struct.error, IndexError, ValueError) as e:
+        logger.debug(f"Header probe failed: {e}")
+        return None
+
+    if result is None:
+        return None
+
+    result.setdefault("orientation", None)
+    result.setdefault("taken_at", None)
+    if result["orientation"] in (5, 6, 7, 8):
+        result["width"], result["height"] = result["height"], result["width"]
+    return result
+
+
+# ============================================================
+# JPEG + EXIF
+# ============================================================
+
+def _probe_jpeg(data: bytes) -> Optional[Dict[str, Any]]:
+    exif = {}
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            # Markers without length
+            pos += 2
+            continue
+
+        (length,) = struct.unpack(">H", data[pos + 2:pos + 4])
+        if marker == 0xE1 and data[pos + 4:pos + 10] == b"Exif\x00\x00" and not exif:
+            exif = _parse_exif(data[pos + 10:pos + 2 + length])
+        elif marker in _SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return {"format": "jpeg", "width": width, "height": height, **exif}
+        elif marker == 0xDA:
+            # Start of scan without SOF - broken file
+            return None
+        pos += 2 + length
+    return None
+
+
+def _parse_exif(tiff: bytes) -> Dict[str, Any]:
+    """Orientation + DateTimeOriginal from TIFF-structured EXIF block."""
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return {}
+
+    (ifd0,) = struct.unpack(endian + "I", tiff[4:8])
+    tags = _read_ifd(tiff, ifd0, endian)
+
+    result = {}
+    if _TAG_ORIENTATION in tags:
+        orientation = tags[_TAG_ORIENTATION]
+        if 1 <= orientation <= 8:
+            result["orientation"] = orientation
+
+    taken_at = None
+    if _TAG_EXIF_IFD in tags:
+        exif_tags = _read_ifd(tiff, tags[_TAG_EXIF_IFD], endian)
+        taken_at = exif_tags.get(_TAG_DATETIME_ORIGINAL)
+    taken_at = _exif_datetime(taken_at or tags.get(_TAG_DATETIME))
+    if taken_at:
+        result["taken_at"] = taken_at
+    return result
+
+
+def _read_ifd(tiff: bytes, offset: int, endian: str) -> Dict[int, Any]:
+    """Read SHORT/LONG/ASCII values of one IFD (other types skipped)."""
+    values = {}
+    (count,) = struct.unpack(endian + "H", tiff[offset:offset + 2])
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        if entry + 12 > len(tiff):
+            break
+        tag, type_, n = struct.unpack(endian + "HHI", tiff[entry:entry + 8])
+        raw = tiff[entry + 8:entry + 12]
+        if type_ == 3:  # SHORT
+            values[tag] = struct.unpack(endian + "H", raw[:2])[0]
+        elif type_ == 4:  # LONG
+            values[tag] = struct.unpack(endian + "I", raw)[0]
+        elif type_ == 2:  # ASCII
+            if n <= 4:
+                text = raw[:n]
+            else:
+                (value_offset,) = struct.unpack(endian + "I", raw)
+                text = tiff[value_offset:value_offset + n]
+            values[tag] = text.split(b"\x00", 1)[0].decode("ascii", "ignore")
+    return values
+
+
+def _exif_datetime(value: Optional[str]) -> Optional[str]:
+    """'YYYY:MM:DD HH:MM:SS' -> 'YYYY-MM-DDTHH:MM:SS' (None if malformed)."""
+    if not value or len(value) < 19 or value.startswith("0000"):
+        return None
+    date, _, time = value[:19].partition(" ")
+    parts = date.split(":")
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return None
+    return f"{'-'.join(parts)}T{time}"
+
+
+# ============================================================
+# PNG / WebP
+# ============================================================
+
+def _probe_png(data: bytes) -> Optional[Dict[str, Any]]:
+    if data[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", data[16:24])
+    return {"format": "png", "width": width, "height": height}
+
+
+def _probe_webp(data: bytes) -> Optional[Dict[str, Any]]:
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        # Lossy: 14-bit dimensions after the frame tag and start code
+        width, height = struct.unpack("<HH", data[26:30])
+        width, height = width & 0x3FFF, height & 0x3FFF
+    elif chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+    else:
+        return None
+    return {"format": "webp", "width": width, "height": height}
+
+
+# ============================================================
+# HEIF (HEIC / AVIF) - ISO BMFF boxes: meta > iprp > ipco > ispe/irot
+# ============================================================
+
+def _iter_boxes(data: bytes, start: int, end: int):
+    """Yield (type, payload_start, box_end) of boxes in data[start:end]."""
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack(">I4s", data[pos:pos + 8])
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack(">Q", data[pos + 8:pos + 16])
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield box_type, pos + header, min(pos + size, end)
+        pos += size
+
+
+def _find_box(data: bytes, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for found_type, payload, box_end in _iter_boxes(data, start, end):
+        if found_type == box_type:
+            return payload, box_end
+    return None
+
+
+def _probe_heif(data: bytes) -> Optional[Dict[str, Any]]:
+    meta = _find_box(data, 0, len(data), b"meta")
+    if not meta:
+        return None
+    # meta is a FullBox: 4 bytes version/flags before children
+    iprp = _find_box(data, meta[0] + 4, meta[1], b"iprp")
+    if not iprp:
+        return None
+    ipco = _find_box(data, iprp[0], iprp[1], b"ipco")
+    if not ipco:
+        return None
+
+    # Largest ispe is the primary image (others are thumbnails/tiles)
+    width = height = 0
+    rotation = 0
+    for box_type, payload, _ in _iter_boxes(data, ipco[0], ipco[1]):
+        if box_type == b"ispe":
+            w, h = struct.unpack(">II", data[payload + 4:payload + 12])
+            if w * h > width * height:
+                width, height = w, h
+        elif box_type == b"irot":
+            rotation = data[payload] & 0x03
+
+    if not width:
+        return None
+
+    result = {
+        "format": "avif" if data[8:12] in (b"avif", b"avis") else "heic",
+        "width": width,
+        "height": height,
+    }
+    if rotation in (1, 3):
+        # 90/270 degrees - same effect on dimensions as EXIF orientation 6/8
+        result["orientation"] = 6 if rotation == 3 else 8
+    return result
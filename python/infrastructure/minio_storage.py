@@ -6,21 +6,67 @@ Handles file uploads and deletions in MinIO S3-compatible storage.
 import os
 import uuid
 import io
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Tuple, BinaryIO, Iterable, List
 from urllib.parse import unquote, quote
 
 from minio import Minio
 from minio.error import S3Error
+from minio.deleteobjects import DeleteObject
 
 from core.logging import get_logger
 from core.slug import to_slug
+from infrastructure.http_client import content_total_size
+from infrastructure.image_header import probe_header, HEADER_PROBE_BYTES
 
 MAX_SLUG_LENGTH = 80
 
+# Multipart part size for streamed uploads (MinIO minimum is 5 MB).
+# Bounds memory per upload regardless of file size.
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+
+# Batch deletes: S3 DeleteObjects accepts up to 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+DELETE_CONCURRENCY = 4
+
 logger = get_logger(__name__)
 
 
+def _unique_object_name(filename: str) -> str:
+    """Generate slug+UUID object name: {slug}_{uuid}.ext"""
+    ext = os.path.splitext(filename)[1].lower() or ".jpg"
+    name_without_ext = os.path.splitext(filename)[0]
+    slug = to_slug(name_without_ext, max_length=MAX_SLUG_LENGTH) or "image"
+    unique_id = uuid.uuid4().hex[:12]
+    return f"{slug}_{unique_id}{ext}"
+
+
+class _HashingReader:
+    """
+    File-like wrapper: sha256 + size + first header bytes computed
+    while put_object reads the stream part by part.
+    """
+
+    def __init__(self, stream: BinaryIO, header_limit: int = HEADER_PROBE_BYTES):
+        self._stream = stream
+        self._header_limit = header_limit
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.header = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        if chunk:
+            self.sha256.update(chunk)
+            self.size += len(chunk)
+            if len(self.header) < self._header_limit:
+                self.header += chunk[:self._header_limit - len(self.header)]
+        return chunk
+
+
 class MinioStorage:
     """MinIO storage service for file operations."""
 
@@ -59,12 +105,7 @@ class MinioStorage:
         Returns:
             Dict with url and object_name
         """
-        # Generate slug+UUID filename: {slug}_{uuid}.ext
-        ext = os.path.splitext(filename)[1].lower() or ".jpg"
-        name_without_ext = os.path.splitext(filename)[0]
-        slug = to_slug(name_without_ext, max_length=MAX_SLUG_LENGTH) or "image"
-        unique_id = uuid.uuid4().hex[:12]
-        object_name = f"{slug}_{unique_id}{ext}"
+        object_name = _unique_object_name(filename)
 
         try:
             self.client.put_object(
@@ -90,6 +131,202 @@ class MinioStorage:
             logger.error(f"MinIO upload error: {e}")
             raise
 
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        content_type: str = "image/jpeg",
+        folder: str = "photos",
+        length: int = -1
+    ) -> dict:
+        """
+        Upload file-like object to MinIO without reading it into memory.
+
+        Multipart put_object reads UPLOAD_PART_SIZE at a time; sha256 and
+        image header (format, dimensions) are computed on the fly.
+
+        Args:
+            stream: Readable binary stream (e.g. UploadFile.file)
+            filename: Original filename (used for slug generation)
+            content_type: MIME type
+            folder: Bucket name - "photos", "covers", or "avatars"
+            length: Stream size if known, -1 otherwise
+
+        Returns:
+            Dict with url, object_name, bucket, size, sha256, header
+            (header is probe_header() result or None)
+        """
+        object_name = _unique_object_name(filename)
+        reader = _HashingReader(stream)
+
+        try:
+            self.client.put_object(
+                bucket_name=folder,  # folder IS the bucket
+                object_name=object_name,
+                data=reader,
+                length=length,
+                content_type=content_type,
+                part_size=UPLOAD_PART_SIZE
+            )
+        except S3Error as e:
+            logger.error(f"MinIO upload error: {e}")
+            raise
+
+        logger.info(f"Uploaded to {folder}: {object_name} ({reader.size} bytes, streamed)")
+
+        return {
+            "url": f"{self.public_url}/{folder}/{object_name}",
+            "object_name": object_name,
+            "bucket": folder,
+            "size": reader.size,
+            "sha256": reader.sha256.hexdigest(),
+            "header": probe_header(bytes(reader.header)),
+        }
+
+    def get_public_url(self, bucket: str, object_name: str) -> str:
+        """Public URL of an object."""
+        return f"{self.public_url}/{bucket}/{quote(object_name)}"
+
+    def put_object_bytes(
+        self,
+        bucket: str,
+        object_name: str,
+        data: bytes,
+        content_type: str = "image/jpeg"
+    ) -> str:
+        """
+        Store bytes under an exact object name (overwrites existing object).
+
+        Used for deterministic names (image derivatives), unlike upload_file
+        which generates a unique name.
+
+        Returns:
+            Public URL of the object
+        """
+        self.client.put_object(
+            bucket_name=bucket,
+            object_name=object_name,
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type
+        )
+        return self.get_public_url(bucket, object_name)
+
+    def delete_prefix(self, bucket: str, prefix: str) -> int:
+        """
+        Delete all objects under prefix (e.g. "derived/{photo_id}/").
+
+        Returns:
+            Number of objects deleted
+        """
+        objects = [
+            DeleteObject(obj.object_name)
+            for obj in self.client.list_objects(bucket, prefix=prefix, recursive=True)
+        ]
+        if not objects:
+            return 0
+
+        errors = list(self.client.remove_objects(bucket, objects))
+        for error in errors:
+            logger.error(f"MinIO delete error: {error}")
+        return len(objects) - len(errors)
+
+    def delete_objects(self, bucket: str, object_names: Iterable[str]) -> int:
+        """
+        Delete many objects of one bucket with batched DeleteObjects requests
+        (up to DELETE_CONCURRENCY requests in flight).
+
+        Returns:
+            Number of objects deleted
+        """
+        names = list(dict.fromkeys(object_names))
+        if not names:
+            return 0
+
+        def remove_batch(batch: List[str]) -> int:
+            errors = list(self.client.remove_objects(bucket, [DeleteObject(name) for name in batch]))
+            for error in errors:
+                logger.error(f"MinIO delete error: {error}")
+            return len(batch) - len(errors)
+
+        batches = [names[i:i + DELETE_BATCH_SIZE] for i in range(0, len(names), DELETE_BATCH_SIZE)]
+        if len(batches) == 1:
+            deleted = remove_batch(batches[0])
+        else:
+            with ThreadPoolExecutor(max_workers=DELETE_CONCURRENCY) as executor:
+                deleted = sum(executor.map(remove_batch, batches))
+
+        logger.info(f"Deleted {deleted}/{len(names)} objects from {bucket}")
+        return deleted
+
+    def delete_files(self, urls: Iterable[str]) -> int:
+        """
+        Delete many files by public URL (batched per bucket, see delete_objects).
+        URLs not from MinIO are skipped.
+
+        Returns:
+            Number of objects deleted
+        """
+        by_bucket = defaultdict(list)
+        for url in urls:
+            location = self.parse_url(url)
+            if location:
+                by_bucket[location[0]].append(location[1])
+        return sum(self.delete_objects(bucket, names) for bucket, names in by_bucket.items())
+
+    def parse_url(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Extract bucket and object name from public URL.
+
+        URL format: https://api.vlcpadel.com/storage/photos/filename.jpg
+
+        Returns:
+            (bucket, object_name) or None if URL is not from MinIO
+        """
+        prefix = f"{self.public_url}/"
+        if not url or not url.startswith(prefix):
+            return None
+
+        # path is "photos/filename.jpg" or "covers/filename.jpg"
+        path = url[len(prefix):].split("?", 1)[0]
+        parts = path.split("/", 1)
+        if len(parts) != 2 or not parts[1]:
+            return None
+
+        return parts[0], unquote(parts[1])
+
+    def get_object_bytes(self, bucket: str, object_name: str, length: int = 0) -> bytes:
+        """
+        Read object directly from MinIO (bypasses public HTTP endpoint).
+
+        Args:
+            length: Read only the first `length` bytes (ranged GET); 0 = whole object
+        """
+        response = self.client.get_object(
+            bucket_name=bucket, object_name=object_name, offset=0, length=length
+        )
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    def get_object_head(self, bucket: str, object_name: str, length: int) -> Tuple[bytes, Optional[int]]:
+        """
+        Read the first `length` bytes of an object plus its total size.
+
+        Returns:
+            (head bytes, total object size from Content-Range or None)
+        """
+        response = self.client.get_object(
+            bucket_name=bucket, object_name=object_name, offset=0, length=length
+        )
+        try:
+            return response.read(), content_total_size(response.headers)
+        finally:
+            response.close()
+            response.release_conn()
+
     def delete_file(self, url: str) -> bool:
         """
         Delete file from MinIO by URL.
@@ -101,21 +338,11 @@ class MinioStorage:
             True if deleted, False otherwise
         """
         try:
-            # Extract bucket and object name from URL
-            # URL format: https://api.vlcpadel.com/storage/photos/filename.jpg
-            if self.public_url in url:
-                path = url.replace(f"{self.public_url}/", "")
-                # path is now "photos/filename.jpg" or "covers/filename.jpg"
-                parts = path.split("/", 1)
-                if len(parts) == 2:
-                    bucket_name = parts[0]  # photos, covers, or avatars
-                    object_name = unquote(parts[1])
-                else:
-                    logger.warning(f"Invalid URL path: {path}")
-                    return False
-            else:
+            location = self.parse_url(url)
+            if not location:
                 logger.warning(f"URL not from MinIO: {url}")
                 return False
+            bucket_name, object_name = location
 
             self.client.remove_object(
                 bucket_name=bucket_name,
@@ -157,12 +384,7 @@ class MinioStorage:
         Returns:
             Dict with upload_url, object_name, public_url
         """
-        # Generate slug+UUID filename: {slug}_{uuid}.ext
-        ext = os.path.splitext(filename)[1].lower() or ".jpg"
-        name_without_ext = os.path.splitext(filename)[0]
-        slug = to_slug(name_without_ext, max_length=MAX_SLUG_LENGTH) or "image"
-        unique_id = uuid.uuid4().hex[:12]
-        object_name = f"{slug}_{unique_id}{ext}"
+        object_name = _unique_object_name(filename)
 
         try:
             upload_url = self.client.presigned_put_object(
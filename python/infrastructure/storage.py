@@ -1,18 +1,24 @@
 """
 File storage operations.
 Handles photo caching and file management.
+
+PhotoCache is a byte-budget LRU content cache (see disk_cache.py):
+every image consumer (detection, descriptor regeneration, training,
+BiRefNet) reads photos through it, so re-processing a tournament
+never re-downloads.
 """
 
 import os
 import hashlib
-from typing import Optional, Dict
+from typing import Optional, Dict, Any
 import httpx
-import cv2
 import numpy as np
 
 from core.config import settings
 from core.logging import get_logger
 from core.exceptions import ValidationError
+from infrastructure.http_client import get_image_downloader
+from infrastructure.disk_cache import DiskLRUCache
 
 logger = get_logger(__name__)
 
@@ -21,80 +27,102 @@ class PhotoCache:
     """
     Photo caching service.
     Downloads and caches photos locally for processing.
+    
+    - Original bytes stored as {md5(url)}.jpg
+    - Optional reduced-resolution decoded variants as {md5(url)}_{max_size}.npy
     """
     
-    def __init__(self, cache_dir: str = None):
-        self.cache_dir = cache_dir or os.path.join(settings.cache_dir, "photos")
-        os.makedirs(self.cache_dir, exist_ok=True)
-        self._url_to_path: Dict[str, str] = {}
-        logger.info(f"PhotoCache initialized at {self.cache_dir}")
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self._store = DiskLRUCache(
+            cache_dir or os.path.join(settings.cache_dir, "photos"),
+            max_bytes if max_bytes is not None else settings.photo_cache_max_mb * 1024 * 1024,
+            name="PhotoCache"
+        )
+        self.cache_dir = self._store.cache_dir
     
-    def _get_cache_path(self, url: str) -> str:
-        """Generate cache file path from URL."""
-        filename = hashlib.md5(url.encode()).hexdigest() + ".jpg"
-        return os.path.join(self.cache_dir, filename)
+    @staticmethod
+    def _url_key(url: str) -> str:
+        return hashlib.md5(url.encode()).hexdigest()
     
     def get_cached(self, url: str) -> Optional[str]:
         """Get cached file path if exists."""
-        path = self._get_cache_path(url)
-        if os.path.exists(path):
-            return path
-        return self._url_to_path.get(url)
+        return self._store.lookup(f"{self._url_key(url)}.jpg")
     
-    async def download(self, url: str) -> np.ndarray:
+    async def get_bytes(self, url: str) -> bytes:
+        """
+        Get original photo bytes, downloading on cache miss.
+        
+        Raises:
+            ValidationError: If download fails
+        """
+        key = f"{self._url_key(url)}.jpg"
+        
+        content = self._store.read_bytes(key)
+        if content is not None:
+            return content
+        
+        try:
+            content = await get_image_downloader().fetch(url)
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to download photo: {url} - {e}")
+            raise ValidationError(f"Failed to download photo: {e}")
+        
+        self._store.write(key, content)
+        logger.debug(f"Downloaded and cached: {key} ({len(content)} bytes)")
+        return content
+    
+    def put_bytes(self, url: str, content: bytes):
+        """Seed cache with bytes we already have (e.g. just-uploaded derivatives)."""
+        self._store.write(f"{self._url_key(url)}.jpg", content)
+    
+    async def download(
+        self,
+        url: str,
+        max_size: Optional[int] = None,
+        apply_orientation: bool = True
+    ) -> np.ndarray:
         """
         Download photo and return as numpy array.
         Uses cache if available.
         
         Args:
             url: Photo URL
+            max_size: If set, return (and cache) decoded variant with
+                      longest side <= max_size
+            apply_orientation: False to keep raw (pre-EXIF) orientation,
+                      see decode_image
         
         Returns:
             Image as numpy array (BGR format)
         """
-        # Check cache first
-        cached_path = self.get_cached(url)
-        if cached_path and os.path.exists(cached_path):
-            logger.debug(f"Using cached photo: {cached_path}")
-            return cv2.imread(cached_path)
+        if max_size:
+            suffix = "" if apply_orientation else "_raw"
+            variant_key = f"{self._url_key(url)}_{max_size}{suffix}.npy"
+            path = self._store.lookup(variant_key)
+            if path is not None:
+                try:
+                    return np.load(path)
+                except Exception as e:
+                    logger.warning(f"PhotoCache: unreadable variant {variant_key}: {e}")
+                    self._store.remove(variant_key)
         
-        # Download
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=30.0)
-                response.raise_for_status()
-                
-                # Save to cache
-                local_path = self._get_cache_path(url)
-                with open(local_path, "wb") as f:
-                    f.write(response.content)
-                
-                self._url_to_path[url] = local_path
-                logger.debug(f"Downloaded and cached: {local_path}")
-                
-                return cv2.imread(local_path)
-                
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to download photo: {url} - {e}")
-            raise ValidationError(f"Failed to download photo: {e}")
-    
-    def clear_cache(self, max_age_days: int = 7):
-        """Remove old cached files."""
-        import time
-        now = time.time()
-        max_age_seconds = max_age_days * 24 * 60 * 60
+        image = decode_image(await self.get_bytes(url), apply_orientation=apply_orientation)
         
-        removed = 0
-        for filename in os.listdir(self.cache_dir):
-            filepath = os.path.join(self.cache_dir, filename)
-            if os.path.isfile(filepath):
-                age = now - os.path.getmtime(filepath)
-                if age > max_age_seconds:
-                    os.remove(filepath)
-                    removed += 1
+        if max_size:
+            image = resize_image(image, max_size)
+            self._store.write_with(variant_key, lambda f: np.save(f, image))
         
+        return image
+    
+    def clear_cache(self, max_age_days: int = 7):
+        """Remove cached files not accessed for max_age_days."""
+        removed = self._store.clear_older_than(max_age_days * 24 * 60 * 60)
         logger.info(f"Cleared {removed} cached files older than {max_age_days} days")
         return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics (files, bytes, hits, misses, hit_rate)."""
+        return self._store.get_stats()
 
 
 # Global instance
@@ -112,12 +140,34 @@ def get_photo_cache() -> PhotoCache:
 # Image Processing Utilities
 # ============================================================
 
-def decode_image(image_bytes: bytes) -> np.ndarray:
+# Identifies decode output geometry (part of detection cache keys).
+# cv2.imdecode applies EXIF orientation, PIL-based decode did not.
+DECODE_VERSION = "cv2-exif"
+
+# cv2 flag names - cv2 itself is imported on first decode (not needed by the readonly profile)
+_REDUCED_FLAGS = {
+    1: "IMREAD_COLOR",
+    2: "IMREAD_REDUCED_COLOR_2",
+    4: "IMREAD_REDUCED_COLOR_4",
+    8: "IMREAD_REDUCED_COLOR_8",
+}
+
+
+def decode_image(image_bytes, scale: int = 1, apply_orientation: bool = True) -> np.ndarray:
     """
-    Decode image from bytes to numpy array.
+    Decode image from bytes straight to BGR numpy array.
+    
+    Single decode (no PIL -> RGB -> cvtColor copies). The buffer is
+    wrapped without copying (bytes, bytearray or memoryview).
+    EXIF orientation is applied by OpenCV.
     
     Args:
         image_bytes: Raw image bytes
+        scale: Reduced-size decode factor 1, 2, 4 or 8
+               (JPEG is downscaled inside the decoder - faster, less memory)
+        apply_orientation: False decodes in raw sensor orientation, the frame
+               of photo_faces rows stored before EXIF-aware decoding
+               (exif_oriented = false)
     
     Returns:
         Image as numpy array (BGR format)
@@ -125,8 +175,19 @@ def decode_image(image_bytes: bytes) -> np.ndarray:
     Raises:
         ValidationError: If image cannot be decoded
     """
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    import cv2
+    
+    if scale not in _REDUCED_FLAGS:
+        raise ValidationError(f"Unsupported decode scale: {scale}")
+    
+    nparr = np.frombuffer(memoryview(image_bytes), np.uint8)
+    flags = getattr(cv2, _REDUCED_FLAGS[scale])
+    if not apply_orientation:
+        flags |= cv2.IMREAD_IGNORE_ORIENTATION
+    image = cv2.imdecode(nparr, flags)
+    
+    if image is None:
+        image = _decode_with_pil(image_bytes, scale, apply_orientation)
     
     if image is None:
         raise ValidationError("Failed to decode image")
@@ -134,6 +195,25 @@ def decode_image(image_bytes: bytes) -> np.ndarray:
     return image
 
 
+def _decode_with_pil(image_bytes, scale: int = 1, apply_orientation: bool = True) -> Optional[np.ndarray]:
+    """Fallback for formats OpenCV can't read (applies EXIF orientation too)."""
+    import io
+    import cv2
+    from PIL import Image, ImageOps
+    
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        if apply_orientation:
+            image = ImageOps.exif_transpose(image)
+        image = image.convert("RGB")
+        if scale > 1:
+            image = image.reduce(scale)
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+    except Exception as e:
+        logger.warning(f"PIL decode failed: {e}")
+        return None
+
+
 def encode_image(image: np.ndarray, format: str = "jpg", quality: int = 90) -> bytes:
     """
     Encode numpy array to image bytes.
@@ -146,6 +226,8 @@ def encode_image(image: np.ndarray, format: str = "jpg", quality: int = 90) -> b
     Returns:
         Encoded image bytes
     """
+    import cv2
+    
     if format.lower() == "jpg":
         params = [cv2.IMWRITE_JPEG_QUALITY, quality]
         success, encoded = cv2.imencode(".jpg", image, params)
@@ -174,6 +256,8 @@ def resize_image(image: np.ndarray, max_size: int = 1920) -> np.ndarray:
     if max(h, w) <= max_size:
         return image
     
+    import cv2
+    
     scale = max_size / max(h, w)
     new_w = int(w * scale)
     new_h = int(h * scale)
@@ -9,6 +9,16 @@ v4.1: Migrated to SupabaseService (modular architecture)
 - Added: SupabaseService with modular repositories
 
 v4.2: Added AuthMiddleware for write operation protection
+
+v4.3: Lifespan warm-up of models + index at boot, /live and /ready probes
+
+v4.4: Heavy ML dependencies (insightface, onnxruntime, hnswlib, hdbscan,
+      sklearn) are imported lazily. API_PROFILE=readonly serves reads only:
+      no ML routers, no warm-up, write methods rejected.
+      Import time: python scripts/startup_benchmark.py
+v4.5: Readonly profile doesn't import or construct FaceRecognitionService,
+      TrainingService, the photo processing worker or the training/recognition
+      routers (no cv2 at startup)
 """
 
 from dotenv import load_dotenv
@@ -16,6 +26,8 @@ load_dotenv()
 
 import os
 import re
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -32,10 +44,11 @@ from core.logging import setup_logging, get_logger
 setup_logging(level="INFO" if not settings.debug else "DEBUG")
 logger = get_logger(__name__)
 
+# Models are warmed up at boot only in the full profile
+WARMUP_ENABLED = settings.warmup_on_startup and not settings.is_readonly_profile
+
 # v4.1: Use unified SupabaseService
 from services.supabase import SupabaseService, get_supabase_service
-from services.face_recognition import FaceRecognitionService
-from services.training_service import TrainingService
 from services.auth import get_current_user, get_current_user_optional, verify_google_token, create_access_token
 
 # v4.2: Auth middleware
@@ -43,16 +56,78 @@ from middleware.auth import AuthMiddleware
 
 # Router imports
 from routers import (
-    training, recognition, faces, images,
+    faces, images,
     photographers, people, galleries, locations, organizers, cities,
     admin, user, auth
 )
 
+# v4.5: ML services and routers (cv2, model code) - full profile only
+if not settings.is_readonly_profile:
+    from services.face_recognition import FaceRecognitionService
+    from services.training_service import TrainingService
+    from services.photo_processing import init_photo_processing_worker, get_photo_processing_worker
+    from routers import training, recognition
+
 # ============================================================
 # Application Setup
 # ============================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup: warm up models + players index in background (gated by /ready).
+    Shutdown: close pooled image download connections, flush the activity log,
+    stop the Supabase pool.
+    """
+    app.state.warmup_error = None
+    warmup_task = asyncio.create_task(_warm_up_services(app))
+    
+    yield
+    
+    if not warmup_task.done():
+        warmup_task.cancel()
+    
+    worker = _photo_processing_worker()
+    if worker:
+        await worker.stop()
+    
+    from infrastructure.http_client import get_image_downloader
+    await get_image_downloader().close()
+    
+    from services.activity_log import get_activity_log
+    await asyncio.to_thread(get_activity_log().close)
+    
+    from services.supabase import aio
+    aio.shutdown()
+
+
+async def _warm_up_services(app: FastAPI):
+    """
+    Background warm-up task - /live responds while this runs.
+    Photo processing worker starts after models are warm.
+    """
+    if WARMUP_ENABLED:
+        try:
+            await face_service.warm_up()
+        except Exception as e:
+            app.state.warmup_error = str(e)
+            logger.error(f"Warm-up failed: {e}", exc_info=True)
+            return
+    
+    worker = _photo_processing_worker()
+    if worker:
+        worker.start()
+
+
+def _photo_processing_worker():
+    """Worker singleton (None in the readonly profile or when disabled)."""
+    if settings.is_readonly_profile:
+        return None
+    return get_photo_processing_worker()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Padel Tournament Face Recognition API",
     description="API для распознавания и группировки игроков на турнирах по паделу",
     version=VERSION,
@@ -100,6 +175,26 @@ logger.info(f"CORS configured for origins: {cors_origins} + Vercel previews")
 app.add_middleware(AuthMiddleware)
 logger.info("Auth middleware configured - write operations require admin token")
 
+# ============================================================
+# Read-only profile (API_PROFILE=readonly)
+# ============================================================
+
+if settings.is_readonly_profile:
+    @app.middleware("http")
+    async def reject_writes(request: Request, call_next):
+        """Read-only instances serve GET/HEAD/OPTIONS only."""
+        if request.method not in ("GET", "HEAD", "OPTIONS") and request.url.path.startswith("/api/"):
+            return JSONResponse(
+                status_code=405,
+                content=ApiResponse.fail(
+                    message="Read-only API instance",
+                    code="READ_ONLY"
+                ).model_dump()
+            )
+        return await call_next(request)
+    
+    logger.info("API profile: readonly (ML routers disabled, writes rejected)")
+
 # ============================================================
 # Global Exception Handlers
 # ============================================================
@@ -142,19 +237,30 @@ logger.info("Creating singleton service instances...")
 supabase_service = get_supabase_service()
 logger.info("✓ Created SupabaseService (unified)")
 
-# Face recognition service - now uses SupabaseService internally
-face_service = FaceRecognitionService(supabase_service=supabase_service)
-logger.info("✓ Created FaceRecognitionService")
+# ML services exist only in the full profile (readonly routers get None)
+face_service = None
+training_service = None
+
+if not settings.is_readonly_profile:
+    # Face recognition service - now uses SupabaseService internally
+    face_service = FaceRecognitionService(supabase_service=supabase_service)
+    logger.info("✓ Created FaceRecognitionService")
+
+    # Training service - now uses SupabaseService internally
+    training_service = TrainingService(face_service=face_service, supabase_service=supabase_service)
+    logger.info("✓ Created TrainingService")
+
+    # Background detection/recognition of uploaded photos
+    if settings.photo_queue_enabled:
+        init_photo_processing_worker(face_service)
+        logger.info("✓ Created PhotoProcessingWorker")
 
-# Training service - now uses SupabaseService internally
-training_service = TrainingService(face_service=face_service, supabase_service=supabase_service)
-logger.info("✓ Created TrainingService")
+    training.set_training_service(training_service)
+    recognition.set_services(face_service, supabase_service)
 
 # v4.1: Inject SupabaseService into routers
 # Routers receive supabase_service which provides access to all repositories
-training.set_training_service(training_service)
 faces.set_services(face_service, supabase_service)
-recognition.set_services(face_service, supabase_service)
 images.set_services(supabase_service, face_service)
 photographers.set_services(supabase_service)
 people.set_services(supabase_service, face_service)
@@ -179,11 +285,11 @@ app.mount("/uploads", StaticFiles(directory=settings.uploads_dir), name="uploads
 # Dependency Injection Functions
 # ============================================================
 
-def get_face_service() -> FaceRecognitionService:
+def get_face_service() -> "FaceRecognitionService":
     """Dependency injection for FaceRecognitionService"""
     return face_service
 
-def get_training_service() -> TrainingService:
+def get_training_service() -> "TrainingService":
     """Dependency injection for TrainingService"""
     return training_service
 
@@ -216,25 +322,49 @@ async def root():
             status_code=200
         )
 
+@app.get("/live")
+async def liveness():
+    """Liveness probe: process is up and serving requests."""
+    return {"status": "alive"}
+
+@app.get("/ready")
+async def readiness():
+    """
+    Readiness probe: models and index loaded and warmed up.
+    Returns 503 until warm-up finishes - don't route traffic before that.
+    """
+    if WARMUP_ENABLED and not face_service.warmed_up:
+        error = app.state.warmup_error
+        return JSONResponse(
+            status_code=503,
+            content=ApiResponse.fail(
+                message=f"Warm-up failed: {error}" if error else "Warming up",
+                code="NOT_READY"
+            ).model_dump()
+        )
+    return {"status": "ready", "version": VERSION, "profile": settings.api_profile}
+
 @app.get("/api/health")
 async def health_check():
     """
     Health check endpoint.
-    Returns service status and model readiness.
+    Returns service status and model readiness (does not trigger model loading).
     """
     return ApiResponse.ok({
         "status": "healthy",
         "service": "padel-recognition",
         "version": VERSION,
-        "model_loaded": face_service.is_ready()
+        "model_loaded": face_service.is_ready() if face_service else False
     }).model_dump()
 
 # ============================================================
 # Router Registration
 # ============================================================
 
-app.include_router(training.router, prefix="/api/v2", tags=["training"])
-app.include_router(recognition.router, prefix="/api/recognition", tags=["recognition"])
+# ML routers are not served by the read-only profile
+if not settings.is_readonly_profile:
+    app.include_router(training.router, prefix="/api/v2", tags=["training"])
+    app.include_router(recognition.router, prefix="/api/recognition", tags=["recognition"])
 app.include_router(faces.router, prefix="/api/faces", tags=["faces"])
 app.include_router(images.router, prefix="/api/images", tags=["images"])
 app.include_router(photographers.router, prefix="/api/photographers", tags=["photographers"])
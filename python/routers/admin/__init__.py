@@ -9,20 +9,24 @@ v1.2: Migrated to SupabaseService (removed SupabaseDatabase)
 v1.3: Modularized debug.py into debug/ package
 """
 
+from typing import TYPE_CHECKING
+
 from fastapi import APIRouter
 
 from services.supabase import SupabaseService
-from services.face_recognition import FaceRecognitionService
 from core.logging import get_logger
 
+if TYPE_CHECKING:
+    from services.face_recognition import FaceRecognitionService
+
 logger = get_logger(__name__)
 
 # Global service instances (set via set_services)
 supabase_db_instance: SupabaseService = None
-face_service_instance: FaceRecognitionService = None
+face_service_instance: "FaceRecognitionService" = None
 
 
-def set_services(supabase_db: SupabaseService, face_service: FaceRecognitionService = None):
+def set_services(supabase_db: SupabaseService, face_service: "FaceRecognitionService" = None):
     """Set service instances for dependency injection."""
     global supabase_db_instance, face_service_instance
     supabase_db_instance = supabase_db
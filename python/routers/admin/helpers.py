@@ -6,6 +6,8 @@ Shared utilities for admin endpoints
 from typing import Optional, List, Dict, Any
 
 from core.logging import get_logger
+from services.supabase.aio import execute
+from services.supabase.config import get_recognition_config
 
 logger = get_logger(__name__)
 
@@ -92,7 +94,7 @@ async def load_all_photo_faces(client, select_fields: str, filters: Optional[Dic
                 else:
                     query = query.eq(key, value)
         
-        result = query.execute()
+        result = await execute(query)
         batch = result.data if result.data else []
         
         if not batch:
@@ -106,11 +108,11 @@ async def load_all_photo_faces(client, select_fields: str, filters: Optional[Dic
 
 
 async def get_confidence_threshold(client) -> float:
-    """Get confidence threshold from settings"""
+    """Get confidence threshold from settings (cached recognition config)"""
     try:
-        result = client.table("face_recognition_config").select("value").eq("key", "recognition_settings").single().execute()
-        if result.data and result.data.get("value", {}).get("confidence_thresholds", {}).get("high_data"):
-            return result.data["value"]["confidence_thresholds"]["high_data"]
+        threshold = get_recognition_config().get("confidence_thresholds", {}).get("high_data")
+        if threshold:
+            return threshold
     except Exception as e:
         logger.warning(f"Failed to get confidence threshold: {e}")
     return 0.6  # fallback
@@ -133,7 +135,7 @@ def log_admin_activity(
     admin: Optional[Dict[str, Any]] = None,
 ):
     """
-    Log admin activity to admin_activity table.
+    Log admin activity to admin_activity table (write-behind, see services/activity_log.py).
 
     Args:
         event_type: Type of event (person_created, person_deleted, admin_created, etc.)
@@ -142,25 +144,20 @@ def log_admin_activity(
         metadata: Additional event data
         admin: Current admin dict (from request.state.admin)
     """
-    from services.supabase.base import get_supabase_client
-
-    try:
-        supabase = get_supabase_client()
-
-        # Add admin info to metadata
-        event_metadata = metadata or {}
-        if admin:
-            event_metadata["admin_id"] = admin.get("id")
-            event_metadata["admin_email"] = admin.get("email")
-            event_metadata["admin_name"] = admin.get("name")
-
-        supabase.table("admin_activity").insert({
-            "event_type": event_type,
-            "person_id": person_id,
-            "user_id": user_id,
-            "metadata": event_metadata,
-        }).execute()
-
-        logger.info(f"Logged admin activity: {event_type} by {admin.get('email') if admin else 'system'}")
-    except Exception as e:
-        logger.error(f"Failed to log admin activity: {e}")
+    from services.activity_log import get_activity_log
+
+    # Add admin info to metadata
+    event_metadata = metadata or {}
+    if admin:
+        event_metadata["admin_id"] = admin.get("id")
+        event_metadata["admin_email"] = admin.get("email")
+        event_metadata["admin_name"] = admin.get("name")
+
+    get_activity_log().add("admin_activity", {
+        "event_type": event_type,
+        "person_id": person_id,
+        "user_id": user_id,
+        "metadata": event_metadata,
+    })
+
+    logger.info(f"Logged admin activity: {event_type} by {admin.get('email') if admin else 'system'}")
@@ -3,13 +3,16 @@ Admin API - Face Statistics
 Comprehensive face recognition statistics endpoint
 
 v1.2: Use exact comparison (!=1) after normalization in sync tool
+v1.3: Independent queries run concurrently without blocking the event loop
 """
 
+import asyncio
 from typing import Dict
 from fastapi import APIRouter
 
 from core.responses import ApiResponse
 from core.logging import get_logger
+from services.supabase.aio import execute
 
 from .helpers import (
     get_supabase_db,
@@ -40,18 +43,46 @@ async def get_face_statistics(top: int = 15):
     try:
         client = supabase_db.client
         
-        # Get confidence threshold from settings
-        confidence_threshold = await get_confidence_threshold(client)
+        # Independent queries run concurrently (services/supabase/aio.py)
+        (
+            confidence_threshold,
+            total_people,
+            total_photo_faces,
+            verified_faces,
+            unknown_faces,
+            total_images,
+            processed_images,
+            people_with_verified,
+            all_people_result,
+            all_photo_faces,
+            galleries_result,
+            no_avatar_result,
+        ) = await asyncio.gather(
+            get_confidence_threshold(client),
+            execute(client.table("people").select("*", count="exact", head=True)),
+            execute(client.table("photo_faces").select("*", count="exact", head=True)),
+            execute(client.table("photo_faces").select("*", count="exact", head=True).eq("verified", True)),
+            execute(client.table("photo_faces").select("*", count="exact", head=True).is_("person_id", "null")),
+            execute(client.table("gallery_images").select("*", count="exact", head=True)),
+            execute(client.table("gallery_images").select("*", count="exact", head=True).eq("has_been_processed", True)),
+            # Verified faces for unique people count
+            load_all_photo_faces(
+                client,
+                "person_id",
+                {"verified": True, "person_id": {"neq": None}}
+            ),
+            # All people for name lookups
+            execute(client.table("people").select("id, real_name, telegram_full_name").order("real_name")),
+            # All photo_faces for analysis
+            load_all_photo_faces(
+                client,
+                "photo_id, person_id, recognition_confidence, verified"
+            ),
+            execute(client.table("galleries").select("id, title, shoot_date, slug, gallery_images(id, slug, has_been_processed)")),
+            execute(client.table("people").select("id, real_name, telegram_full_name").is_("avatar_url", "null").limit(50)),
+        )
         logger.debug(f"Using confidence threshold: {confidence_threshold}")
         
-        # Basic counts
-        total_people = client.table("people").select("*", count="exact", head=True).execute()
-        total_photo_faces = client.table("photo_faces").select("*", count="exact", head=True).execute()
-        verified_faces = client.table("photo_faces").select("*", count="exact", head=True).eq("verified", True).execute()
-        unknown_faces = client.table("photo_faces").select("*", count="exact", head=True).is_("person_id", "null").execute()
-        total_images = client.table("gallery_images").select("*", count="exact", head=True).execute()
-        processed_images = client.table("gallery_images").select("*", count="exact", head=True).eq("has_been_processed", True).execute()
-        
         total_people_count = total_people.count or 0
         total_photo_faces_count = total_photo_faces.count or 0
         verified_faces_count = verified_faces.count or 0
@@ -59,18 +90,10 @@ async def get_face_statistics(top: int = 15):
         total_images_count = total_images.count or 0
         processed_images_count = processed_images.count or 0
         
-        # Load all verified faces for unique people count
-        people_with_verified = await load_all_photo_faces(
-            client, 
-            "person_id",
-            {"verified": True, "person_id": {"neq": None}}
-        )
         unique_people_with_verified = set(f["person_id"] for f in people_with_verified if f.get("person_id"))
         people_with_verified_count = len(unique_people_with_verified)
         people_without_verified_count = total_people_count - people_with_verified_count
         
-        # Get all people for name lookups
-        all_people_result = client.table("people").select("id, real_name, telegram_full_name").order("real_name").execute()
         all_people = all_people_result.data or []
         
         # People without verified faces list
@@ -79,12 +102,6 @@ async def get_face_statistics(top: int = 15):
             for p in all_people if p["id"] not in unique_people_with_verified
         ][:50]
         
-        # Load all photo_faces for analysis
-        all_photo_faces = await load_all_photo_faces(
-            client,
-            "photo_id, person_id, recognition_confidence, verified"
-        )
-        
         # Photos with faces count
         photo_face_counts: Dict[str, int] = {}
         for face in all_photo_faces:
@@ -116,7 +133,6 @@ async def get_face_statistics(top: int = 15):
         player_stats_max = max_photos_per_player
         
         # Gallery statistics
-        galleries_result = client.table("galleries").select("id, title, shoot_date, slug, gallery_images(id, slug, has_been_processed)").execute()
         galleries = galleries_result.data or []
         
         # Track photos with unknown/unverified faces
@@ -151,7 +167,6 @@ async def get_face_statistics(top: int = 15):
         few_photos_list.sort(key=lambda x: x["count"])
         
         # No avatar list
-        no_avatar_result = client.table("people").select("id, real_name, telegram_full_name").is_("avatar_url", "null").limit(50).execute()
         no_avatar_list = [
             {"id": p["id"], "name": p.get("real_name") or p.get("telegram_full_name") or "Без имени"}
             for p in (no_avatar_result.data or [])
@@ -229,19 +244,19 @@ async def get_face_statistics(top: int = 15):
                 })
         
         # v1.2: Use exact comparison != 1 (after sync tool normalizes >= 0.999 to 1.0)
-        inconsistent_result = client.table("photo_faces").select("*", count="exact", head=True).eq("verified", True).neq("recognition_confidence", 1).execute()
+        inconsistent_result = await execute(client.table("photo_faces").select("*", count="exact", head=True).eq("verified", True).neq("recognition_confidence", 1))
         inconsistent_count = inconsistent_result.count or 0
         
         # Orphaned descriptors (try RPC)
         orphaned_descriptors_count = 0
         try:
-            orphaned_result = client.rpc("count_orphaned_descriptors").execute()
+            orphaned_result = await execute(client.rpc("count_orphaned_descriptors"))
             orphaned_descriptors_count = orphaned_result.data or 0
         except:
             pass
         
         # Average unverified confidence (sample)
-        unverified_conf_result = client.table("photo_faces").select("recognition_confidence").eq("verified", False).not_.is_("person_id", "null").not_.is_("recognition_confidence", "null").limit(1000).execute()
+        unverified_conf_result = await execute(client.table("photo_faces").select("recognition_confidence").eq("verified", False).not_.is_("person_id", "null").not_.is_("recognition_confidence", "null").limit(1000))
         avg_unverified_confidence = 0
         if unverified_conf_result.data:
             confs = [f["recognition_confidence"] for f in unverified_conf_result.data if f.get("recognition_confidence") is not None]
@@ -20,6 +20,7 @@ from pydantic import BaseModel
 from core.logging import get_logger
 from core.responses import ApiResponse
 from infrastructure.supabase import get_supabase_client
+from services.activity_log import get_activity_log
 from services.auth import verify_google_token, verify_google_access_token
 
 logger = get_logger(__name__)
@@ -118,15 +119,12 @@ def create_user_google(
 
 
 def log_admin_activity(db, event_type: str, person_id: str, metadata: dict) -> None:
-    """Log activity to admin_activity table (fire-and-forget)."""
-    try:
-        db.table("admin_activity").insert({
-            "event_type": event_type,
-            "person_id": person_id,
-            "metadata": metadata,
-        }).execute()
-    except Exception as e:
-        logger.warning(f"Failed to log admin activity: {e}")
+    """Log activity to admin_activity table (buffered, written in background)."""
+    get_activity_log().add("admin_activity", {
+        "event_type": event_type,
+        "person_id": person_id,
+        "metadata": metadata,
+    })
 
 
 # =============================================================================
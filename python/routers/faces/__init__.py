@@ -6,17 +6,21 @@ v5.0: Refactored into modular structure (models, crud, batch_operations, recogni
 v5.1: Migrated to SupabaseService (removed SupabaseDatabase)
 """
 
+from typing import TYPE_CHECKING
+
 from fastapi import APIRouter
 
-from services.face_recognition import FaceRecognitionService
 from services.supabase import SupabaseService
 
+if TYPE_CHECKING:
+    from services.face_recognition import FaceRecognitionService
+
 # Global service instances (set via set_services)
 face_service_instance = None
 supabase_db_instance = None
 
 
-def set_services(face_service: FaceRecognitionService, supabase_db: SupabaseService):
+def set_services(face_service: "FaceRecognitionService", supabase_db: SupabaseService):
     """Set service instances for dependency injection."""
     global face_service_instance, supabase_db_instance
     face_service_instance = face_service
@@ -7,15 +7,21 @@ v6.0: all-faces-indexed architecture
       - Faces are already in index when created
       - Use update_face_metadata instead of add/remove for person_id changes
       - Only mark_deleted when faces are actually deleted from DB
+v6.2: Set-based writes - one update/delete per group of faces via in_(),
+      one batched index metadata update per group (no per-face round trips)
 """
 
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import List
+
 from fastapi import APIRouter, Depends
 
 from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
-from services.face_recognition import FaceRecognitionService
 from services.supabase import SupabaseService
+from services.supabase.aio import execute
 
 from .models import (
     BatchVerifyRequest,
@@ -25,6 +31,9 @@ from .models import (
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Max face ids per in_() filter (keeps PostgREST URLs short)
+IN_CHUNK_SIZE = 200
+
 
 def get_face_service():
     from . import face_service_instance
@@ -36,66 +45,68 @@ def get_supabase_db():
     return supabase_db_instance
 
 
+def _chunks(items: List[str], size: int = IN_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
 @router.post("/batch-assign")
 async def batch_assign_faces(
     request: BatchAssignRequest,
-    face_service: FaceRecognitionService = Depends(get_face_service),
+    face_service=Depends(get_face_service),
     supabase_db: SupabaseService = Depends(get_supabase_db)
 ):
     """
     Batch assign multiple faces to a person.
 
     v6.0: Faces are already in index (all faces indexed), use update_face_metadata.
+    v6.2: One update with in_() per IN_CHUNK_SIZE faces (returned rows tell
+          which faces exist and have descriptors), one index metadata update.
     """
     try:
         logger.info(f"[batch-assign] START: {len(request.face_ids)} faces -> person {request.person_id}")
 
-        if not request.face_ids:
+        face_ids = list(dict.fromkeys(request.face_ids))
+        if not face_ids:
             return ApiResponse.ok({
                 "updated_count": 0,
                 "metadata_updated": 0
             })
 
-        updated_count = 0
-        metadata_updated = 0
+        update_data = {
+            "person_id": request.person_id,
+            "verified": True,
+            "recognition_confidence": 1.0,
+            "verified_at": datetime.now(timezone.utc).isoformat(),
+            "excluded_from_index": False
+        }
 
-        for face_id in request.face_ids:
+        updated_count = 0
+        indexed_ids = []
+        for chunk in _chunks(face_ids):
             try:
-                check_response = supabase_db.client.table("photo_faces").select(
-                    "id, insightface_descriptor"
-                ).eq("id", face_id).execute()
-
-                if check_response.data:
-                    has_descriptor = check_response.data[0].get("insightface_descriptor") is not None
-
-                    from datetime import datetime, timezone
-                    update_response = supabase_db.client.table("photo_faces").update({
-                        "person_id": request.person_id,
-                        "verified": True,
-                        "recognition_confidence": 1.0,
-                        "verified_at": datetime.now(timezone.utc).isoformat(),
-                        "excluded_from_index": False
-                    }).eq("id", face_id).execute()
-
-                    if update_response.data:
-                        updated_count += 1
-
-                        # v6.0: Update index metadata (face already in index (all faces indexed))
-                        if has_descriptor:
-                            try:
-                                await face_service.update_face_metadata(
-                                    face_id,
-                                    person_id=request.person_id,
-                                    verified=True,
-                                    confidence=1.0,
-                                    excluded=False
-                                )
-                                metadata_updated += 1
-                            except Exception as idx_err:
-                                logger.warning(f"[batch-assign] Failed to update metadata for {face_id}: {idx_err}")
-
+                response = await execute(supabase_db.client.table("photo_faces").update(
+                    update_data
+                ).in_("id", chunk))
+                rows = response.data or []
+                updated_count += len(rows)
+                indexed_ids.extend(
+                    row["id"] for row in rows if row.get("insightface_descriptor") is not None
+                )
             except Exception as e:
-                logger.warning(f"[batch-assign] Failed to update face {face_id}: {e}")
+                logger.warning(f"[batch-assign] Failed to update {len(chunk)} faces: {e}")
+
+        # v6.0: Update index metadata (faces already in index (all faces indexed))
+        metadata_updated = 0
+        if indexed_ids:
+            result = await face_service.update_faces_metadata(
+                indexed_ids,
+                person_id=request.person_id,
+                verified=True,
+                confidence=1.0,
+                excluded=False
+            )
+            metadata_updated = result.get("updated", 0)
 
         logger.info(f"[batch-assign] Updated {updated_count}/{len(request.face_ids)} faces, {metadata_updated} metadata")
 
@@ -114,7 +125,7 @@ async def batch_assign_faces(
 @router.post("/batch-verify")
 async def batch_verify_faces(
     request: BatchVerifyRequest,
-    face_service: FaceRecognitionService = Depends(get_face_service),
+    face_service=Depends(get_face_service),
     supabase_db: SupabaseService = Depends(get_supabase_db)
 ):
     """
@@ -122,98 +133,86 @@ async def batch_verify_faces(
 
     v4.8: Optimized - rebuild index ONLY when person_id changes or faces deleted.
     v6.0: All faces indexed - use update_face_metadata for person_id changes, mark_deleted only for DB deletes.
+    v6.2: One delete with in_() for removed faces; kept faces grouped by
+          (person_id, person_id changed) - one update per group.
     """
     try:
         logger.info(f"[batch-verify] START photo={request.photo_id}, faces={len(request.kept_faces)}")
 
-        for i, face in enumerate(request.kept_faces):
-            logger.info(f"[batch-verify] Input face[{i}]: id={face.id}, person_id={face.person_id}")
-
-        existing_response = supabase_db.client.table("photo_faces").select(
+        existing_response = await execute(supabase_db.client.table("photo_faces").select(
             "id, person_id, insightface_descriptor, excluded_from_index"
-        ).eq("photo_id", request.photo_id).execute()
+        ).eq("photo_id", request.photo_id))
 
-        existing_faces = existing_response.data or []
-        existing_ids = [f["id"] for f in existing_faces]
-        kept_ids = [f.id for f in request.kept_faces if f.id]
+        existing_faces = {f["id"]: f for f in (existing_response.data or [])}
+        kept_faces = {f.id: f for f in request.kept_faces if f.id}
 
-        logger.info(f"[batch-verify] Existing IDs in DB: {existing_ids}")
-        logger.info(f"[batch-verify] Kept IDs from request: {kept_ids}")
+        logger.info(f"[batch-verify] Existing IDs in DB: {list(existing_faces)}")
+        logger.info(f"[batch-verify] Kept IDs from request: {list(kept_faces)}")
 
-        # v6.0: Track faces to delete from index (only those being deleted from DB)
-        deleted_face_ids = []
-        to_delete = [fid for fid in existing_ids if fid not in kept_ids]
-
-        for face_id in to_delete:
-            face_data = next((f for f in existing_faces if f["id"] == face_id), None)
-            if face_data and face_data.get("insightface_descriptor"):
-                deleted_face_ids.append(face_id)
-                logger.info(f"[batch-verify] Deleting face {face_id} (will remove from index)")
-            supabase_db.client.table("photo_faces").delete().eq("id", face_id).execute()
+        to_delete = [fid for fid in existing_faces if fid not in kept_faces]
+        # v6.0: Only faces deleted from DB are removed from index
+        deleted_face_ids = [
+            fid for fid in to_delete if existing_faces[fid].get("insightface_descriptor")
+        ]
 
         if to_delete:
+            await execute(supabase_db.client.table("photo_faces").delete().in_("id", to_delete))
             logger.info(f"[batch-verify] Deleted {len(to_delete)} faces, {len(deleted_face_ids)} had descriptors")
 
+        # Group kept faces by resulting DB values
+        groups = defaultdict(list)
+        for face_id, face in kept_faces.items():
+            current_person_id = existing_faces.get(face_id, {}).get("person_id")
+            groups[(face.person_id, face.person_id != current_person_id)].append(face_id)
+
+        verified_at = datetime.now(timezone.utc).isoformat()
         updated_count = 0
         failed_count = 0
         metadata_updated = 0
 
-        for face in request.kept_faces:
-            if not face.id:
-                continue
-
-            current_face = next((f for f in existing_faces if f["id"] == face.id), None)
-            current_person_id = current_face.get("person_id") if current_face else None
-            current_excluded = current_face.get("excluded_from_index", False) if current_face else False
-            has_descriptor = current_face.get("insightface_descriptor") is not None if current_face else False
-
-            person_id_changed = face.person_id != current_person_id
-
-            from datetime import datetime, timezone
+        for (person_id, person_id_changed), face_ids in groups.items():
             update_data = {
-                "person_id": face.person_id,
-                "recognition_confidence": 1.0 if face.person_id else None,
-                "verified": bool(face.person_id),
-                "verified_at": datetime.now(timezone.utc).isoformat() if face.person_id else None,
+                "person_id": person_id,
+                "recognition_confidence": 1.0 if person_id else None,
+                "verified": bool(person_id),
+                "verified_at": verified_at if person_id else None,
             }
-
             if person_id_changed:
                 update_data["excluded_from_index"] = False
 
-            logger.info(f"[batch-verify] Updating face {face.id} with: {update_data}")
-
-            response = supabase_db.client.table("photo_faces").update(update_data).eq("id", face.id).execute()
-
-            if response.data:
-                updated_count += 1
-
-                # v6.1: Always update index metadata (not just when person_id changes)
-                # This ensures verified/confidence are synced even for verification without reassignment
-                # v6.1.2: Preserve excluded status unless person_id changed (P1 fix)
-                if has_descriptor:
-                    try:
-                        # Use empty string to signal "set to None" for person_id
-                        # excluded: only reset to False when person_id changes (matches DB update logic)
-                        new_excluded = False if person_id_changed else current_excluded
-                        await face_service.update_face_metadata(
-                            face.id,
-                            person_id=face.person_id if face.person_id else "",
-                            verified=bool(face.person_id),
-                            confidence=1.0 if face.person_id else 0.0,
-                            excluded=new_excluded
-                        )
-                        metadata_updated += 1
-                        if person_id_changed:
-                            logger.info(f"[batch-verify] Updated metadata for {face.id}: person_id={face.person_id}")
-                    except Exception as idx_err:
-                        logger.warning(f"[batch-verify] Failed to update metadata for {face.id}: {idx_err}")
-            else:
-                failed_count += 1
-                logger.error(f"[batch-verify] Face {face.id} update FAILED - no data returned")
+            logger.info(f"[batch-verify] Updating {len(face_ids)} faces with: {update_data}")
+
+            response = await execute(supabase_db.client.table("photo_faces").update(update_data).in_("id", face_ids))
+            updated_ids = {row["id"] for row in (response.data or [])}
+            updated_count += len(updated_ids)
+
+            missing = [fid for fid in face_ids if fid not in updated_ids]
+            if missing:
+                failed_count += len(missing)
+                logger.error(f"[batch-verify] Face update FAILED - no data returned for {missing}")
+
+            # v6.1: Always update index metadata (not just when person_id changes)
+            # v6.1.2: Preserve excluded status unless person_id changed (P1 fix)
+            by_excluded = defaultdict(list)
+            for fid in updated_ids:
+                current_face = existing_faces.get(fid)
+                if current_face and current_face.get("insightface_descriptor") is not None:
+                    excluded = False if person_id_changed else current_face.get("excluded_from_index", False)
+                    by_excluded[bool(excluded)].append(fid)
+
+            for excluded, indexed_ids in by_excluded.items():
+                # Empty string signals "set to None" for person_id
+                result = await face_service.update_faces_metadata(
+                    indexed_ids,
+                    person_id=person_id if person_id else "",
+                    verified=bool(person_id),
+                    confidence=1.0 if person_id else 0.0,
+                    excluded=excluded
+                )
+                metadata_updated += result.get("updated", 0)
 
         logger.info(f"[batch-verify] Update summary: {updated_count} succeeded, {failed_count} failed, {metadata_updated} metadata updated")
 
-        # v6.0: Only mark_deleted for faces actually deleted from DB
         if deleted_face_ids:
             try:
                 result = await face_service.remove_faces_from_index(deleted_face_ids)
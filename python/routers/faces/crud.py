@@ -11,6 +11,7 @@ from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
 from services.supabase import SupabaseService
+from services.supabase.aio import execute
 
 from .models import BatchPhotoIdsRequest
 
@@ -35,7 +36,7 @@ async def get_batch_photo_faces(
         if not request.photo_ids:
             return ApiResponse.ok([])
 
-        result = supabase_db.client.table("photo_faces").select("*, people(id, real_name, telegram_full_name)").in_("photo_id", request.photo_ids).execute()
+        result = await execute(supabase_db.client.table("photo_faces").select("*, people(id, real_name, telegram_full_name)").in_("photo_id", request.photo_ids))
 
         logger.info(f"Found {len(result.data or [])} faces")
         return ApiResponse.ok(result.data or [])
@@ -4,6 +4,7 @@ Recognition endpoints: recognize-unknown, clear-descriptor, set-excluded
 Helper functions: parse_descriptor, get_all_unknown_faces_paginated
 
 v4.4: Migrated to SupabaseService
+v4.5: recognize-unknown - batched recognition, bulk result writer, batched name lookup
 """
 
 from fastapi import APIRouter, Depends, Query
@@ -14,14 +15,18 @@ import json
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
-from services.face_recognition import FaceRecognitionService
 from services.supabase import SupabaseService
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run, as_async
 
 from .models import RecognizeUnknownRequest
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Faces per index query in recognize-unknown
+RECOGNITION_BATCH_SIZE = 500
+
 
 def get_face_service():
     from . import face_service_instance
@@ -73,7 +78,7 @@ async def get_all_unknown_faces_paginated(
     
     while True:
         if gallery_id:
-            response = supabase_db.client.table("photo_faces").select(
+            response = await execute(supabase_db.client.table("photo_faces").select(
                 "id, photo_id, insightface_descriptor, gallery_images!inner(gallery_id)"
             ).is_(
                 "person_id", "null"
@@ -81,15 +86,15 @@ async def get_all_unknown_faces_paginated(
                 "insightface_descriptor", "null"
             ).eq(
                 "gallery_images.gallery_id", gallery_id
-            ).order("created_at", desc=False).range(offset, offset + page_size - 1).execute()
+            ).order("created_at", desc=False).range(offset, offset + page_size - 1))
         else:
-            response = supabase_db.client.table("photo_faces").select(
+            response = await execute(supabase_db.client.table("photo_faces").select(
                 "id, photo_id, insightface_descriptor"
             ).is_(
                 "person_id", "null"
             ).not_.is_(
                 "insightface_descriptor", "null"
-            ).order("created_at", desc=False).range(offset, offset + page_size - 1).execute()
+            ).order("created_at", desc=False).range(offset, offset + page_size - 1))
         
         if not response.data or len(response.data) == 0:
             break
@@ -108,7 +113,7 @@ async def get_all_unknown_faces_paginated(
 @router.post("/recognize-unknown")
 async def recognize_unknown_faces(
     request: RecognizeUnknownRequest,
-    face_service: FaceRecognitionService = Depends(get_face_service),
+    face_service=Depends(get_face_service),
     supabase_db: SupabaseService = Depends(get_supabase_db)
 ):
     """
@@ -137,7 +142,7 @@ async def recognize_unknown_faces(
 
         threshold = request.confidence_threshold
         if threshold is None:
-            config = supabase_db.get_recognition_config()
+            config = await run(supabase_db.get_recognition_config)
             threshold = config.get('confidence_thresholds', {}).get('high_data', 0.60)
 
         logger.info(f"[recognize-unknown] Using threshold: {threshold}")
@@ -145,60 +150,55 @@ async def recognize_unknown_faces(
         recognized_count = 0
         skipped_count = 0
         by_person = {}
-        recognized_face_ids = []  # Track face_ids for index update
-
-        for i, face in enumerate(unknown_faces):
-            face_id = face["id"]
-            descriptor = face.get("insightface_descriptor")
-
-            embedding = parse_descriptor(descriptor)
 
+        # v4.5: batched recognition (one index query per batch) + bulk result writes
+        faces_with_embeddings = []
+        embeddings = []
+        for face in unknown_faces:
+            embedding = parse_descriptor(face.get("insightface_descriptor"))
             if embedding is None:
                 skipped_count += 1
                 continue
-
-            person_id, confidence = await face_service.recognize_face(embedding, threshold)
-
-            if person_id and confidence:
-                supabase_db.client.table("photo_faces").update({
-                    "person_id": person_id,
-                    "recognition_confidence": confidence,
-                    "verified": False
-                }).eq("id", face_id).execute()
-
-                # v6.1: Update index metadata (face already in index (all faces indexed))
-                try:
-                    await face_service.update_face_metadata(
-                        face_id,
-                        person_id=person_id,
-                        confidence=confidence,
-                        verified=False
-                    )
-                except Exception as idx_err:
-                    logger.warning(f"[recognize-unknown] Failed to update metadata for {face_id[:8]}: {idx_err}")
-
-                recognized_count += 1
-                recognized_face_ids.append(face_id)
-
-                if person_id not in by_person:
-                    person_result = supabase_db.client.table("people").select(
-                        "real_name, telegram_full_name"
-                    ).eq("id", person_id).execute()
-
-                    person_name = "Unknown"
-                    if person_result.data:
-                        p = person_result.data[0]
-                        person_name = p.get("real_name") or p.get("telegram_full_name") or "Unknown"
-
-                    by_person[person_id] = {"name": person_name, "count": 0}
-
-                by_person[person_id]["count"] += 1
-
-                if recognized_count <= 10 or recognized_count % 50 == 0:
-                    logger.info(f"[recognize-unknown] Face {face_id[:8]}... -> {by_person[person_id]['name']} ({confidence:.3f})")
-
-            if (i + 1) % 100 == 0:
-                logger.info(f"[recognize-unknown] Progress: {i + 1}/{len(unknown_faces)} processed, {recognized_count} recognized")
+            faces_with_embeddings.append(face)
+            embeddings.append(embedding)
+
+        async with supabase_db.faces.recognition_writer() as writer:
+            for start in range(0, len(embeddings), RECOGNITION_BATCH_SIZE):
+                batch_faces = faces_with_embeddings[start:start + RECOGNITION_BATCH_SIZE]
+                recognitions = await face_service.recognize_faces(
+                    embeddings[start:start + RECOGNITION_BATCH_SIZE], confidence_threshold=threshold
+                )
+
+                for face, recognition in zip(batch_faces, recognitions):
+                    person_id = recognition["person_id"]
+                    confidence = recognition["confidence"]
+                    if not (person_id and confidence):
+                        continue
+
+                    await writer.add_async(face["id"], person_id, confidence, verified=False)
+
+                    # v6.1: Update index metadata (face already in index (all faces indexed))
+                    try:
+                        await face_service.update_face_metadata(
+                            face["id"],
+                            person_id=person_id,
+                            confidence=confidence,
+                            verified=False
+                        )
+                    except Exception as idx_err:
+                        logger.warning(f"[recognize-unknown] Failed to update metadata for {face['id'][:8]}: {idx_err}")
+
+                    recognized_count += 1
+                    by_person.setdefault(person_id, {"name": "Unknown", "count": 0})
+                    by_person[person_id]["count"] += 1
+
+                logger.info(f"[recognize-unknown] Progress: {start + len(batch_faces)}/{len(embeddings)} processed, {recognized_count} recognized")
+
+        write_stats = await writer.close_async()
+
+        # Names for all recognized people from the directory
+        for p in (await as_async(get_people_directory()).get_many(by_person)).values():
+            by_person[p["id"]]["name"] = p.get("real_name") or p.get("telegram_full_name") or "Unknown"
 
         if skipped_count > 0:
             logger.warning(f"[recognize-unknown] Skipped {skipped_count} faces with invalid descriptors")
@@ -216,7 +216,9 @@ async def recognize_unknown_faces(
             "total_unknown": len(unknown_faces),
             "recognized_count": recognized_count,
             "by_person": by_person_list,
-            "metadata_updated": recognized_count  # v6.1: count of faces with updated metadata
+            "metadata_updated": recognized_count,  # v6.1: count of faces with updated metadata
+            "written": write_stats["written"],
+            "write_failed": write_stats["failed"]
         })
         
     except Exception as e:
@@ -227,7 +229,7 @@ async def recognize_unknown_faces(
 @router.post("/{face_id}/clear-descriptor")
 async def clear_face_descriptor(
     face_id: str,
-    face_service: FaceRecognitionService = Depends(get_face_service),
+    face_service=Depends(get_face_service),
     supabase_db: SupabaseService = Depends(get_supabase_db)
 ):
     """
@@ -236,9 +238,9 @@ async def clear_face_descriptor(
     try:
         logger.info(f"[clear-descriptor] Clearing descriptor for face {face_id}")
         
-        check_response = supabase_db.client.table("photo_faces").select(
+        check_response = await execute(supabase_db.client.table("photo_faces").select(
             "id, person_id, insightface_descriptor"
-        ).eq("id", face_id).execute()
+        ).eq("id", face_id))
         
         if not check_response.data:
             raise NotFoundError("Face", face_id)
@@ -255,9 +257,9 @@ async def clear_face_descriptor(
                 "index_rebuilt": False
             })
 
-        supabase_db.client.table("photo_faces").update({
+        await execute(supabase_db.client.table("photo_faces").update({
             "insightface_descriptor": None
-        }).eq("id", face_id).execute()
+        }).eq("id", face_id))
 
         logger.info(f"[clear-descriptor] Descriptor cleared for face {face_id}")
 
@@ -290,7 +292,7 @@ async def clear_face_descriptor(
 async def set_face_excluded(
     face_id: str,
     excluded: bool = Query(True, description="Set to True to exclude from index, False to include"),
-    face_service: FaceRecognitionService = Depends(get_face_service),
+    face_service=Depends(get_face_service),
     supabase_db: SupabaseService = Depends(get_supabase_db)
 ):
     """
@@ -302,9 +304,9 @@ async def set_face_excluded(
     try:
         logger.info(f"[set-excluded] Processing face {face_id}, excluded={excluded}")
 
-        check_response = supabase_db.client.table("photo_faces").select(
+        check_response = await execute(supabase_db.client.table("photo_faces").select(
             "id, person_id, excluded_from_index"
-        ).eq("id", face_id).execute()
+        ).eq("id", face_id))
 
         if not check_response.data:
             raise NotFoundError("Face", face_id)
@@ -323,7 +325,7 @@ async def set_face_excluded(
             except Exception as idx_err:
                 logger.warning(f"[set-excluded] Failed to remove from index: {idx_err}")
 
-            supabase_db.client.table("photo_faces").delete().eq("id", face_id).execute()
+            await execute(supabase_db.client.table("photo_faces").delete().eq("id", face_id))
             return ApiResponse.ok({
                 "updated": True,
                 "deleted": True,
@@ -342,9 +344,9 @@ async def set_face_excluded(
                 "index_rebuilt": False
             })
 
-        supabase_db.client.table("photo_faces").update({
+        await execute(supabase_db.client.table("photo_faces").update({
             "excluded_from_index": excluded
-        }).eq("id", face_id).execute()
+        }).eq("id", face_id))
 
         logger.info(f"[set-excluded] Updated face {face_id}: excluded_from_index={excluded}")
 
@@ -13,6 +13,7 @@ from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
 from services.supabase import SupabaseService
+from services.supabase.aio import execute, run
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -32,10 +33,10 @@ async def get_face_statistics(
     try:
         logger.info(f"Getting face statistics")
         
-        config = supabase_db.get_recognition_config()
+        config = await run(supabase_db.get_recognition_config)
         threshold = confidence_threshold or config.get('confidence_thresholds', {}).get('high_data', 0.60)
         
-        people_response = supabase_db.client.table("people").select("id", count="exact").execute()
+        people_response = await execute(supabase_db.client.table("people").select("id", count="exact"))
         people_data = people_response.data or []
         total_people = people_response.count or 0
         
@@ -44,9 +45,9 @@ async def get_face_statistics(
         page_size = 1000
         
         while True:
-            faces_response = supabase_db.client.table("photo_faces").select(
+            faces_response = await execute(supabase_db.client.table("photo_faces").select(
                 "id, photo_id, person_id, verified, recognition_confidence"
-            ).range(offset, offset + page_size - 1).execute()
+            ).range(offset, offset + page_size - 1))
             
             batch = faces_response.data or []
             if not batch:
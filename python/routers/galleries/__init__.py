@@ -7,17 +7,21 @@ v2.0: Modular structure (refactored from monolithic galleries.py)
 v2.1: Fixed router order - specific routes before parametric
 """
 
+from typing import TYPE_CHECKING
+
 from fastapi import APIRouter
 
 from services.supabase import SupabaseService
-from services.face_recognition import FaceRecognitionService
+
+if TYPE_CHECKING:
+    from services.face_recognition import FaceRecognitionService
 
 # Global service instances (set via set_services)
 supabase_db_instance: SupabaseService = None
-face_service_instance: FaceRecognitionService = None
+face_service_instance: "FaceRecognitionService" = None
 
 
-def set_services(supabase_db: SupabaseService, face_service: FaceRecognitionService = None):
+def set_services(supabase_db: SupabaseService, face_service: "FaceRecognitionService" = None):
     """Set service instances for dependency injection."""
     global supabase_db_instance, face_service_instance
     supabase_db_instance = supabase_db
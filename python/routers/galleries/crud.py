@@ -17,6 +17,8 @@ from fastapi import APIRouter, Query
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, ValidationError, DatabaseError
 from core.logging import get_logger
+from services.supabase.aio import execute, run
+from services.derivative_urls import with_derivative_urls
 from core.slug import generate_gallery_slug, generate_photo_slug, make_unique_slug
 
 from .models import GalleryCreate, GalleryUpdate
@@ -160,7 +162,7 @@ async def get_galleries(
         if not include_private:
             query = query.eq("is_public", True)
 
-        result = query.order(sort_by, desc=True).execute()
+        result = await execute(query.order(sort_by, desc=True))
         galleries = result.data or []
 
         # Collect cover image data for bbox query
@@ -195,9 +197,9 @@ async def get_galleries(
         # Get bboxes for all cover images in one query
         bboxes_by_image = {}
         if cover_image_ids:
-            faces_result = supabase_db.client.table("photo_faces").select(
+            faces_result = await execute(supabase_db.client.table("photo_faces").select(
                 "photo_id, insightface_bbox"
-            ).in_("photo_id", cover_image_ids).not_.is_("insightface_bbox", "null").execute()
+            ).in_("photo_id", cover_image_ids).not_.is_("insightface_bbox", "null"))
 
             for face in (faces_result.data or []):
                 photo_id = face["photo_id"]
@@ -241,7 +243,8 @@ async def get_gallery(identifier: str, full: bool = Query(False)):
     supabase_db = get_supabase_db()
     
     try:
-        gallery = _resolve_gallery(
+        gallery = await run(
+            _resolve_gallery,
             identifier,
             select="*, photographers(id, name), locations(id, name), organizers(id, name)"
         )
@@ -253,20 +256,20 @@ async def get_gallery(identifier: str, full: bool = Query(False)):
         
         if full:
             # Full mode: include images with people for public gallery page
-            images_result = supabase_db.client.table("gallery_images").select(
-                "id, gallery_id, image_url, original_url, original_filename, file_size, width, height, display_order, download_count, created_at, slug"
-            ).eq("gallery_id", gallery_id).order("original_filename").execute()
+            images_result = await execute(supabase_db.client.table("gallery_images").select(
+                "id, gallery_id, image_url, original_url, original_filename, file_size, width, height, display_order, download_count, created_at, slug, derivatives"
+            ).eq("gallery_id", gallery_id).order("original_filename"))
 
-            images = images_result.data or []
+            images = [with_derivative_urls(img) for img in images_result.data or []]
 
             if images:
                 image_ids = [img["id"] for img in images]
 
                 # Get ALL faces (including hidden) to determine which photos to exclude
                 # A photo is hidden if: single person on photo AND that person hid it
-                faces_result = supabase_db.client.table("photo_faces").select(
+                faces_result = await execute(supabase_db.client.table("photo_faces").select(
                     "photo_id, person_id, hidden_by_user, people(id, real_name, show_photos_in_galleries, show_name_on_photos)"
-                ).in_("photo_id", image_ids).not_.is_("person_id", "null").execute()
+                ).in_("photo_id", image_ids).not_.is_("person_id", "null"))
 
                 all_faces = faces_result.data or []
 
@@ -322,9 +325,9 @@ async def get_gallery(identifier: str, full: bool = Query(False)):
             gallery["photo_count"] = len(images)
         else:
             # Simple mode: just count
-            count_result = supabase_db.client.table("gallery_images").select(
+            count_result = await execute(supabase_db.client.table("gallery_images").select(
                 "id", count="exact"
-            ).eq("gallery_id", gallery_id).execute()
+            ).eq("gallery_id", gallery_id))
             gallery["photo_count"] = count_result.count or 0
         
         return ApiResponse.ok(gallery)
@@ -344,9 +347,9 @@ async def create_gallery(data: GalleryCreate):
         insert_data = data.model_dump(exclude_none=True)
 
         # Auto-generate slug with date
-        insert_data["slug"] = _generate_unique_gallery_slug(data.title or "", data.shoot_date)
+        insert_data["slug"] = await run(_generate_unique_gallery_slug, data.title or "", data.shoot_date)
 
-        result = supabase_db.client.table("galleries").insert(insert_data).execute()
+        result = await execute(supabase_db.client.table("galleries").insert(insert_data))
         if result.data:
             logger.info(f"Created gallery: {data.title} (slug: {insert_data['slug']})")
             return ApiResponse.ok(result.data[0])
@@ -362,7 +365,7 @@ async def update_gallery(identifier: str, data: GalleryUpdate):
     supabase_db = get_supabase_db()
 
     try:
-        gallery_id = _get_gallery_id(identifier)
+        gallery_id = await run(_get_gallery_id, identifier)
 
         update_data = data.model_dump(exclude_none=True)
         if not update_data:
@@ -371,20 +374,21 @@ async def update_gallery(identifier: str, data: GalleryUpdate):
         # Regenerate slug if title or shoot_date changed
         if "title" in update_data or "shoot_date" in update_data:
             # Get current gallery data for fields not being updated
-            current = supabase_db.client.table("galleries").select("title, shoot_date").eq("id", gallery_id).execute()
+            current = await execute(supabase_db.client.table("galleries").select("title, shoot_date").eq("id", gallery_id))
             current_data = current.data[0] if current.data else {}
 
             new_title = update_data.get("title", current_data.get("title", ""))
             new_date = update_data.get("shoot_date", current_data.get("shoot_date"))
 
-            update_data["slug"] = _generate_unique_gallery_slug(
+            update_data["slug"] = await run(
+                _generate_unique_gallery_slug,
                 new_title,
                 new_date,
                 exclude_id=gallery_id
             )
             logger.info(f"Regenerated slug for gallery {gallery_id}: {update_data['slug']}")
 
-        result = supabase_db.client.table("galleries").update(update_data).eq("id", gallery_id).execute()
+        result = await execute(supabase_db.client.table("galleries").update(update_data).eq("id", gallery_id))
         if result.data:
             logger.info(f"Updated gallery {gallery_id}")
             return ApiResponse.ok(result.data[0])
@@ -402,9 +406,9 @@ async def update_sort_order(identifier: str, sort_order: str = Query(...)):
     supabase_db = get_supabase_db()
     
     try:
-        gallery_id = _get_gallery_id(identifier)
+        gallery_id = await run(_get_gallery_id, identifier)
         
-        supabase_db.client.table("galleries").update({"sort_order": sort_order}).eq("id", gallery_id).execute()
+        await execute(supabase_db.client.table("galleries").update({"sort_order": sort_order}).eq("id", gallery_id))
         logger.info(f"Updated sort order for gallery {gallery_id}")
         return ApiResponse.ok({"updated": True})
     except NotFoundError:
@@ -421,29 +425,29 @@ async def delete_gallery(identifier: str, delete_images: bool = Query(True)):
     face_service = get_face_service()
     
     try:
-        gallery_id = _get_gallery_id(identifier)
+        gallery_id = await run(_get_gallery_id, identifier)
         face_ids_in_index = []
 
         if delete_images:
-            images = supabase_db.client.table("gallery_images").select("id").eq("gallery_id", gallery_id).execute()
+            images = await execute(supabase_db.client.table("gallery_images").select("id").eq("gallery_id", gallery_id))
             image_ids = [img["id"] for img in (images.data or [])]
 
             if image_ids:
                 # Get face_ids with descriptors and person_id before deletion
-                faces_result = supabase_db.client.table("photo_faces").select(
+                faces_result = await execute(supabase_db.client.table("photo_faces").select(
                     "id, insightface_descriptor, person_id"
-                ).in_("photo_id", image_ids).execute()
+                ).in_("photo_id", image_ids))
 
                 face_ids_in_index = [
                     f["id"] for f in (faces_result.data or [])
                     if f.get("insightface_descriptor") and f.get("person_id")
                 ]
 
-                supabase_db.client.table("photo_faces").delete().in_("photo_id", image_ids).execute()
-                supabase_db.client.table("gallery_images").delete().eq("gallery_id", gallery_id).execute()
+                await execute(supabase_db.client.table("photo_faces").delete().in_("photo_id", image_ids))
+                await execute(supabase_db.client.table("gallery_images").delete().eq("gallery_id", gallery_id))
                 logger.info(f"Deleted {len(image_ids)} images from gallery {gallery_id}")
 
-        supabase_db.client.table("galleries").delete().eq("id", gallery_id).execute()
+        await execute(supabase_db.client.table("galleries").delete().eq("id", gallery_id))
         logger.info(f"Deleted gallery {gallery_id}")
 
         index_rebuilt = False
@@ -476,7 +480,7 @@ async def rename_gallery_files(identifier: str):
 
     try:
         # Get gallery info
-        gallery = _resolve_gallery(identifier, select="id, title, shoot_date, sort_order")
+        gallery = await run(_resolve_gallery, identifier, select="id, title, shoot_date, sort_order")
         if not gallery:
             raise NotFoundError("Gallery", identifier)
 
@@ -503,9 +507,9 @@ async def rename_gallery_files(identifier: str):
             sort_field = "created_at"  # Same as created for now
 
         # Get all images in sort order
-        result = supabase_db.client.table("gallery_images").select(
+        result = await execute(supabase_db.client.table("gallery_images").select(
             "id, original_filename"
-        ).eq("gallery_id", gallery_id).order(sort_field).execute()
+        ).eq("gallery_id", gallery_id).order(sort_field))
 
         images = result.data or []
         if not images:
@@ -518,9 +522,9 @@ async def rename_gallery_files(identifier: str):
         base_name = f"{title} {date_str}" if date_str else title
 
         # Get all existing slugs in gallery for uniqueness check
-        slugs_result = supabase_db.client.table("gallery_images").select(
+        slugs_result = await execute(supabase_db.client.table("gallery_images").select(
             "id, slug"
-        ).eq("gallery_id", gallery_id).execute()
+        ).eq("gallery_id", gallery_id))
 
         # Rename each image
         renamed_count = 0
@@ -539,10 +543,10 @@ async def rename_gallery_files(identifier: str):
             new_slug = generate_photo_slug(f"{base_name}-{idx:03d}")
 
             # Update image
-            supabase_db.client.table("gallery_images").update({
+            await execute(supabase_db.client.table("gallery_images").update({
                 "original_filename": new_filename,
                 "slug": new_slug
-            }).eq("id", image["id"]).execute()
+            }).eq("id", image["id"]))
 
             renamed_count += 1
 
@@ -5,13 +5,18 @@ Endpoints:
 - GET /with-unprocessed-photos  - Galleries with unprocessed photos
 - GET /with-unverified-faces    - Galleries with unverified faces
 - GET /with-unrecognized-faces  - Alias for with-unverified-faces
+
+Per-gallery queries run concurrently (services/supabase/aio.py).
 """
 
+import asyncio
+
 from fastapi import APIRouter
 
 from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
+from services.supabase.aio import execute
 
 from .helpers import get_supabase_db
 
@@ -25,26 +30,32 @@ async def get_galleries_with_unprocessed_photos():
     supabase_db = get_supabase_db()
     
     try:
-        galleries_result = supabase_db.client.table("galleries").select(
+        client = supabase_db.client
+        galleries_result = await execute(client.table("galleries").select(
             "id, title, shoot_date, slug"
-        ).order("shoot_date", desc=True).execute()
+        ).order("shoot_date", desc=True))
         
         galleries = galleries_result.data or []
         if not galleries:
             return ApiResponse.ok([])
         
+        async def count_photos(gallery_id: str):
+            return await asyncio.gather(
+                execute(client.table("gallery_images").select(
+                    "id", count="exact"
+                ).eq("gallery_id", gallery_id)),
+                execute(client.table("gallery_images").select(
+                    "id", count="exact"
+                ).eq("gallery_id", gallery_id).or_(
+                    "has_been_processed.is.null,has_been_processed.eq.false"
+                )),
+            )
+        
+        counts = await asyncio.gather(*(count_photos(g["id"]) for g in galleries))
+        
         result = []
-        for gallery in galleries:
-            total_result = supabase_db.client.table("gallery_images").select(
-                "id", count="exact"
-            ).eq("gallery_id", gallery["id"]).execute()
+        for gallery, (total_result, unprocessed_result) in zip(galleries, counts):
             total_count = total_result.count or 0
-            
-            unprocessed_result = supabase_db.client.table("gallery_images").select(
-                "id", count="exact"
-            ).eq("gallery_id", gallery["id"]).or_(
-                "has_been_processed.is.null,has_been_processed.eq.false"
-            ).execute()
             unprocessed_count = unprocessed_result.count or 0
             
             if unprocessed_count > 0:
@@ -70,35 +81,32 @@ async def get_galleries_with_unverified_faces():
     supabase_db = get_supabase_db()
     
     try:
-        galleries_result = supabase_db.client.table("galleries").select(
+        client = supabase_db.client
+        galleries_result = await execute(client.table("galleries").select(
             "id, title, shoot_date, slug"
-        ).order("shoot_date", desc=True).execute()
+        ).order("shoot_date", desc=True))
         
         galleries = galleries_result.data or []
         if not galleries:
             return ApiResponse.ok([])
         
-        result = []
-        for gallery in galleries:
-            photos_result = supabase_db.client.table("gallery_images").select(
+        async def count_unverified(gallery_id: str):
+            """(total photos, unverified photos) of a gallery."""
+            photos_result = await execute(client.table("gallery_images").select(
                 "id"
-            ).eq("gallery_id", gallery["id"]).execute()
+            ).eq("gallery_id", gallery_id))
             
             photos = photos_result.data or []
             if not photos:
-                continue
+                return 0, 0
             
-            total_count = len(photos)
             photo_ids = [p["id"] for p in photos]
-            
-            all_faces_result = supabase_db.client.table("photo_faces").select(
+            all_faces_result = await execute(client.table("photo_faces").select(
                 "photo_id, recognition_confidence"
-            ).in_("photo_id", photo_ids).execute()
-            
-            all_faces = all_faces_result.data or []
+            ).in_("photo_id", photo_ids))
             
             faces_by_photo = {}
-            for face in all_faces:
+            for face in (all_faces_result.data or []):
                 pid = face["photo_id"]
                 if pid not in faces_by_photo:
                     faces_by_photo[pid] = []
@@ -109,8 +117,12 @@ async def get_galleries_with_unverified_faces():
                 if len(faces) > 0 and all(f.get("recognition_confidence") == 1 for f in faces):
                     fully_verified_photo_ids.add(photo_id)
             
-            unverified_count = total_count - len(fully_verified_photo_ids)
-            
+            return len(photos), len(photos) - len(fully_verified_photo_ids)
+        
+        counts = await asyncio.gather(*(count_unverified(g["id"]) for g in galleries))
+        
+        result = []
+        for gallery, (total_count, unverified_count) in zip(galleries, counts):
             if unverified_count > 0:
                 result.append({
                     "id": gallery["id"],
@@ -13,6 +13,7 @@ from fastapi import APIRouter
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
+from services.supabase.aio import execute, run
 
 from .models import BatchDeleteImagesRequest
 from .helpers import get_supabase_db, get_face_service, _get_gallery_id
@@ -27,13 +28,13 @@ async def get_gallery_unprocessed_photos(identifier: str):
     supabase_db = get_supabase_db()
     
     try:
-        gallery_id = _get_gallery_id(identifier)
+        gallery_id = await run(_get_gallery_id, identifier)
         
-        result = supabase_db.client.table("gallery_images").select(
+        result = await execute(supabase_db.client.table("gallery_images").select(
             "id, image_url, original_filename, slug"
         ).eq("gallery_id", gallery_id).or_(
             "has_been_processed.is.null,has_been_processed.eq.false"
-        ).order("original_filename").execute()
+        ).order("original_filename"))
         
         images = result.data or []
         logger.info(f"Found {len(images)} unprocessed photos in gallery {gallery_id}")
@@ -51,11 +52,11 @@ async def get_gallery_unverified_photos(identifier: str):
     supabase_db = get_supabase_db()
     
     try:
-        gallery_id = _get_gallery_id(identifier)
+        gallery_id = await run(_get_gallery_id, identifier)
         
-        photos_result = supabase_db.client.table("gallery_images").select(
+        photos_result = await execute(supabase_db.client.table("gallery_images").select(
             "id, image_url, original_filename, slug"
-        ).eq("gallery_id", gallery_id).order("original_filename").execute()
+        ).eq("gallery_id", gallery_id).order("original_filename"))
         
         photos = photos_result.data or []
         if not photos:
@@ -63,9 +64,9 @@ async def get_gallery_unverified_photos(identifier: str):
         
         photo_ids = [p["id"] for p in photos]
         
-        all_faces_result = supabase_db.client.table("photo_faces").select(
+        all_faces_result = await execute(supabase_db.client.table("photo_faces").select(
             "photo_id, recognition_confidence"
-        ).in_("photo_id", photo_ids).execute()
+        ).in_("photo_id", photo_ids))
         
         all_faces = all_faces_result.data or []
         
@@ -118,20 +119,20 @@ async def batch_delete_gallery_images(data: BatchDeleteImagesRequest):
         logger.info(f"Batch deleting {len(image_ids)} images from gallery {gallery_id}")
 
         # Get face_ids with descriptors and person_id before deletion (for index removal)
-        faces_result = supabase_db.client.table("photo_faces").select(
+        faces_result = await execute(supabase_db.client.table("photo_faces").select(
             "id, insightface_descriptor, person_id"
-        ).in_("photo_id", image_ids).execute()
+        ).in_("photo_id", image_ids))
 
         face_ids_in_index = [
             f["id"] for f in (faces_result.data or [])
             if f.get("insightface_descriptor") and f.get("person_id")
         ]
 
-        supabase_db.client.table("photo_faces").delete().in_("photo_id", image_ids).execute()
+        await execute(supabase_db.client.table("photo_faces").delete().in_("photo_id", image_ids))
 
-        delete_result = supabase_db.client.table("gallery_images").delete().in_(
+        delete_result = await execute(supabase_db.client.table("gallery_images").delete().in_(
             "id", image_ids
-        ).eq("gallery_id", gallery_id).execute()
+        ).eq("gallery_id", gallery_id))
 
         deleted_count = len(delete_result.data) if delete_result.data else 0
         logger.info(f"Deleted {deleted_count} images from gallery {gallery_id}")
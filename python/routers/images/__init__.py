@@ -5,17 +5,21 @@ Gallery image management endpoints
 v2.0: Modular structure (refactored from monolithic images.py)
 """
 
+from typing import TYPE_CHECKING
+
 from fastapi import APIRouter
 
 from services.supabase import SupabaseService
-from services.face_recognition import FaceRecognitionService
+
+if TYPE_CHECKING:
+    from services.face_recognition import FaceRecognitionService
 
 # Global service instances (set via set_services)
 supabase_db_instance: SupabaseService = None
-face_service_instance: FaceRecognitionService = None
+face_service_instance: "FaceRecognitionService" = None
 
 
-def set_services(db: SupabaseService, face: FaceRecognitionService):
+def set_services(db: SupabaseService, face: "FaceRecognitionService"):
     """Set service instances for dependency injection."""
     global supabase_db_instance, face_service_instance
     supabase_db_instance = db
@@ -3,10 +3,14 @@ Images CRUD Operations
 
 Endpoints:
 - DELETE /{image_id}  - Delete single image
-- POST /batch-add     - Batch add images
+- POST /batch-add     - Batch add images (+ enqueue background face processing)
+- POST /backfill-metadata - Probe dimensions/EXIF of existing images from header bytes
+- POST /storage/cleanup-orphans - Delete stored objects no photo references
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from typing import Optional
+import asyncio
 import httpx
 import os
 
@@ -15,6 +19,10 @@ from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
 from core.slug import generate_photo_slug, make_unique_slug
 from infrastructure.minio_storage import get_minio_storage
+from services.image_metadata import probe_many, metadata_update
+from services.content_store import content_hashes_for_urls, cleanup_orphans, release as release_content
+from services.supabase import get_storage_objects_repository
+from services.supabase.aio import execute, run
 
 from .models import BatchAddImagesRequest, UpdateFeaturedRequest
 from .helpers import get_supabase_db, get_face_service
@@ -25,21 +33,36 @@ router = APIRouter()
 
 @router.post("/batch-add")
 async def batch_add_images(request: BatchAddImagesRequest):
-    """Добавляет несколько фото в галерею."""
+    """
+    Добавляет несколько фото в галерею.
+    
+    Вставленные фото ставятся в очередь photo_processing_queue:
+    детекция и распознавание выполняются в фоне (неверифицированные лица).
+    
+    Размеры, EXIF-ориентация и дата съёмки читаются из заголовка файла
+    (ranged GET первых КБ) - клиентские width/height только запасной вариант.
+    Размер файла (если не передан) - из Content-Range того же запроса.
+    """
     supabase_db = get_supabase_db()
 
     try:
         logger.info(f"Adding {len(request.images)} images to gallery {request.galleryId}")
 
         # Get max display_order
-        max_order_result = supabase_db.client.table("gallery_images").select("display_order").eq("gallery_id", request.galleryId).order("display_order", desc=True).limit(1).execute()
+        max_order_result = await execute(supabase_db.client.table("gallery_images").select("display_order").eq("gallery_id", request.galleryId).order("display_order", desc=True).limit(1))
 
         start_order = max_order_result.data[0]["display_order"] + 1 if max_order_result.data else 0
 
         # Get existing slugs in this gallery for uniqueness
-        existing_result = supabase_db.client.table("gallery_images").select("slug").eq("gallery_id", request.galleryId).execute()
+        existing_result = await execute(supabase_db.client.table("gallery_images").select("slug").eq("gallery_id", request.galleryId))
         existing_slugs = {img["slug"] for img in (existing_result.data or []) if img.get("slug")}
 
+        # Header-only metadata probe for all images at once
+        probed = await probe_many([img.imageUrl for img in request.images])
+
+        # Content hashes of objects already registered (uploaded via /upload)
+        content_hashes = await run(content_hashes_for_urls, [img.imageUrl for img in request.images])
+
         images_to_insert = []
         for idx, img in enumerate(request.images):
             # Generate unique slug within gallery
@@ -49,7 +72,7 @@ async def batch_add_images(request: BatchAddImagesRequest):
             slug = make_unique_slug(base_slug, existing_slugs)
             existing_slugs.add(slug)
 
-            images_to_insert.append({
+            row = {
                 "gallery_id": request.galleryId,
                 "image_url": img.imageUrl,
                 "original_url": img.originalUrl,
@@ -59,15 +82,32 @@ async def batch_add_images(request: BatchAddImagesRequest):
                 "file_size": img.fileSize,
                 "display_order": start_order + idx,
                 "slug": slug
-            })
+            }
+            row.update(metadata_update(row, probed.get(img.imageUrl)))
+            if img.imageUrl in content_hashes:
+                row["content_hash"] = content_hashes[img.imageUrl]
+            images_to_insert.append(row)
 
-        result = supabase_db.client.table("gallery_images").insert(images_to_insert).execute()
+        result = await execute(supabase_db.client.table("gallery_images").insert(images_to_insert))
 
         inserted_count = len(result.data) if result.data else 0
         logger.info(f"Successfully inserted {inserted_count} images with slugs")
 
+        if content_hashes:
+            await run(get_storage_objects_repository().recount, list(content_hashes.values()))
+
+        # Background detection/recognition - never fail the upload because of it
+        queued_count = 0
+        if result.data:
+            try:
+                from services.photo_processing import enqueue_photos  # cv2 stack, full profile only
+                queued_count = await enqueue_photos([row["id"] for row in result.data])
+            except Exception as queue_err:
+                logger.error(f"Failed to enqueue photos for processing: {queue_err}")
+
         return ApiResponse.ok({
             "inserted_count": inserted_count,
+            "queued_count": queued_count,
             "message": f"Successfully added {inserted_count} images"
         })
 
@@ -76,6 +116,76 @@ async def batch_add_images(request: BatchAddImagesRequest):
         raise DatabaseError(str(e), operation="batch_add_images")
 
 
+@router.post("/backfill-metadata")
+async def backfill_image_metadata(
+    only_missing: bool = Query(True),
+    batch_size: int = Query(500, ge=1, le=2000),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """
+    Заполняет width/height/exif_orientation/taken_at/file_size существующих фото.
+    
+    Читаются только заголовки файлов (ranged GET первых КБ, параллельно).
+    
+    Args:
+        only_missing: только фото без width/height/file_size (иначе - все фото)
+        batch_size: фото за один проход
+        limit: максимум фото за вызов
+    """
+    supabase_db = get_supabase_db()
+
+    try:
+        scanned = 0
+        updated = 0
+        failed = 0
+        last_id = None
+
+        while limit is None or scanned < limit:
+            page_size = batch_size if limit is None else min(batch_size, limit - scanned)
+            query = supabase_db.client.table("gallery_images").select(
+                "id, image_url, width, height, exif_orientation, taken_at, file_size"
+            )
+            if only_missing:
+                query = query.or_("width.is.null,height.is.null,file_size.is.null")
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = (await execute(query.order("id").limit(page_size))).data or []
+            if not rows:
+                break
+
+            scanned += len(rows)
+            last_id = rows[-1]["id"]
+
+            probed = await probe_many([row["image_url"] for row in rows])
+            updates = []
+            for row in rows:
+                metadata = probed.get(row["image_url"])
+                if metadata is None:
+                    failed += 1
+                    continue
+                update = metadata_update(row, metadata)
+                if update:
+                    updates.append((row["id"], update))
+
+            def write_updates():
+                for image_id, update in updates:
+                    supabase_db.client.table("gallery_images").update(update).eq("id", image_id).execute()
+
+            await asyncio.to_thread(write_updates)
+            updated += len(updates)
+            logger.info(f"Metadata backfill: scanned {scanned}, updated {updated}, failed {failed}")
+
+        return ApiResponse.ok({
+            "scanned": scanned,
+            "updated": updated,
+            "failed": failed
+        })
+
+    except Exception as e:
+        logger.error(f"Error in metadata backfill: {e}")
+        raise DatabaseError(str(e), operation="backfill_image_metadata")
+
+
 @router.delete("/{image_id}")
 async def delete_image(image_id: str):
     """Удаляет фото и все связанные данные."""
@@ -86,17 +196,18 @@ async def delete_image(image_id: str):
         logger.info(f"Deleting image: {image_id}")
         
         # Get image URL for blob deletion
-        result = supabase_db.client.table("gallery_images").select("image_url").eq("id", image_id).execute()
+        result = await execute(supabase_db.client.table("gallery_images").select("image_url, content_hash").eq("id", image_id))
         
         if not result.data:
             raise NotFoundError("Image", image_id)
         
         image_url = result.data[0].get("image_url")
+        content_hash = result.data[0].get("content_hash")
         
         # Get faces with descriptors and person_id (those are in index)
-        faces_result = supabase_db.client.table("photo_faces").select(
+        faces_result = await execute(supabase_db.client.table("photo_faces").select(
             "id, insightface_descriptor, person_id"
-        ).eq("photo_id", image_id).execute()
+        ).eq("photo_id", image_id))
 
         face_ids_in_index = [
             f["id"] for f in (faces_result.data or [])
@@ -105,12 +216,19 @@ async def delete_image(image_id: str):
         has_descriptors = len(face_ids_in_index) > 0
 
         # Delete from DB (CASCADE deletes photo_faces)
-        supabase_db.client.table("gallery_images").delete().eq("id", image_id).execute()
+        await execute(supabase_db.client.table("gallery_images").delete().eq("id", image_id))
 
         logger.info("Image deleted from DB")
 
-        # Delete storage file (MinIO or Vercel Blob)
-        if image_url:
+        # Delete storage file (MinIO or Vercel Blob).
+        # Content-addressed objects may be shared - released here, deleted by
+        # orphan cleanup once unreferenced for the grace period.
+        if content_hash:
+            try:
+                await run(release_content, [content_hash])
+            except Exception as e:
+                logger.warning(f"Failed to release storage object: {e}")
+        elif image_url:
             try:
                 minio_public_url = os.getenv("MINIO_PUBLIC_URL", "")
                 if minio_public_url and minio_public_url in image_url:
@@ -132,6 +250,15 @@ async def delete_image(image_id: str):
             except Exception as e:
                 logger.warning(f"Failed to delete storage file: {e}")
 
+        # Delete image derivatives (derived/{image_id}/*)
+        try:
+            from services.image_derivatives import get_image_derivative_service
+            removed = await asyncio.to_thread(get_image_derivative_service().delete, image_id)
+            if removed:
+                logger.info(f"Deleted {removed} derivatives")
+        except Exception as e:
+            logger.warning(f"Failed to delete derivatives: {e}")
+
         # Remove faces from index
         index_rebuilt = False
         if face_ids_in_index:
@@ -155,15 +282,32 @@ async def delete_image(image_id: str):
         raise DatabaseError(str(e), operation="delete_image")
 
 
+@router.post("/storage/cleanup-orphans")
+async def cleanup_orphan_objects(min_age_hours: Optional[float] = Query(None, ge=0)):
+    """
+    Удаляет из MinIO загруженные объекты, на которые не ссылается ни одно фото.
+    
+    Args:
+        min_age_hours: не трогать объекты моложе (по умолчанию ORPHAN_GRACE_HOURS)
+    """
+    try:
+        result = await asyncio.to_thread(cleanup_orphans, min_age_hours)
+        logger.info(f"Orphan cleanup: checked {result['checked']}, deleted {result['deleted']}")
+        return ApiResponse.ok(result)
+    except Exception as e:
+        logger.error(f"Error in orphan cleanup: {e}")
+        raise DatabaseError(str(e), operation="cleanup_orphan_objects")
+
+
 @router.patch("/{image_id}/featured")
 async def update_image_featured(image_id: str, request: UpdateFeaturedRequest):
     """Update is_featured flag for an image."""
     supabase_db = get_supabase_db()
 
     try:
-        result = supabase_db.client.table("gallery_images").update({
+        result = await execute(supabase_db.client.table("gallery_images").update({
             "is_featured": request.is_featured
-        }).eq("id", image_id).execute()
+        }).eq("id", image_id))
 
         if not result.data:
             raise NotFoundError("Image", image_id)
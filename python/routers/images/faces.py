@@ -10,6 +10,7 @@ from fastapi import APIRouter
 from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
+from services.supabase.aio import execute
 
 from .helpers import get_supabase_db
 
@@ -31,9 +32,9 @@ async def get_image_linked_people(image_id: str):
         logger.info(f"Getting linked people for image: {image_id}")
 
         # Get all faces with person_id (not just verified)
-        result = supabase_db.client.table("photo_faces").select(
+        result = await execute(supabase_db.client.table("photo_faces").select(
             "person_id, people!inner(id, slug, real_name, telegram_full_name, show_name_on_photos, create_personal_gallery)"
-        ).eq("photo_id", image_id).execute()
+        ).eq("photo_id", image_id))
 
         people = []
         seen_person_ids = set()
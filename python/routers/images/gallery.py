@@ -2,18 +2,23 @@
 Images Gallery Operations
 
 Endpoints:
-- GET /gallery/{gallery_id}           - Get all gallery images
+- GET /gallery/{gallery_id}           - Get all gallery images (?hide_duplicates=true)
 - PATCH /gallery/{gallery_id}/sort-order - Update sort order
 - DELETE /gallery/{gallery_id}/all    - Delete all gallery images
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+import asyncio
 import httpx
 import os
 
 from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
+from infrastructure.minio_storage import get_minio_storage, DELETE_CONCURRENCY
+from services.content_store import release as release_content
+from services.derivative_urls import with_derivative_urls
+from services.supabase.aio import execute
 
 from .models import BatchSortOrderRequest
 from .helpers import get_supabase_db, get_face_service
@@ -21,16 +26,26 @@ from .helpers import get_supabase_db, get_face_service
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Max image ids per in_() filter (keeps PostgREST URLs short)
+IN_CHUNK_SIZE = 200
+
 
 @router.get("/gallery/{gallery_id}")
-async def get_gallery_images(gallery_id: str):
-    """Получает все изображения галереи с счётчиками лайков и избранного."""
+async def get_gallery_images(gallery_id: str, hide_duplicates: bool = Query(False)):
+    """
+    Получает все изображения галереи с счётчиками лайков и избранного.
+    
+    hide_duplicates=true скрывает почти-дубликаты (duplicate_of IS NOT NULL).
+    """
     supabase_db = get_supabase_db()
 
     try:
         logger.info(f"Getting images for gallery: {gallery_id}")
 
-        result = supabase_db.client.table("gallery_images").select("*").eq("gallery_id", gallery_id).order("display_order").execute()
+        query = supabase_db.client.table("gallery_images").select("*").eq("gallery_id", gallery_id)
+        if hide_duplicates:
+            query = query.is_("duplicate_of", "null")
+        result = await execute(query.order("display_order"))
 
         images = result.data or []
 
@@ -38,23 +53,24 @@ async def get_gallery_images(gallery_id: str):
             image_ids = [img["id"] for img in images]
 
             # Get likes counts
-            likes_result = supabase_db.client.table("likes").select("image_id").in_("image_id", image_ids).execute()
+            likes_result = await execute(supabase_db.client.table("likes").select("image_id").in_("image_id", image_ids))
             likes_by_image = {}
             for like in (likes_result.data or []):
                 img_id = like["image_id"]
                 likes_by_image[img_id] = likes_by_image.get(img_id, 0) + 1
 
             # Get favorites counts
-            favorites_result = supabase_db.client.table("favorites").select("gallery_image_id").in_("gallery_image_id", image_ids).execute()
+            favorites_result = await execute(supabase_db.client.table("favorites").select("gallery_image_id").in_("gallery_image_id", image_ids))
             favorites_by_image = {}
             for fav in (favorites_result.data or []):
                 img_id = fav["gallery_image_id"]
                 favorites_by_image[img_id] = favorites_by_image.get(img_id, 0) + 1
 
-            # Add counts to images
+            # Add counts and derivative URLs to images
             for img in images:
                 img["likes_count"] = likes_by_image.get(img["id"], 0)
                 img["favorites_count"] = favorites_by_image.get(img["id"], 0)
+                with_derivative_urls(img)
 
         logger.info(f"Found {len(images)} images")
         return ApiResponse.ok(images)
@@ -66,14 +82,30 @@ async def get_gallery_images(gallery_id: str):
 
 @router.patch("/gallery/{gallery_id}/sort-order")
 async def update_images_sort_order(gallery_id: str, request: BatchSortOrderRequest):
-    """Обновляет порядок изображений в галерее."""
+    """
+    Обновляет порядок изображений в галерее.
+
+    Один RPC update_gallery_images_order (массивы id/order) вместо UPDATE на каждое фото.
+    """
     supabase_db = get_supabase_db()
     
     try:
         logger.info(f"Updating sort order for gallery {gallery_id}, {len(request.image_orders)} images")
-        
-        for item in request.image_orders:
-            supabase_db.client.table("gallery_images").update({"display_order": item.order}).eq("id", item.id).eq("gallery_id", gallery_id).execute()
+
+        if not request.image_orders:
+            return ApiResponse.ok({"updated": True})
+
+        try:
+            await execute(supabase_db.client.rpc("update_gallery_images_order", {
+                "p_gallery_id": gallery_id,
+                "p_ids": [item.id for item in request.image_orders],
+                "p_orders": [item.order for item in request.image_orders],
+            }))
+        except Exception as rpc_error:
+            # Function not deployed yet (migrations/20261018_create_update_gallery_images_order.sql)
+            logger.warning(f"update_gallery_images_order RPC failed, updating per image: {rpc_error}")
+            for item in request.image_orders:
+                await execute(supabase_db.client.table("gallery_images").update({"display_order": item.order}).eq("id", item.id).eq("gallery_id", gallery_id))
         
         logger.info("Sort order updated successfully")
         return ApiResponse.ok({"updated": True})
@@ -83,16 +115,41 @@ async def update_images_sort_order(gallery_id: str, request: BatchSortOrderReque
         raise DatabaseError(str(e), operation="update_sort_order")
 
 
+async def _delete_legacy_blobs(urls: list) -> None:
+    """Delete Vercel Blob files (legacy storage) with one client, bounded concurrency."""
+    blob_token = os.getenv("BLOB_READ_WRITE_TOKEN")
+    urls = [url for url in urls if url.startswith("https://")]
+    if not blob_token or not urls:
+        return
+
+    semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+    async with httpx.AsyncClient(headers={"Authorization": f"Bearer {blob_token}"}) as client:
+        async def delete(url: str):
+            async with semaphore:
+                try:
+                    await client.delete(url)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(delete(url) for url in urls))
+
+
 @router.delete("/gallery/{gallery_id}/all")
 async def delete_all_gallery_images(gallery_id: str):
-    """Удаляет все фото из галереи."""
+    """
+    Удаляет все фото из галереи.
+
+    Строки удаляются пачками через in_(), файлы в MinIO - батчами remove_objects.
+    """
     supabase_db = get_supabase_db()
     face_service = get_face_service()
     
     try:
         logger.info(f"Deleting all images from gallery: {gallery_id}")
         
-        result = supabase_db.client.table("gallery_images").select("id, image_url").eq("gallery_id", gallery_id).execute()
+        result = await execute(supabase_db.client.table("gallery_images").select(
+            "id, image_url, content_hash, derivatives"
+        ).eq("gallery_id", gallery_id))
         
         if not result.data:
             return ApiResponse.ok({
@@ -104,45 +161,64 @@ async def delete_all_gallery_images(gallery_id: str):
         image_ids = [img["id"] for img in images]
 
         # Get faces with descriptors and person_id before deletion (for index removal)
-        faces_result = supabase_db.client.table("photo_faces").select(
-            "id, insightface_descriptor, person_id"
-        ).in_("photo_id", image_ids).execute()
-
-        face_ids_in_index = [
-            f["id"] for f in (faces_result.data or [])
-            if f.get("insightface_descriptor") and f.get("person_id")
-        ]
+        face_ids_in_index = []
+        for i in range(0, len(image_ids), IN_CHUNK_SIZE):
+            faces_result = await execute(supabase_db.client.table("photo_faces").select(
+                "id, insightface_descriptor, person_id"
+            ).in_("photo_id", image_ids[i:i + IN_CHUNK_SIZE]))
+            face_ids_in_index.extend(
+                f["id"] for f in (faces_result.data or [])
+                if f.get("insightface_descriptor") and f.get("person_id")
+            )
         has_descriptors = len(face_ids_in_index) > 0
 
-        # Delete all images
-        deleted_count = 0
+        # Delete rows (CASCADE deletes photo_faces)
+        deleted_ids = set()
         failed_count = 0
-
-        for image in images:
+        for i in range(0, len(image_ids), IN_CHUNK_SIZE):
+            chunk = image_ids[i:i + IN_CHUNK_SIZE]
             try:
-                supabase_db.client.table("gallery_images").delete().eq("id", image["id"]).execute()
-                deleted_count += 1
-
-                # Delete blob
-                image_url = image.get("image_url")
-                if image_url:
-                    try:
-                        blob_token = os.getenv("BLOB_READ_WRITE_TOKEN")
-                        if blob_token and image_url.startswith("https://"):
-                            async with httpx.AsyncClient() as client:
-                                await client.delete(
-                                    image_url,
-                                    headers={"Authorization": f"Bearer {blob_token}"}
-                                )
-                    except Exception:
-                        pass
-
+                delete_result = await execute(supabase_db.client.table("gallery_images").delete().in_(
+                    "id", chunk
+                ))
+                deleted_ids.update(row["id"] for row in (delete_result.data or []))
             except Exception as e:
-                logger.error(f"Failed to delete image {image['id']}: {e}")
-                failed_count += 1
+                logger.error(f"Failed to delete {len(chunk)} images: {e}")
+                failed_count += len(chunk)
 
+        deleted_count = len(deleted_ids)
+        deleted_images = [img for img in images if img["id"] in deleted_ids]
         logger.info(f"Deleted {deleted_count} images, {failed_count} failed")
 
+        # Release content-addressed objects (unreferenced ones removed by orphan cleanup)
+        content_hashes = [img["content_hash"] for img in deleted_images if img.get("content_hash")]
+        if content_hashes:
+            try:
+                await asyncio.to_thread(release_content, content_hashes)
+            except Exception as e:
+                logger.warning(f"Failed to release storage objects: {e}")
+
+        # Files not in the content registry: MinIO in batches, legacy Vercel Blob per file
+        minio = get_minio_storage()
+        untracked_urls = [
+            img["image_url"] for img in deleted_images
+            if img.get("image_url") and not img.get("content_hash")
+        ]
+        try:
+            await asyncio.to_thread(
+                minio.delete_files, [url for url in untracked_urls if minio.parse_url(url)]
+            )
+            await _delete_legacy_blobs([url for url in untracked_urls if not minio.parse_url(url)])
+        except Exception as e:
+            logger.warning(f"Failed to delete storage files: {e}")
+
+        # Delete image derivatives (derived/{image_id}/*)
+        try:
+            from services.image_derivatives import get_image_derivative_service
+            await asyncio.to_thread(get_image_derivative_service().delete_many, deleted_images)
+        except Exception as e:
+            logger.warning(f"Failed to delete derivatives: {e}")
+
         # Remove faces from index
         index_rebuilt = False
         if face_ids_in_index and deleted_count > 0:
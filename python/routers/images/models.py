@@ -3,16 +3,18 @@ Images Pydantic Models
 """
 
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 class GalleryImageInput(BaseModel):
     imageUrl: str
     originalUrl: str
     originalFilename: str
-    fileSize: int
-    width: int
-    height: int
+    # Optional: filled at batch-add when missing (dimensions from the image
+    # header, file size from the Content-Range of the same ranged GET)
+    fileSize: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
 
 
 class BatchAddImagesRequest(BaseModel):
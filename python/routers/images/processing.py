@@ -15,6 +15,8 @@ import numpy as np
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run, as_async
 
 from .helpers import get_supabase_db, get_face_service
 
@@ -30,7 +32,7 @@ async def mark_image_as_processed(image_id: str):
     try:
         logger.info(f"Marking image {image_id} as processed")
         
-        result = supabase_db.client.table("gallery_images").update({"has_been_processed": True}).eq("id", image_id).execute()
+        result = await execute(supabase_db.client.table("gallery_images").update({"has_been_processed": True}).eq("id", image_id))
         
         if not result.data:
             raise NotFoundError("Image", image_id)
@@ -66,7 +68,7 @@ async def auto_recognize_faces(image_id: str):
         logger.info(f"Auto-recognizing faces for image: {image_id}")
         
         # Load recognition config
-        config = supabase_db.get_recognition_config()
+        config = await run(supabase_db.get_recognition_config)
         threshold = config.get('confidence_thresholds', {}).get('high_data', 0.60)
         logger.info(f"Using recognition threshold: {threshold}")
         
@@ -85,9 +87,9 @@ async def auto_recognize_faces(image_id: str):
             })
         
         # Get all unverified faces with descriptors
-        result = supabase_db.client.table("photo_faces").select(
+        result = await execute(supabase_db.client.table("photo_faces").select(
             "id, person_id, verified, insightface_descriptor, recognition_confidence"
-        ).eq("photo_id", image_id).eq("verified", False).execute()
+        ).eq("photo_id", image_id).eq("verified", False))
         
         faces = result.data or []
         logger.info(f"Found {len(faces)} unverified faces")
@@ -152,10 +154,10 @@ async def auto_recognize_faces(image_id: str):
                 
                 if person_id and confidence >= threshold:
                     # Update face with recognized person
-                    supabase_db.client.table("photo_faces").update({
+                    await execute(supabase_db.client.table("photo_faces").update({
                         "person_id": person_id,
                         "recognition_confidence": confidence
-                    }).eq("id", face_id).execute()
+                    }).eq("id", face_id))
 
                     # v6.1: Sync index metadata (face already in index (all faces indexed))
                     try:
@@ -168,14 +170,7 @@ async def auto_recognize_faces(image_id: str):
                     except Exception as idx_err:
                         logger.warning(f"Failed to sync index for face {face_id}: {idx_err}")
 
-                    # Get person name for result
-                    person_result = supabase_db.client.table("people").select(
-                        "real_name, telegram_full_name"
-                    ).eq("id", person_id).execute()
-                    
-                    person_name = "Unknown"
-                    if person_result.data:
-                        person_name = person_result.data[0].get("real_name") or person_result.data[0].get("telegram_full_name") or "Unknown"
+                    person_name = await as_async(get_people_directory()).display_name(person_id)
                     
                     recognized += 1
                     results.append({
@@ -6,6 +6,8 @@ Handles file uploads to MinIO storage.
 - GET /presign - Get presigned URL for direct MinIO upload (requires auth)
 """
 
+import asyncio
+
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from typing import Optional, List
 from pydantic import BaseModel
@@ -13,6 +15,7 @@ from pydantic import BaseModel
 from core.responses import ApiResponse
 from core.logging import get_logger
 from infrastructure.minio_storage import get_minio_storage
+from services.content_store import register_upload, find_existing
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -22,6 +25,8 @@ class PresignRequest(BaseModel):
     """Request for batch presigned URLs."""
     filenames: List[str]
     folder: str = "photos"  # "photos", "covers", or "avatars"
+    # Optional sha256 per filename (same order): already stored content is reused
+    sha256s: Optional[List[Optional[str]]] = None
 
 
 @router.post("/presign")
@@ -35,6 +40,9 @@ async def get_presigned_urls(request: PresignRequest):
 
     Returns list of {upload_url, object_name, public_url} for each filename.
     URLs expire in 60 seconds.
+
+    If sha256s are given and the content is already stored, the item has
+    existing=true and no upload_url - the client uses public_url as is.
     """
     if not request.filenames:
         raise HTTPException(400, "No filenames provided")
@@ -46,10 +54,27 @@ async def get_presigned_urls(request: PresignRequest):
     allowed_folders = ["photos", "covers", "avatars"]
     folder = request.folder if request.folder in allowed_folders else "photos"
 
+    if request.sha256s is not None and len(request.sha256s) != len(request.filenames):
+        raise HTTPException(400, "sha256s must match filenames")
+
+    sha256s = request.sha256s or [None] * len(request.filenames)
+    existing = await asyncio.to_thread(find_existing, sha256s) if request.sha256s else {}
+
     minio = get_minio_storage()
     results = []
 
-    for filename in request.filenames:
+    for filename, sha256 in zip(request.filenames, sha256s):
+        stored = existing.get(sha256.lower()) if sha256 else None
+        if stored and stored["bucket"] == folder:
+            results.append({
+                "filename": filename,
+                "object_name": stored["object_name"],
+                "bucket": stored["bucket"],
+                "public_url": stored["url"],
+                "existing": True
+            })
+            continue
+
         try:
             result = minio.generate_presigned_upload_url(filename, folder=folder, expires_seconds=60)
             results.append({
@@ -71,12 +96,19 @@ async def upload_image(file: UploadFile = File(...)):
     """
     Upload image to MinIO storage.
 
+    The file is streamed from the multipart spool to MinIO in parts
+    (never read into memory as a whole); sha256 and image header are
+    computed while streaming.
+
     Returns:
         url: Public URL of uploaded file
         object_name: MinIO object name (clean UUID)
         original_filename: Original filename from upload
         size: File size in bytes
         content_type: MIME type
+        sha256: Content hash
+        deduplicated: True if identical content was already stored (its URL returned)
+        width, height, format: From image header (None if not recognized)
     """
     # Validate file type
     allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp", "image/heic", "image/heif"]
@@ -88,32 +120,46 @@ async def upload_image(file: UploadFile = File(...)):
             detail=f"Unsupported file type: {content_type}. Allowed: {', '.join(allowed_types)}"
         )
 
-    try:
-        # Read file data
-        file_data = await file.read()
-
-        if not file_data:
-            raise HTTPException(status_code=400, detail="Empty file")
+    if file.size == 0:
+        raise HTTPException(status_code=400, detail="Empty file")
 
+    try:
         # Get original filename
         original_filename = file.filename or "image.jpg"
 
-        # Upload to MinIO
+        # Stream to MinIO (blocking client - off the event loop)
         minio = get_minio_storage()
-        result = minio.upload_file(
-            file_data=file_data,
-            filename=original_filename,
-            content_type=content_type
+        result = await asyncio.to_thread(
+            minio.upload_stream,
+            file.file,
+            original_filename,
+            content_type,
+            "photos",
+            file.size if file.size is not None else -1
         )
 
-        logger.info(f"Uploaded: {original_filename} -> {result['object_name']}")
+        if not result["size"]:
+            minio.delete_file(result["url"])
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        # Content-addressed dedup: identical content returns the stored object
+        result = await asyncio.to_thread(register_upload, result)
+
+        logger.info(f"Uploaded: {original_filename} -> {result['object_name']}"
+                    f"{' (deduplicated)' if result['deduplicated'] else ''}")
 
+        header = result["header"] or {}
         return ApiResponse.ok({
             "url": result["url"],
             "object_name": result["object_name"],
             "original_filename": original_filename,
             "size": result["size"],
-            "content_type": content_type
+            "content_type": content_type,
+            "sha256": result["sha256"],
+            "deduplicated": result["deduplicated"],
+            "width": header.get("width"),
+            "height": header.get("height"),
+            "format": header.get("format")
         })
 
     except HTTPException:
@@ -121,3 +167,5 @@ async def upload_image(file: UploadFile = File(...)):
     except Exception as e:
         logger.error(f"Upload error: {e}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+    finally:
+        await file.close()
@@ -6,7 +6,6 @@ Endpoints for updating avatar and visibility settings
 from fastapi import APIRouter, Query, Body
 from uuid import UUID
 from typing import Optional
-import httpx
 import io
 
 from PIL import Image
@@ -15,7 +14,10 @@ from core.responses import ApiResponse
 from core.exceptions import NotFoundError, ValidationError, DatabaseError
 from core.logging import get_logger
 from infrastructure.minio_storage import get_minio_storage
+from infrastructure.http_client import get_image_downloader
 from services.birefnet_service import get_birefnet_service
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run
 
 from .models import VisibilityUpdate
 from .helpers import get_supabase_db
@@ -24,11 +26,20 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-def _get_person_id_from_uuid(supabase_db, person_uuid: UUID) -> str:
-    """Get person ID from UUID. Raises NotFoundError if not found."""
-    result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
-    if result.data and len(result.data) > 0:
-        return result.data[0]["id"]
+def _get_person_id_from_uuid(supabase_db, person_uuid: UUID, check_exists: bool = False) -> str:
+    """
+    Get person ID from UUID. Raises NotFoundError if not found.
+
+    Write endpoints pass check_exists=True: the people directory may still
+    hold a person deleted by another worker, and the write would fail on the FK.
+    """
+    if check_exists:
+        result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
+        person = result.data[0] if result.data else None
+    else:
+        person = get_people_directory().get(str(person_uuid))
+    if person:
+        return person["id"]
     raise NotFoundError("Person", str(person_uuid))
 
 
@@ -38,9 +49,10 @@ async def update_avatar(identifier: UUID, avatar_url: str = Query(...)):
     supabase_db = get_supabase_db()
 
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
 
-        result = supabase_db.client.table("people").update({"avatar_url": avatar_url}).eq("id", person_id).execute()
+        result = await execute(supabase_db.client.table("people").update({"avatar_url": avatar_url}).eq("id", person_id))
+        get_people_directory().invalidate(person_id)
         if result.data:
             logger.info(f"Updated avatar for person {person_id}")
             return ApiResponse.ok(result.data[0])
@@ -58,9 +70,10 @@ async def delete_avatar(identifier: UUID):
     supabase_db = get_supabase_db()
 
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
 
-        result = supabase_db.client.table("people").update({"avatar_url": None}).eq("id", person_id).execute()
+        result = await execute(supabase_db.client.table("people").update({"avatar_url": None}).eq("id", person_id))
+        get_people_directory().invalidate(person_id)
         if result.data:
             logger.info(f"Deleted avatar for person {person_id}")
             return ApiResponse.ok(result.data[0])
@@ -81,12 +94,12 @@ async def get_best_face_for_avatar(identifier: UUID):
     supabase_db = get_supabase_db()
 
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier)
 
         # Get all faces for this person with descriptors
-        faces_result = supabase_db.client.table("photo_faces").select(
+        faces_result = await execute(supabase_db.client.table("photo_faces").select(
             "id, photo_id, insightface_bbox, insightface_descriptor, gallery_images(image_url)"
-        ).eq("person_id", person_id).eq("verified", True).execute()
+        ).eq("person_id", person_id).eq("verified", True))
 
         faces = faces_result.data or []
         if not faces:
@@ -163,12 +176,13 @@ async def update_visibility(identifier: UUID, data: VisibilityUpdate):
     supabase_db = get_supabase_db()
 
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
 
         update_data = data.model_dump(exclude_none=True)
         if not update_data:
             raise ValidationError("No fields to update")
-        result = supabase_db.client.table("people").update(update_data).eq("id", person_id).execute()
+        result = await execute(supabase_db.client.table("people").update(update_data).eq("id", person_id))
+        get_people_directory().invalidate(person_id)
         if result.data:
             return ApiResponse.ok(result.data[0])
         raise NotFoundError("Person", str(identifier))
@@ -212,12 +226,12 @@ async def generate_avatar(
     birefnet = get_birefnet_service()
 
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
 
         # Get person info including current avatar
-        person_result = supabase_db.client.table("people").select(
+        person_result = await execute(supabase_db.client.table("people").select(
             "id, real_name, telegram_full_name, avatar_url"
-        ).eq("id", person_id).execute()
+        ).eq("id", person_id))
 
         if not person_result.data:
             raise NotFoundError("Person", str(identifier))
@@ -231,10 +245,7 @@ async def generate_avatar(
 
         # Download current avatar
         logger.info(f"Generating transparent avatar from: {current_avatar_url}")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(current_avatar_url, timeout=30)
-            response.raise_for_status()
-            image_bytes = response.content
+        image_bytes = await get_image_downloader().fetch(current_avatar_url)
 
         if not image_bytes:
             raise ValidationError("Could not get source image")
@@ -286,22 +297,23 @@ async def generate_avatar(
         object_name = upload_result["object_name"]
 
         # Set existing primary avatars to non-primary
-        supabase_db.client.table("person_avatars").update({
+        await execute(supabase_db.client.table("person_avatars").update({
             "is_primary": False
-        }).eq("person_id", person_id).eq("is_primary", True).execute()
+        }).eq("person_id", person_id).eq("is_primary", True))
 
         # Create person_avatars record
-        avatar_record = supabase_db.client.table("person_avatars").insert({
+        avatar_record = await execute(supabase_db.client.table("person_avatars").insert({
             "person_id": person_id,
             "avatar_url": avatar_url,
             "object_name": object_name,
             "is_primary": True
-        }).execute()
+        }))
 
         # Update people.avatar_url
-        supabase_db.client.table("people").update({
+        await execute(supabase_db.client.table("people").update({
             "avatar_url": avatar_url
-        }).eq("id", person_id).execute()
+        }).eq("id", person_id))
+        get_people_directory().invalidate(person_id)
 
         logger.info(f"Generated transparent avatar for person {person_id}: {avatar_url}")
 
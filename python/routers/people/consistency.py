@@ -12,6 +12,8 @@ from uuid import UUID
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run, as_async
 
 from .helpers import get_supabase_db, convert_bbox_to_array
 
@@ -21,9 +23,9 @@ router = APIRouter()
 
 def _get_person_id_from_uuid(supabase_db, person_uuid: UUID) -> str:
     """Get person ID from UUID. Raises NotFoundError if not found."""
-    result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
-    if result.data and len(result.data) > 0:
-        return result.data[0]["id"]
+    person = get_people_directory().get(str(person_uuid))
+    if person:
+        return person["id"]
     raise NotFoundError("Person", str(person_uuid))
 
 
@@ -46,15 +48,11 @@ async def consistency_audit(
         logger.info(f"[consistency-audit] Starting audit, threshold={outlier_threshold}, min_descriptors={min_descriptors}")
         
         # Get all people
-        people_result = supabase_db.client.table("people").select(
-            "id, real_name, telegram_full_name"
-        ).order("real_name").execute()
-        
-        people = people_result.data or []
+        people = await as_async(get_people_directory()).all()
         logger.info(f"[consistency-audit] Found {len(people)} people")
         
         # Get confidence threshold for photo counting
-        config = supabase_db.get_recognition_config()
+        config = await run(supabase_db.get_recognition_config)
         confidence_threshold = config.get('confidence_thresholds', {}).get('high_data', 0.6)
         
         # Load ALL photo_faces with embeddings (paginated)
@@ -62,11 +60,11 @@ async def consistency_audit(
         offset = 0
         page_size = 1000
         while True:
-            faces_result = supabase_db.client.table("photo_faces").select(
+            faces_result = await execute(supabase_db.client.table("photo_faces").select(
                 "id, person_id, photo_id, verified, recognition_confidence, insightface_descriptor, excluded_from_index"
             ).not_.is_("person_id", "null").not_.is_("insightface_descriptor", "null").range(
                 offset, offset + page_size - 1
-            ).execute()
+            ))
             
             batch = faces_result.data or []
             all_faces.extend(batch)
@@ -220,15 +218,15 @@ async def get_embedding_consistency(
     supabase_db = get_supabase_db()
     
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier)
         
         logger.info(f"[consistency] Analyzing embeddings for person {person_id}")
         
         # Get all faces with embeddings for this person (include bbox and image dimensions)
-        result = supabase_db.client.table("photo_faces").select(
+        result = await execute(supabase_db.client.table("photo_faces").select(
             "id, photo_id, verified, recognition_confidence, insightface_descriptor, insightface_bbox, excluded_from_index, "
             "gallery_images(id, image_url, original_filename, width, height)"
-        ).eq("person_id", person_id).not_.is_("insightface_descriptor", "null").execute()
+        ).eq("person_id", person_id).not_.is_("insightface_descriptor", "null"))
         
         faces = result.data or []
         
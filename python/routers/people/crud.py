@@ -14,6 +14,8 @@ from core.responses import ApiResponse
 from core.exceptions import NotFoundError, ValidationError, DatabaseError
 from core.logging import get_logger
 from core.slug import generate_player_slug, make_unique_slug
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run
 
 from .models import PersonCreate, PersonUpdate
 from .helpers import (
@@ -72,7 +74,7 @@ async def get_people(
 
     try:
         fields = ADMIN_FIELDS if admin else PUBLIC_FIELDS
-        result = supabase_db.client.table("people").select(fields).order("real_name").execute()
+        result = await execute(supabase_db.client.table("people").select(fields).order("real_name"))
         people = result.data or []
 
         # For admin panel - add linked user info (telegram_id, google_id)
@@ -117,9 +119,9 @@ async def _add_gallery_data(people: list) -> list:
         page_size = 1000
         
         while True:
-            faces_result = supabase_db.client.table("photo_faces").select(
+            faces_result = await execute(supabase_db.client.table("photo_faces").select(
                 "person_id, photo_id, gallery_images!inner(gallery_id, galleries!inner(shoot_date))"
-            ).not_.is_("person_id", "null").range(offset, offset + page_size - 1).execute()
+            ).not_.is_("person_id", "null").range(offset, offset + page_size - 1))
             
             batch = faces_result.data or []
             all_faces.extend(batch)
@@ -190,9 +192,9 @@ async def _add_user_auth_info(people: list) -> list:
 
     try:
         # Get all users with person_id
-        users_result = supabase_db.client.table("users").select(
+        users_result = await execute(supabase_db.client.table("users").select(
             "person_id, telegram_id, google_id"
-        ).execute()
+        ))
         users = users_result.data or []
 
         # Build lookup: person_id -> {telegram_id, google_id}
@@ -230,12 +232,13 @@ async def create_person(data: PersonCreate, request: Request):
         insert_data = data.model_dump(exclude_none=True)
 
         # Auto-generate slug
-        insert_data["slug"] = _generate_unique_player_slug(
+        insert_data["slug"] = await run(
+            _generate_unique_player_slug,
             name=data.real_name or "",
             telegram_username=data.telegram_username
         )
 
-        result = supabase_db.client.table("people").insert(insert_data).execute()
+        result = await execute(supabase_db.client.table("people").insert(insert_data))
         if result.data:
             person = result.data[0]
             logger.info(f"Created person: {data.real_name} (slug: {insert_data['slug']})")
@@ -264,7 +267,7 @@ async def create_person(data: PersonCreate, request: Request):
 async def get_person_by_slug(slug: str):
     """Get a person by slug (legacy route, use /{identifier} instead)."""
     try:
-        person = resolve_person(slug)
+        person = await run(resolve_person, slug)
         if person:
             return ApiResponse.ok(person)
         raise NotFoundError("Person", slug)
@@ -279,7 +282,7 @@ async def get_person_by_slug(slug: str):
 async def get_person(identifier: str):
     """Get a person by UUID or slug."""
     try:
-        person = resolve_person(identifier)
+        person = await run(resolve_person, identifier)
         if person:
             return ApiResponse.ok(person)
         raise NotFoundError("Person", identifier)
@@ -297,9 +300,9 @@ async def update_person(identifier: UUID, data: PersonUpdate):
 
     try:
         # Get current person data
-        result = supabase_db.client.table("people").select(
+        result = await execute(supabase_db.client.table("people").select(
             "id, real_name, telegram_username"
-        ).eq("id", str(identifier)).execute()
+        ).eq("id", str(identifier)))
         if not result.data:
             raise NotFoundError("Person", str(identifier))
 
@@ -315,14 +318,16 @@ async def update_person(identifier: UUID, data: PersonUpdate):
         new_tg = update_data.get("telegram_username", current.get("telegram_username"))
 
         if "real_name" in update_data or "telegram_username" in update_data:
-            update_data["slug"] = _generate_unique_player_slug(
+            update_data["slug"] = await run(
+                _generate_unique_player_slug,
                 name=new_name or "",
                 telegram_username=new_tg,
                 exclude_id=person_id
             )
             logger.info(f"Regenerated slug for person {person_id}: {update_data['slug']}")
 
-        result = supabase_db.client.table("people").update(update_data).eq("id", person_id).execute()
+        result = await execute(supabase_db.client.table("people").update(update_data).eq("id", person_id))
+        get_people_directory().invalidate(person_id)
         if result.data:
             logger.info(f"Updated person {person_id}")
             return ApiResponse.ok(result.data[0])
@@ -342,29 +347,30 @@ async def delete_person(identifier: UUID, request: Request):
 
     try:
         # Verify person exists and get name for logging
-        result = supabase_db.client.table("people").select("id, real_name").eq("id", str(identifier)).execute()
+        result = await execute(supabase_db.client.table("people").select("id, real_name").eq("id", str(identifier)))
         if not result.data:
             raise NotFoundError("Person", str(identifier))
         person_id = str(identifier)
         person_name = result.data[0].get("real_name", "Unknown")
         
         # Get face_ids with descriptors before unlinking (for index removal)
-        faces_result = supabase_db.client.table("photo_faces").select(
+        faces_result = await execute(supabase_db.client.table("photo_faces").select(
             "id, insightface_descriptor"
-        ).eq("person_id", person_id).execute()
+        ).eq("person_id", person_id))
         face_ids_in_index = [f["id"] for f in (faces_result.data or []) if f.get("insightface_descriptor")]
 
         # Unlink photo_faces (clear person_id, keep embeddings)
-        supabase_db.client.table("photo_faces").update({
+        await execute(supabase_db.client.table("photo_faces").update({
             "person_id": None,
             "verified": False,
             "recognition_confidence": None,
             "verified_at": None,
             "verified_by": None,
-        }).eq("person_id", person_id).execute()
+        }).eq("person_id", person_id))
 
         # Delete person
-        supabase_db.client.table("people").delete().eq("id", person_id).execute()
+        await execute(supabase_db.client.table("people").delete().eq("id", person_id))
+        get_people_directory().invalidate(person_id)
 
         # Remove faces from index
         index_rebuilt = False
@@ -381,8 +387,8 @@ async def delete_person(identifier: UUID, request: Request):
             from routers.admin.helpers import log_admin_activity
             log_admin_activity(
                 event_type="person_deleted",
-                person_id=person_id,
-                metadata={"person_name": person_name},
+                # The row is gone - admin_activity.person_id references people(id)
+                metadata={"person_id": person_id, "person_name": person_name},
                 admin=admin,
             )
 
@@ -8,6 +8,8 @@ from typing import Optional, List
 from core.exceptions import NotFoundError
 from core.logging import get_logger
 from core.slug import resolve_identifier
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run
 
 logger = get_logger(__name__)
 
@@ -51,7 +53,7 @@ def resolve_person(identifier: str) -> Optional[dict]:
 
 def get_person_id(identifier: str) -> str:
     """Get person ID from identifier (ID or slug). Raises NotFoundError if not found."""
-    person = resolve_person(identifier)
+    person = get_people_directory().resolve(identifier)
     if not person:
         raise NotFoundError("Person", identifier)
     return person["id"]
@@ -101,7 +103,7 @@ async def calculate_people_stats(people: list) -> list:
     supabase_db = get_supabase_db()
     
     try:
-        config = supabase_db.get_recognition_config()
+        config = await run(supabase_db.get_recognition_config)
         confidence_threshold = config.get('confidence_thresholds', {}).get('high_data', 0.6)
         
         # Load all photo_faces with their embedding status
@@ -109,9 +111,9 @@ async def calculate_people_stats(people: list) -> list:
         offset = 0
         page_size = 1000
         while True:
-            faces_result = supabase_db.client.table("photo_faces").select(
+            faces_result = await execute(supabase_db.client.table("photo_faces").select(
                 "person_id, photo_id, verified, recognition_confidence, excluded_from_index"
-            ).not_.is_("insightface_descriptor", "null").range(offset, offset + page_size - 1).execute()
+            ).not_.is_("insightface_descriptor", "null").range(offset, offset + page_size - 1))
             
             batch = faces_result.data or []
             all_faces.extend(batch)
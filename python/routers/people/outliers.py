@@ -12,6 +12,8 @@ from uuid import UUID
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run, as_async
 
 from .helpers import get_supabase_db, get_face_service
 
@@ -19,11 +21,20 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
-def _get_person_id_from_uuid(supabase_db, person_uuid: UUID) -> str:
-    """Get person ID from UUID. Raises NotFoundError if not found."""
-    result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
-    if result.data and len(result.data) > 0:
-        return result.data[0]["id"]
+def _get_person_id_from_uuid(supabase_db, person_uuid: UUID, check_exists: bool = False) -> str:
+    """
+    Get person ID from UUID. Raises NotFoundError if not found.
+
+    Write endpoints pass check_exists=True: the people directory may still
+    hold a person deleted by another worker, and the write would fail on the FK.
+    """
+    if check_exists:
+        result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
+        person = result.data[0] if result.data else None
+    else:
+        person = get_people_directory().get(str(person_uuid))
+    if person:
+        return person["id"]
     raise NotFoundError("Person", str(person_uuid))
 
 
@@ -55,11 +66,7 @@ async def audit_all_embeddings(
         logger.info(f"[audit-all] Starting mass audit, threshold={outlier_threshold}, min_descriptors={min_descriptors}, dry_run={dry_run}")
         
         # Get all people
-        people_result = supabase_db.client.table("people").select(
-            "id, real_name, telegram_full_name"
-        ).execute()
-        
-        people = people_result.data or []
+        people = await as_async(get_people_directory()).all()
         logger.info(f"[audit-all] Processing {len(people)} people")
         
         # Load ALL photo_faces with embeddings
@@ -67,11 +74,11 @@ async def audit_all_embeddings(
         offset = 0
         page_size = 1000
         while True:
-            faces_result = supabase_db.client.table("photo_faces").select(
+            faces_result = await execute(supabase_db.client.table("photo_faces").select(
                 "id, person_id, insightface_descriptor, excluded_from_index"
             ).not_.is_("person_id", "null").not_.is_("insightface_descriptor", "null").range(
                 offset, offset + page_size - 1
-            ).execute()
+            ))
             
             batch = faces_result.data or []
             all_faces.extend(batch)
@@ -147,7 +154,7 @@ async def audit_all_embeddings(
             # Mark new outliers as excluded (unless dry_run)
             if new_outlier_ids:
                 if not dry_run:
-                    updated = supabase_db.set_excluded_from_index(new_outlier_ids, excluded=True)
+                    updated = await run(supabase_db.set_excluded_from_index, new_outlier_ids, excluded=True)
                     total_newly_excluded += updated
                     all_outlier_face_ids.extend(new_outlier_ids)
                 else:
@@ -201,14 +208,14 @@ async def clear_person_outliers(
     face_service = get_face_service()
     
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
         
         logger.info(f"[clear-outliers] Marking outliers for person {person_id}, threshold={outlier_threshold}")
         
         # Get all faces with embeddings for this person
-        result = supabase_db.client.table("photo_faces").select(
+        result = await execute(supabase_db.client.table("photo_faces").select(
             "id, insightface_descriptor, excluded_from_index"
-        ).eq("person_id", person_id).not_.is_("insightface_descriptor", "null").execute()
+        ).eq("person_id", person_id).not_.is_("insightface_descriptor", "null"))
         
         faces = result.data or []
         
@@ -271,7 +278,7 @@ async def clear_person_outliers(
             })
         
         # Mark as excluded (not delete!)
-        updated = supabase_db.set_excluded_from_index(outlier_face_ids, excluded=True)
+        updated = await run(supabase_db.set_excluded_from_index, outlier_face_ids, excluded=True)
 
         # Remove from index
         index_rebuilt = False
@@ -14,6 +14,8 @@ from uuid import UUID
 from core.responses import ApiResponse
 from core.exceptions import NotFoundError, DatabaseError
 from core.logging import get_logger
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute, run
 
 from .helpers import get_supabase_db, convert_bbox_to_array, get_face_service, get_person_id
 
@@ -26,11 +28,20 @@ class BatchVerifyRequest(BaseModel):
     photo_ids: List[str]
 
 
-def _get_person_id_from_uuid(supabase_db, person_uuid: UUID) -> str:
-    """Get person ID from UUID. Raises NotFoundError if not found."""
-    result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
-    if result.data and len(result.data) > 0:
-        return result.data[0]["id"]
+def _get_person_id_from_uuid(supabase_db, person_uuid: UUID, check_exists: bool = False) -> str:
+    """
+    Get person ID from UUID. Raises NotFoundError if not found.
+
+    Write endpoints pass check_exists=True: the people directory may still
+    hold a person deleted by another worker, and the write would fail on the FK.
+    """
+    if check_exists:
+        result = supabase_db.client.table("people").select("id").eq("id", str(person_uuid)).execute()
+        person = result.data[0] if result.data else None
+    else:
+        person = get_people_directory().get(str(person_uuid))
+    if person:
+        return person["id"]
     raise NotFoundError("Person", str(person_uuid))
 
 
@@ -48,20 +59,20 @@ async def get_person_photos(identifier: str):
     supabase_db = get_supabase_db()
 
     try:
-        person_id = _get_person_id_from_identifier(identifier)
+        person_id = await run(_get_person_id_from_identifier, identifier)
 
-        config = supabase_db.get_recognition_config()
+        config = await run(supabase_db.get_recognition_config)
         confidence_threshold = config.get('confidence_thresholds', {}).get('high_data', 0.6)
 
         # Include galleries join for title, shoot_date, sort_order
         # Added: original_url, file_size, width, height for lightbox display
         # Added: slug for SEO-friendly URLs
         # Filter: hidden_by_user = false (user can hide their own photos)
-        result = supabase_db.client.table("photo_faces").select(
+        result = await execute(supabase_db.client.table("photo_faces").select(
             "id, photo_id, verified, recognition_confidence, hidden_by_user, "
             "gallery_images!inner(id, slug, image_url, original_url, original_filename, file_size, width, height, gallery_id, created_at, "
             "galleries(id, slug, title, shoot_date, sort_order))"
-        ).eq("person_id", person_id).eq("hidden_by_user", False).or_(f"verified.eq.true,recognition_confidence.gte.{confidence_threshold}").execute()
+        ).eq("person_id", person_id).eq("hidden_by_user", False).or_(f"verified.eq.true,recognition_confidence.gte.{confidence_threshold}"))
         return ApiResponse.ok(result.data or [])
     except NotFoundError:
         raise
@@ -76,21 +87,20 @@ async def get_person_photos_with_details(identifier: UUID):
     supabase_db = get_supabase_db()
     
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier)
         
         logger.info(f"Getting photos with details for person {person_id}")
         
-        config = supabase_db.get_recognition_config()
+        config = await run(supabase_db.get_recognition_config)
         confidence_threshold = config.get('confidence_thresholds', {}).get('high_data', 0.6)
         
         # Получаем все photo_faces для этого человека (включая excluded_from_index, hidden_by_user)
-        photo_faces_result = supabase_db.client.table("photo_faces")\
+        photo_faces_result = await execute(supabase_db.client.table("photo_faces")\
             .select(
                 "id, photo_id, recognition_confidence, verified, insightface_bbox, person_id, excluded_from_index, hidden_by_user, "
                 "gallery_images(id, image_url, gallery_id, width, height, original_filename, galleries(shoot_date, title))"
             )\
-            .eq("person_id", person_id)\
-            .execute()
+            .eq("person_id", person_id))
         
         all_photo_faces = photo_faces_result.data or []
         
@@ -136,11 +146,10 @@ async def get_person_photos_with_details(identifier: UUID):
             return ApiResponse.ok([])
         
         # Получаем все лица для этих фото
-        all_faces_result = supabase_db.client.table("photo_faces")\
+        all_faces_result = await execute(supabase_db.client.table("photo_faces")\
             .select("id, photo_id, person_id, verified, recognition_confidence, people(real_name, telegram_full_name)")\
             .in_("photo_id", photo_ids)\
-            .or_(f"verified.eq.true,recognition_confidence.gte.{confidence_threshold}")\
-            .execute()
+            .or_(f"verified.eq.true,recognition_confidence.gte.{confidence_threshold}"))
         
         all_faces = all_faces_result.data or []
         
@@ -182,20 +191,19 @@ async def verify_person_on_photo(identifier: UUID, photo_id: str = Query(...)):
     supabase_db = get_supabase_db()
     
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
         
         logger.info(f"Verifying person {person_id} on photo {photo_id}")
         
         from datetime import datetime, timezone
-        result = supabase_db.client.table("photo_faces")\
+        result = await execute(supabase_db.client.table("photo_faces")\
             .update({
                 "verified": True,
                 "recognition_confidence": 1.0,
                 "verified_at": datetime.now(timezone.utc).isoformat(),
             })\
             .eq("photo_id", photo_id)\
-            .eq("person_id", person_id)\
-            .execute()
+            .eq("person_id", person_id))
         
         if result.data:
             logger.info(f"Person verified on photo successfully")
@@ -226,7 +234,7 @@ async def batch_verify_person_on_photos(identifier: UUID, request: BatchVerifyRe
     supabase_db = get_supabase_db()
     
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
         photo_ids = request.photo_ids
         
         if not photo_ids:
@@ -236,15 +244,14 @@ async def batch_verify_person_on_photos(identifier: UUID, request: BatchVerifyRe
         
         # Single UPDATE with IN clause - O(1) instead of O(n)
         from datetime import datetime, timezone
-        result = supabase_db.client.table("photo_faces")\
+        result = await execute(supabase_db.client.table("photo_faces")\
             .update({
                 "verified": True,
                 "recognition_confidence": 1.0,
                 "verified_at": datetime.now(timezone.utc).isoformat(),
             })\
             .in_("photo_id", photo_ids)\
-            .eq("person_id", person_id)\
-            .execute()
+            .eq("person_id", person_id))
         
         verified_count = len(result.data) if result.data else 0
         logger.info(f"Batch verified {verified_count} faces")
@@ -269,16 +276,15 @@ async def unlink_person_from_photo(identifier: UUID, photo_id: str = Query(...))
     supabase_db = get_supabase_db()
     
     try:
-        person_id = _get_person_id_from_uuid(supabase_db, identifier)
+        person_id = await run(_get_person_id_from_uuid, supabase_db, identifier, check_exists=True)
         
         logger.info(f"Unlinking person {person_id} from photo {photo_id}")
 
         # Get face_ids with descriptors before unlinking (for index removal)
-        faces_result = supabase_db.client.table("photo_faces")\
+        faces_result = await execute(supabase_db.client.table("photo_faces")\
             .select("id, insightface_descriptor")\
             .eq("photo_id", photo_id)\
-            .eq("person_id", person_id)\
-            .execute()
+            .eq("person_id", person_id))
 
         faces_data = faces_result.data or []
         face_ids_in_index = [f["id"] for f in faces_data if f.get("insightface_descriptor")]
@@ -286,7 +292,7 @@ async def unlink_person_from_photo(identifier: UUID, photo_id: str = Query(...))
         logger.info(f"Found {faces_count} faces to unlink, {len(face_ids_in_index)} in index")
 
         # Then update
-        supabase_db.client.table("photo_faces")\
+        await execute(supabase_db.client.table("photo_faces")\
             .update({
                 "person_id": None,
                 "verified": False,
@@ -295,8 +301,7 @@ async def unlink_person_from_photo(identifier: UUID, photo_id: str = Query(...))
                 "recognition_confidence": None
             })\
             .eq("photo_id", photo_id)\
-            .eq("person_id", person_id)\
-            .execute()
+            .eq("person_id", person_id))
 
         logger.info(f"Unlinked {faces_count} faces")
 
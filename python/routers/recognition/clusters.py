@@ -4,17 +4,20 @@ Face clustering endpoints.
 - POST /reject-face-cluster
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 from typing import List, Optional
 import numpy as np
-import hdbscan
 import json
 
 from core.config import VERSION
 from core.responses import ApiResponse
 from core.exceptions import ClusteringError
 from core.logging import get_logger
-from services.supabase import get_faces_repository, get_supabase_client
+from services.face_recognition import FaceRecognitionService
+from services.supabase import get_faces_repository
+from services.supabase.aio import run
+
+from .dependencies import get_face_service
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -61,7 +64,8 @@ def cluster_unknown_faces(
         
         embeddings_array = np.array(embeddings)
         
-        # Cluster with HDBSCAN
+        # Cluster with HDBSCAN (imported on first use - heavy)
+        import hdbscan
         clusterer = hdbscan.HDBSCAN(
             min_cluster_size=min_cluster_size,
             min_samples=1,
@@ -148,32 +152,43 @@ def cluster_unknown_faces(
 
 
 @router.post("/reject-face-cluster")
-def reject_face_cluster(
+async def reject_face_cluster(
     face_ids: List[str],
+    face_service: FaceRecognitionService = Depends(get_face_service),
 ):
     """
-    Delete a cluster of faces from photo_faces table.
+    Reject a cluster of faces (e.g. spectators).
     
-    NOTE: rejected_faces table exists but not used yet.
-    TODO: Implement spectator detection using rejected_faces in future.
+    v1.2.0: Set-based - descriptors saved to rejected_faces with one bulk insert,
+    faces deleted with one in_() delete, deleted faces removed from the players
+    index in one batch (no dangling labels until the next rebuild).
     
     Args:
-        face_ids: List of face IDs to delete
+        face_ids: List of face IDs to reject
     """
-    supabase_client = get_supabase_client()
+    faces_repo = get_faces_repository()
     try:
         logger.info(f"[v{VERSION}] ===== REJECT FACE CLUSTER =====")
         logger.info(f"[v{VERSION}] Face IDs to delete: {len(face_ids)}")
         
-        deleted_count = 0
-        for face_id in face_ids:
-            result = supabase_client.table("photo_faces").delete().eq("id", face_id).execute()
-            if result.data:
-                deleted_count += 1
+        result = await run(faces_repo.reject_faces, face_ids, reason="cluster_rejected")
+        
+        removed_from_index = 0
+        if result["indexed"]:
+            index_result = await face_service.remove_faces_from_index(result["indexed"])
+            removed_from_index = index_result.get("deleted", 0)
         
-        logger.info(f"[v{VERSION}] Successfully deleted {deleted_count} faces")
+        deleted_count = len(result["deleted"])
+        logger.info(
+            f"[v{VERSION}] Successfully deleted {deleted_count} faces, "
+            f"{result['rejected']} descriptors saved, {removed_from_index} removed from index"
+        )
         
-        return ApiResponse.ok({"deleted": deleted_count}).model_dump()
+        return ApiResponse.ok({
+            "deleted": deleted_count,
+            "rejected_descriptors": result["rejected"],
+            "removed_from_index": removed_from_index
+        }).model_dump()
         
     except Exception as e:
         logger.error(f"[v{VERSION}] ERROR rejecting cluster: {str(e)}", exc_info=True)
@@ -10,6 +10,10 @@ v2.0: all-faces-indexed architecture
 - regenerate-missing: add_faces_to_index (faces had no descriptor = weren't in index)
 - regenerate-single: remove + add (embedding changes, face might be in index)
 - regenerate-unknown: add_faces_to_index (faces had no descriptor = weren't in index)
+
+v3.0: Embedding-only fast path (no full-image detection + IoU matching)
+- Stored kps: aligned crop + recognition model only
+- No kps: detection on padded bbox region, kps saved for next time
 """
 
 from fastapi import APIRouter, Query, Depends
@@ -26,13 +30,25 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
+def _descriptor_update(result: dict) -> dict:
+    """Build photo_faces update from extract_embeddings() result"""
+    update = {
+        "insightface_descriptor": result["embedding"].tolist(),
+        "insightface_kps": result["kps"],
+    }
+    # kps path runs no detection - keep stored det_score/bbox
+    if result["det_score"] is not None:
+        update["insightface_det_score"] = result["det_score"]
+    return update
+
+
 @router.post("/regenerate-missing-descriptors")
 async def regenerate_missing_descriptors(
     face_service=Depends(get_face_service)
 ):
     """
     Regenerate insightface_descriptor for faces that were manually assigned to people.
-    Uses IoU matching to find the corresponding detected face.
+    Uses stored bbox/kps to compute the embedding (no full-image detection).
     """
     supabase_client = get_supabase_client()
     try:
@@ -40,7 +56,7 @@ async def regenerate_missing_descriptors(
         
         # Get faces with person_id but no descriptor
         missing_result = supabase_client.client.table("photo_faces").select(
-            "id, photo_id, person_id, insightface_bbox, people(real_name), gallery_images(image_url)"
+            "id, photo_id, person_id, insightface_bbox, insightface_kps, exif_oriented, people(real_name), gallery_images(image_url)"
         ).not_.is_("person_id", "null").is_("insightface_descriptor", "null").execute()
         
         missing_faces = missing_result.data or []
@@ -59,7 +75,7 @@ async def regenerate_missing_descriptors(
         details = []
         regenerated_face_ids = []  # Track for index sync
 
-        # Group by photo_id for efficient processing
+        # Group by photo_id - download each photo once
         faces_by_photo = {}
         for face in missing_faces:
             photo_id = face["photo_id"]
@@ -71,52 +87,36 @@ async def regenerate_missing_descriptors(
         
         for photo_id, photo_faces in faces_by_photo.items():
             try:
-                image_url = photo_faces[0].get("gallery_images", {}).get("image_url")
+                image_url = (photo_faces[0].get("gallery_images") or {}).get("image_url")
                 if not image_url:
                     for face in photo_faces:
                         failed += 1
                         details.append({"face_id": face["id"], "status": "error", "error": "No image URL"})
                     continue
                 
-                detected_faces = await face_service.detect_faces(image_url, apply_quality_filters=False)
+                extracted = await face_service.extract_embeddings(image_url, photo_faces)
                 
-                for missing_face in photo_faces:
+                for missing_face, result in zip(photo_faces, extracted):
                     try:
-                        manual_bbox = missing_face.get("insightface_bbox")
-                        if not manual_bbox:
+                        if not missing_face.get("insightface_bbox"):
                             failed += 1
                             details.append({"face_id": missing_face["id"], "status": "error", "error": "No bbox"})
                             continue
                         
-                        best_match = None
-                        best_iou = 0.0
-                        
-                        for detected_face in detected_faces:
-                            detected_bbox = {
-                                "x": float(detected_face["bbox"][0]),
-                                "y": float(detected_face["bbox"][1]),
-                                "width": float(detected_face["bbox"][2] - detected_face["bbox"][0]),
-                                "height": float(detected_face["bbox"][3] - detected_face["bbox"][1]),
-                            }
-                            iou = calculate_iou(manual_bbox, detected_bbox)
-                            if iou > best_iou:
-                                best_iou = iou
-                                best_match = detected_face
-                        
-                        if best_match and best_iou > 0.5:
-                            embedding = best_match["embedding"].tolist()
-                            supabase_client.client.table("photo_faces").update({
-                                "insightface_descriptor": embedding,
-                                "insightface_det_score": float(best_match["det_score"]),
-                            }).eq("id", missing_face["id"]).execute()
-
-                            regenerated += 1
-                            regenerated_face_ids.append(missing_face["id"])
-                            details.append({"face_id": missing_face["id"], "status": "success", "iou": round(best_iou, 3)})
-                            logger.info(f"[v{VERSION}] ✓ Regenerated {missing_face['id']} (IoU: {best_iou:.3f})")
-                        else:
+                        if result is None:
                             failed += 1
-                            details.append({"face_id": missing_face["id"], "status": "error", "error": f"No match (IoU: {best_iou:.3f})"})
+                            details.append({"face_id": missing_face["id"], "status": "error", "error": "No face in bbox region"})
+                            continue
+                        
+                        supabase_client.client.table("photo_faces").update(
+                            _descriptor_update(result)
+                        ).eq("id", missing_face["id"]).execute()
+
+                        iou = calculate_iou(missing_face["insightface_bbox"], result["bbox"])
+                        regenerated += 1
+                        regenerated_face_ids.append(missing_face["id"])
+                        details.append({"face_id": missing_face["id"], "status": "success", "iou": round(iou, 3)})
+                        logger.info(f"[v{VERSION}] ✓ Regenerated {missing_face['id']} ({result['method']})")
                     
                     except Exception as face_error:
                         failed += 1
@@ -161,7 +161,7 @@ async def regenerate_single_descriptor(
     supabase_client = get_supabase_client()
     try:
         face_result = supabase_client.client.table("photo_faces").select(
-            "id, photo_id, person_id, insightface_bbox, gallery_images(image_url)"
+            "id, photo_id, person_id, insightface_bbox, insightface_kps, insightface_det_score, exif_oriented, gallery_images(image_url)"
         ).eq("id", face_id).execute()
         
         if not face_result.data:
@@ -177,36 +177,18 @@ async def regenerate_single_descriptor(
         if not bbox:
             return ApiResponse.fail("No bbox stored", code="NO_BBOX").model_dump()
         
-        detected_faces = await face_service.detect_faces(image_url, apply_quality_filters=False)
-        
-        if not detected_faces:
-            return ApiResponse.fail("No faces detected on image", code="NO_FACES").model_dump()
-        
-        best_match = None
-        best_iou = 0.0
+        result = (await face_service.extract_embeddings(image_url, [face]))[0]
         
-        for detected_face in detected_faces:
-            detected_bbox = {
-                "x": float(detected_face["bbox"][0]),
-                "y": float(detected_face["bbox"][1]),
-                "width": float(detected_face["bbox"][2] - detected_face["bbox"][0]),
-                "height": float(detected_face["bbox"][3] - detected_face["bbox"][1]),
-            }
-            iou = calculate_iou(bbox, detected_bbox)
-            if iou > best_iou:
-                best_iou = iou
-                best_match = detected_face
+        if result is None:
+            return ApiResponse.fail("No face detected in bbox region", code="NO_FACES").model_dump()
         
-        if not best_match or best_iou < 0.3:
-            return ApiResponse.fail(f"No matching face (best IoU: {best_iou:.2f})", code="NO_MATCH").model_dump()
-        
-        embedding = best_match["embedding"].tolist()
-        supabase_client.client.table("photo_faces").update({
-            "insightface_descriptor": embedding,
-            "insightface_det_score": float(best_match["det_score"]),
-        }).eq("id", face_id).execute()
+        supabase_client.client.table("photo_faces").update(
+            _descriptor_update(result)
+        ).eq("id", face_id).execute()
 
-        logger.info(f"[v{VERSION}] ✓ Regenerated {face_id} (IoU: {best_iou:.2f})")
+        iou = calculate_iou(bbox, result["bbox"])
+        det_score = result["det_score"] if result["det_score"] is not None else face.get("insightface_det_score")
+        logger.info(f"[v{VERSION}] ✓ Regenerated {face_id} ({result['method']})")
 
         # v2.0: Embedding changed - remove old entry and add new one
         # (can't use update_metadata because embedding itself changed)
@@ -222,9 +204,10 @@ async def regenerate_single_descriptor(
             logger.error(f"[v{VERSION}] Failed to sync index: {idx_err}")
 
         return ApiResponse.ok({
-            "iou": round(best_iou, 2),
+            "iou": round(iou, 2),
+            "method": result["method"],
             "index_rebuilt": index_rebuilt,
-            "det_score": round(float(best_match["det_score"]), 2)
+            "det_score": round(float(det_score), 2) if det_score is not None else None
         }).model_dump()
         
     except FaceNotFoundError:
@@ -244,6 +227,7 @@ async def regenerate_unknown_descriptors(
     This fixes faces that were saved without descriptors during batch recognition.
 
     v2.0: Adds regenerated faces to index (all faces indexed).
+    v3.0: Faces grouped by photo, embedding computed from stored bbox/kps.
     """
     supabase_client = get_supabase_client()
     try:
@@ -260,7 +244,7 @@ async def regenerate_unknown_descriptors(
         logger.info(f"[v{VERSION}] Found {len(photo_ids)} photos in gallery")
 
         faces_response = supabase_client.client.table("photo_faces").select(
-            "id, photo_id, insightface_bbox, insightface_descriptor, gallery_images(id, image_url)"
+            "id, photo_id, insightface_bbox, insightface_kps, exif_oriented, insightface_descriptor, gallery_images(id, image_url)"
         ).in_("photo_id", photo_ids).is_("person_id", "null").execute()
 
         if not faces_response.data:
@@ -275,11 +259,10 @@ async def regenerate_unknown_descriptors(
 
         logger.info(f"[v{VERSION}] Found {total_faces} unknown faces, checking descriptors...")
 
+        # Group faces needing a descriptor by photo - download each photo once
+        faces_by_photo = {}
         for face in faces_response.data:
-            face_id = face["id"]
-            photo_data = face.get("gallery_images")
-
-            if not photo_data:
+            if not face.get("gallery_images"):
                 failed += 1
                 continue
 
@@ -287,55 +270,39 @@ async def regenerate_unknown_descriptors(
                 already_had_descriptor += 1
                 continue
 
-            bbox = face.get("insightface_bbox")
-            if not bbox:
+            if not face.get("insightface_bbox"):
                 failed += 1
                 continue
 
-            try:
-                image_url = photo_data["image_url"]
-                detected_faces = await face_service.detect_faces(image_url)
+            faces_by_photo.setdefault(face["photo_id"], []).append(face)
 
-                if not detected_faces:
-                    failed += 1
-                    continue
+        for photo_id, photo_faces in faces_by_photo.items():
+            try:
+                image_url = photo_faces[0]["gallery_images"]["image_url"]
+                extracted = await face_service.extract_embeddings(image_url, photo_faces)
+            except Exception as e:
+                logger.error(f"[v{VERSION}] Error loading photo {photo_id}: {str(e)}")
+                failed += len(photo_faces)
+                continue
 
-                best_match = None
-                best_iou = 0.0
-
-                for detected_face in detected_faces:
-                    detected_bbox = {
-                        "x": float(detected_face["bbox"][0]),
-                        "y": float(detected_face["bbox"][1]),
-                        "width": float(detected_face["bbox"][2] - detected_face["bbox"][0]),
-                        "height": float(detected_face["bbox"][3] - detected_face["bbox"][1]),
-                    }
-                    iou = calculate_iou(bbox, detected_bbox)
-                    if iou > best_iou:
-                        best_iou = iou
-                        best_match = detected_face
-
-                if best_match and best_iou > 0.3:
-                    descriptor = best_match["embedding"]
-                    if len(descriptor) != 512:
+            for face, result in zip(photo_faces, extracted):
+                face_id = face["id"]
+                try:
+                    if result is None or len(result["embedding"]) != 512:
                         failed += 1
                         continue
 
-                    descriptor_str = f"[{','.join(map(str, descriptor))}]"
-                    supabase_client.client.table("photo_faces").update({
-                        "insightface_descriptor": descriptor_str,
-                        "insightface_det_score": float(best_match["det_score"])
-                    }).eq("id", face_id).execute()
+                    supabase_client.client.table("photo_faces").update(
+                        _descriptor_update(result)
+                    ).eq("id", face_id).execute()
 
                     regenerated += 1
                     regenerated_face_ids.append(face_id)  # v2.0: Track for index
-                    logger.info(f"[v{VERSION}] ✓ Regenerated {face_id} (IoU: {best_iou:.2f})")
-                else:
-                    failed += 1
+                    logger.info(f"[v{VERSION}] ✓ Regenerated {face_id} ({result['method']})")
 
-            except Exception as e:
-                logger.error(f"[v{VERSION}] Error regenerating {face_id}: {str(e)}")
-                failed += 1
+                except Exception as e:
+                    logger.error(f"[v{VERSION}] Error regenerating {face_id}: {str(e)}")
+                    failed += 1
 
         logger.info(f"[v{VERSION}] ===== REGENERATION COMPLETE =====")
         logger.info(f"[v{VERSION}] Total: {total_faces}, Already had: {already_had_descriptor}, Regenerated: {regenerated}, Failed: {failed}")
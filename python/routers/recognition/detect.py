@@ -21,96 +21,91 @@ v3.0: all-faces-indexed architecture
       - ALL faces added to index (not just those with person_id)
       - Use update_face_metadata() when person_id changes
       - Skip excluded faces in top_matches
+v3.1: 5-point landmarks (insightface_kps) persisted with each face
+      for embedding-only descriptor regeneration
+v3.2: CASE 1 detects on the detection-size image derivative (coordinates
+      scaled back to the original)
+v3.3: Round-trip-minimal process-photo: one config read, one batched
+      recognition (recognize_faces), one bulk insert/upsert, one people lookup;
+      CASE 2 response built without reloading faces
+v3.4: CASE 1 (with quality filters) drops faces matching rejected clusters
+      (spectators) via the in-memory RejectedFacesIndex
+v3.5: Person names from the in-memory PeopleDirectory (no people query)
+v3.6: blur_score measured on the original even when detecting on the derivative
+v3.7: CASE 2 writes results with a bulk UPDATE (deleted faces are not re-created)
+v3.8: All database calls run in the Supabase pool (services/supabase/aio.py)
 """
 
 from fastapi import APIRouter, Depends
+from typing import Dict, List, Optional
+import asyncio
 import numpy as np
 import json
 
-from core.config import VERSION
+from core.config import VERSION, settings
 from core.responses import ApiResponse
 from core.exceptions import DetectionError, PhotoNotFoundError
 from core.logging import get_logger
+from services.image_derivatives import detection_source
+from services.people_directory import get_people_directory
+from services.rejected_faces_index import get_rejected_faces_index
+from services.supabase import get_faces_repository
+from services.supabase.aio import execute, run, as_async
 from .dependencies import get_face_service, get_supabase_client
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
-def _get_face_metrics(face_service, supabase_client, embedding: np.ndarray):
-    """
-    Helper function to get distance_to_nearest and top_matches from HNSW index.
+def _parse_embedding(descriptor) -> Optional[np.ndarray]:
+    """Descriptor from DB (JSON string or list) -> float32 array."""
+    if isinstance(descriptor, str):
+        return np.array(json.loads(descriptor), dtype=np.float32)
+    if isinstance(descriptor, list):
+        return np.array(descriptor, dtype=np.float32)
+    return None
 
-    v3.0: Skips faces without person_id or with excluded=True in top_matches.
 
-    Returns:
-        tuple: (distance_to_nearest, top_matches)
-        top_matches includes source_verified and source_confidence for UI display
+PERSON_FIELDS = ("id", "real_name", "telegram_full_name")
+
+
+async def _load_people(person_ids) -> Dict[str, Dict]:
     """
-    distance_to_nearest = None
-    top_matches = []
+    People for all person_ids of a photo (saved faces + candidates), from the directory.
 
-    # Use the wrapped index which has query() method with verified/confidence info
-    index = getattr(face_service, '_players_index', None)
-    if index is None or not index.is_loaded():
-        return distance_to_nearest, top_matches
+    Entries are projected to PERSON_FIELDS (the response shape of the former
+    people query), not the full directory entry.
 
+    Returns:
+        Dict person_id -> {id, real_name, telegram_full_name}
+    """
     try:
-        # v3.0: Query more candidates to account for skipped ones
-        k = min(10, index.get_count())
-        person_ids, similarities, verified_flags, source_confidences, excluded_flags = index.query(embedding, k=k)
-
-        if not person_ids:
-            return distance_to_nearest, top_matches
-
-        # Distance to nearest (first valid result)
-        for i, (pid, sim, excluded) in enumerate(zip(person_ids, similarities, excluded_flags)):
-            if pid is not None and not excluded:
-                distance_to_nearest = 1.0 - sim
-                break
-
-        # Build top_matches with verified/confidence info
-        # v3.0: Skip faces without person_id or excluded
-        # v6.1.2: Batch query people names to fix N+1 (P3)
-
-        # First, collect valid candidates
-        valid_candidates = []
-        for i, (person_id, similarity, is_verified, source_conf, is_excluded) in enumerate(
-            zip(person_ids, similarities, verified_flags, source_confidences, excluded_flags)
-        ):
-            if person_id is None or is_excluded:
-                continue
-            if len(valid_candidates) >= 3:
-                break
-            valid_candidates.append({
-                "person_id": person_id,
-                "similarity": float(similarity),
-                "source_verified": is_verified,
-                "source_confidence": float(source_conf)
-            })
+        people = await as_async(get_people_directory()).get_many(person_ids)
+        return {
+            person_id: {field: person.get(field) for field in PERSON_FIELDS}
+            for person_id, person in people.items()
+        }
+    except Exception as e:
+        logger.warning(f"Could not load people: {str(e)}")
+        return {}
 
-        # Batch query all person names at once
-        if valid_candidates:
-            unique_person_ids = list(set(c["person_id"] for c in valid_candidates))
-            people_response = supabase_client.client.table("people").select(
-                "id, real_name"
-            ).in_("id", unique_person_ids).execute()
-
-            person_names = {p["id"]: p.get("real_name", "Unknown") for p in (people_response.data or [])}
-
-            for candidate in valid_candidates:
-                top_matches.append({
-                    "person_id": candidate["person_id"],
-                    "name": person_names.get(candidate["person_id"], "Unknown"),
-                    "similarity": candidate["similarity"],
-                    "source_verified": candidate["source_verified"],
-                    "source_confidence": candidate["source_confidence"]
-                })
 
-    except Exception as e:
-        logger.warning(f"Could not get face metrics: {str(e)}")
+def _candidate_ids(recognitions: List[Dict]) -> List[str]:
+    return [m["person_id"] for rec in recognitions for m in rec["top_matches"]]
+
 
-    return distance_to_nearest, top_matches
+def _named_matches(top_matches: List[Dict], people: Dict[str, Dict]) -> List[Dict]:
+    """top_matches from recognize_faces() with person names for the UI."""
+    return [
+        {
+            "person_id": match["person_id"],
+            "name": (people.get(match["person_id"]) or {}).get("real_name") or "Unknown",
+            "similarity": match["similarity"],
+            "source_verified": match["source_verified"],
+            "source_confidence": match["source_confidence"]
+        }
+        for match in top_matches
+    ]
 
 
 @router.post("/detect-faces")
@@ -142,14 +137,14 @@ async def detect_faces(
         
         logger.info(f"[v{VERSION}] Detected {len(detected_faces)} faces")
         
+        # One index query for all faces (only metrics are used here - no threshold)
+        recognitions = await face_service.recognize_faces(
+            [face["embedding"] for face in detected_faces], confidence_threshold=0.0
+        )
+        people = await _load_people(_candidate_ids(recognitions))
+        
         faces_data = []
-        for idx, face in enumerate(detected_faces):
-            embedding = face["embedding"]
-
-            # v6.1.2: Removed unused recognize_face call (P3)
-            # Recognition is done via _get_face_metrics which returns top_matches
-            distance_to_nearest, top_matches = _get_face_metrics(face_service, supabase_client, embedding)
-            
+        for face, recognition in zip(detected_faces, recognitions):
             face_data = {
                 "insightface_bbox": {
                     "x": float(face["bbox"][0]),
@@ -158,10 +153,11 @@ async def detect_faces(
                     "height": float(face["bbox"][3] - face["bbox"][1]),
                 },
                 "insightface_det_score": float(face["det_score"]),
+                "insightface_kps": face["kps"].tolist() if face.get("kps") is not None else None,
                 "blur_score": float(face.get("blur_score", 0)),
                 "embedding": face["embedding"].tolist(),
-                "distance_to_nearest": distance_to_nearest,
-                "top_matches": top_matches,
+                "distance_to_nearest": recognition["distance_to_nearest"],
+                "top_matches": _named_matches(recognition["top_matches"], people),
             }
             faces_data.append(face_data)
         
@@ -202,8 +198,8 @@ async def process_photo(
         req_min_face_size = request.get("min_face_size")
         req_min_blur_score = request.get("min_blur_score")
 
-        # Load config from DB (sync method - no await)
-        config = supabase_client.get_recognition_config()
+        # Load config (cached; DB read runs in the Supabase pool)
+        config = await run(supabase_client.get_recognition_config)
         quality_filters_config = config.get('quality_filters', {})
         db_confidence_threshold = config.get('confidence_thresholds', {}).get('high_data', 0.60)
         
@@ -229,13 +225,10 @@ async def process_photo(
             logger.info(f"[v{VERSION}] Quality filters: det={local_min_detection_score}, size={local_min_face_size}, blur={local_min_blur_score}")
         
         if force_redetect:
-            logger.info(f"[v{VERSION}] Force redetect - getting face IDs before deletion")
-            # Get face IDs BEFORE deleting (for index cleanup)
-            existing_for_delete = supabase_client.client.table("photo_faces").select("id").eq("photo_id", photo_id).execute()
-            face_ids_to_remove = [f["id"] for f in (existing_for_delete.data or [])]
-
-            # Delete from DB
-            supabase_client.client.table("photo_faces").delete().eq("photo_id", photo_id).execute()
+            logger.info(f"[v{VERSION}] Force redetect - deleting existing faces")
+            # Deleted rows are returned - their IDs are used for index cleanup
+            deleted = await execute(supabase_client.client.table("photo_faces").delete().eq("photo_id", photo_id))
+            face_ids_to_remove = [f["id"] for f in (deleted.data or [])]
             logger.info(f"[v{VERSION}] Deleted {len(face_ids_to_remove)} faces from DB")
 
             # Remove from index
@@ -246,9 +239,9 @@ async def process_photo(
                 except Exception as idx_err:
                     logger.error(f"[v{VERSION}] Failed to remove from index: {idx_err}")
         
-        existing_result = supabase_client.client.table("photo_faces").select(
+        existing_result = await execute(supabase_client.client.table("photo_faces").select(
             "id, person_id, recognition_confidence, verified, insightface_bbox, insightface_det_score, insightface_descriptor, blur_score"
-        ).eq("photo_id", photo_id).execute()
+        ).eq("photo_id", photo_id))
         
         existing_faces = existing_result.data or []
         logger.info(f"[v{VERSION}] Found {len(existing_faces)} existing faces in DB")
@@ -259,40 +252,43 @@ async def process_photo(
         if len(existing_faces) == 0:
             logger.info(f"[v{VERSION}] Case 1: New photo - detecting faces")
             
-            photo_response = supabase_client.client.table("gallery_images").select("image_url").eq("id", photo_id).execute()
+            photo_response = await execute(supabase_client.client.table("gallery_images").select("image_url, derivatives").eq("id", photo_id))
             if not photo_response.data or len(photo_response.data) == 0:
                 raise PhotoNotFoundError(photo_id)
             
-            image_url = photo_response.data[0]["image_url"]
+            # v3.2: detect on the detection-size derivative when it exists
+            detection_url, coordinate_scale = detection_source(photo_response.data[0])
             
             detected_faces = await face_service.detect_faces(
-                image_url,
+                detection_url,
                 apply_quality_filters=apply_quality_filters,
                 min_detection_score=local_min_detection_score,
                 min_face_size=local_min_face_size,
-                min_blur_score=local_min_blur_score
+                min_blur_score=local_min_blur_score,
+                coordinate_scale=coordinate_scale,
+                original_url=photo_response.data[0]["image_url"]
             )
             logger.info(f"[v{VERSION}] Detected {len(detected_faces)} faces")
             
-            saved_faces = []
-            face_metrics = {}
+            # v3.4: drop spectators (faces matching rejected clusters), one batch query
+            if apply_quality_filters and settings.reject_spectators_enabled and detected_faces:
+                detected_faces, rejected = await asyncio.to_thread(
+                    get_rejected_faces_index().split, detected_faces
+                )
+                if rejected:
+                    logger.info(f"[v{VERSION}] Dropped {len(rejected)} faces matching rejected clusters")
             
-            for idx, face in enumerate(detected_faces):
+            # v3.3: one batched recognition for all faces (search_threshold finds candidates)
+            recognitions = await face_service.recognize_faces(
+                [face["embedding"] for face in detected_faces],
+                confidence_threshold=search_threshold
+            )
+            
+            rows = []
+            for idx, (face, recognition) in enumerate(zip(detected_faces, recognitions)):
                 embedding = face["embedding"]
-                bbox = {
-                    "x": float(face["bbox"][0]),
-                    "y": float(face["bbox"][1]),
-                    "width": float(face["bbox"][2] - face["bbox"][0]),
-                    "height": float(face["bbox"][3] - face["bbox"][1]),
-                }
-                det_score = float(face["det_score"])
-                blur_score = float(face.get("blur_score", 0))
-                
-                # Use search_threshold to find candidates
-                person_id, rec_confidence = await face_service.recognize_face(
-                    embedding, 
-                    confidence_threshold=search_threshold
-                )
+                person_id = recognition["person_id"]
+                rec_confidence = recognition["confidence"]
                 
                 # v2.3: Only save person_id if confidence >= save_threshold
                 # Boxes are always saved, but person_id only if high confidence
@@ -306,29 +302,28 @@ async def process_photo(
                     conf_str = f"{rec_confidence:.3f}" if rec_confidence else "None"
                     logger.info(f"[v{VERSION}] Face {idx+1}: person_id=None (found={person_id[:8] if person_id else 'None'}..., conf={conf_str} < {save_threshold})")
                 
-                distance_to_nearest, top_matches = _get_face_metrics(face_service, supabase_client, embedding)
-                
-                insert_data = {
+                rows.append({
                     "photo_id": photo_id,
                     "person_id": save_person_id,
-                    "insightface_bbox": bbox,
-                    "insightface_det_score": det_score,
-                    "blur_score": blur_score,
+                    "insightface_bbox": {
+                        "x": float(face["bbox"][0]),
+                        "y": float(face["bbox"][1]),
+                        "width": float(face["bbox"][2] - face["bbox"][0]),
+                        "height": float(face["bbox"][3] - face["bbox"][1]),
+                    },
+                    "insightface_det_score": float(face["det_score"]),
+                    "insightface_kps": face["kps"].tolist() if face.get("kps") is not None else None,
+                    "blur_score": float(face.get("blur_score", 0)),
                     "recognition_confidence": save_confidence,
                     "verified": False,
                     "insightface_descriptor": f"[{','.join(map(str, embedding.tolist()))}]",
-                }
-                
-                save_response = supabase_client.client.table("photo_faces").insert(insert_data).execute()
-                
-                if save_response.data:
-                    saved_face = save_response.data[0]
-                    saved_faces.append(saved_face)
-                    face_metrics[saved_face['id']] = {
-                        "blur_score": blur_score,
-                        "distance_to_nearest": distance_to_nearest,
-                        "top_matches": top_matches,
-                    }
+                })
+            
+            # Single bulk insert (rows come back in insertion order)
+            saved_faces = []
+            if rows:
+                save_response = await execute(supabase_client.client.table("photo_faces").insert(rows))
+                saved_faces = save_response.data or []
             
             logger.info(f"[v{VERSION}] Saved {len(saved_faces)} faces")
 
@@ -344,15 +339,13 @@ async def process_photo(
                 except Exception as idx_err:
                     logger.error(f"[v{VERSION}] Failed to add to index: {idx_err}")
 
+            # One people lookup for saved persons and all candidates
+            people = await _load_people(
+                [face["person_id"] for face in saved_faces] + _candidate_ids(recognitions)
+            )
+            
             response_faces = []
-            for face in saved_faces:
-                if face["person_id"]:
-                    person_response = supabase_client.client.table("people").select("id, real_name, telegram_full_name").eq("id", face["person_id"]).execute()
-                    person_data = person_response.data[0] if person_response.data else None
-                else:
-                    person_data = None
-                
-                metrics = face_metrics.get(face["id"], {})
+            for face, recognition in zip(saved_faces, recognitions):
                 response_faces.append({
                     "id": face["id"],
                     "person_id": face["person_id"],
@@ -360,10 +353,10 @@ async def process_photo(
                     "verified": face["verified"],
                     "insightface_bbox": face["insightface_bbox"],
                     "insightface_det_score": face.get("insightface_det_score"),
-                    "blur_score": face.get("blur_score") or metrics.get("blur_score"),
-                    "distance_to_nearest": metrics.get("distance_to_nearest"),
-                    "top_matches": metrics.get("top_matches", []),
-                    "people": person_data,
+                    "blur_score": face.get("blur_score"),
+                    "distance_to_nearest": recognition["distance_to_nearest"],
+                    "top_matches": _named_matches(recognition["top_matches"], people),
+                    "people": people.get(face["person_id"]) if face["person_id"] else None,
                     "index_rebuilt": index_rebuilt,
                 })
             
@@ -379,81 +372,80 @@ async def process_photo(
         # ========================================================================
         logger.info(f"[v{VERSION}] Case 2: Existing faces - recognizing unverified")
 
-        face_metrics = {}
-        recognized_count = 0
-
+        # v3.3: one batched recognition for all faces with descriptors
+        faces_with_embeddings = []
+        embeddings = []
         for face in existing_faces:
-            face_id = face["id"]
-            descriptor = face.get("insightface_descriptor")
-
-            if not descriptor:
-                continue
-
-            # Parse embedding
-            if isinstance(descriptor, str):
-                embedding = np.array(json.loads(descriptor), dtype=np.float32)
-            elif isinstance(descriptor, list):
-                embedding = np.array(descriptor, dtype=np.float32)
-            else:
+            embedding = _parse_embedding(face.get("insightface_descriptor"))
+            if embedding is not None:
+                faces_with_embeddings.append(face)
+                embeddings.append(embedding)
+
+        recognitions = await face_service.recognize_faces(embeddings, confidence_threshold=search_threshold)
+        face_metrics = {
+            face["id"]: recognition
+            for face, recognition in zip(faces_with_embeddings, recognitions)
+        }
+
+        # v2.3: Recognize unverified faces, but only save if >= save_threshold
+        updates = []
+        for face, recognition in zip(faces_with_embeddings, recognitions):
+            person_id = recognition["person_id"]
+            rec_confidence = recognition["confidence"]
+            if face.get("verified") or not (person_id and rec_confidence and rec_confidence >= save_threshold):
                 continue
 
-            # Get metrics for all faces
-            distance_to_nearest, top_matches = _get_face_metrics(face_service, supabase_client, embedding)
-            face_metrics[face_id] = {
-                "distance_to_nearest": distance_to_nearest,
-                "top_matches": top_matches,
-            }
+            # Update if new match or better confidence
+            if person_id != face.get("person_id") or rec_confidence > (face.get("recognition_confidence") or 0):
+                face["person_id"] = person_id
+                face["recognition_confidence"] = rec_confidence
+                updates.append({
+                    "id": face["id"],
+                    "person_id": person_id,
+                    "recognition_confidence": rec_confidence
+                })
+                logger.info(f"[v{VERSION}] Recognized face {face['id'][:8]}: person={person_id[:8]}, confidence={rec_confidence:.3f}")
 
-            # v2.3: Recognize unverified faces, but only save if >= save_threshold
-            if not face.get("verified"):
-                person_id, rec_confidence = await face_service.recognize_face(
-                    embedding,
-                    confidence_threshold=search_threshold
-                )
+        if updates:
+            # Single bulk update for all changed faces (never re-creates deleted faces)
+            await run(get_faces_repository().update_recognition_results, updates)
 
-                # Only update DB if confidence >= save_threshold
-                if person_id and rec_confidence and rec_confidence >= save_threshold:
-                    old_person_id = face.get("person_id")
-                    old_confidence = face.get("recognition_confidence") or 0
-
-                    # Update if new match or better confidence
-                    if person_id != old_person_id or rec_confidence > old_confidence:
-                        supabase_client.client.table("photo_faces").update({
-                            "person_id": person_id,
-                            "recognition_confidence": rec_confidence
-                        }).eq("id", face_id).execute()
-
-                        # v3.0: Update index metadata (face already in index (all faces indexed))
-                        try:
-                            await face_service.update_face_metadata(
-                                face_id,
-                                person_id=person_id,
-                                confidence=rec_confidence
-                            )
-                        except Exception as idx_err:
-                            logger.warning(f"[v{VERSION}] Failed to update metadata for {face_id[:8]}: {idx_err}")
-
-                        recognized_count += 1
-                        logger.info(f"[v{VERSION}] Recognized face {face_id[:8]}: person={person_id[:8]}, confidence={rec_confidence:.3f}")
+            # v3.0: Update index metadata (faces already in index (all faces indexed))
+            for update in updates:
+                try:
+                    await face_service.update_face_metadata(
+                        update["id"],
+                        person_id=update["person_id"],
+                        confidence=update["recognition_confidence"]
+                    )
+                except Exception as idx_err:
+                    logger.warning(f"[v{VERSION}] Failed to update metadata for {update['id'][:8]}: {idx_err}")
 
+        recognized_count = len(updates)
         logger.info(f"[v{VERSION}] Recognized {recognized_count} unverified faces")
 
         # v3.0: No need for index_rebuilt flag - update_metadata doesn't trigger rebuild
         index_rebuilt = False
         
-        # Reload faces after potential updates
-        final_result = supabase_client.client.table("photo_faces").select(
-            "id, person_id, recognition_confidence, verified, insightface_bbox, insightface_det_score, blur_score, people(id, real_name, telegram_full_name)"
-        ).eq("photo_id", photo_id).execute()
+        # Response from loaded rows + applied updates (no reload)
+        people = await _load_people(
+            [face.get("person_id") for face in existing_faces] + _candidate_ids(recognitions)
+        )
         
         response_faces = []
-        for face in (final_result.data or []):
+        for face in existing_faces:
             metrics = face_metrics.get(face["id"], {})
             response_faces.append({
-                **face,
-                "blur_score": face.get("blur_score") or metrics.get("blur_score"),
+                "id": face["id"],
+                "person_id": face.get("person_id"),
+                "recognition_confidence": face.get("recognition_confidence"),
+                "verified": face.get("verified"),
+                "insightface_bbox": face.get("insightface_bbox"),
+                "insightface_det_score": face.get("insightface_det_score"),
+                "blur_score": face.get("blur_score"),
+                "people": people.get(face["person_id"]) if face.get("person_id") else None,
                 "distance_to_nearest": metrics.get("distance_to_nearest"),
-                "top_matches": metrics.get("top_matches", []),
+                "top_matches": _named_matches(metrics.get("top_matches", []), people),
                 "index_rebuilt": index_rebuilt,
             })
         
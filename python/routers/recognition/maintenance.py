@@ -2,6 +2,8 @@
 Maintenance endpoints for face recognition system.
 - POST /rebuild-index
 - GET /index-status
+- GET /cache-stats
+- GET /processing-queue
 - GET /index-debug-person
 - GET /debug-recognition
 """
@@ -105,6 +107,41 @@ async def get_index_status(
         return ApiResponse.fail(str(e), code="INDEX_ERROR").model_dump()
 
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Photo and detection cache statistics (size, hit/miss).
+    """
+    from infrastructure.storage import get_photo_cache
+    from infrastructure.detection_cache import get_detection_cache
+
+    return ApiResponse.ok({
+        "photos": get_photo_cache().get_stats(),
+        "detections": get_detection_cache().get_stats()
+    }).model_dump()
+
+
+@router.get("/processing-queue")
+async def get_processing_queue_status():
+    """
+    Background photo processing queue: job counts per status.
+    """
+    from services.supabase import get_processing_queue_repository
+    from services.supabase.aio import run
+    from services.photo_processing import get_photo_processing_worker
+
+    try:
+        counts = await run(get_processing_queue_repository().get_status_counts)
+    except Exception as e:
+        logger.error(f"Error getting queue status: {e}")
+        return ApiResponse.fail(str(e), code="QUEUE_ERROR").model_dump()
+
+    return ApiResponse.ok({
+        "worker_running": get_photo_processing_worker() is not None,
+        **counts
+    }).model_dump()
+
+
 @router.get("/index-debug-person")
 async def get_index_debug_person(
     person_id: str = Query(..., description="Person ID to debug"),
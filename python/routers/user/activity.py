@@ -18,6 +18,7 @@ from core.responses import ApiResponse
 from core.exceptions import DatabaseError
 from core.logging import get_logger
 from services.supabase.base import get_supabase_client
+from services.supabase.aio import execute
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -49,12 +50,11 @@ async def get_user_activity(
 
     try:
         # 1. User actions from user_activity table
-        user_actions = supabase.table("user_activity")\
+        user_actions = await execute(supabase.table("user_activity")\
             .select("id, activity_type, image_id, gallery_id, metadata, created_at")\
             .eq("person_id", person_id)\
             .order("created_at", desc=True)\
-            .limit(limit)\
-            .execute()
+            .limit(limit))
 
         for action in (user_actions.data or []):
             activities.append({
@@ -67,15 +67,14 @@ async def get_user_activity(
 
         # 2. New photos with user (grouped by gallery and date)
         # Get recent photo_faces, group by gallery
-        new_photos = supabase.table("photo_faces")\
+        new_photos = await execute(supabase.table("photo_faces")\
             .select(
                 "id, created_at, photo_id, "
                 "gallery_images!inner(id, slug, gallery_id, galleries(id, slug, title))"
             )\
             .eq("person_id", person_id)\
             .order("created_at", desc=True)\
-            .limit(200)\
-            .execute()
+            .limit(200))
 
         # Group by gallery_id and date (day)
         gallery_groups = {}
@@ -117,15 +116,14 @@ async def get_user_activity(
         comments_data = []
         try:
             # Fallback: get photo_ids for this person, then get comments
-            person_photos = supabase.table("photo_faces")\
+            person_photos = await execute(supabase.table("photo_faces")\
                 .select("photo_id")\
-                .eq("person_id", person_id)\
-                .execute()
+                .eq("person_id", person_id))
 
             photo_ids = [p["photo_id"] for p in (person_photos.data or [])]
 
             if photo_ids:
-                comments = supabase.table("comments")\
+                comments = await execute(supabase.table("comments")\
                     .select(
                         "id, content, created_at, user_id, gallery_image_id, "
                         "users(first_name, username), "
@@ -133,8 +131,7 @@ async def get_user_activity(
                     )\
                     .in_("gallery_image_id", photo_ids)\
                     .order("created_at", desc=True)\
-                    .limit(limit)\
-                    .execute()
+                    .limit(limit))
 
                 for comment in (comments.data or []):
                     # Skip own comments
@@ -162,15 +159,14 @@ async def get_user_activity(
 
         # 4. User's favorites
         if user_id:
-            favorites = supabase.table("favorites")\
+            favorites = await execute(supabase.table("favorites")\
                 .select(
                     "id, created_at, gallery_image_id, "
                     "gallery_images(slug, original_filename, galleries(title, slug))"
                 )\
                 .eq("user_id", user_id)\
                 .order("created_at", desc=True)\
-                .limit(limit)\
-                .execute()
+                .limit(limit))
 
             for fav in (favorites.data or []):
                 gi = fav.get("gallery_images") or {}
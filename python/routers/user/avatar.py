@@ -10,6 +10,8 @@ from core.responses import ApiResponse
 from core.logging import get_logger
 from core.slug import to_slug
 from infrastructure.minio_storage import get_minio_storage
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute
 
 
 def get_supabase_client():
@@ -55,9 +57,9 @@ async def update_user_avatar(
             raise HTTPException(400, "Invalid person_id format")
 
         # Get person data (including current avatar)
-        result = supabase.table("people").select(
+        result = await execute(supabase.table("people").select(
             "id, real_name, avatar_url"
-        ).eq("id", person_id).execute()
+        ).eq("id", person_id))
 
         if not result.data:
             raise HTTPException(404, "Person not found")
@@ -105,9 +107,10 @@ async def update_user_avatar(
         new_avatar_url = upload_result["url"]
 
         # Update person.avatar_url
-        supabase.table("people").update({
+        await execute(supabase.table("people").update({
             "avatar_url": new_avatar_url
-        }).eq("id", person_id).execute()
+        }).eq("id", person_id))
+        get_people_directory().invalidate(person_id)
 
         logger.info(f"Updated avatar for person {person_id}: {new_avatar_url}")
 
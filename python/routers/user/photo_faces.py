@@ -18,6 +18,8 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from core.logging import get_logger
 from core.responses import ApiResponse
 from infrastructure.supabase import get_supabase_client
+from services.activity_log import get_activity_log
+from services.supabase.aio import execute, run
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -65,30 +67,24 @@ def get_photo_face_with_image(db, photo_face_id: str) -> dict:
 
 
 def log_user_activity(db, person_id: str, activity_type: str, image_id: str, gallery_id: str, metadata: dict) -> None:
-    """Log to user_activity table (fire-and-forget)."""
-    try:
-        db.table("user_activity").insert({
-            "person_id": person_id,
-            "activity_type": activity_type,
-            "image_id": image_id,
-            "gallery_id": gallery_id,
-            "metadata": metadata,
-        }).execute()
-    except Exception as e:
-        logger.warning(f"Failed to log user activity: {e}")
+    """Log to user_activity table (buffered, written in background)."""
+    get_activity_log().add("user_activity", {
+        "person_id": person_id,
+        "activity_type": activity_type,
+        "image_id": image_id,
+        "gallery_id": gallery_id,
+        "metadata": metadata,
+    })
 
 
 def log_admin_activity(db, event_type: str, user_id: str, person_id: str, metadata: dict) -> None:
-    """Log to admin_activity table (fire-and-forget)."""
-    try:
-        db.table("admin_activity").insert({
-            "event_type": event_type,
-            "user_id": user_id,
-            "person_id": person_id,
-            "metadata": metadata,
-        }).execute()
-    except Exception as e:
-        logger.warning(f"Failed to log admin activity: {e}")
+    """Log to admin_activity table (buffered, written in background)."""
+    get_activity_log().add("admin_activity", {
+        "event_type": event_type,
+        "user_id": user_id,
+        "person_id": person_id,
+        "metadata": metadata,
+    })
 
 
 # =============================================================================
@@ -108,18 +104,18 @@ async def verify_photo_face(
     """
     db = get_supabase_client().client
 
-    photo_face = get_photo_face_with_image(db, photo_face_id)
+    photo_face = await run(get_photo_face_with_image, db, photo_face_id)
 
     # Check ownership
     if photo_face.get("person_id") != person_id:
         raise HTTPException(status_code=403, detail="Cannot verify other person's photos")
 
     # Update - set verified=true AND recognition_confidence=1.0
-    db.table("photo_faces").update({
+    await execute(db.table("photo_faces").update({
         "verified": True,
         "recognition_confidence": 1.0,  # Fix #5: verified faces always have confidence 1.0
         "updated_at": datetime.utcnow().isoformat(),
-    }).eq("id", photo_face_id).execute()
+    }).eq("id", photo_face_id))
 
     logger.info(f"User {user_id or 'unknown'} verified photo_face {photo_face_id}")
 
@@ -162,7 +158,7 @@ async def reject_photo_face(
     """
     db = get_supabase_client().client
 
-    photo_face = get_photo_face_with_image(db, photo_face_id)
+    photo_face = await run(get_photo_face_with_image, db, photo_face_id)
 
     # Check ownership
     if photo_face.get("person_id") != person_id:
@@ -181,13 +177,13 @@ async def reject_photo_face(
         log_admin_activity(db, "photo_rejected", user_id, person_id, metadata)
 
     # Remove person link and reset confidence
-    db.table("photo_faces").update({
+    await execute(db.table("photo_faces").update({
         "person_id": None,
         "verified": False,
         "hidden_by_user": False,
         "recognition_confidence": None,  # Reset confidence when rejected
         "updated_at": datetime.utcnow().isoformat(),
-    }).eq("id", photo_face_id).execute()
+    }).eq("id", photo_face_id))
 
     logger.info(f"User {user_id or 'unknown'} rejected photo_face {photo_face_id} (removed person_id)")
 
@@ -222,25 +218,25 @@ async def hide_photo_face(
     """
     db = get_supabase_client().client
 
-    photo_face = get_photo_face_with_image(db, photo_face_id)
+    photo_face = await run(get_photo_face_with_image, db, photo_face_id)
 
     # Check ownership
     if photo_face.get("person_id") != person_id:
         raise HTTPException(status_code=403, detail="Cannot hide other person's photos")
 
     # Check if this person is the only one on the photo
-    count_result = db.table("photo_faces").select(
+    count_result = await execute(db.table("photo_faces").select(
         "id", count="exact"
-    ).eq("photo_id", photo_face["photo_id"]).not_.is_("person_id", "null").execute()
+    ).eq("photo_id", photo_face["photo_id"]).not_.is_("person_id", "null"))
 
     if count_result.count and count_result.count > 1:
         raise HTTPException(status_code=400, detail="Cannot hide photo with multiple people")
 
     # Hide
-    db.table("photo_faces").update({
+    await execute(db.table("photo_faces").update({
         "hidden_by_user": True,
         "updated_at": datetime.utcnow().isoformat(),
-    }).eq("id", photo_face_id).execute()
+    }).eq("id", photo_face_id))
 
     logger.info(f"User {user_id or 'unknown'} hid photo_face {photo_face_id}")
 
@@ -272,17 +268,17 @@ async def unhide_photo_face(
     """
     db = get_supabase_client().client
 
-    photo_face = get_photo_face_with_image(db, photo_face_id)
+    photo_face = await run(get_photo_face_with_image, db, photo_face_id)
 
     # Check ownership
     if photo_face.get("person_id") != person_id:
         raise HTTPException(status_code=403, detail="Cannot unhide other person's photos")
 
     # Unhide
-    db.table("photo_faces").update({
+    await execute(db.table("photo_faces").update({
         "hidden_by_user": False,
         "updated_at": datetime.utcnow().isoformat(),
-    }).eq("id", photo_face_id).execute()
+    }).eq("id", photo_face_id))
 
     logger.info(f"User {user_id or 'unknown'} unhid photo_face {photo_face_id}")
 
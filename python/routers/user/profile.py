@@ -14,6 +14,9 @@ from pydantic import BaseModel, field_validator
 from core.logging import get_logger
 from core.responses import ApiResponse
 from infrastructure.supabase import get_supabase_client
+from services.activity_log import get_activity_log
+from services.people_directory import get_people_directory
+from services.supabase.aio import execute
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -78,16 +81,13 @@ PRIVACY_SETTING_LABELS = {
 # =============================================================================
 
 def log_admin_activity(db, event_type: str, user_id: str, person_id: str, metadata: dict) -> None:
-    """Log activity to admin_activity table (fire-and-forget)."""
-    try:
-        db.table("admin_activity").insert({
-            "event_type": event_type,
-            "user_id": user_id,
-            "person_id": person_id,
-            "metadata": metadata,
-        }).execute()
-    except Exception as e:
-        logger.warning(f"Failed to log admin activity: {e}")
+    """Log activity to admin_activity table (buffered, written in background)."""
+    get_activity_log().add("admin_activity", {
+        "event_type": event_type,
+        "user_id": user_id,
+        "person_id": person_id,
+        "metadata": metadata,
+    })
 
 
 # =============================================================================
@@ -102,7 +102,7 @@ async def get_profile(person_id: str) -> dict:
     """
     db = get_supabase_client().client
 
-    result = db.table("people").select("*").eq("id", person_id).execute()
+    result = await execute(db.table("people").select("*").eq("id", person_id))
 
     if not result.data:
         raise HTTPException(status_code=404, detail="Person not found")
@@ -141,10 +141,10 @@ async def update_profile(person_id: str, data: ProfileUpdateRequest, user_id: Op
         update_data["show_in_players_gallery"] = False
 
     # Get current values before updating (for activity logging)
-    current_result = db.table("people").select(
+    current_result = await execute(db.table("people").select(
         "real_name, show_in_players_gallery, create_personal_gallery, "
         "show_name_on_photos, show_telegram_username, show_social_links"
-    ).eq("id", person_id).execute()
+    ).eq("id", person_id))
 
     if not current_result.data:
         raise HTTPException(status_code=404, detail="Person not found")
@@ -155,10 +155,11 @@ async def update_profile(person_id: str, data: ProfileUpdateRequest, user_id: Op
     update_data["updated_at"] = datetime.utcnow().isoformat()
 
     # Perform update
-    db.table("people").update(update_data).eq("id", person_id).execute()
+    await execute(db.table("people").update(update_data).eq("id", person_id))
+    get_people_directory().invalidate(person_id)
 
     # Fetch updated record
-    updated_result = db.table("people").select("*").eq("id", person_id).execute()
+    updated_result = await execute(db.table("people").select("*").eq("id", person_id))
 
     if not updated_result.data:
         raise HTTPException(status_code=500, detail="Failed to fetch updated profile")
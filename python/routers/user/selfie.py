@@ -7,14 +7,11 @@ Uses face recognition to match against unknown faces in the database.
 
 import base64
 import uuid
-import io
 import json
 from typing import Optional, List
 from datetime import datetime
 
 import numpy as np
-from PIL import Image
-import cv2
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
@@ -22,6 +19,9 @@ from core.logging import get_logger
 from core.responses import ApiResponse
 from infrastructure.supabase import get_supabase_client
 from infrastructure.minio_storage import get_minio_storage
+from infrastructure.storage import decode_image
+from services.supabase import get_recognition_config
+from services.supabase.aio import execute, run
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -46,14 +46,9 @@ class ConfirmSelfieRequest(BaseModel):
 
 
 async def get_confidence_threshold() -> float:
-    """Get confidence threshold from settings."""
+    """Get confidence threshold from settings (cached recognition config)."""
     try:
-        db = get_supabase_client().client
-        result = db.table("face_recognition_config").select("value").eq(
-            "key", "recognition_settings"
-        ).single().execute()
-        if result.data:
-            return result.data.get("value", {}).get("confidence_thresholds", {}).get("high_data", 0.6)
+        return (await run(get_recognition_config)).get("confidence_thresholds", {}).get("high_data", 0.6)
     except Exception as e:
         logger.warning(f"Failed to get threshold: {e}")
     return 0.6
@@ -99,13 +94,13 @@ async def search_unknown_faces(
     offset = 0
 
     while True:
-        result = db.table("photo_faces").select(
+        result = await execute(db.table("photo_faces").select(
             "id, photo_id, insightface_descriptor"
         ).is_(
             "person_id", "null"
         ).not_.is_(
             "insightface_descriptor", "null"
-        ).range(offset, offset + page_size - 1).execute()
+        ).range(offset, offset + page_size - 1))
 
         if not result.data:
             break
@@ -161,7 +156,7 @@ async def check_collisions(
 
     # Get faces with person_id (known faces)
     # Sample to avoid processing entire database
-    result = db.table("photo_faces").select(
+    result = await execute(db.table("photo_faces").select(
         "id, person_id, insightface_descriptor"
     ).not_.is_(
         "person_id", "null"
@@ -169,7 +164,7 @@ async def check_collisions(
         "insightface_descriptor", "null"
     ).eq(
         "verified", True  # Only check against verified faces
-    ).limit(5000).execute()
+    ).limit(5000))
 
     if not result.data:
         return None
@@ -206,13 +201,13 @@ async def check_collisions(
         logger.info(f"[Selfie] Collision detected: person_id={best_match['person_id']}, sim={best_match['similarity']:.3f}")
 
         # Get sample photos for this person
-        photos_result = db.table("photo_faces").select(
+        photos_result = await execute(db.table("photo_faces").select(
             "photo_id, gallery_images(id, image_url)"
         ).eq(
             "person_id", best_match["person_id"]
         ).eq(
             "verified", True
-        ).limit(3).execute()
+        ).limit(3))
 
         sample_photos = []
         for pf in (photos_result.data or []):
@@ -264,9 +259,7 @@ async def selfie_search(
         face_service._ensure_initialized()
 
         # Load image
-        image = Image.open(io.BytesIO(image_bytes))
-        img_array = np.array(image.convert('RGB'))
-        img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+        img_array = decode_image(image_bytes)
 
         # Detect faces
         faces = face_service._model.get_faces(img_array)
@@ -275,12 +268,12 @@ async def selfie_search(
             logger.warning("[Selfie] No face detected in selfie")
             # Save search record with no_match status
             db = get_supabase_client().client
-            db.table("selfie_searches").insert({
+            await execute(db.table("selfie_searches").insert({
                 "user_id": user_id,
                 "image_url": image_url,
                 "status": "no_match",
                 "matches_count": 0
-            }).execute()
+            }))
 
             return ApiResponse.ok({
                 "matches": [],
@@ -311,9 +304,9 @@ async def selfie_search(
         top_matches = []
 
         for match in matches[:3]:
-            photo_result = db.table("gallery_images").select(
+            photo_result = await execute(db.table("gallery_images").select(
                 "id, image_url, original_filename"
-            ).eq("id", match["photo_id"]).single().execute()
+            ).eq("id", match["photo_id"]).single())
 
             if photo_result.data:
                 top_matches.append({
@@ -333,13 +326,13 @@ async def selfie_search(
             status = "no_match"
 
         # Save search record
-        search_record = db.table("selfie_searches").insert({
+        search_record = await execute(db.table("selfie_searches").insert({
             "user_id": user_id,
             "image_url": image_url,
             "descriptor": descriptor.tolist(),
             "status": status,
             "matches_count": len(matches)
-        }).execute()
+        }))
 
         selfie_search_id = search_record.data[0]["id"] if search_record.data else None
 
@@ -380,9 +373,9 @@ async def confirm_selfie(
 
     try:
         # Get selfie search record
-        search_result = db.table("selfie_searches").select(
+        search_result = await execute(db.table("selfie_searches").select(
             "id, descriptor, status"
-        ).eq("id", data.selfie_search_id).single().execute()
+        ).eq("id", data.selfie_search_id).single())
 
         if not search_result.data:
             raise HTTPException(status_code=404, detail="Selfie search not found")
@@ -396,9 +389,9 @@ async def confirm_selfie(
             raise HTTPException(status_code=400, detail="No descriptor found")
 
         # Get user info
-        user_result = db.table("users").select(
+        user_result = await execute(db.table("users").select(
             "id, first_name, last_name, username"
-        ).eq("id", user_id).single().execute()
+        ).eq("id", user_id).single())
 
         if not user_result.data:
             raise HTTPException(status_code=404, detail="User not found")
@@ -410,10 +403,10 @@ async def confirm_selfie(
         if not real_name:
             real_name = user.get("username") or "Unknown"
 
-        person_result = db.table("people").insert({
+        person_result = await execute(db.table("people").insert({
             "real_name": real_name,
             "created_at": datetime.utcnow().isoformat()
-        }).execute()
+        }))
 
         if not person_result.data:
             raise HTTPException(status_code=500, detail="Failed to create person")
@@ -422,17 +415,17 @@ async def confirm_selfie(
         logger.info(f"[Selfie] Created person {person_id} for user {user_id}")
 
         # Link user to person
-        db.table("users").update({
+        await execute(db.table("users").update({
             "person_id": person_id
-        }).eq("id", user_id).execute()
+        }).eq("id", user_id))
 
         # Mark confirmed faces as verified
         for photo_face_id in data.photo_face_ids:
-            db.table("photo_faces").update({
+            await execute(db.table("photo_faces").update({
                 "person_id": person_id,
                 "verified": True,
                 "recognition_confidence": 1.0
-            }).eq("id", photo_face_id).execute()
+            }).eq("id", photo_face_id))
 
         verified_count = len(data.photo_face_ids)
         logger.info(f"[Selfie] Verified {verified_count} faces")
@@ -450,21 +443,21 @@ async def confirm_selfie(
         # Assign remaining matches (unverified)
         found_count = 0
         for match in remaining_matches:
-            db.table("photo_faces").update({
+            await execute(db.table("photo_faces").update({
                 "person_id": person_id,
                 "verified": False,
                 "recognition_confidence": match["similarity"]
-            }).eq("id", match["photo_face_id"]).execute()
+            }).eq("id", match["photo_face_id"]))
             found_count += 1
 
         logger.info(f"[Selfie] Assigned {found_count} additional faces (unverified)")
 
         # Update selfie search status
-        db.table("selfie_searches").update({
+        await execute(db.table("selfie_searches").update({
             "status": "matched",
             "matched_person_id": person_id,
             "matches_count": verified_count + found_count
-        }).eq("id", data.selfie_search_id).execute()
+        }).eq("id", data.selfie_search_id))
 
         # Rebuild index to include new faces
         try:
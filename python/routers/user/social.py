@@ -13,6 +13,7 @@ from pydantic import BaseModel
 from core.logging import get_logger
 from core.responses import ApiResponse
 from infrastructure.supabase import get_supabase_client
+from services.supabase.aio import execute
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -45,13 +46,13 @@ async def get_likes(
     db = get_supabase_client().client
 
     # Get total count
-    count_result = db.table("likes").select("id", count="exact").eq("image_id", image_id).execute()
+    count_result = await execute(db.table("likes").select("id", count="exact").eq("image_id", image_id))
     count = count_result.count or 0
 
     # Check if user liked
     is_liked = False
     if user_id:
-        user_like = db.table("likes").select("id").eq("image_id", image_id).eq("user_id", user_id).execute()
+        user_like = await execute(db.table("likes").select("id").eq("image_id", image_id).eq("user_id", user_id))
         is_liked = len(user_like.data) > 0
 
     return ApiResponse.ok({"count": count, "isLiked": is_liked}).model_dump()
@@ -68,22 +69,22 @@ async def toggle_like(
     db = get_supabase_client().client
 
     # Check existing like
-    existing = db.table("likes").select("id").eq("image_id", image_id).eq("user_id", user_id).execute()
+    existing = await execute(db.table("likes").select("id").eq("image_id", image_id).eq("user_id", user_id))
 
     if existing.data:
         # Unlike
-        db.table("likes").delete().eq("id", existing.data[0]["id"]).execute()
+        await execute(db.table("likes").delete().eq("id", existing.data[0]["id"]))
         is_liked = False
     else:
         # Like
-        db.table("likes").insert({
+        await execute(db.table("likes").insert({
             "image_id": image_id,
             "user_id": user_id,
-        }).execute()
+        }))
         is_liked = True
 
     # Get updated count
-    count_result = db.table("likes").select("id", count="exact").eq("image_id", image_id).execute()
+    count_result = await execute(db.table("likes").select("id", count="exact").eq("image_id", image_id))
     count = count_result.count or 0
 
     return ApiResponse.ok({"count": count, "isLiked": is_liked}).model_dump()
@@ -101,9 +102,9 @@ async def get_comments(image_id: str) -> dict:
     db = get_supabase_client().client
 
     # Get comments
-    comments_result = db.table("comments").select(
+    comments_result = await execute(db.table("comments").select(
         "id, content, created_at, updated_at, user_id, gallery_image_id"
-    ).eq("gallery_image_id", image_id).order("created_at", desc=False).execute()
+    ).eq("gallery_image_id", image_id).order("created_at", desc=False))
 
     comments = comments_result.data or []
 
@@ -112,9 +113,9 @@ async def get_comments(image_id: str) -> dict:
     users_map = {}
 
     if user_ids:
-        users_result = db.table("users").select(
+        users_result = await execute(db.table("users").select(
             "id, telegram_id, username, first_name, last_name, photo_url"
-        ).in_("id", user_ids).execute()
+        ).in_("id", user_ids))
         users_map = {u["id"]: u for u in (users_result.data or [])}
 
     # Attach user info to comments
@@ -144,18 +145,18 @@ async def create_comment(
     db = get_supabase_client().client
 
     # Insert comment
-    db.table("comments").insert({
+    await execute(db.table("comments").insert({
         "gallery_image_id": image_id,
         "user_id": user_id,
         "content": content,
-    }).execute()
+    }))
 
     # Get the created comment with user info
-    comment_result = db.table("comments").select(
+    comment_result = await execute(db.table("comments").select(
         "id, content, created_at, updated_at, user_id, gallery_image_id"
     ).eq("gallery_image_id", image_id).eq("user_id", user_id).order(
         "created_at", desc=True
-    ).limit(1).execute()
+    ).limit(1))
 
     if not comment_result.data:
         raise HTTPException(status_code=500, detail="Failed to create comment")
@@ -163,9 +164,9 @@ async def create_comment(
     comment = comment_result.data[0]
 
     # Get user info
-    user_result = db.table("users").select(
+    user_result = await execute(db.table("users").select(
         "id, telegram_id, username, first_name, last_name, photo_url"
-    ).eq("id", user_id).execute()
+    ).eq("id", user_id))
 
     comment["users"] = user_result.data[0] if user_result.data else None
 
@@ -192,7 +193,7 @@ async def update_comment(
     db = get_supabase_client().client
 
     # Check ownership
-    comment_result = db.table("comments").select("user_id").eq("id", comment_id).execute()
+    comment_result = await execute(db.table("comments").select("user_id").eq("id", comment_id))
 
     if not comment_result.data:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -201,22 +202,22 @@ async def update_comment(
         raise HTTPException(status_code=403, detail="Forbidden")
 
     # Update
-    db.table("comments").update({
+    await execute(db.table("comments").update({
         "content": content,
         "updated_at": datetime.utcnow().isoformat(),
-    }).eq("id", comment_id).execute()
+    }).eq("id", comment_id))
 
     # Get updated comment
-    updated_result = db.table("comments").select(
+    updated_result = await execute(db.table("comments").select(
         "id, content, created_at, updated_at, user_id, gallery_image_id"
-    ).eq("id", comment_id).execute()
+    ).eq("id", comment_id))
 
     comment = updated_result.data[0] if updated_result.data else None
 
     if comment:
-        user_result = db.table("users").select(
+        user_result = await execute(db.table("users").select(
             "id, telegram_id, username, first_name, last_name, photo_url"
-        ).eq("id", user_id).execute()
+        ).eq("id", user_id))
         comment["users"] = user_result.data[0] if user_result.data else None
 
     return ApiResponse.ok({"comment": comment}).model_dump()
@@ -236,9 +237,9 @@ async def delete_comment(
     db = get_supabase_client().client
 
     # Get comment with gallery info
-    comment_result = db.table("comments").select(
+    comment_result = await execute(db.table("comments").select(
         "id, user_id, gallery_image_id"
-    ).eq("id", comment_id).execute()
+    ).eq("id", comment_id))
 
     if not comment_result.data:
         raise HTTPException(status_code=404, detail="Comment not found")
@@ -254,14 +255,14 @@ async def delete_comment(
             can_delete = True
         elif admin_role == "local_admin" and admin_id:
             # Check if admin owns the gallery
-            image_result = db.table("gallery_images").select(
+            image_result = await execute(db.table("gallery_images").select(
                 "gallery_id"
-            ).eq("id", comment["gallery_image_id"]).execute()
+            ).eq("id", comment["gallery_image_id"]))
 
             if image_result.data:
-                gallery_result = db.table("galleries").select(
+                gallery_result = await execute(db.table("galleries").select(
                     "created_by"
-                ).eq("id", image_result.data[0]["gallery_id"]).execute()
+                ).eq("id", image_result.data[0]["gallery_id"]))
 
                 if gallery_result.data and gallery_result.data[0]["created_by"] == admin_id:
                     can_delete = True
@@ -274,7 +275,7 @@ async def delete_comment(
         raise HTTPException(status_code=403, detail="Forbidden")
 
     # Delete
-    db.table("comments").delete().eq("id", comment_id).execute()
+    await execute(db.table("comments").delete().eq("id", comment_id))
 
     return ApiResponse.ok({"success": True}).model_dump()
 
@@ -293,9 +294,9 @@ async def get_favorites(
     db = get_supabase_client().client
 
     # Get favorites
-    favorites_result = db.table("favorites").select(
+    favorites_result = await execute(db.table("favorites").select(
         "id, user_id, gallery_image_id, created_at"
-    ).eq("user_id", user_id).order("created_at", desc=True).execute()
+    ).eq("user_id", user_id).order("created_at", desc=True))
 
     favorites = favorites_result.data or []
 
@@ -303,9 +304,9 @@ async def get_favorites(
     image_ids = [f["gallery_image_id"] for f in favorites if f.get("gallery_image_id")]
 
     if image_ids:
-        images_result = db.table("gallery_images").select(
+        images_result = await execute(db.table("gallery_images").select(
             "id, gallery_id, image_url, original_url, original_filename, file_size, width, height, created_at"
-        ).in_("id", image_ids).execute()
+        ).in_("id", image_ids))
 
         images_map = {img["id"]: img for img in (images_result.data or [])}
 
@@ -328,9 +329,9 @@ async def check_favorite(
 
     db = get_supabase_client().client
 
-    result = db.table("favorites").select("id").eq(
+    result = await execute(db.table("favorites").select("id").eq(
         "user_id", user_id
-    ).eq("gallery_image_id", image_id).execute()
+    ).eq("gallery_image_id", image_id))
 
     return ApiResponse.ok({"isFavorited": len(result.data) > 0}).model_dump()
 
@@ -346,20 +347,20 @@ async def toggle_favorite(
     db = get_supabase_client().client
 
     # Check existing
-    existing = db.table("favorites").select("id").eq(
+    existing = await execute(db.table("favorites").select("id").eq(
         "user_id", user_id
-    ).eq("gallery_image_id", image_id).execute()
+    ).eq("gallery_image_id", image_id))
 
     if existing.data:
         # Remove
-        db.table("favorites").delete().eq("id", existing.data[0]["id"]).execute()
+        await execute(db.table("favorites").delete().eq("id", existing.data[0]["id"]))
         is_favorited = False
     else:
         # Add
-        db.table("favorites").insert({
+        await execute(db.table("favorites").insert({
             "user_id": user_id,
             "gallery_image_id": image_id,
-        }).execute()
+        }))
         is_favorited = True
 
     return ApiResponse.ok({"isFavorited": is_favorited}).model_dump()
@@ -378,7 +379,7 @@ async def increment_download(image_id: str) -> dict:
     db = get_supabase_client().client
 
     try:
-        db.rpc("increment_download_count", {"image_id": image_id}).execute()
+        await execute(db.rpc("increment_download_count", {"image_id": image_id}))
     except Exception as e:
         logger.error(f"Error incrementing download count: {e}")
         raise HTTPException(status_code=500, detail="Failed to increment download count")
@@ -401,13 +402,13 @@ async def get_my_photos(
     db = get_supabase_client().client
 
     # Get all photo_faces for this person
-    photo_faces_result = db.table("photo_faces").select(
+    photo_faces_result = await execute(db.table("photo_faces").select(
         "id, photo_id, person_id, recognition_confidence, verified, hidden_by_user, insightface_bbox"
     ).eq("person_id", person_id).order(
         "verified", desc=False  # Unverified first
     ).order(
         "recognition_confidence", desc=False  # Low confidence first
-    ).execute()
+    ))
 
     photo_faces = photo_faces_result.data or []
 
@@ -418,9 +419,9 @@ async def get_my_photos(
     photo_ids = list(set(pf["photo_id"] for pf in photo_faces if pf.get("photo_id")))
 
     # Get gallery_images for these photos
-    images_result = db.table("gallery_images").select(
+    images_result = await execute(db.table("gallery_images").select(
         "id, slug, gallery_id, image_url, original_url, original_filename, width, height"
-    ).in_("id", photo_ids).execute()
+    ).in_("id", photo_ids))
 
     images_map = {img["id"]: img for img in (images_result.data or [])}
 
@@ -429,15 +430,15 @@ async def get_my_photos(
 
     galleries_map = {}
     if gallery_ids:
-        galleries_result = db.table("galleries").select(
+        galleries_result = await execute(db.table("galleries").select(
             "id, slug, title, shoot_date, is_public"
-        ).in_("id", gallery_ids).execute()
+        ).in_("id", gallery_ids))
         galleries_map = {g["id"]: g for g in (galleries_result.data or [])}
 
     # Count faces per photo (all people, not just current user)
-    faces_count_result = db.table("photo_faces").select(
+    faces_count_result = await execute(db.table("photo_faces").select(
         "photo_id"
-    ).in_("photo_id", photo_ids).not_.is_("person_id", "null").execute()
+    ).in_("photo_id", photo_ids).not_.is_("person_id", "null"))
 
     faces_count_map: dict = {}
     for face in (faces_count_result.data or []):
@@ -474,9 +475,9 @@ async def get_favorites_full(
     db = get_supabase_client().client
 
     # Get favorites
-    favorites_result = db.table("favorites").select(
+    favorites_result = await execute(db.table("favorites").select(
         "id, user_id, gallery_image_id, created_at"
-    ).eq("user_id", user_id).order("created_at", desc=True).execute()
+    ).eq("user_id", user_id).order("created_at", desc=True))
 
     favorites = favorites_result.data or []
 
@@ -486,9 +487,9 @@ async def get_favorites_full(
     # Get image info
     image_ids = [f["gallery_image_id"] for f in favorites if f.get("gallery_image_id")]
 
-    images_result = db.table("gallery_images").select(
+    images_result = await execute(db.table("gallery_images").select(
         "id, slug, gallery_id, image_url, original_url, original_filename, file_size, width, height, created_at"
-    ).in_("id", image_ids).execute()
+    ).in_("id", image_ids))
 
     images_map = {img["id"]: img for img in (images_result.data or [])}
 
@@ -497,9 +498,9 @@ async def get_favorites_full(
 
     galleries_map = {}
     if gallery_ids:
-        galleries_result = db.table("galleries").select(
+        galleries_result = await execute(db.table("galleries").select(
             "id, slug"
-        ).in_("id", gallery_ids).execute()
+        ).in_("id", gallery_ids))
         galleries_map = {g["id"]: g for g in (galleries_result.data or [])}
 
     # Assemble response
@@ -10,6 +10,7 @@ from fastapi import APIRouter, Request, HTTPException
 from core.responses import ApiResponse
 from core.logging import get_logger
 from services.supabase.base import get_supabase_client
+from services.supabase.aio import execute
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -45,11 +46,10 @@ async def get_welcome(request: Request, lang: str = "en"):
 
     try:
         # Get welcome content from site_content
-        content_result = supabase.table("site_content")\
+        content_result = await execute(supabase.table("site_content")\
             .select("value")\
             .eq("key", "welcome")\
-            .single()\
-            .execute()
+            .single())
 
         if not content_result.data:
             return ApiResponse.ok({
@@ -61,11 +61,10 @@ async def get_welcome(request: Request, lang: str = "en"):
         current_version = welcome_data.get("version", 1)
 
         # Get user's welcome_version_seen
-        user_result = supabase.table("users")\
+        user_result = await execute(supabase.table("users")\
             .select("welcome_version_seen")\
             .eq("id", user_id)\
-            .single()\
-            .execute()
+            .single())
 
         if not user_result.data:
             return ApiResponse.ok({
@@ -126,21 +125,19 @@ async def mark_welcome_seen(request: Request):
 
     try:
         # Get current welcome version
-        content_result = supabase.table("site_content")\
+        content_result = await execute(supabase.table("site_content")\
             .select("value")\
             .eq("key", "welcome")\
-            .single()\
-            .execute()
+            .single())
 
         current_version = 1
         if content_result.data:
             current_version = content_result.data.get("value", {}).get("version", 1)
 
         # Update user's welcome_version_seen
-        supabase.table("users")\
+        await execute(supabase.table("users")\
             .update({"welcome_version_seen": current_version})\
-            .eq("id", user_id)\
-            .execute()
+            .eq("id", user_id))
 
         logger.info(f"User {user_id} marked welcome v{current_version} as seen")
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark.
+
+Imports main.py in a fresh interpreter with `python -X importtime`,
+reports total import time and the slowest top-level modules, and checks
+that heavy ML libraries were not imported at startup.
+
+Usage (from python/ directory):
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --profile readonly --budget-ms 800
+
+Exit code 1 if the budget is exceeded or a heavy module was imported.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Must never be imported at startup (loaded lazily on first use)
+HEAVY_MODULES = ["insightface", "onnxruntime", "hnswlib", "hdbscan", "sklearn", "torch"]
+
+# The readonly profile doesn't load the image pipeline at all
+READONLY_HEAVY_MODULES = HEAVY_MODULES + ["cv2"]
+
+
+def probe(profile: str) -> str:
+    heavy = READONLY_HEAVY_MODULES if profile == "readonly" else HEAVY_MODULES
+    return (
+        "import sys, json, main; "
+        f"print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+    )
+
+
+def run_import(profile: str):
+    """Import main in a fresh process. Returns (heavy_modules_loaded, importtime_stderr)."""
+    env = dict(os.environ, API_PROFILE=profile)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe(profile)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-4000:])
+        raise SystemExit(f"Import of main failed (exit code {result.returncode})")
+
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return loaded, result.stderr
+
+
+def parse_importtime(stderr: str):
+    """Parse -X importtime output into [(cumulative_us, module, depth)]."""
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:       123 |        456 |     package.module"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        cumulative_us, name = parts[1], parts[2]
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us.strip()), name.strip(), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API startup import time")
+    parser.add_argument("--profile", default="readonly", choices=["full", "readonly"])
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    loaded, stderr = run_import(args.profile)
+    rows = parse_importtime(stderr)
+
+    # Top-level imports (depth 0 after the 'import time:' prefix indentation)
+    min_depth = min((depth for _, _, depth in rows), default=0)
+    top_level = [(us, name) for us, name, depth in rows if depth == min_depth]
+    total_ms = sum(us for us, _ in top_level) / 1000
+
+    print(f"Profile: {args.profile}")
+    print(f"Total import time: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"Slowest top-level imports:")
+    for us, name in sorted(top_level, reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
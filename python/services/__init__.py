@@ -21,10 +21,10 @@ Other:
 
 v4.1: Removed legacy supabase_client.py and supabase_database.py
       Use SupabaseService from services.supabase instead
+v4.4: FaceRecognitionService / TrainingService re-exports are lazy, so
+      importing any services.* module doesn't pull in the ML stack (cv2)
 """
 
-from services.face_recognition import FaceRecognitionService
-from services.training_service import TrainingService
 from services.supabase import SupabaseService, get_supabase_service
 
 __all__ = [
@@ -33,3 +33,14 @@ __all__ = [
     'SupabaseService',
     'get_supabase_service',
 ]
+
+
+def __getattr__(name):
+    """Lazy re-exports of the ML facades (PEP 562)."""
+    if name == "FaceRecognitionService":
+        from services.face_recognition import FaceRecognitionService
+        return FaceRecognitionService
+    if name == "TrainingService":
+        from services.training_service import TrainingService
+        return TrainingService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,274 @@
+"""
+Write-behind activity log (admin_activity, user_activity).
+
+Handlers only append rows to an in-process buffer; a background thread
+writes them with one bulk insert per table when ACTIVITY_FLUSH_SIZE rows
+are pending or every ACTIVITY_FLUSH_SECONDS.
+
+If the database is unavailable (connection errors, 5xx), rows are spilled
+to a local JSON-lines journal (ACTIVITY_JOURNAL_PATH) and replayed once
+inserts succeed again, so audit events survive outages and restarts.
+A chunk rejected by the database itself (constraint/data errors) is
+bisected so only the offending rows are dropped - they go to a dead-letter
+file next to the journal and are never retried. created_at is set when
+the event is recorded, not when it is written.
+
+Usage:
+    from services.activity_log import get_activity_log
+
+    get_activity_log().add("admin_activity", {"event_type": "...", "metadata": {...}})
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rows per INSERT request
+INSERT_CHUNK_SIZE = 500
+# Pause between replay attempts after a failed replay (seconds)
+REPLAY_RETRY_SECONDS = 60.0
+# SQLSTATE classes of errors caused by the row itself (retrying can't help):
+# 22 data exception, 23 integrity constraint, 42 syntax error / undefined column
+PERMANENT_SQLSTATE_CLASSES = ("22", "23", "42")
+
+Entry = Tuple[str, Dict]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _is_permanent(error: Exception) -> bool:
+    """True if the database rejected the rows (vs. unavailable database)."""
+    code = str(getattr(error, "code", "") or "")
+    if code.startswith("PGRST"):
+        # PostgREST request errors (PGRST1xx/2xx) - bad payload, unknown column
+        return code[5:6] in ("1", "2")
+    return len(code) == 5 and code[:2] in PERMANENT_SQLSTATE_CLASSES
+
+
+class ActivityLogWriter:
+    """Buffers activity rows and writes them in bulk from a background thread."""
+
+    def __init__(
+        self,
+        flush_size: int = None,
+        flush_seconds: float = None,
+        journal_path: str = None
+    ):
+        self.flush_size = flush_size or settings.activity_flush_size
+        self.flush_seconds = flush_seconds or settings.activity_flush_seconds
+        self.journal_path = journal_path or settings.activity_journal_path
+
+        self._pending: List[Entry] = []
+        self._lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._next_replay_at = 0.0
+
+        self.stats = {"written": 0, "spilled": 0, "replayed": 0, "dropped": 0}
+
+    def add(self, table: str, row: Dict):
+        """Record one activity row (never blocks on the database)."""
+        row = {**row, "created_at": row.get("created_at") or _now()}
+        with self._lock:
+            self._pending.append((table, row))
+            pending = len(self._pending)
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="activity-log", daemon=True)
+                self._thread.start()
+        if pending >= self.flush_size:
+            self._wake.set()
+
+    def _run(self):
+        logger.info(f"[ActivityLog] Started (flush {self.flush_size} rows / {self.flush_seconds}s)")
+        self._safe_replay()
+        while not self._stopped:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                flushed = self.flush()
+            except Exception as e:
+                # Never let the writer thread die - add() would only grow memory
+                logger.error(f"[ActivityLog] Flush failed: {e}")
+                continue
+            if flushed and time.monotonic() >= self._next_replay_at:
+                self._safe_replay()
+
+    def _safe_replay(self):
+        try:
+            self._replay_journal()
+        except Exception as e:
+            logger.error(f"[ActivityLog] Journal replay failed: {e}")
+            self._next_replay_at = time.monotonic() + REPLAY_RETRY_SECONDS
+
+    def flush(self) -> bool:
+        """
+        Write all pending rows now.
+
+        Returns:
+            True if everything was written, False if rows were spilled to the journal
+        """
+        with self._lock:
+            entries, self._pending = self._pending, []
+        if not entries:
+            return True
+
+        dropped = self.stats["dropped"]
+        failed = self._insert(entries)
+        self.stats["written"] += len(entries) - len(failed) - (self.stats["dropped"] - dropped)
+        if failed:
+            self._spill(failed)
+            return False
+        return True
+
+    def _insert(self, entries: List[Entry]) -> List[Entry]:
+        """
+        Bulk insert entries, one request per table and chunk.
+
+        Returns:
+            Entries that failed to insert
+        """
+        by_table: Dict[str, List[Dict]] = defaultdict(list)
+        for table, row in entries:
+            by_table[table].append(row)
+
+        failed: List[Entry] = []
+        for table, rows in by_table.items():
+            # Bulk inserts need the same keys in every row
+            columns = set().union(*rows)
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+
+            for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+                failed.extend((table, row) for row in self._insert_chunk(table, rows[i:i + INSERT_CHUNK_SIZE]))
+        return failed
+
+    def _insert_chunk(self, table: str, chunk: List[Dict]) -> List[Dict]:
+        """
+        Insert one chunk; on a row-level rejection bisect it so valid rows
+        are still written and only offending rows are dead-lettered.
+
+        Returns:
+            Rows to spill (database unavailable)
+        """
+        from services.supabase.base import get_supabase_client
+
+        try:
+            get_supabase_client().table(table).insert(chunk).execute()
+            return []
+        except Exception as e:
+            if not _is_permanent(e):
+                logger.warning(f"[ActivityLog] Insert of {len(chunk)} {table} rows failed: {e}")
+                return chunk
+            if len(chunk) == 1:
+                logger.error(f"[ActivityLog] {table} row rejected, dropping: {e}")
+                self._dead_letter(table, chunk[0], e)
+                return []
+
+        middle = len(chunk) // 2
+        return self._insert_chunk(table, chunk[:middle]) + self._insert_chunk(table, chunk[middle:])
+
+    def _dead_letter(self, table: str, row: Dict, error: Exception):
+        """Keep a rejected row for inspection (never replayed)."""
+        self.stats["dropped"] += 1
+        try:
+            with self._journal_lock:
+                directory = os.path.dirname(self.journal_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(f"{self.journal_path}.dead", "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"table": table, "row": row, "error": str(error)}, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"[ActivityLog] Failed to write dead-letter row: {e}")
+
+    def _spill(self, entries: List[Entry]):
+        """Append entries to the local journal."""
+        try:
+            with self._journal_lock:
+                directory = os.path.dirname(self.journal_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    for table, row in entries:
+                        f.write(json.dumps({"table": table, "row": row}, default=str) + "\n")
+            self.stats["spilled"] += len(entries)
+            logger.warning(f"[ActivityLog] Spilled {len(entries)} rows to {self.journal_path}")
+        except OSError as e:
+            logger.error(f"[ActivityLog] Failed to write journal, {len(entries)} rows lost: {e}")
+
+    def _replay_journal(self):
+        """Insert journaled rows (incl. leftovers of a crashed replay); re-spill failures."""
+        replay_path = f"{self.journal_path}.{os.getpid()}.replay"
+        with self._journal_lock:
+            try:
+                os.replace(self.journal_path, replay_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"[ActivityLog] Can't open journal for replay: {e}")
+                return
+
+        for path in glob.glob(f"{self.journal_path}.*.replay"):
+            try:
+                if path != replay_path and os.path.getmtime(path) > time.time() - 3600:
+                    # Probably being replayed by another worker process
+                    continue
+
+                entries: List[Entry] = []
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                            entries.append((record["table"], record["row"]))
+                        except (ValueError, KeyError):
+                            logger.warning("[ActivityLog] Skipping malformed journal line")
+            except FileNotFoundError:
+                # Taken and removed by another process meanwhile
+                continue
+
+            dropped = self.stats["dropped"]
+            failed = self._insert(entries) if entries else []
+            if failed:
+                self._spill(failed)
+                self._next_replay_at = time.monotonic() + REPLAY_RETRY_SECONDS
+            replayed = len(entries) - len(failed) - (self.stats["dropped"] - dropped)
+            self.stats["replayed"] += replayed
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            if entries:
+                logger.info(f"[ActivityLog] Replayed {replayed}/{len(entries)} journaled rows")
+
+    def close(self, timeout: float = 10.0):
+        """Stop the background thread and write (or spill) remaining rows."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+
+# Global instance
+_activity_log: Optional[ActivityLogWriter] = None
+
+
+def get_activity_log() -> ActivityLogWriter:
+    """Get singleton ActivityLogWriter instance."""
+    global _activity_log
+    if _activity_log is None:
+        _activity_log = ActivityLogWriter()
+    return _activity_log
@@ -10,9 +10,9 @@ import uuid
 from typing import Optional
 from PIL import Image
 import io
-import httpx
 
 from core.logging import get_logger
+from infrastructure.storage import get_photo_cache
 
 logger = get_logger(__name__)
 
@@ -103,10 +103,7 @@ class BiRefNetService:
             PNG bytes with transparent background, or None on error
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_url, timeout=30)
-                response.raise_for_status()
-                image_bytes = response.content
+            image_bytes = await get_photo_cache().get_bytes(image_url)
         except Exception as e:
             logger.error(f"Failed to download image from {image_url}: {e}")
             return None
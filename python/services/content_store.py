@@ -0,0 +1,158 @@
+"""
+Content-addressed storage (deduplication of stored photo objects).
+
+Every stored photo is identified by the sha256 of its content
+(storage_objects registry, gallery_images.content_hash):
+
+- /images/upload: hash computed while streaming; if the content is already
+  stored, the new copy is deleted and the existing object is returned
+- /images/presign: clients may send sha256 per file; known content gets
+  the existing object instead of an upload URL
+- background processing: photos uploaded via presign are hashed when
+  first downloaded; a duplicate object is replaced by the canonical one
+  and detections of an identical processed photo are reused
+- deleting photos releases references (release); objects with no
+  references left are removed from MinIO by cleanup_orphans once they have
+  been unreferenced for ORPHAN_GRACE_HOURS - an upload/presign may have just
+  handed out the object's URL for a photo not added yet
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+from core.config import settings
+from core.logging import get_logger
+from infrastructure.minio_storage import get_minio_storage
+from services.supabase import get_supabase_client
+from services.supabase.storage_objects import get_storage_objects_repository
+
+logger = get_logger(__name__)
+
+
+def register_upload(upload: Dict) -> Dict:
+    """
+    Register a just-uploaded object (upload_stream result) by its sha256.
+
+    Returns:
+        Upload result pointing at the canonical object, with "deduplicated"
+        True if identical content was already stored (new copy deleted)
+    """
+    if not settings.content_dedup_enabled:
+        return {**upload, "deduplicated": False}
+
+    canonical = get_storage_objects_repository().register(
+        upload["sha256"], upload["bucket"], upload["object_name"], upload["url"], upload["size"]
+    )
+    if not canonical or canonical["url"] == upload["url"]:
+        return {**upload, "deduplicated": False}
+
+    get_minio_storage().delete_file(upload["url"])
+    logger.info(f"Upload deduplicated: {upload['object_name']} -> {canonical['object_name']}")
+    return {
+        **upload,
+        "url": canonical["url"],
+        "object_name": canonical["object_name"],
+        "bucket": canonical["bucket"],
+        "deduplicated": True,
+    }
+
+
+def find_existing(hashes: List[Optional[str]]) -> Dict[str, Dict]:
+    """Already stored objects for client-supplied hashes (sha256 -> row)."""
+    if not settings.content_dedup_enabled:
+        return {}
+    return get_storage_objects_repository().get_by_hashes(
+        [h.lower() for h in hashes if h]
+    )
+
+
+def content_hashes_for_urls(urls: List[str]) -> Dict[str, str]:
+    """Known content hashes of stored object URLs (url -> sha256)."""
+    rows = get_storage_objects_repository().get_by_urls(urls)
+    return {url: row["sha256"] for url, row in rows.items()}
+
+
+def assign_photo_content(photo: Dict, image_bytes: bytes) -> str:
+    """
+    Set gallery_images.content_hash of a photo from its bytes.
+
+    If identical content is already stored under another object, the photo
+    is re-pointed to the canonical object and the duplicate object is deleted
+    (when nothing else references it). Mutates photo (image_url, content_hash).
+
+    Returns:
+        sha256 of the photo content
+    """
+    client = get_supabase_client()
+    repo = get_storage_objects_repository()
+    minio = get_minio_storage()
+
+    sha256 = hashlib.sha256(image_bytes).hexdigest()
+    update = {"content_hash": sha256}
+    duplicate_url = None
+
+    location = minio.parse_url(photo["image_url"])
+    if location:
+        bucket, object_name = location
+        canonical = repo.register(sha256, bucket, object_name, photo["image_url"], len(image_bytes))
+        if canonical and canonical["url"] != photo["image_url"]:
+            duplicate_url = photo["image_url"]
+            update["image_url"] = canonical["url"]
+            if photo.get("original_url") == duplicate_url:
+                update["original_url"] = canonical["url"]
+
+    client.table("gallery_images").update(update).eq("id", photo["id"]).execute()
+    photo.update(update)
+
+    if duplicate_url:
+        still_used = any(
+            client.table("gallery_images").select(
+                "id", count="exact"
+            ).eq(column, duplicate_url).limit(1).execute().count
+            for column in ("image_url", "original_url")
+        )
+        if not still_used:
+            minio.delete_file(duplicate_url)
+        logger.info(f"Photo {photo['id'][:8]} deduplicated to {update['image_url']}")
+
+    repo.recount([sha256])
+    return sha256
+
+
+def release(hashes: List[Optional[str]]) -> int:
+    """
+    Recount references after photos were deleted. Objects left without
+    references are not deleted here (see cleanup_orphans).
+
+    Returns:
+        Number of objects that are now unreferenced
+    """
+    counts = get_storage_objects_repository().recount([h for h in hashes if h])
+    unreferenced = sum(1 for count in counts.values() if count == 0)
+    if unreferenced:
+        logger.info(f"{unreferenced} storage objects unreferenced (deleted after grace period)")
+    return unreferenced
+
+
+def cleanup_orphans(min_age_hours: float = None) -> Dict[str, int]:
+    """
+    Delete registered objects that no photo references (uploaded but never
+    added to a gallery) and that are older than the grace period.
+
+    Returns:
+        Dict with checked and deleted counts
+    """
+    repo = get_storage_objects_repository()
+    hours = min_age_hours if min_age_hours is not None else settings.orphan_grace_hours
+
+    orphans = repo.get_orphans(hours)
+    # References may have been added without a recount
+    counts = repo.recount([row["sha256"] for row in orphans])
+    rows = [row for row in orphans if counts.get(row["sha256"]) == 0]
+    if not rows:
+        return {"checked": len(orphans), "deleted": 0}
+
+    deleted = get_minio_storage().delete_files(row["url"] for row in rows)
+    repo.delete_many([row["sha256"] for row in rows])
+    logger.info(f"Deleted {deleted} orphaned storage objects")
+    return {"checked": len(orphans), "deleted": deleted}
@@ -0,0 +1,55 @@
+"""
+UI-facing URLs of image derivatives.
+
+Gallery listings return these compact fields instead of the full
+gallery_images.derivatives manifest (see image_derivatives.py):
+
+    {
+        "thumb_url": url, "grid_url": url, "lightbox_url": url,
+        "srcset": "thumb.webp 320w, grid.webp 960w, lightbox.webp 2048w"
+    }
+
+Photos without derivatives get no fields - the UI falls back to image_url.
+Kept free of cv2/numpy so the readonly profile can use it.
+"""
+
+from typing import Dict, Optional
+
+# Sizes shown by the UI, smallest first (detection is backend-only)
+WEB_SIZES = ("thumb", "grid", "lightbox")
+
+# Preferred format of the *_url fields and srcset (JPEG is the fallback)
+WEB_FORMATS = ("webp", "jpeg")
+
+
+def _url(entry: Dict) -> Optional[str]:
+    for fmt in WEB_FORMATS:
+        if entry.get(fmt):
+            return entry[fmt]
+    return None
+
+
+def derivative_urls(derivatives: Optional[Dict]) -> Dict:
+    """thumb/grid/lightbox URLs + srcset of a derivatives manifest ({} if none)."""
+    sizes = (derivatives or {}).get("sizes") or {}
+
+    urls = {}
+    srcset = []
+    for size in WEB_SIZES:
+        entry = sizes.get(size) or {}
+        url = _url(entry)
+        if not url:
+            continue
+        urls[f"{size}_url"] = url
+        if entry.get("width"):
+            srcset.append(f"{url} {entry['width']}w")
+
+    if srcset:
+        urls["srcset"] = ", ".join(srcset)
+    return urls
+
+
+def with_derivative_urls(image: Dict) -> Dict:
+    """Replace an image row's derivatives manifest with derivative_urls() fields."""
+    image.update(derivative_urls(image.pop("derivatives", None)))
+    return image
@@ -19,17 +19,27 @@ v6.0: All faces with descriptors in index
       - excluded_from_index is metadata, not filter
       - update_metadata() for changing person_id without rebuild
       - Recognition skips faces where person_id is None OR excluded is True
+v6.2: Detection cache - raw detections keyed by image hash + model version,
+      quality filters re-applied on cached results
+v6.3: Startup warm-up (models + index concurrently); is_ready() no longer initializes
+v6.4: detect_faces(coordinate_scale=...) - detection on downscaled derivatives
+v6.5: recognize_faces() - batched recognition + UI metrics in one index query
+v6.6: blur_score of derivative detections measured on the original image
+      (Laplacian variance is resolution-dependent; thresholds and stored
+      scores refer to originals) - from LaplacianCells of derivative
+      generation, else the original once, kept in the detection cache
 """
 
 import os
 import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any, Union
 from datetime import datetime
 import uuid
-import io
-from PIL import Image
-import cv2
 
 from fastapi import UploadFile
 
@@ -43,10 +53,16 @@ from services.insightface_model import InsightFaceModel, get_model
 from services.hnsw_index import HNSWIndex, TournamentIndex
 from services.quality_filters import (
     calculate_blur_score,
+    calculate_blur_scores,
+    blur_scores_from_cells,
+    LaplacianCells,
     passes_quality_filters,
+    quality_masks,
     DEFAULT_QUALITY_FILTERS
 )
 from services.grouping import group_tournament_faces
+from infrastructure.detection_cache import get_detection_cache
+from infrastructure.storage import get_photo_cache, decode_image, DECODE_VERSION
 
 # New modular Supabase service
 from services.supabase import SupabaseService, get_supabase_service
@@ -104,6 +120,10 @@ class FaceRecognitionService:
         # Quality filters
         self.quality_filters = DEFAULT_QUALITY_FILTERS.copy()
         
+        # Initialization guard (startup warm-up vs. lazy init from requests)
+        self._init_lock = threading.Lock()
+        self.warmed_up = False
+        
         # Temporary storage for tournament processing
         self.embeddings_store: Dict[str, List[np.ndarray]] = {}
         self.faces_data_store: Dict[str, List[Dict]] = {}
@@ -119,19 +139,51 @@ class FaceRecognitionService:
         return self._model.app
     
     def _ensure_initialized(self):
-        """Lazy initialization of InsightFace model"""
-        if not self._model.is_ready:
-            self._model.initialize()
-            self._load_players_index()
+        """Lazy initialization of InsightFace model (no-op after startup warm-up)"""
+        if self._model.is_ready and self._players_index.is_loaded():
+            return
+        with self._init_lock:
+            if not self._model.is_ready:
+                self._model.initialize()
+            if not self._players_index.is_loaded():
+                self._load_players_index()
     
     def _ensure_model_unpacked(self):
         """Legacy method - delegates to model"""
         return self._model._ensure_model_unpacked()
     
+    async def warm_up(self):
+        """
+        Startup warm-up (called from application lifespan).
+        Loads ONNX models and players index concurrently in worker threads,
+        then runs a warm-up inference. Sets warmed_up when done.
+        """
+        await asyncio.to_thread(self._warm_up_sync)
+    
+    def _warm_up_sync(self):
+        logger.info("[FaceRecognition] Warm-up started")
+        started = time.monotonic()
+        
+        # Lock is held in a worker thread only - requests calling
+        # _ensure_initialized() meanwhile simply wait for warm-up to finish
+        with self._init_lock:
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup") as pool:
+                model_future = pool.submit(self._model.initialize)
+                index_future = pool.submit(self._load_players_index)
+                model_future.result()
+                index_future.result()
+        
+        self._model.warm_up()
+        
+        self.warmed_up = True
+        logger.info(f"[FaceRecognition] Warm-up completed in {time.monotonic() - started:.1f}s")
+    
     def is_ready(self) -> bool:
-        """Check if service is ready"""
-        self._ensure_initialized()
-        return self._model.is_ready
+        """
+        Check if service is ready.
+        Does NOT trigger initialization (health/readiness probes stay cheap).
+        """
+        return self._model.is_ready and self._players_index.is_loaded()
     
     # ==================== Index Operations ====================
     
@@ -440,6 +492,40 @@ class FaceRecognitionService:
             logger.error(f"[FaceRecognition] Error updating face metadata: {e}")
             return {"success": False, "error": str(e)}
 
+    async def update_faces_metadata(
+        self,
+        face_ids: List[str],
+        person_id: Optional[str] = None,
+        verified: Optional[bool] = None,
+        confidence: Optional[float] = None,
+        excluded: Optional[bool] = None
+    ) -> Dict:
+        """
+        Set the same metadata values for multiple faces (see update_face_metadata).
+
+        Returns:
+            Dict with updated count (faces found in index)
+        """
+        self._ensure_initialized()
+
+        if not face_ids:
+            return {"updated": 0}
+
+        try:
+            updated = self._players_index.update_metadata_batch(
+                face_ids,
+                person_id=person_id,
+                verified=verified,
+                confidence=confidence,
+                excluded=excluded
+            )
+            logger.info(f"[FaceRecognition] Updated metadata for {updated}/{len(face_ids)} faces")
+            return {"updated": updated}
+
+        except Exception as e:
+            logger.error(f"[FaceRecognition] Error updating faces metadata: {e}")
+            return {"updated": 0, "error": str(e)}
+
     def get_index_stats(self) -> Dict:
         """Get current index statistics."""
         return self._players_index.get_stats()
@@ -455,18 +541,122 @@ class FaceRecognitionService:
             self._tournament_index.build(tournament_id, embeddings)
             self.index_store[tournament_id] = self._tournament_index.get(tournament_id)
     
+    # ==================== Image Loading ====================
+
+    async def _download_image(self, image_url: str) -> bytes:
+        """Get raw image bytes via shared PhotoCache (downloads on miss)"""
+        image_bytes = await get_photo_cache().get_bytes(image_url)
+
+        logger.info(f"[FaceRecognition] Loaded {len(image_bytes)} bytes")
+        return image_bytes
+
+    def _decode_image(self, image_bytes: bytes, apply_orientation: bool = True) -> np.ndarray:
+        """Decode image bytes to BGR numpy array (single cv2 decode, EXIF-aware)"""
+        return decode_image(image_bytes, apply_orientation=apply_orientation)
+
+    async def _load_image(self, image_url: str, apply_orientation: bool = True) -> np.ndarray:
+        """Download image and decode to BGR numpy array"""
+        return self._decode_image(await self._download_image(image_url), apply_orientation)
+
     # ==================== Face Detection ====================
     
+    def _detect_raw(self, image_bytes: bytes) -> List[Dict]:
+        """
+        Run detection + embedding + blur scoring, without quality filtering.
+        
+        v6.2: Results are cached by image content hash + model version,
+        so repeat detections of the same image skip decode and inference.
+        """
+        cache = get_detection_cache()
+        key = self._detection_key(image_bytes)
+        
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"[FaceRecognition] Detection cache hit: {len(cached)} faces")
+            return cached
+        
+        img_array = self._decode_image(image_bytes)
+        faces = self._model.get_faces(img_array)
+        
+        # Blur for all faces in one pass (single grayscale + Laplacian)
+        blur_scores = calculate_blur_scores(img_array, [face.bbox for face in faces])
+        
+        detections = [
+            {
+                "bbox": face.bbox,
+                "kps": face.kps,
+                "det_score": face.det_score,
+                "blur_score": float(blur_scores[i]),
+                "embedding": face.embedding
+            }
+            for i, face in enumerate(faces)
+        ]
+        
+        cache.put(key, detections)
+        return detections
+    
+    def _detection_key(self, image_bytes: bytes) -> str:
+        return get_detection_cache().make_key(image_bytes, f"{self._model.model_version}/{DECODE_VERSION}")
+    
+    async def _original_blur_scores(
+        self,
+        image_bytes: bytes,
+        detections: List[Dict],
+        coordinate_scale: float,
+        blur_cells: Optional[LaplacianCells],
+        original_url: Optional[str]
+    ) -> Optional[List[float]]:
+        """
+        Blur scores at original resolution for detections of a derivative.
+        
+        Measured once per derivative and stored with its cached detections:
+        from blur_cells (computed during derivative generation) when given,
+        otherwise by decoding original_url. None if neither is available.
+        """
+        if all("original_blur_score" in det for det in detections):
+            return [det["original_blur_score"] for det in detections]
+        
+        bboxes = [det["bbox"] * coordinate_scale for det in detections]
+        if blur_cells is not None:
+            scores = blur_scores_from_cells(blur_cells, bboxes)
+        elif original_url:
+            logger.info("[FaceRecognition] Measuring blur on the original (no Laplacian cells)")
+            original = await self._load_image(original_url)
+            scores = await asyncio.to_thread(calculate_blur_scores, original, bboxes)
+        else:
+            return None
+        
+        for det, score in zip(detections, scores):
+            det["original_blur_score"] = float(score)
+        await asyncio.to_thread(get_detection_cache().put, self._detection_key(image_bytes), detections)
+        return [float(score) for score in scores]
+    
     async def detect_faces(
         self, 
         image_url: str, 
         apply_quality_filters: bool = True,
         min_detection_score: Optional[float] = None,
         min_face_size: Optional[float] = None,
-        min_blur_score: Optional[float] = None
+        min_blur_score: Optional[float] = None,
+        coordinate_scale: float = 1.0,
+        original_url: Optional[str] = None,
+        blur_cells: Optional[LaplacianCells] = None
     ) -> List[Dict]:
         """
         Detect faces on an image from URL with optional quality filtering.
+        
+        Quality filters are applied on top of (possibly cached) raw detections,
+        so changing filter thresholds never requires re-running inference.
+        
+        v6.4: image_url may be a downscaled detection derivative; bbox/kps are
+        multiplied by coordinate_scale to map them back to original pixels
+        (min_face_size is then checked in original pixels too).
+        
+        v6.5: with a derivative, blur_score is measured at original resolution
+        (Laplacian variance grows when an image is downscaled, so derivative
+        scores are not comparable to min_blur_score or stored scores): from
+        blur_cells if the derivative was just generated, otherwise original_url
+        is decoded once and the scores are kept in the detection cache.
         """
         self._ensure_initialized()
         
@@ -483,61 +673,148 @@ class FaceRecognitionService:
             logger.info(f"[FaceRecognition] detect_faces with filters: {filters}")
         
         try:
-            # Download image
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_url, timeout=30.0)
-                response.raise_for_status()
-                image_bytes = response.content
-            
-            logger.info(f"[FaceRecognition] Downloaded {len(image_bytes)} bytes")
+            image_bytes = await self._download_image(image_url)
             
-            # Process image
-            image = Image.open(io.BytesIO(image_bytes))
-            img_array = np.array(image.convert('RGB'))
-            img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            
-            # Detect faces
-            faces = self._model.get_faces(img_array)
+            # Detect faces (raw, cached) - inference off the event loop
+            faces = await asyncio.to_thread(self._detect_raw, image_bytes)
             logger.info(f"[FaceRecognition] Detected {len(faces)} faces before filtering")
             
-            results = []
-            filtered_count = 0
+            if coordinate_scale != 1.0 and faces:
+                blur_scores = await self._original_blur_scores(
+                    image_bytes, faces, coordinate_scale, blur_cells, original_url
+                )
+                if blur_scores is None:
+                    logger.warning("[FaceRecognition] blur_score measured on a downscaled image (no original_url)")
+                    blur_scores = [face["blur_score"] for face in faces]
+                faces = [
+                    {
+                        **face,
+                        "bbox": face["bbox"] * coordinate_scale,
+                        "kps": face["kps"] * coordinate_scale if face["kps"] is not None else None,
+                        "blur_score": score,
+                    }
+                    for face, score in zip(faces, blur_scores)
+                ]
             
-            for idx, face in enumerate(faces):
-                # Calculate blur score
-                blur_score = calculate_blur_score(img_array, face.bbox)
-                
-                if apply_quality_filters:
-                    passes, reason = passes_quality_filters(
-                        face.det_score,
-                        face.bbox,
-                        blur_score,
-                        filters
-                    )
-                    
-                    # v4.2: Use max side for logging (consistent with filter)
-                    face_size = max(face.bbox[2] - face.bbox[0], face.bbox[3] - face.bbox[1])
-                    logger.info(f"[FaceRecognition] Face {idx+1}: det={face.det_score:.3f}, size={face_size:.0f}px, blur={blur_score:.1f} - {reason}")
-                    
-                    if not passes:
-                        filtered_count += 1
-                        continue
-                
-                results.append({
-                    "bbox": face.bbox,
-                    "det_score": face.det_score,
-                    "blur_score": blur_score,
-                    "embedding": face.embedding
-                })
+            if not apply_quality_filters or not faces:
+                return faces
             
-            logger.info(f"[FaceRecognition] After filtering: {len(results)} kept, {filtered_count} filtered")
+            # Vectorized quality stage: boolean masks for all faces at once
+            masks = quality_masks(
+                [face["det_score"] for face in faces],
+                [face["bbox"] for face in faces],
+                [face["blur_score"] for face in faces],
+                filters
+            )
+            passed = masks["passed"]
+            results = [face for face, ok in zip(faces, passed) if ok]
+            
+            # Reasons follow passes_quality_filters precedence: det -> size -> blur
+            low_det = int((~masks["det_ok"]).sum())
+            small = int((masks["det_ok"] & ~masks["size_ok"]).sum())
+            blurry = int((masks["det_ok"] & masks["size_ok"] & ~masks["blur_ok"]).sum())
+            logger.info(
+                f"[FaceRecognition] After filtering: {len(results)} kept, {len(faces) - len(results)} filtered "
+                f"(det_score={low_det}, face_size={small}, blur={blurry})"
+            )
             return results
             
         except Exception as e:
             logger.error(f"[FaceRecognition] ERROR in detect_faces: {e}")
             raise
     
+    # ==================== Embedding Extraction (no full detection) ====================
+
+    def extract_embedding_from_image(
+        self,
+        img_array: np.ndarray,
+        bbox: Dict,
+        kps: Optional[List] = None
+    ) -> Optional[Dict]:
+        """
+        Compute embedding for a stored face without full-image detection.
+
+        - With stored kps: align crop and run only the recognition model.
+        - Without kps: detect on padded bbox region, then recognition.
+
+        Args:
+            img_array: Full image (BGR format)
+            bbox: Stored bbox dict with x, y, width, height
+            kps: Stored 5-point landmarks [[x, y], ...] (optional)
+
+        Returns:
+            Dict with embedding, kps, det_score (None for kps path), bbox, method
+            or None if no face found in region
+        """
+        self._ensure_initialized()
+
+        if kps:
+            embedding = self._model.get_embedding_from_kps(img_array, kps)
+            return {
+                "embedding": embedding,
+                "kps": kps,
+                "det_score": None,
+                "bbox": bbox,
+                "method": "kps",
+            }
+
+        x1, y1 = bbox["x"], bbox["y"]
+        x2, y2 = x1 + bbox["width"], y1 + bbox["height"]
+        face = self._model.detect_in_region(img_array, [x1, y1, x2, y2])
+        if face is None:
+            return None
+
+        return {
+            "embedding": face.embedding,
+            "kps": face.kps.tolist(),
+            "det_score": float(face.det_score),
+            "bbox": {
+                "x": float(face.bbox[0]),
+                "y": float(face.bbox[1]),
+                "width": float(face.bbox[2] - face.bbox[0]),
+                "height": float(face.bbox[3] - face.bbox[1]),
+            },
+            "method": "region",
+        }
+
+    async def extract_embeddings(self, image_url: str, faces: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Compute embeddings for several stored faces of one photo.
+        Image is downloaded once; each face costs one recognition forward pass
+        (plus a small region detection if it has no stored kps).
+
+        Faces stored before EXIF-aware decoding (exif_oriented False) have
+        coordinates in raw orientation; the image is decoded in the frame
+        matching each face.
+
+        Args:
+            image_url: Photo URL
+            faces: List of dicts with insightface_bbox and optional
+                   insightface_kps / exif_oriented (default True)
+
+        Returns:
+            List aligned with faces: result of extract_embedding_from_image or None
+        """
+        self._ensure_initialized()
+        image_bytes = await self._download_image(image_url)
+        images = {}  # apply_orientation -> decoded image
+
+        results = []
+        for face in faces:
+            bbox = face.get("insightface_bbox")
+            if not bbox:
+                results.append(None)
+                continue
+            try:
+                oriented = face.get("exif_oriented", True) is not False
+                if oriented not in images:
+                    images[oriented] = self._decode_image(image_bytes, oriented)
+                results.append(self.extract_embedding_from_image(images[oriented], bbox, face.get("insightface_kps")))
+            except Exception as e:
+                logger.warning(f"[FaceRecognition] Embedding extraction failed for face {face.get('id')}: {e}")
+                results.append(None)
+        return results
+
     # ==================== Face Recognition ====================
     
     async def recognize_face(
@@ -594,53 +871,140 @@ class FaceRecognitionService:
             logger.info("[v6.0] No candidates found in index")
             return None, None
 
-        # Adaptive search with early exit
+        best_person_id, best_final_confidence, iterations, skipped = self._best_match(
+            person_ids, similarities, source_confidences, excluded_flags
+        )
+
+        logger.info(f"[v6.0] Search complete: {iterations} iterations, {skipped} skipped, best={best_final_confidence:.3f}")
+
+        # Check threshold
+        if best_final_confidence >= confidence_threshold:
+            logger.info(f"[v6.0] ✓ Match accepted: person={best_person_id}, confidence={best_final_confidence:.3f}")
+            return best_person_id, best_final_confidence
+        else:
+            logger.info(f"[v6.0] ✗ Below threshold: {best_final_confidence:.3f} < {confidence_threshold:.3f}")
+            return None, None
+    
+    @staticmethod
+    def _best_match(
+        person_ids: List[Optional[str]],
+        similarities: List[float],
+        source_confidences: List[float],
+        excluded_flags: List[bool]
+    ) -> Tuple[Optional[str], float, int, int]:
+        """
+        Adaptive early exit over candidates sorted by similarity (descending).
+
+        final_confidence = source_confidence × similarity; stop when
+        similarity < best (no later candidate can win, since conf ≤ 1.0).
+        Faces without person_id or excluded are skipped.
+
+        Returns:
+            (best_person_id, best_final_confidence, iterations, skipped)
+        """
         best_person_id = None
         best_final_confidence = 0.0
         iterations = 0
         skipped = 0
 
-        for i in range(len(person_ids)):
-            person_id = person_ids[i]
-            similarity = similarities[i]
-            source_conf = source_confidences[i]
-            is_verified = verified_flags[i]
-            is_excluded = excluded_flags[i]
-
+        for person_id, similarity, source_conf, is_excluded in zip(
+            person_ids, similarities, source_confidences, excluded_flags
+        ):
             iterations += 1
 
-            # v6.0: Skip faces without person_id or excluded from recognition
-            # These are in the index but should not contribute to recognition
             if person_id is None or is_excluded:
                 skipped += 1
                 continue
 
-            # Early exit condition: similarity < best means no future candidate can win
-            # Because: future_final = future_conf × future_sim ≤ 1.0 × future_sim ≤ similarity < best
             if similarity < best_final_confidence:
-                logger.info(f"[v6.0] Early exit at iteration {iterations}: sim={similarity:.3f} < best={best_final_confidence:.3f}")
                 break
 
-            # Calculate final confidence
             final_confidence = source_conf * similarity
-
-            # Update best if improved
             if final_confidence > best_final_confidence:
                 best_final_confidence = final_confidence
                 best_person_id = person_id
-                v_marker = "✓" if is_verified else "○"
-                logger.info(f"[v6.0] [{iterations}] {v_marker} New best: person={person_id[:8]}..., sim={similarity:.3f} × conf={source_conf:.3f} = {final_confidence:.3f}")
 
-        logger.info(f"[v6.0] Search complete: {iterations} iterations, {skipped} skipped, best={best_final_confidence:.3f}")
+        return best_person_id, best_final_confidence, iterations, skipped
+
+    async def recognize_faces(
+        self,
+        embeddings: List[np.ndarray],
+        confidence_threshold: Optional[float] = None,
+        top_k: int = 3
+    ) -> List[Dict]:
+        """
+        Recognize all faces of a photo with one index query.
+
+        Same algorithm as recognize_face(), plus the metrics the UI shows,
+        so callers need no per-face index or DB round-trips.
+
+        Args:
+            embeddings: Face embeddings
+            confidence_threshold: Match threshold (config high_data if None - read once)
+            top_k: Number of candidates in top_matches
+
+        Returns:
+            Per embedding: {
+                "person_id", "confidence" (None if below threshold),
+                "distance_to_nearest",
+                "top_matches": [{person_id, similarity, source_verified, source_confidence}]
+            }
+        """
+        self._ensure_initialized()
+
+        if not embeddings:
+            return []
+
+        if confidence_threshold is None:
+            config = self._config.get_recognition_config()
+            confidence_threshold = config.get('confidence_thresholds', {}).get('high_data', 0.60)
+
+        if not self._players_index.is_loaded():
+            try:
+                self._load_players_index()
+            except Exception as e:
+                logger.error(f"[FaceRecognition] Cannot initialize index: {e}")
+
+        max_k = min(50, self._players_index.get_count())
+        batch = self._players_index.query_batch(np.stack(embeddings), k=max_k)
+
+        results = []
+        for person_ids, similarities, verified_flags, source_confidences, excluded_flags in batch:
+            best_person_id, best_confidence, _, _ = self._best_match(
+                person_ids, similarities, source_confidences, excluded_flags
+            )
+            matched = best_person_id is not None and best_confidence >= confidence_threshold
+
+            # Metrics over the 10 nearest (as shown in the UI)
+            distance_to_nearest = None
+            top_matches = []
+            for person_id, similarity, is_verified, source_conf, is_excluded in list(zip(
+                person_ids, similarities, verified_flags, source_confidences, excluded_flags
+            ))[:10]:
+                if person_id is None or is_excluded:
+                    continue
+                if distance_to_nearest is None:
+                    distance_to_nearest = 1.0 - similarity
+                if len(top_matches) < top_k:
+                    top_matches.append({
+                        "person_id": person_id,
+                        "similarity": float(similarity),
+                        "source_verified": is_verified,
+                        "source_confidence": float(source_conf)
+                    })
+
+            results.append({
+                "person_id": best_person_id if matched else None,
+                "confidence": best_confidence if matched else None,
+                "distance_to_nearest": distance_to_nearest,
+                "top_matches": top_matches,
+            })
+
+        matched_count = sum(1 for r in results if r["person_id"])
+        logger.info(f"[FaceRecognition] Batch recognition: {len(results)} faces, {matched_count} matched "
+                    f"(threshold={confidence_threshold:.2f})")
+        return results
 
-        # Check threshold
-        if best_final_confidence >= confidence_threshold:
-            logger.info(f"[v6.0] ✓ Match accepted: person={best_person_id}, confidence={best_final_confidence:.3f}")
-            return best_person_id, best_final_confidence
-        else:
-            logger.info(f"[v6.0] ✗ Below threshold: {best_final_confidence:.3f} < {confidence_threshold:.3f}")
-            return None, None
-    
     # ==================== Quality Filters ====================
     
     def calculate_blur_score(self, image: np.ndarray, bbox: List[float]) -> float:
@@ -727,11 +1091,7 @@ class FaceRecognitionService:
             
             try:
                 contents = await file.read()
-                image = Image.open(io.BytesIO(contents))
-                img_array = np.array(image.convert('RGB'))
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-                
-                faces = self._model.get_faces(img_array)
+                faces = self._detect_raw(contents)
                 logger.info(f"[FaceRecognition] Detected {len(faces)} faces")
                 
                 for face in faces:
@@ -739,12 +1099,12 @@ class FaceRecognitionService:
                     face_data = {
                         "face_id": face_id,
                         "image_name": file.filename,
-                        "bbox": [float(x) for x in face.bbox],
-                        "confidence": float(face.det_score),
-                        "embedding": face.embedding.tolist()
+                        "bbox": [float(x) for x in face["bbox"]],
+                        "confidence": float(face["det_score"]),
+                        "embedding": face["embedding"].tolist()
                     }
                     all_faces.append(face_data)
-                    embeddings.append(face.embedding)
+                    embeddings.append(face["embedding"])
                     
             except Exception as e:
                 logger.error(f"[FaceRecognition] ERROR processing {file.filename}: {e}")
@@ -4,7 +4,6 @@ Groups similar faces together for player identification.
 """
 
 import numpy as np
-import hdbscan
 from typing import List, Dict, Tuple
 import logging
 
@@ -35,6 +34,8 @@ def cluster_faces(
     
     logger.info(f"Starting HDBSCAN clustering on {len(embeddings)} embeddings...")
     
+    import hdbscan  # heavy (sklearn/numba) - imported on first clustering
+
     clusterer = hdbscan.HDBSCAN(
         min_cluster_size=min_cluster_size,
         min_samples=min_samples,
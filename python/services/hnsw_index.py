@@ -8,14 +8,24 @@ v5.0: Incremental operations support
 - Automatic rebuild triggers (5% deleted, 95% capacity)
 """
 
+from __future__ import annotations
+
 import numpy as np
-import hnswlib
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, TYPE_CHECKING
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    import hnswlib
+
+
+def _new_index(dim: int) -> "hnswlib.Index":
+    """Create cosine hnswlib index (hnswlib imported on first use)."""
+    import hnswlib
+    return hnswlib.Index(space="cosine", dim=dim)
+
 # Rebuild thresholds
 DELETED_THRESHOLD = 0.05  # 5% deleted triggers rebuild
 CAPACITY_THRESHOLD = 0.95  # 95% capacity triggers rebuild
@@ -73,7 +83,7 @@ class HNSWIndex:
         v6.1: Used when database has no embeddings yet.
         """
         try:
-            self.index = hnswlib.Index(space='cosine', dim=self.dim)
+            self.index = _new_index(self.dim)
             self.index.init_index(
                 max_elements=initial_capacity,
                 ef_construction=ef_construction,
@@ -169,7 +179,7 @@ class HNSWIndex:
             self.max_elements = int(num_elements * (1 + CAPACITY_BUFFER))
 
             # Create index
-            self.index = hnswlib.Index(space='cosine', dim=dim)
+            self.index = _new_index(dim)
             self.index.init_index(
                 max_elements=self.max_elements,
                 ef_construction=ef_construction,
@@ -418,6 +428,32 @@ class HNSWIndex:
             logger.error(f"Error updating metadata for {face_id}: {e}")
             return False
 
+    def update_metadata_batch(
+        self,
+        face_ids: List[str],
+        person_id: Optional[str] = None,
+        verified: Optional[bool] = None,
+        confidence: Optional[float] = None,
+        excluded: Optional[bool] = None
+    ) -> int:
+        """
+        Set the same metadata values for multiple faces.
+
+        Returns:
+            Number of faces found in index and updated
+        """
+        updated = 0
+        for face_id in face_ids:
+            if self.update_metadata(
+                face_id,
+                person_id=person_id,
+                verified=verified,
+                confidence=confidence,
+                excluded=excluded
+            ):
+                updated += 1
+        return updated
+
     def needs_rebuild(self) -> Tuple[bool, str]:
         """
         Check if index needs rebuilding.
@@ -506,6 +542,51 @@ class HNSWIndex:
             logger.error(f"Error querying HNSW index: {e}")
             return [], [], [], [], []
     
+    def query_batch(
+        self,
+        embeddings: np.ndarray,
+        k: int = 1
+    ) -> List[Tuple[List[Optional[str]], List[float], List[bool], List[float], List[bool]]]:
+        """
+        Query index for several embeddings in one knn_query call.
+
+        Args:
+            embeddings: Query embeddings (N, 512)
+            k: Number of neighbors per embedding
+
+        Returns:
+            One query() result tuple per embedding (same order)
+        """
+        empty = ([], [], [], [], [])
+        n = len(embeddings)
+        if not self.is_loaded() or n == 0:
+            return [empty] * n
+
+        try:
+            k = min(k, self.get_count())
+            if k == 0:
+                return [empty] * n
+
+            labels, distances = self.index.knn_query(
+                np.asarray(embeddings, dtype=np.float32).reshape(n, -1),
+                k=k
+            )
+
+            results = []
+            for row_labels, row_distances in zip(labels, distances):
+                results.append((
+                    [self.ids_map[int(idx)] for idx in row_labels],
+                    [1.0 - float(d) for d in row_distances],
+                    [self.verified_map[int(idx)] for idx in row_labels],
+                    [self.confidence_map[int(idx)] for idx in row_labels],
+                    [self.excluded_map[int(idx)] for idx in row_labels],
+                ))
+            return results
+
+        except Exception as e:
+            logger.error(f"Error querying HNSW index (batch): {e}")
+            return [empty] * n
+    
     def query_raw(
         self,
         embedding: np.ndarray,
@@ -560,7 +641,7 @@ class TournamentIndex:
             dim = len(embeddings[0])
             num_elements = len(embeddings)
             
-            index = hnswlib.Index(space='cosine', dim=dim)
+            index = _new_index(dim)
             index.init_index(
                 max_elements=num_elements * 2,
                 ef_construction=200,
@@ -0,0 +1,245 @@
+"""
+Image derivatives (resized copies of gallery photos).
+
+After upload each photo gets a fixed set of sizes stored in MinIO under
+deterministic names (photos bucket, derived/{photo_id}/{size}.{ext}):
+
+- thumb, grid, lightbox: WebP + JPEG fallback (+ AVIF if the Pillow AVIF
+  plugin is installed) for the gallery UI and face-crop UIs
+- detection: JPEG only, consumed by face detection instead of the original
+
+Generation (one decode, progressive downscale, encode, upload) runs in a
+dedicated thread pool. While the original is decoded, its Laplacian cells
+are computed too, so detection on the derivative can measure blur at
+original resolution without fetching the original again.
+The result is recorded in gallery_images.derivatives:
+
+    {
+        "version": 1,
+        "source": {"width": 6000, "height": 4000},
+        "sizes": {
+            "thumb": {"width": 320, "height": 213, "webp": url, "jpeg": url},
+            ...
+        }
+    }
+
+Gallery listings expose the web sizes to the UI as thumb/grid/lightbox URLs
+and a srcset (services/derivative_urls.py) instead of this manifest.
+"""
+
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import settings
+from core.logging import get_logger
+from infrastructure.minio_storage import get_minio_storage
+from infrastructure.storage import get_photo_cache, decode_image, resize_image
+from services.quality_filters import LaplacianCells, laplacian_cells
+
+logger = get_logger(__name__)
+
+# Bump to regenerate derivatives of all photos (worker checks version)
+DERIVATIVES_VERSION = 1
+
+BUCKET = "photos"
+
+# Longest side in pixels. Order matters: each size is downscaled from the previous one.
+DERIVATIVE_SIZES = {
+    "lightbox": 2048,
+    "detection": 1920,
+    "grid": 960,
+    "thumb": 320,
+}
+
+# Sizes used only by the backend (no web formats)
+INTERNAL_SIZES = {"detection"}
+
+JPEG_QUALITY = 85
+DETECTION_JPEG_QUALITY = 95
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+CONTENT_TYPES = {
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+
+def _avif_available() -> bool:
+    """AVIF needs the optional pillow-avif-plugin (Pillow 10 has no AVIF encoder)."""
+    try:
+        import pillow_avif  # noqa: F401 - registers AVIF with Pillow
+        from PIL import Image
+        return "AVIF" in Image.SAVE
+    except ImportError:
+        return False
+
+
+def object_name(photo_id: str, size: str, fmt: str) -> str:
+    """Deterministic MinIO object name of a derivative."""
+    ext = "jpg" if fmt == "jpeg" else fmt
+    return f"derived/{photo_id}/{size}.{ext}"
+
+
+def is_current(derivatives: Optional[Dict]) -> bool:
+    """True if derivatives were generated by the current DERIVATIVES_VERSION."""
+    return bool(derivatives) and derivatives.get("version") == DERIVATIVES_VERSION
+
+
+def detection_source(photo: Dict) -> Tuple[str, float]:
+    """
+    URL to run detection on + factor that maps its coordinates to the original.
+
+    Args:
+        photo: gallery_images row with image_url and derivatives
+
+    Returns:
+        (url, coordinate_scale) - detection derivative if available,
+        otherwise (image_url, 1.0)
+    """
+    derivatives = photo.get("derivatives") or {}
+    detection = derivatives.get("sizes", {}).get("detection")
+    source = derivatives.get("source")
+
+    if detection and detection.get("jpeg") and detection.get("width") and source:
+        return detection["jpeg"], source["width"] / detection["width"]
+    return photo["image_url"], 1.0
+
+
+class ImageDerivativeService:
+    """Generates and stores derivatives in a dedicated thread pool."""
+
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.derivative_workers,
+            thread_name_prefix="derivatives"
+        )
+        self.avif_enabled = _avif_available()
+        logger.info(f"ImageDerivativeService: formats webp, jpeg{', avif' if self.avif_enabled else ''}")
+
+    async def generate(self, photo_id: str, image_bytes: bytes) -> Tuple[Dict, Optional[LaplacianCells]]:
+        """
+        Generate all derivatives of a photo and upload them to MinIO.
+
+        Returns:
+            (derivatives manifest to store in gallery_images.derivatives,
+            Laplacian cells of the original for blur scoring - None if the
+            detection size is the original itself)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._generate_sync, photo_id, image_bytes)
+
+    def _generate_sync(self, photo_id: str, image_bytes: bytes) -> Tuple[Dict, Optional[LaplacianCells]]:
+        minio = get_minio_storage()
+        photo_cache = get_photo_cache()
+
+        image = decode_image(image_bytes)
+        height, width = image.shape[:2]
+
+        # About one cell per detection-size pixel
+        detection_side = DERIVATIVE_SIZES["detection"]
+        blur_cells = None
+        if max(width, height) > detection_side:
+            blur_cells = laplacian_cells(image, max(1, round(max(width, height) / detection_side)))
+
+        sizes = {}
+        uploaded_bytes = 0
+        for size, max_side in DERIVATIVE_SIZES.items():
+            image = resize_image(image, max_side)
+            h, w = image.shape[:2]
+            entry = {"width": w, "height": h}
+
+            for fmt, data in self._encode(image, size).items():
+                url = minio.put_object_bytes(
+                    BUCKET, object_name(photo_id, size, fmt), data, CONTENT_TYPES[fmt]
+                )
+                entry[fmt] = url
+                uploaded_bytes += len(data)
+
+                if size == "detection":
+                    # Detection runs right after generation - skip the download
+                    photo_cache.put_bytes(url, data)
+
+            sizes[size] = entry
+
+        logger.info(
+            f"Derivatives for {photo_id[:8]}: {width}x{height}, "
+            f"{len(image_bytes) // 1024} KB original -> {uploaded_bytes // 1024} KB total"
+        )
+        return {
+            "version": DERIVATIVES_VERSION,
+            "source": {"width": width, "height": height},
+            "sizes": sizes,
+        }, blur_cells
+
+    def _encode(self, image: np.ndarray, size: str) -> Dict[str, bytes]:
+        """Encode one size in all its formats."""
+        if size in INTERNAL_SIZES:
+            return {"jpeg": _imencode(image, ".jpg", [cv2.IMWRITE_JPEG_QUALITY, DETECTION_JPEG_QUALITY])}
+
+        encoded = {
+            "webp": _imencode(image, ".webp", [cv2.IMWRITE_WEBP_QUALITY, WEBP_QUALITY]),
+            "jpeg": _imencode(image, ".jpg", [
+                cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY,
+                cv2.IMWRITE_JPEG_PROGRESSIVE, 1,
+            ]),
+        }
+        if self.avif_enabled:
+            encoded["avif"] = _encode_avif(image)
+        return encoded
+
+    def delete(self, photo_id: str) -> int:
+        """Delete all derivatives of a photo. Returns number of objects deleted."""
+        return get_minio_storage().delete_prefix(BUCKET, f"derived/{photo_id}/")
+
+    def delete_many(self, photos: List[Dict]) -> int:
+        """
+        Delete derivatives of many photos in batched requests (no listing).
+
+        Args:
+            photos: gallery_images rows with derivatives manifest
+
+        Returns:
+            Number of objects deleted
+        """
+        urls = [
+            url
+            for photo in photos
+            for entry in ((photo.get("derivatives") or {}).get("sizes") or {}).values()
+            for fmt, url in entry.items()
+            if fmt in CONTENT_TYPES
+        ]
+        return get_minio_storage().delete_files(urls)
+
+
+def _imencode(image: np.ndarray, ext: str, params) -> bytes:
+    success, encoded = cv2.imencode(ext, image, params)
+    if not success:
+        raise ValueError(f"Failed to encode derivative as {ext}")
+    return encoded.tobytes()
+
+
+def _encode_avif(image: np.ndarray) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)).save(buffer, "AVIF", quality=AVIF_QUALITY)
+    return buffer.getvalue()
+
+
+# Global instance
+_derivative_service: Optional[ImageDerivativeService] = None
+
+
+def get_image_derivative_service() -> ImageDerivativeService:
+    """Get singleton ImageDerivativeService instance."""
+    global _derivative_service
+    if _derivative_service is None:
+        _derivative_service = ImageDerivativeService()
+    return _derivative_service
@@ -1,20 +1,80 @@
 """
 InsightFace model initialization and management.
 Handles model unpacking and lazy initialization.
+
+v2.0: Lean model loading
+- Only detection (SCRFD) and recognition (ArcFace) models are loaded,
+  landmark_3d_68 / landmark_2d_106 / genderage are skipped
+- Explicit ONNX Runtime session options (threads, full graph optimization)
+- Optimized models cached on disk (CPU provider)
+- Configurable execution provider: CPU or OpenVINO
 """
 
+from __future__ import annotations
+
 import os
 import zipfile
 import shutil
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 
-from insightface.app import FaceAnalysis
+from typing import TYPE_CHECKING
+import numpy as np
+
+# onnxruntime / insightface are imported lazily (inside methods):
+# importing this module must stay cheap for API-only processes.
+if TYPE_CHECKING:
+    import onnxruntime as ort
+    from insightface.app.common import Face
+    from insightface.model_zoo.scrfd import SCRFD
+    from insightface.model_zoo.arcface_onnx import ArcFaceONNX
+
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# antelopev2 pack files that we actually use
+DETECTION_MODEL_FILE = 'scrfd_10g_bnkps.onnx'
+RECOGNITION_MODEL_FILE = 'glintr100.onnx'
+
+DET_SIZE = (640, 640)
+DET_THRESH = 0.5
+
+
+class LeanFaceAnalysis:
+    """
+    Minimal replacement for insightface FaceAnalysis.
+    Holds only detection + recognition models and mirrors FaceAnalysis.get().
+    """
+
+    def __init__(self, det_model: SCRFD, rec_model: ArcFaceONNX):
+        self.det_model = det_model
+        self.rec_model = rec_model
+        self.models = {
+            'detection': det_model,
+            'recognition': rec_model,
+        }
+
+    def get(self, img, max_num: int = 0) -> List[Face]:
+        """Detect faces and compute embeddings (same output as FaceAnalysis.get)"""
+        from insightface.app.common import Face
+        bboxes, kpss = self.det_model.detect(img, max_num=max_num, metric='default')
+        if bboxes.shape[0] == 0:
+            return []
+
+        faces = []
+        for i in range(bboxes.shape[0]):
+            face = Face(
+                bbox=bboxes[i, 0:4],
+                kps=kpss[i] if kpss is not None else None,
+                det_score=bboxes[i, 4]
+            )
+            self.rec_model.get(img, face)
+            faces.append(face)
+        return faces
+
 
 class InsightFaceModel:
     """
@@ -25,7 +85,7 @@ class InsightFaceModel:
     MODEL_NAME = 'antelopev2'
     
     def __init__(self):
-        self.app: Optional[FaceAnalysis] = None
+        self.app: Optional[LeanFaceAnalysis] = None
         self._initialized = False
     
     @property
@@ -33,6 +93,12 @@ class InsightFaceModel:
         """Check if model is initialized and ready"""
         return self._initialized and self.app is not None
     
+    @property
+    def model_version(self) -> str:
+        """Identifies detection output (used as part of detection cache keys)"""
+        return (f"{self.MODEL_NAME}/{DETECTION_MODEL_FILE}/{RECOGNITION_MODEL_FILE}/"
+                f"{DET_SIZE[0]}x{DET_SIZE[1]}/{DET_THRESH}")
+    
     def _get_model_paths(self):
         """Get paths for model directory and zip file"""
         home_dir = Path.home()
@@ -102,6 +168,109 @@ class InsightFaceModel:
             logger.error(f"Error unpacking model: {type(e).__name__}: {e}")
             return False
     
+    # ==================== ONNX Runtime Sessions ====================
+
+    def _get_providers(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Resolve execution providers from settings.
+        Falls back to CPU if OpenVINO is requested but not available.
+        """
+        import onnxruntime as ort
+
+        requested = settings.onnx_execution_provider
+        available = ort.get_available_providers()
+
+        if requested == "openvino":
+            if 'OpenVINOExecutionProvider' in available:
+                cache_dir = self._get_cache_dir() / "openvino"
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                return (
+                    ['OpenVINOExecutionProvider', 'CPUExecutionProvider'],
+                    [{'device_type': 'CPU', 'cache_dir': str(cache_dir)}, {}]
+                )
+            logger.warning(f"OpenVINOExecutionProvider not available ({available}), falling back to CPU")
+
+        return ['CPUExecutionProvider'], [{}]
+
+    def _get_cache_dir(self) -> Path:
+        """Directory for optimized model cache"""
+        cache_dir = settings.onnx_cache_dir or os.path.join(settings.cache_dir, "onnx")
+        return Path(cache_dir)
+
+    def _create_session_options(self) -> ort.SessionOptions:
+        """Session options with explicit thread counts"""
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = settings.onnx_intra_op_threads
+        opts.inter_op_num_threads = settings.onnx_inter_op_threads
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        return opts
+
+    def _create_session(self, model_path: Path) -> ort.InferenceSession:
+        """
+        Create InferenceSession for a single model file.
+
+        CPU provider: on first load the model is optimized with ORT_ENABLE_ALL and
+        saved to the cache dir; next loads read the cached file and skip optimization.
+        OpenVINO provider: compiled blobs are cached by OpenVINO itself (cache_dir).
+        """
+        import onnxruntime as ort
+
+        providers, provider_options = self._get_providers()
+        opts = self._create_session_options()
+
+        if providers[0] == 'CPUExecutionProvider':
+            cache_dir = self._get_cache_dir()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Optimized graph is hardware/version specific - include ORT version in name
+            cached_path = cache_dir / f"{model_path.stem}.ort{ort.__version__}.optimized.onnx"
+
+            if cached_path.exists():
+                opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                logger.info(f"Loading cached optimized model: {cached_path.name}")
+                try:
+                    return ort.InferenceSession(
+                        str(cached_path), sess_options=opts,
+                        providers=providers, provider_options=provider_options
+                    )
+                except Exception as e:
+                    logger.warning(f"Cached model {cached_path.name} is unusable ({e}), re-optimizing")
+                    cached_path.unlink(missing_ok=True)
+                    opts = self._create_session_options()
+
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            opts.optimized_model_filepath = str(cached_path)
+        else:
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        return ort.InferenceSession(
+            str(model_path), sess_options=opts,
+            providers=providers, provider_options=provider_options
+        )
+
+    def _load_models(self, model_dir: Path) -> LeanFaceAnalysis:
+        """Load detection + recognition models only"""
+        from insightface.model_zoo.scrfd import SCRFD
+        from insightface.model_zoo.arcface_onnx import ArcFaceONNX
+
+        det_path = model_dir / DETECTION_MODEL_FILE
+        rec_path = model_dir / RECOGNITION_MODEL_FILE
+
+        for path in (det_path, rec_path):
+            if not path.exists():
+                raise RuntimeError(f"Model file not found: {path}")
+
+        det_model = SCRFD(model_file=str(det_path), session=self._create_session(det_path))
+        rec_model = ArcFaceONNX(model_file=str(rec_path), session=self._create_session(rec_path))
+
+        # ctx_id >= 0: prepare() resets providers to CPU for ctx_id < 0,
+        # which would drop our session (and OpenVINO provider) and reload the model
+        det_model.prepare(0, input_size=DET_SIZE, det_thresh=DET_THRESH)
+        rec_model.prepare(0)
+
+        return LeanFaceAnalysis(det_model, rec_model)
+
     def initialize(self) -> bool:
         """
         Initialize InsightFace model.
@@ -137,8 +306,10 @@ class InsightFaceModel:
                     # Try to trigger InsightFace download
                     logger.info("Zip not found, triggering InsightFace download...")
                     try:
+                        from insightface.app import FaceAnalysis
                         temp_app = FaceAnalysis(
                             name=self.MODEL_NAME,
+                            allowed_modules=['detection'],
                             providers=['CPUExecutionProvider']
                         )
                         del temp_app
@@ -163,26 +334,12 @@ class InsightFaceModel:
             if not model_ready:
                 raise RuntimeError("Model not ready after initialization attempts")
             
-            # Step 3: Create FaceAnalysis
-            logger.info("Creating FaceAnalysis...")
-            self.app = FaceAnalysis(
-                name=self.MODEL_NAME,
-                providers=['CPUExecutionProvider']
-            )
-            logger.info("FaceAnalysis created successfully")
-            
-            # Step 4: Prepare model
-            logger.info("Loading models into memory (prepare)...")
-            self.app.prepare(ctx_id=-1, det_size=(640, 640))
-            logger.info("prepare() completed successfully")
-            
-            # Step 5: Verify models loaded
-            if hasattr(self.app, 'models'):
-                models_list = list(self.app.models.keys())
-                logger.info(f"Models loaded: {models_list}")
-                
-                if 'detection' not in models_list:
-                    raise RuntimeError("'detection' model not loaded")
+            # Step 3: Load detection + recognition sessions
+            providers, _ = self._get_providers()
+            logger.info(f"Loading models (providers={providers}, "
+                        f"intra_op={settings.onnx_intra_op_threads}, inter_op={settings.onnx_inter_op_threads})...")
+            self.app = self._load_models(model_dir)
+            logger.info(f"Models loaded: {list(self.app.models.keys())}")
             
             self._initialized = True
             logger.info("========== INSIGHTFACE READY FOR USE ==========")
@@ -194,6 +351,23 @@ class InsightFaceModel:
             logger.error(f"Error message: {str(e)}")
             raise
     
+    def warm_up(self):
+        """
+        Run one dummy inference through detection and recognition models.
+        First ONNX Runtime run allocates buffers and selects kernels - do it
+        at startup instead of on the first real request.
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        det_input = np.zeros((DET_SIZE[1], DET_SIZE[0], 3), dtype=np.uint8)
+        self.app.det_model.detect(det_input, max_num=0, metric='default')
+        
+        rec_input = np.zeros((112, 112, 3), dtype=np.uint8)
+        self.app.rec_model.get_feat(rec_input)
+        
+        logger.info("InsightFace warm-up inference completed")
+    
     def get_faces(self, img_array):
         """
         Detect faces on image.
@@ -209,6 +383,77 @@ class InsightFaceModel:
         
         return self.app.get(img_array)
 
+    def get_embedding_from_kps(self, img_array, kps) -> np.ndarray:
+        """
+        Compute embedding for a face with known 5-point landmarks.
+        Runs ONLY the recognition model (no detection).
+
+        Args:
+            img_array: Full image as numpy array (BGR format)
+            kps: 5x2 landmarks in image coordinates
+
+        Returns:
+            512-dim embedding (not normalized, same as Face.embedding)
+        """
+        if not self._initialized:
+            self.initialize()
+
+        from insightface.utils import face_align
+
+        rec_model = self.app.rec_model
+        kps = np.asarray(kps, dtype=np.float32).reshape(5, 2)
+        aligned = face_align.norm_crop(img_array, landmark=kps, image_size=rec_model.input_size[0])
+        return rec_model.get_feat(aligned).flatten()
+
+    def detect_in_region(self, img_array, bbox, padding: float = 0.5) -> Optional[Face]:
+        """
+        Detect a face inside a padded bbox region instead of the full image.
+        Used when stored face has no landmarks.
+
+        Args:
+            img_array: Full image as numpy array (BGR format)
+            bbox: [x1, y1, x2, y2] in image coordinates
+            padding: Region padding relative to bbox size (0.5 = 50% on each side)
+
+        Returns:
+            Face with bbox/kps in full-image coordinates and embedding, or None
+        """
+        from insightface.app.common import Face
+
+        if not self._initialized:
+            self.initialize()
+
+        h, w = img_array.shape[:2]
+        x1, y1, x2, y2 = [float(v) for v in bbox]
+        pad_x = (x2 - x1) * padding
+        pad_y = (y2 - y1) * padding
+        rx1 = max(0, int(x1 - pad_x))
+        ry1 = max(0, int(y1 - pad_y))
+        rx2 = min(w, int(x2 + pad_x))
+        ry2 = min(h, int(y2 + pad_y))
+
+        if rx2 <= rx1 or ry2 <= ry1:
+            return None
+
+        region = img_array[ry1:ry2, rx1:rx2]
+        bboxes, kpss = self.app.det_model.detect(region, max_num=0, metric='default')
+        if bboxes.shape[0] == 0 or kpss is None:
+            return None
+
+        # Pick detection closest to the region center (the stored face)
+        offset = np.array([rx1, ry1], dtype=np.float32)
+        target_center = np.array([(x1 + x2) / 2, (y1 + y2) / 2], dtype=np.float32)
+        centers = (bboxes[:, 0:2] + bboxes[:, 2:4]) / 2 + offset
+        best = int(np.argmin(np.linalg.norm(centers - target_center, axis=1)))
+
+        face = Face(
+            bbox=bboxes[best, 0:4] + np.tile(offset, 2),
+            kps=kpss[best] + offset,
+            det_score=bboxes[best, 4]
+        )
+        face.embedding = self.get_embedding_from_kps(img_array, face.kps)
+        return face
+
 
 # Global singleton instance
 _model_instance: Optional[InsightFaceModel] = None
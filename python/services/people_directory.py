@@ -0,0 +1,208 @@
+"""
+In-memory directory of people (names, slugs, avatars, privacy flags, thresholds).
+
+Recognition and people endpoints look up names/slugs of many people per
+request; with the directory these are dictionary reads instead of one
+people query per face.
+
+Loaded lazily on first use, then refreshed by delta (updated_at >= last
+seen, kept current by the people_set_updated_at trigger) every
+REFRESH_SECONDS, with a full reload every FULL_RELOAD_SECONDS to drop
+people deleted by other workers. People CRUD endpoints call invalidate()
+so changes in this process are visible immediately; ids missing from the
+directory (e.g. just created elsewhere) are fetched in one query by
+get_many().
+
+Lookups may query the database (periodic refresh, missing ids), so async
+handlers call them through the Supabase pool. The directory can still hold
+a person deleted by another worker until the next full reload; endpoints
+that write rows referencing a person check the people table instead.
+
+Usage:
+    from services.people_directory import get_people_directory
+    from services.supabase.aio import as_async
+
+    people = await as_async(get_people_directory()).get_many(person_ids)
+    name = get_people_directory().display_name(person_id)  # sync code / pool threads
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from core.logging import get_logger
+from core.slug import is_uuid
+from services.supabase.base import get_supabase_client
+
+logger = get_logger(__name__)
+
+FIELDS = (
+    "id, real_name, telegram_full_name, telegram_username, slug, category, avatar_url, "
+    "show_in_players_gallery, show_photos_in_galleries, show_name_on_photos, "
+    "show_telegram_username, show_social_links, "
+    "custom_confidence_threshold, use_custom_confidence, updated_at"
+)
+PAGE_SIZE = 1000
+IN_CHUNK_SIZE = 200
+REFRESH_SECONDS = 60.0
+FULL_RELOAD_SECONDS = 900.0
+
+
+class PeopleDirectory:
+    """id -> person entry (FIELDS) with slug lookup and bulk reads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._people: Dict[str, Dict] = {}
+        self._by_slug: Dict[str, str] = {}
+        self._loaded = False
+        self._last_seen: Optional[str] = None  # max updated_at loaded from DB
+        self._refreshed_at = 0.0
+        self._reloaded_at = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self._people)
+
+    def _fetch(self, since: Optional[str] = None) -> List[Dict]:
+        client = get_supabase_client()
+        rows = []
+        offset = 0
+        while True:
+            query = client.table("people").select(FIELDS)
+            if since:
+                query = query.gte("updated_at", since)
+            result = query.order("id").range(offset, offset + PAGE_SIZE - 1).execute()
+            batch = result.data or []
+            rows.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    def _fetch_ids(self, ids: List[str]) -> List[Dict]:
+        client = get_supabase_client()
+        rows = []
+        for i in range(0, len(ids), IN_CHUNK_SIZE):
+            result = client.table("people").select(FIELDS).in_("id", ids[i:i + IN_CHUNK_SIZE]).execute()
+            rows.extend(result.data or [])
+        return rows
+
+    def _put_locked(self, rows: Iterable[Dict]):
+        for row in rows:
+            old = self._people.get(row["id"])
+            if old and old.get("slug") and self._by_slug.get(old["slug"]) == row["id"]:
+                del self._by_slug[old["slug"]]
+            self._people[row["id"]] = row
+            if row.get("slug"):
+                self._by_slug[row["slug"]] = row["id"]
+            if row.get("updated_at") and (self._last_seen is None or row["updated_at"] > self._last_seen):
+                self._last_seen = row["updated_at"]
+
+    def refresh(self, full: bool = False):
+        """Reload all people, or only those updated since the last refresh."""
+        full = full or not self._loaded
+        rows = self._fetch(None if full else self._last_seen)
+        now = time.monotonic()
+
+        with self._lock:
+            if full:
+                self._people = {}
+                self._by_slug = {}
+                self._last_seen = None
+                self._reloaded_at = now
+            self._put_locked(rows)
+            self._loaded = True
+            self._refreshed_at = now
+
+        if full:
+            logger.info(f"[People] Directory loaded: {self.size} people")
+        elif rows:
+            logger.debug(f"[People] Directory refreshed: {len(rows)} updated")
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._loaded and now - self._refreshed_at < REFRESH_SECONDS:
+            return
+        try:
+            self.refresh(full=now - self._reloaded_at > FULL_RELOAD_SECONDS)
+        except Exception as e:
+            # Keep serving the current entries; retry on the next refresh interval
+            logger.error(f"[People] Directory refresh failed: {e}")
+            self._refreshed_at = now
+
+    def get_many(self, ids: Iterable[str]) -> Dict[str, Dict]:
+        """Entries for ids (missing ones fetched in one query); unknown ids are left out."""
+        self._ensure_fresh()
+        ids = list({person_id for person_id in ids if person_id})
+        found = {person_id: self._people[person_id] for person_id in ids if person_id in self._people}
+
+        missing = [person_id for person_id in ids if person_id not in found]
+        if missing:
+            try:
+                rows = self._fetch_ids(missing)
+            except Exception as e:
+                logger.warning(f"[People] Could not fetch {len(missing)} people: {e}")
+                rows = []
+            with self._lock:
+                self._put_locked(rows)
+            found.update({row["id"]: row for row in rows})
+        return found
+
+    def get(self, person_id: str) -> Optional[Dict]:
+        if not person_id:
+            return None
+        return self.get_many([person_id]).get(person_id)
+
+    def get_by_slug(self, slug: str) -> Optional[Dict]:
+        self._ensure_fresh()
+        person_id = self._by_slug.get(slug)
+        if person_id:
+            return self._people.get(person_id)
+
+        result = get_supabase_client().table("people").select(FIELDS).eq("slug", slug).execute()
+        if not result.data:
+            return None
+        with self._lock:
+            self._put_locked(result.data)
+        return result.data[0]
+
+    def resolve(self, identifier: str) -> Optional[Dict]:
+        """Entry by ID or slug (same order as core.slug.resolve_identifier)."""
+        if is_uuid(identifier):
+            return self.get(identifier) or self.get_by_slug(identifier)
+        return self.get_by_slug(identifier) or self.get(identifier)
+
+    def all(self) -> List[Dict]:
+        """All people, ordered by real_name."""
+        self._ensure_fresh()
+        return sorted(self._people.values(), key=lambda p: p.get("real_name") or "")
+
+    def display_name(self, person_id: str, default: str = "Unknown") -> str:
+        person = self.get(person_id)
+        if not person:
+            return default
+        return person.get("real_name") or person.get("telegram_full_name") or default
+
+    def invalidate(self, person_id: str = None):
+        """Drop one person (re-fetched on next lookup) or the whole directory."""
+        with self._lock:
+            if person_id is None:
+                self._people = {}
+                self._by_slug = {}
+                self._loaded = False
+                return
+            old = self._people.pop(person_id, None)
+            if old and old.get("slug") and self._by_slug.get(old["slug"]) == person_id:
+                del self._by_slug[old["slug"]]
+
+
+# Global instance
+_people_directory: Optional[PeopleDirectory] = None
+
+
+def get_people_directory() -> PeopleDirectory:
+    """Get singleton PeopleDirectory instance."""
+    global _people_directory
+    if _people_directory is None:
+        _people_directory = PeopleDirectory()
+    return _people_directory
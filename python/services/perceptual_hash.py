@@ -0,0 +1,124 @@
+"""
+Perceptual hashing for near-duplicate photo detection.
+
+dHash (difference hash) on a small grayscale thumbnail: 64 bits, robust to
+re-encoding, resizing and small exposure changes. Hamming distance between
+hashes ~ visual difference (bursts / duplicate exports: 0-6 bits).
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+HASH_SIZE = 8  # 8x8 = 64-bit hash
+
+PAGE_SIZE = 1000  # PostgREST max rows per request
+# Gallery hashes are reloaded after this long to pick up photos processed by other workers
+INDEX_TTL_SECONDS = 60.0
+
+
+def dhash(image: np.ndarray) -> str:
+    """
+    Compute dHash of an image.
+
+    Args:
+        image: Image array (BGR or grayscale). A reduced decode
+               (decode_image(..., scale=8)) is enough.
+
+    Returns:
+        64-bit hash as 16-char hex string
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = int(np.packbits(bits).view(">u8")[0])
+    return f"{value:016x}"
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """Number of differing bits between two hex hashes."""
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count("1")
+
+
+class GalleryHashIndex:
+    """
+    Per-gallery in-memory index of perceptual hashes of processed photos.
+    Loaded lazily from gallery_images.perceptual_hash on lookup and reloaded
+    after INDEX_TTL_SECONDS.
+    """
+
+    def __init__(self, supabase_client_getter, ttl_seconds: float = INDEX_TTL_SECONDS):
+        self._get_client = supabase_client_getter
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._galleries: Dict[str, List[Tuple[str, int]]] = {}  # gallery_id -> [(photo_id, hash)]
+        self._loaded_at: Dict[str, float] = {}
+
+    def _fetch(self, gallery_id: str) -> List[Tuple[str, int]]:
+        """All hashes of a gallery (keyset pagination on id)."""
+        client = self._get_client()
+        entries = []
+        last_id = None
+        while True:
+            query = client.table("gallery_images").select(
+                "id, perceptual_hash"
+            ).eq("gallery_id", gallery_id).not_.is_("perceptual_hash", "null")
+            if last_id:
+                query = query.gt("id", last_id)
+            result = query.order("id").limit(PAGE_SIZE).execute()
+            batch = result.data or []
+            entries.extend((row["id"], int(row["perceptual_hash"], 16)) for row in batch)
+            if len(batch) < PAGE_SIZE:
+                return entries
+            last_id = batch[-1]["id"]
+
+    def _load(self, gallery_id: str) -> List[Tuple[str, int]]:
+        with self._lock:
+            loaded_at = self._loaded_at.get(gallery_id)
+            if loaded_at is not None and time.monotonic() - loaded_at < self._ttl:
+                return self._galleries[gallery_id]
+
+        entries = self._fetch(gallery_id)
+        with self._lock:
+            self._galleries[gallery_id] = entries
+            self._loaded_at[gallery_id] = time.monotonic()
+            return entries
+
+    def find_duplicate(self, gallery_id: str, phash: str, max_distance: int) -> Optional[str]:
+        """
+        Find closest processed photo in gallery within max_distance bits.
+
+        Returns:
+            photo_id of the original or None
+        """
+        entries = self._load(gallery_id)
+        if not entries:
+            return None
+
+        value = int(phash, 16)
+        best_id, best_distance = None, max_distance + 1
+        for photo_id, other in entries:
+            distance = bin(value ^ other).count("1")
+            if distance < best_distance:
+                best_id, best_distance = photo_id, distance
+        return best_id
+
+    def add(self, gallery_id: str, photo_id: str, phash: str):
+        """Add a just-processed photo (galleries not loaded yet pick it up from DB)."""
+        with self._lock:
+            entries = self._galleries.get(gallery_id)
+            if entries is not None:
+                entries.append((photo_id, int(phash, 16)))
+
+    def remove(self, gallery_id: str, photo_id: str):
+        with self._lock:
+            entries = self._galleries.get(gallery_id)
+            if entries:
+                self._galleries[gallery_id] = [e for e in entries if e[0] != photo_id]
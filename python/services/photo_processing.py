@@ -0,0 +1,382 @@
+"""
+Background photo processing (detection + recognition after upload).
+
+/images/batch-add enqueues inserted photos into photo_processing_queue
+(persistent, survives restarts). An in-process worker started from the
+application lifespan takes jobs, detects faces with the DB quality filters,
+runs recognition and saves results as UNVERIFIED photo_faces (+ index).
+
+When an admin later opens the photo, /process-photo finds existing faces
+and takes the fast CASE 2 path (index search only).
+
+Near-duplicates (bursts, duplicate exports): each photo gets a perceptual
+hash (dHash); if a processed photo in the same gallery is within
+DUPLICATE_HASH_DISTANCE bits, its faces are copied (bbox scaled) and only
+recognition runs - no detection. The photo is marked duplicate_of.
+
+Identical content (same sha256, see content_store.py) in any gallery is
+reused the same way; duplicate stored objects are replaced by the canonical one.
+
+Each photo also gets its image derivatives (thumb/grid/lightbox/detection,
+see image_derivatives.py); detection runs on the detection-size derivative.
+
+Detected faces matching a rejected cluster (spectators, see
+rejected_faces_index.py) are dropped before recognition.
+
+All database calls run in the Supabase thread pool (services/supabase/aio.py)
+so background processing never blocks request handling on the event loop.
+"""
+
+import asyncio
+import json
+import time
+from typing import List, Dict, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from core.config import settings
+from core.logging import get_logger
+from infrastructure.storage import get_photo_cache, decode_image
+from services.perceptual_hash import dhash, GalleryHashIndex
+from services.image_derivatives import get_image_derivative_service, is_current, detection_source
+from services.content_store import assign_photo_content
+from services.rejected_faces_index import get_rejected_faces_index
+from services.supabase import get_supabase_service, get_supabase_client
+from services.supabase.aio import execute, run
+from services.supabase.processing_queue import get_processing_queue_repository
+
+if TYPE_CHECKING:
+    from services.face_recognition import FaceRecognitionService
+    from services.quality_filters import LaplacianCells
+
+logger = get_logger(__name__)
+
+
+class PhotoProcessingWorker:
+    """Single in-process consumer of photo_processing_queue."""
+
+    def __init__(self, face_service: "FaceRecognitionService"):
+        self.face_service = face_service
+        self.queue = get_processing_queue_repository()
+        self.supabase = get_supabase_service()
+        self.batch_size = settings.photo_queue_batch_size
+        self.poll_interval = settings.photo_queue_poll_seconds
+        self.max_attempts = settings.photo_queue_max_attempts
+        self.lease_seconds = settings.photo_queue_lease_seconds
+        self.hash_index = GalleryHashIndex(get_supabase_client)
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_reset = 0.0
+
+    def start(self):
+        """Start worker loop (call from running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info("[Queue] Photo processing worker started")
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def notify(self):
+        """Wake worker immediately (new jobs enqueued). Call on the event loop."""
+        self._wake.set()
+
+    async def _reset_stale(self):
+        """Recover jobs of crashed workers, at most once per lease period."""
+        now = time.monotonic()
+        if self._last_reset and now - self._last_reset < self.lease_seconds:
+            return
+        self._last_reset = now
+        try:
+            await run(self.queue.reset_stale, self.lease_seconds)
+        except Exception as e:
+            logger.error(f"[Queue] Failed to reset stale jobs: {e}")
+
+    async def run(self):
+        while True:
+            await self._reset_stale()
+            try:
+                jobs = await run(self.queue.claim_pending, self.batch_size)
+            except Exception as e:
+                logger.error(f"[Queue] Failed to claim jobs: {e}")
+                jobs = []
+
+            if not jobs:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for job in jobs:
+                await self._run_job(job)
+
+    async def _run_job(self, job: dict):
+        job_id = job["id"]
+        photo_id = job["photo_id"]
+        try:
+            if not await run(self.queue.renew, job_id):
+                logger.warning(f"[Queue] Lease on photo {photo_id[:8]} expired, skipping")
+                return
+            faces_count = await self.process_photo(photo_id)
+            await run(self.queue.mark_done, job_id, faces_count)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            attempts = (job.get("attempts") or 0) + 1
+            retry = attempts < self.max_attempts
+            logger.error(f"[Queue] Photo {photo_id[:8]} failed (attempt {attempts}/{self.max_attempts}): {e}")
+            try:
+                await run(self.queue.mark_failed, job_id, attempts, str(e), retry)
+            except Exception as mark_err:
+                logger.error(f"[Queue] Failed to record job failure: {mark_err}")
+
+    async def process_photo(self, photo_id: str) -> int:
+        """
+        Generate derivatives, detect + recognize faces and save them unverified.
+
+        Detection is skipped for photos that already have faces
+        (processed manually meanwhile).
+
+        Returns:
+            Number of faces on the photo after processing
+        """
+        client = self.supabase.client
+
+        photo = await execute(client.table("gallery_images").select(
+            "id, image_url, original_url, gallery_id, width, height, derivatives, content_hash"
+        ).eq("id", photo_id))
+        if not photo.data:
+            logger.info(f"[Queue] Photo {photo_id[:8]} no longer exists - skipping")
+            return 0
+        photo = photo.data[0]
+
+        image_bytes = None
+        blur_cells = None
+        if settings.content_dedup_enabled and not photo.get("content_hash"):
+            # Presigned uploads are hashed here (may re-point to an identical stored object)
+            image_bytes = await get_photo_cache().get_bytes(photo["image_url"])
+            await run(assign_photo_content, photo, image_bytes)
+
+        if settings.derivatives_enabled and not is_current(photo.get("derivatives")):
+            if image_bytes is None:
+                image_bytes = await get_photo_cache().get_bytes(photo["image_url"])
+            photo["derivatives"], blur_cells = await get_image_derivative_service().generate(photo_id, image_bytes)
+            await execute(client.table("gallery_images").update({
+                "derivatives": photo["derivatives"],
+            }).eq("id", photo_id))
+
+        existing = await execute(client.table("photo_faces").select(
+            "id", count="exact"
+        ).eq("photo_id", photo_id).limit(1))
+        if existing.count:
+            logger.info(f"[Queue] Photo {photo_id[:8]} already has {existing.count} faces - skipping")
+            return existing.count
+
+        config = await run(self.supabase.config.get_recognition_config)
+        threshold = config.get("confidence_thresholds", {}).get("high_data", 0.60)
+
+        # Perceptual hash on a reduced decode (1/8 scale)
+        if image_bytes is None:
+            image_bytes = await get_photo_cache().get_bytes(photo["image_url"])
+        phash = await asyncio.to_thread(lambda: dhash(decode_image(image_bytes, scale=8)))
+        image_bytes = None
+
+        original = await run(self._find_identical, photo) or await run(self._find_original, photo, phash)
+        if original:
+            rows = await self._copy_faces(photo, original, threshold)
+            logger.info(f"[Queue] Photo {photo_id[:8]} is a duplicate of {original['id'][:8]} - reused detections")
+        else:
+            rows = await self._detect_faces(photo, config, threshold, blur_cells)
+
+        saved_ids = []
+        if rows:
+            # Single bulk insert for all faces of the photo
+            result = await execute(client.table("photo_faces").insert(rows))
+            saved_ids = [row["id"] for row in (result.data or [])]
+
+        if saved_ids:
+            try:
+                await self.face_service.add_faces_to_index(saved_ids)
+            except Exception as idx_err:
+                logger.error(f"[Queue] Failed to add faces to index: {idx_err}")
+
+        # Hash is stored only after processing - hashed photos are valid originals
+        await execute(client.table("gallery_images").update({
+            "perceptual_hash": phash,
+            "duplicate_of": original["id"] if original else None,
+        }).eq("id", photo_id))
+        self.hash_index.add(photo["gallery_id"], photo_id, phash)
+
+        recognized = sum(1 for row in rows if row["person_id"])
+        logger.info(f"[Queue] Photo {photo_id[:8]}: saved {len(saved_ids)} faces ({recognized} recognized)")
+        return len(saved_ids)
+
+    def _find_identical(self, photo: Dict) -> Optional[Dict]:
+        """Processed photo (any gallery) with exactly the same content hash."""
+        if not photo.get("content_hash"):
+            return None
+
+        result = self.supabase.client.table("gallery_images").select(
+            "id, width, height"
+        ).eq("content_hash", photo["content_hash"]).neq(
+            "id", photo["id"]
+        ).not_.is_("perceptual_hash", "null").limit(1).execute()
+        return result.data[0] if result.data else None
+
+    def _find_original(self, photo: Dict, phash: str) -> Optional[Dict]:
+        """Processed photo in the same gallery that this one near-duplicates."""
+        original_id = self.hash_index.find_duplicate(
+            photo["gallery_id"], phash, settings.duplicate_hash_distance
+        )
+        if not original_id or original_id == photo["id"]:
+            return None
+
+        result = self.supabase.client.table("gallery_images").select(
+            "id, width, height"
+        ).eq("id", original_id).execute()
+        if not result.data:
+            # Original deleted since it was indexed
+            self.hash_index.remove(photo["gallery_id"], original_id)
+            return None
+        return result.data[0]
+
+    async def _detect_faces(
+        self, photo: Dict, config: Dict, threshold: float, blur_cells: Optional["LaplacianCells"] = None
+    ) -> List[Dict]:
+        """Full detection + recognition (blur_cells from derivative generation, if just generated)."""
+        quality_filters = config.get("quality_filters", {})
+
+        detection_url, coordinate_scale = detection_source(photo)
+        detected_faces = await self.face_service.detect_faces(
+            detection_url,
+            apply_quality_filters=True,
+            min_detection_score=quality_filters.get("min_detection_score", 0.7),
+            min_face_size=quality_filters.get("min_face_size", 80),
+            min_blur_score=quality_filters.get("min_blur_score", 80),
+            coordinate_scale=coordinate_scale,
+            original_url=photo["image_url"],
+            blur_cells=blur_cells
+        )
+
+        if settings.reject_spectators_enabled and detected_faces:
+            # Drop faces matching rejected clusters (one batch query per photo)
+            detected_faces, rejected = await asyncio.to_thread(
+                get_rejected_faces_index().split, detected_faces
+            )
+            if rejected:
+                logger.info(f"[Queue] Photo {photo['id'][:8]}: dropped {len(rejected)} rejected faces")
+
+        return await self._face_rows(photo["id"], [
+            {
+                "embedding": face["embedding"],
+                "bbox": {
+                    "x": float(face["bbox"][0]),
+                    "y": float(face["bbox"][1]),
+                    "width": float(face["bbox"][2] - face["bbox"][0]),
+                    "height": float(face["bbox"][3] - face["bbox"][1]),
+                },
+                "det_score": float(face["det_score"]),
+                "kps": face["kps"].tolist() if face.get("kps") is not None else None,
+                "blur_score": float(face.get("blur_score", 0)),
+            }
+            for face in detected_faces
+        ], threshold)
+
+    async def _copy_faces(self, photo: Dict, original: Dict, threshold: float) -> List[Dict]:
+        """Reuse detections of the original photo (bbox/kps scaled to this photo's size)."""
+        result = await execute(self.supabase.client.table("photo_faces").select(
+            "insightface_bbox, insightface_det_score, insightface_kps, blur_score, insightface_descriptor, exif_oriented"
+        ).eq("photo_id", original["id"]))
+
+        scale_x = (photo.get("width") or 0) / original["width"] if original.get("width") else 1.0
+        scale_y = (photo.get("height") or 0) / original["height"] if original.get("height") else 1.0
+        if not scale_x or not scale_y:
+            scale_x = scale_y = 1.0
+
+        faces = []
+        for face in (result.data or []):
+            descriptor = face.get("insightface_descriptor")
+            bbox = face.get("insightface_bbox")
+            if not descriptor or not bbox:
+                continue
+            if isinstance(descriptor, str):
+                descriptor = json.loads(descriptor)
+
+            kps = face.get("insightface_kps")
+            faces.append({
+                "embedding": np.array(descriptor, dtype=np.float32),
+                "bbox": {
+                    "x": bbox["x"] * scale_x,
+                    "y": bbox["y"] * scale_y,
+                    "width": bbox["width"] * scale_x,
+                    "height": bbox["height"] * scale_y,
+                },
+                "det_score": face.get("insightface_det_score"),
+                "kps": [[x * scale_x, y * scale_y] for x, y in kps] if kps else None,
+                "blur_score": face.get("blur_score"),
+                # Copied coordinates stay in the original's frame
+                "exif_oriented": face.get("exif_oriented", True) is not False,
+            })
+        return await self._face_rows(photo["id"], faces, threshold)
+
+    async def _face_rows(self, photo_id: str, faces: List[Dict], threshold: float) -> List[Dict]:
+        """Run batched recognition and build unverified photo_faces rows."""
+        recognitions = await self.face_service.recognize_faces(
+            [face["embedding"] for face in faces], confidence_threshold=threshold
+        )
+
+        return [
+            {
+                "photo_id": photo_id,
+                "person_id": recognition["person_id"],
+                "insightface_bbox": face["bbox"],
+                "insightface_det_score": face["det_score"],
+                "insightface_kps": face["kps"],
+                "blur_score": face["blur_score"],
+                "recognition_confidence": recognition["confidence"],
+                "verified": False,
+                "insightface_descriptor": f"[{','.join(map(str, face['embedding'].tolist()))}]",
+                "exif_oriented": face.get("exif_oriented", True),
+            }
+            for face, recognition in zip(faces, recognitions)
+        ]
+
+
+# Global instance (created by main.py in the full API profile)
+_worker: Optional[PhotoProcessingWorker] = None
+
+
+def init_photo_processing_worker(face_service: "FaceRecognitionService") -> PhotoProcessingWorker:
+    """Create the worker singleton."""
+    global _worker
+    _worker = PhotoProcessingWorker(face_service)
+    return _worker
+
+
+def get_photo_processing_worker() -> Optional[PhotoProcessingWorker]:
+    """Get worker singleton (None if background processing is disabled)."""
+    return _worker
+
+
+async def enqueue_photos(photo_ids: List[str]) -> int:
+    """
+    Queue photos for background detection/recognition and wake the worker.
+
+    The insert runs in the Supabase pool; the worker is woken on the event
+    loop (asyncio.Event is not thread-safe).
+
+    Returns:
+        Number of jobs queued
+    """
+    count = await run(get_processing_queue_repository().enqueue, photo_ids)
+    if _worker is not None:
+        _worker.notify()
+    return count
@@ -1,11 +1,19 @@
 """
 Quality filters for face detection.
 Calculates blur score and checks if faces pass quality thresholds.
+
+Batch stage (all faces of a photo at once):
+- calculate_blur_scores: one grayscale + one Laplacian, per-box variance via integral images
+- quality_masks: boolean masks for det_score / size / blur
+
+Blur of faces detected on a downscaled copy is measured at original
+resolution from LaplacianCells (Laplacian sums per cell x cell block of the
+original), computed once while the original is decoded anyway.
 """
 
 import cv2
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, NamedTuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -105,3 +113,197 @@ def passes_quality_filters(
         return False, f"blur_score {blur_score:.1f} < {min_blur}"
     
     return True, "passed"
+
+
+# ============================================================
+# Batch quality stage
+# ============================================================
+
+def _padded_boxes(bboxes: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Add 10% padding (same as calculate_blur_score), clip to image. Returns int (N,4)."""
+    boxes = bboxes[:, :4].astype(np.int64)
+    pad_x = ((boxes[:, 2] - boxes[:, 0]) * 0.1).astype(np.int64)
+    pad_y = ((boxes[:, 3] - boxes[:, 1]) * 0.1).astype(np.int64)
+
+    padded = np.empty_like(boxes)
+    padded[:, 0] = np.clip(boxes[:, 0] - pad_x, 0, width)
+    padded[:, 1] = np.clip(boxes[:, 1] - pad_y, 0, height)
+    padded[:, 2] = np.clip(boxes[:, 2] + pad_x, 0, width)
+    padded[:, 3] = np.clip(boxes[:, 3] + pad_y, 0, height)
+    return padded
+
+
+def calculate_blur_scores(image: np.ndarray, bboxes) -> np.ndarray:
+    """
+    Blur scores (Laplacian variance) for all faces of one image.
+    
+    Grayscale conversion and Laplacian run once over the region covering
+    all padded boxes; per-box variance comes from integral images of the
+    Laplacian and its square (O(1) per box).
+    
+    Args:
+        image: Full image array (BGR format)
+        bboxes: Face bounding boxes, shape (N, 4) [x1, y1, x2, y2]
+        
+    Returns:
+        Array of N blur scores (0.0 for empty boxes)
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    scores = np.zeros(len(bboxes), dtype=np.float64)
+    if len(bboxes) == 0:
+        return scores
+
+    h, w = image.shape[:2]
+    boxes = _padded_boxes(bboxes, w, h)
+    valid = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+    if not valid.any():
+        return scores
+
+    # Union of all boxes - avoid processing the whole frame
+    ux1, uy1 = boxes[valid, 0].min(), boxes[valid, 1].min()
+    ux2, uy2 = boxes[valid, 2].max(), boxes[valid, 3].max()
+
+    region = image[uy1:uy2, ux1:ux2]
+    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if region.ndim == 3 else region
+    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+    sums, sq_sums = cv2.integral2(laplacian, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+
+    # Box coordinates relative to union region
+    x1 = boxes[valid, 0] - ux1
+    y1 = boxes[valid, 1] - uy1
+    x2 = boxes[valid, 2] - ux1
+    y2 = boxes[valid, 3] - uy1
+
+    area = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+    box_sum = sums[y2, x2] - sums[y1, x2] - sums[y2, x1] + sums[y1, x1]
+    box_sq = sq_sums[y2, x2] - sq_sums[y1, x2] - sq_sums[y2, x1] + sq_sums[y1, x1]
+
+    mean = box_sum / area
+    scores[valid] = np.maximum(box_sq / area - mean * mean, 0.0)
+    return scores
+
+
+class LaplacianCells(NamedTuple):
+    """Sums of the Laplacian and its square per cell x cell block of an image."""
+    cell: int
+    width: int
+    height: int
+    sums: np.ndarray
+    sq_sums: np.ndarray
+
+
+def laplacian_cells(image: np.ndarray, cell: int, band_cells: int = 128) -> LaplacianCells:
+    """
+    Laplacian statistics of a full-resolution image on a coarse grid.
+    
+    The Laplacian is computed in horizontal bands (one row of overlap, so
+    values match a full-frame Laplacian) to keep peak memory at one band.
+    
+    Args:
+        image: Full image array (BGR format)
+        cell: Block size in pixels (grid is ceil(h/cell) x ceil(w/cell))
+        band_cells: Band height in cells
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    h, w = gray.shape[:2]
+    grid_h, grid_w = -(-h // cell), -(-w // cell)
+    sums = np.zeros((grid_h, grid_w), dtype=np.float32)
+    sq_sums = np.zeros((grid_h, grid_w), dtype=np.float32)
+
+    band = cell * band_cells
+    for y0 in range(0, h, band):
+        y1 = min(h, y0 + band)
+        top, bottom = max(0, y0 - 1), min(h, y1 + 1)
+        laplacian = cv2.Laplacian(gray[top:bottom], cv2.CV_32F)[y0 - top:y0 - top + (y1 - y0)]
+
+        rows = -(-(y1 - y0) // cell)
+        laplacian = np.pad(laplacian, ((0, rows * cell - (y1 - y0)), (0, grid_w * cell - w)))
+        blocks = laplacian.reshape(rows, cell, grid_w, cell)
+        sums[y0 // cell:y0 // cell + rows] = blocks.sum(axis=(1, 3))
+        sq_sums[y0 // cell:y0 // cell + rows] = (blocks * blocks).sum(axis=(1, 3))
+
+    return LaplacianCells(cell, w, h, sums, sq_sums)
+
+
+def blur_scores_from_cells(cells: LaplacianCells, bboxes) -> np.ndarray:
+    """
+    Blur scores for boxes in original pixels from precomputed LaplacianCells.
+    
+    Same padding as calculate_blur_scores; box edges are snapped to the
+    cell grid (error below one cell per edge).
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    scores = np.zeros(len(bboxes), dtype=np.float64)
+    if len(bboxes) == 0:
+        return scores
+
+    boxes = _padded_boxes(bboxes, cells.width, cells.height)
+    grid_h, grid_w = cells.sums.shape
+    x1 = np.clip(np.rint(boxes[:, 0] / cells.cell).astype(np.int64), 0, grid_w)
+    y1 = np.clip(np.rint(boxes[:, 1] / cells.cell).astype(np.int64), 0, grid_h)
+    x2 = np.clip(np.rint(boxes[:, 2] / cells.cell).astype(np.int64), 0, grid_w)
+    y2 = np.clip(np.rint(boxes[:, 3] / cells.cell).astype(np.int64), 0, grid_h)
+    valid = (x2 > x1) & (y2 > y1)
+    if not valid.any():
+        return scores
+
+    sums = cv2.integral(cells.sums.astype(np.float64), sdepth=cv2.CV_64F)
+    sq_sums = cv2.integral(cells.sq_sums.astype(np.float64), sdepth=cv2.CV_64F)
+    x1, y1, x2, y2 = x1[valid], y1[valid], x2[valid], y2[valid]
+
+    # Pixel area (last row/column of cells may be partial)
+    width = np.minimum(x2 * cells.cell, cells.width) - x1 * cells.cell
+    height = np.minimum(y2 * cells.cell, cells.height) - y1 * cells.cell
+    area = (width * height).astype(np.float64)
+
+    box_sum = sums[y2, x2] - sums[y1, x2] - sums[y2, x1] + sums[y1, x1]
+    box_sq = sq_sums[y2, x2] - sq_sums[y1, x2] - sq_sums[y2, x1] + sq_sums[y1, x1]
+
+    mean = box_sum / area
+    scores[valid] = np.maximum(box_sq / area - mean * mean, 0.0)
+    return scores
+
+
+def quality_masks(
+    det_scores,
+    bboxes,
+    blur_scores,
+    filters: Dict[str, float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized quality filters for N faces.
+    
+    Args:
+        det_scores: (N,) detection confidences
+        bboxes: (N, 4) boxes [x1, y1, x2, y2]
+        blur_scores: (N,) blur scores
+        filters: Quality filter thresholds (uses defaults if None)
+        
+    Returns:
+        Dict of boolean arrays: det_ok, size_ok, blur_ok, passed
+    """
+    if filters is None:
+        filters = DEFAULT_QUALITY_FILTERS
+
+    det_scores = np.asarray(det_scores, dtype=np.float64).reshape(-1)
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    blur_scores = np.asarray(blur_scores, dtype=np.float64).reshape(-1)
+
+    min_det = filters.get("min_detection_score", DEFAULT_QUALITY_FILTERS["min_detection_score"])
+    min_size = filters.get("min_face_size", DEFAULT_QUALITY_FILTERS["min_face_size"])
+    min_blur = filters.get("min_blur_score", DEFAULT_QUALITY_FILTERS["min_blur_score"])
+
+    # Face size = MAX side (v2.3)
+    face_sizes = np.maximum(bboxes[:, 2] - bboxes[:, 0], bboxes[:, 3] - bboxes[:, 1])
+
+    det_ok = det_scores >= min_det
+    size_ok = face_sizes >= min_size
+    blur_ok = blur_scores >= min_blur
+
+    return {
+        "det_ok": det_ok,
+        "size_ok": size_ok,
+        "blur_ok": blur_ok,
+        # Same precedence as passes_quality_filters: det -> size -> blur
+        "passed": det_ok & size_ok & blur_ok,
+    }
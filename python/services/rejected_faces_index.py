@@ -0,0 +1,170 @@
+"""
+In-memory index of rejected face descriptors (spectators, see /reject-face-cluster).
+
+Exact search over one L2-normalized float32 matrix (rows = rejected_faces):
+all faces of a photo are checked with a single matrix product, so the
+check is cheap enough to run at detection time and drop faces that match
+a rejected cluster (REJECT_SPECTATORS_ENABLED, REJECTED_FACE_THRESHOLD).
+
+Loaded lazily on first query, extended in place when clusters are rejected
+in this process; rows rejected by other workers are picked up by a delta
+refresh (rejected_at >= last seen) every REFRESH_SECONDS.
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.config import settings
+from core.logging import get_logger
+from services.supabase.base import get_supabase_client
+
+logger = get_logger(__name__)
+
+EMBEDDING_DIM = 512
+PAGE_SIZE = 1000
+REFRESH_SECONDS = 300.0
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _parse_descriptor(descriptor) -> Optional[np.ndarray]:
+    if isinstance(descriptor, str):
+        descriptor = json.loads(descriptor)
+    if not isinstance(descriptor, list) or len(descriptor) != EMBEDDING_DIM:
+        return None
+    return np.asarray(descriptor, dtype=np.float32)
+
+
+class RejectedFacesIndex:
+    """Normalized descriptor matrix of rejected_faces with batched max-similarity queries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._ids: set = set()
+        self._loaded = False
+        self._last_seen: Optional[str] = None  # max rejected_at loaded from DB
+        self._refreshed_at = 0.0
+
+    @property
+    def size(self) -> int:
+        return self._matrix.shape[0]
+
+    def _fetch(self, since: Optional[str]) -> List[Dict]:
+        client = get_supabase_client()
+        rows = []
+        offset = 0
+        while True:
+            query = client.table("rejected_faces").select("id, descriptor, rejected_at")
+            if since:
+                # gte: rows of one bulk insert share rejected_at; known ids are skipped
+                query = query.gte("rejected_at", since)
+            result = query.order("rejected_at").order("id").range(offset, offset + PAGE_SIZE - 1).execute()
+            batch = result.data or []
+            rows.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    def refresh(self, full: bool = False):
+        """Load rejected descriptors (all, or only those added since the last refresh)."""
+        since = None if full else self._last_seen
+        rows = self._fetch(since)
+
+        with self._lock:
+            if full:
+                self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+                self._ids = set()
+            self._append_locked(
+                [row["id"] for row in rows],
+                [_parse_descriptor(row["descriptor"]) for row in rows]
+            )
+            for row in rows:
+                if row.get("rejected_at") and (self._last_seen is None or row["rejected_at"] > self._last_seen):
+                    self._last_seen = row["rejected_at"]
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+        if rows:
+            logger.info(f"[RejectedFaces] Loaded {len(rows)} descriptors (total {self.size})")
+
+    def _ensure_fresh(self):
+        if not self._loaded or time.monotonic() - self._refreshed_at > REFRESH_SECONDS:
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the current matrix; retry on the next refresh interval
+                logger.error(f"[RejectedFaces] Refresh failed: {e}")
+                self._refreshed_at = time.monotonic()
+
+    def _append_locked(self, ids: Sequence[str], descriptors: Sequence[Optional[np.ndarray]]):
+        new = [
+            (face_id, descriptor) for face_id, descriptor in zip(ids, descriptors)
+            if descriptor is not None and face_id not in self._ids
+        ]
+        if not new:
+            return
+        self._ids.update(face_id for face_id, _ in new)
+        vectors = _normalize(np.stack([descriptor for _, descriptor in new]).astype(np.float32))
+        self._matrix = np.vstack([self._matrix, vectors])
+
+    def add(self, ids: Sequence[str], descriptors: Sequence):
+        """Add just-inserted rejected_faces rows (no-op until the index is loaded)."""
+        if not self._loaded:
+            return
+        with self._lock:
+            self._append_locked(
+                ids,
+                [_parse_descriptor(d.tolist() if isinstance(d, np.ndarray) else d) for d in descriptors]
+            )
+
+    def max_similarities(self, embeddings: Sequence[np.ndarray]) -> np.ndarray:
+        """Highest cosine similarity to any rejected face, per embedding."""
+        if len(embeddings) == 0:
+            return np.zeros(0, dtype=np.float32)
+        self._ensure_fresh()
+
+        matrix = self._matrix
+        if matrix.shape[0] == 0:
+            return np.zeros(len(embeddings), dtype=np.float32)
+
+        queries = _normalize(np.stack([np.asarray(e, dtype=np.float32) for e in embeddings]))
+        return (queries @ matrix.T).max(axis=1)
+
+    def is_rejected(self, embedding: np.ndarray, threshold: float = None) -> bool:
+        threshold = threshold if threshold is not None else settings.rejected_face_threshold
+        return bool(self.max_similarities([embedding])[0] >= threshold)
+
+    def split(self, faces: List[Dict], threshold: float = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split faces (dicts with "embedding") into (kept, rejected) in one batch query.
+        """
+        if not faces:
+            return [], []
+        threshold = threshold if threshold is not None else settings.rejected_face_threshold
+        similarities = self.max_similarities([face["embedding"] for face in faces])
+
+        kept, rejected = [], []
+        for face, similarity in zip(faces, similarities):
+            (rejected if similarity >= threshold else kept).append(face)
+        return kept, rejected
+
+
+# Global instance
+_rejected_faces_index: Optional[RejectedFacesIndex] = None
+
+
+def get_rejected_faces_index() -> RejectedFacesIndex:
+    """Get singleton RejectedFacesIndex instance."""
+    global _rejected_faces_index
+    if _rejected_faces_index is None:
+        _rejected_faces_index = RejectedFacesIndex()
+    return _rejected_faces_index
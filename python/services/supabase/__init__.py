@@ -28,6 +28,9 @@ from .embeddings import EmbeddingsRepository, get_embeddings_repository
 from .training import TrainingRepository, get_training_repository
 from .faces import FacesRepository, get_faces_repository
 from .people import PeopleRepository, get_people_repository
+from .processing_queue import ProcessingQueueRepository, get_processing_queue_repository
+from .storage_objects import StorageObjectsRepository, get_storage_objects_repository
+from .aio import AsyncRepository, as_async
 
 from core.logging import get_logger
 
@@ -214,11 +217,12 @@ class SupabaseService:
         face_id: str,
         descriptor: np.ndarray,
         det_score: float,
-        bbox: Dict
+        bbox: Dict,
+        kps: Optional[List] = None
     ) -> bool:
         """Legacy: Delegate to training repository."""
         return await self.training.update_face_descriptor(
-            face_id, descriptor, det_score, bbox
+            face_id, descriptor, det_score, bbox, kps
         )
 
 
@@ -250,6 +254,8 @@ __all__ = [
     "TrainingRepository",
     "FacesRepository",
     "PeopleRepository",
+    "ProcessingQueueRepository",
+    "StorageObjectsRepository",
     
     # Convenience functions
     "get_config_repository",
@@ -257,5 +263,11 @@ __all__ = [
     "get_training_repository",
     "get_faces_repository",
     "get_people_repository",
+    "get_processing_queue_repository",
+    "get_storage_objects_repository",
     "get_recognition_config",
+    
+    # Async access (see aio.py for execute/run)
+    "AsyncRepository",
+    "as_async",
 ]
@@ -0,0 +1,113 @@
+"""
+Async access to Supabase from async handlers.
+
+supabase-py calls are blocking; running them directly in `async def`
+handlers stalls the event loop for the whole network round trip. Here every
+call runs in a dedicated thread pool:
+
+- bounded: at most SUPABASE_CONCURRENCY calls in flight per worker, and the
+  default executor (asyncio.to_thread, CPU work) is never starved by DB calls
+- per-call timeout (SUPABASE_TIMEOUT): the awaiting handler gets a
+  DatabaseError instead of hanging; the HTTP client has the same timeout
+- shared: all threads use the one client (and its connection pool) from base.py
+
+A timed-out call is abandoned, not interrupted: a call still queued is
+cancelled and never runs, but one already running keeps its pool thread
+until the PostgREST request hits the HTTP timeout (the same SUPABASE_TIMEOUT).
+Timed-out calls therefore hold a slot for at most ~2x SUPABASE_TIMEOUT and
+can't exhaust the pool for longer. Functions making many requests in a row
+(backfills, cleanups) need a timeout covering all of them - or
+asyncio.to_thread, which has none.
+
+Usage:
+    from services.supabase.aio import execute, run, as_async
+
+    # Independent queries concurrently
+    people, faces = await asyncio.gather(
+        execute(client.table("people").select("id")),
+        execute(client.table("photo_faces").select("id").eq("verified", True)),
+    )
+
+    # Sync function / repository method off the loop
+    config = await run(get_config_repository().get_recognition_config)
+    config = await as_async(get_config_repository()).get_recognition_config()
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.config import settings
+from core.exceptions import DatabaseError
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.supabase_concurrency,
+            thread_name_prefix="supabase"
+        )
+    return _executor
+
+
+async def run(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a blocking Supabase call (any sync callable) in the Supabase pool.
+
+    On timeout the call is abandoned (see module docstring), not interrupted.
+
+    Raises:
+        DatabaseError: if the call doesn't finish within timeout
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+    timeout = timeout if timeout is not None else settings.supabase_timeout
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        name = getattr(fn, "__qualname__", repr(fn))
+        logger.warning(f"Supabase call {name} timed out after {timeout}s")
+        raise DatabaseError(f"Database call timed out after {timeout}s", operation=name)
+
+
+async def execute(query, timeout: Optional[float] = None):
+    """Execute a PostgREST query builder without blocking the event loop."""
+    return await run(query.execute, timeout=timeout)
+
+
+class AsyncRepository:
+    """Awaitable view of a sync repository: every method call runs via run()."""
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._repository, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await run(attr, *args, **kwargs)
+
+        return call
+
+
+def as_async(repository) -> AsyncRepository:
+    """Wrap a repository (or SupabaseService facade section) for async use."""
+    return AsyncRepository(repository)
+
+
+def shutdown():
+    """Stop the Supabase pool (app shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -2,11 +2,19 @@
 Supabase Base Client - Single connection point for all Supabase operations.
 
 All repositories use this shared client to avoid multiple connections.
+Its HTTP connection pool is shared by all threads; async code reaches it
+through services/supabase/aio.py (bounded pool, per-call timeout).
 """
 
 import os
 from supabase import create_client, Client
+try:
+    # supabase >= 2.8: create_client() needs the sync options class
+    from supabase.lib.client_options import SyncClientOptions as ClientOptions
+except ImportError:
+    from supabase.lib.client_options import ClientOptions
 
+from core.config import settings
 from core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -36,7 +44,11 @@ class SupabaseBase:
         if not supabase_url or not supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set")
         
-        self._client = create_client(supabase_url, supabase_key)
+        self._client = create_client(
+            supabase_url,
+            supabase_key,
+            options=ClientOptions(postgrest_client_timeout=settings.supabase_timeout)
+        )
         logger.info("SupabaseBase initialized (singleton)")
     
     @property
@@ -3,15 +3,30 @@ Supabase Config Repository - Single source of truth for recognition config.
 
 Consolidates duplicated get_config/get_recognition_config from both
 supabase_client.py and supabase_database.py.
+
+Read-through cache: config is served from memory. Every
+VERSION_CHECK_SECONDS one small query reads the version row
+(key 'config_version', bumped by every update from any process); the
+config is reloaded only when the version changed or CACHE_TTL_SECONDS
+passed (covers edits made directly in the DB). Updates through this
+repository invalidate the local cache immediately.
 """
 
-from typing import Dict
+import copy
+import threading
+import time
+import uuid
+from typing import Dict, Optional
 
 from core.logging import get_logger
 from .base import get_supabase_client
 
 logger = get_logger(__name__)
 
+VERSION_KEY = "config_version"
+VERSION_CHECK_SECONDS = 5.0
+CACHE_TTL_SECONDS = 300.0
+
 # Default configuration values
 DEFAULT_CONFIG = {
     'confidence_thresholds': {
@@ -36,23 +51,68 @@ class ConfigRepository:
     
     def __init__(self):
         self._client = get_supabase_client()
+        self._lock = threading.Lock()
+        self._raw_cache: Optional[Dict] = None
+        self._recognition_cache: Optional[Dict] = None
+        self._version = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+    
+    def _load_raw_config(self) -> Dict:
+        response = self._client.table("face_recognition_config").select("key, value").execute()
+        
+        config = {}
+        for row in response.data or []:
+            config[row["key"]] = row["value"]
+        
+        logger.debug(f"Loaded {len(config)} config entries from DB")
+        return config
+    
+    def _read_version(self):
+        response = self._client.table("face_recognition_config").select("value").eq(
+            "key", VERSION_KEY
+        ).execute()
+        return response.data[0]["value"] if response.data else None
+    
+    def _cached_raw_config(self) -> Dict:
+        """Raw config from memory; reloaded when the version row changed or TTL expired."""
+        now = time.monotonic()
+        with self._lock:
+            if self._raw_cache is not None and now - self._loaded_at < CACHE_TTL_SECONDS:
+                if now - self._checked_at < VERSION_CHECK_SECONDS:
+                    return self._raw_cache
+                try:
+                    version = self._read_version()
+                except Exception as e:
+                    logger.warning(f"Config version check failed, serving cached config: {e}")
+                    version = self._version
+                self._checked_at = now
+                if version == self._version:
+                    return self._raw_cache
+                logger.info("Recognition config changed in another process - reloading")
+            
+            raw_config = self._load_raw_config()
+            self._raw_cache = raw_config
+            self._recognition_cache = None
+            self._version = raw_config.get(VERSION_KEY)
+            self._loaded_at = self._checked_at = now
+            return raw_config
+    
+    def invalidate(self):
+        """Drop cached config (next read goes to the DB)."""
+        with self._lock:
+            self._raw_cache = None
+            self._recognition_cache = None
     
     def get_raw_config(self) -> Dict:
         """
-        Get raw configuration from face_recognition_config table.
+        Get raw configuration from face_recognition_config table (cached).
         
         Returns:
             Dict with config key-value pairs
         """
         try:
-            response = self._client.table("face_recognition_config").select("key, value").execute()
-            
-            config = {}
-            for row in response.data or []:
-                config[row["key"]] = row["value"]
-            
-            logger.debug(f"Loaded {len(config)} config entries from DB")
-            return config
+            return copy.deepcopy(self._cached_raw_config())
             
         except Exception as e:
             logger.error(f"Error getting config: {e}")
@@ -60,13 +120,16 @@ class ConfigRepository:
     
     def get_recognition_config(self) -> Dict:
         """
-        Get recognition settings with defaults.
+        Get recognition settings with defaults (cached, see module docstring).
         
         Returns:
             Dict with merged config (DB values override defaults)
         """
         try:
-            raw_config = self.get_raw_config()
+            raw_config = self._cached_raw_config()
+            cached = self._recognition_cache
+            if cached is not None:
+                return copy.deepcopy(cached)
             
             # Start with defaults
             result = {
@@ -95,7 +158,8 @@ class ConfigRepository:
                         result[key] = stored[key]
             
             logger.debug(f"Recognition config: {result}")
-            return result
+            self._recognition_cache = result
+            return copy.deepcopy(result)
             
         except Exception as e:
             logger.error(f"Error getting recognition config: {e}")
@@ -113,10 +177,12 @@ class ConfigRepository:
             True if successful
         """
         try:
-            self._client.table("face_recognition_config").upsert({
-                "key": key,
-                "value": value
-            }, on_conflict='key').execute()
+            # Config row + version row (other processes reload on version change)
+            self._client.table("face_recognition_config").upsert([
+                {"key": key, "value": value},
+                {"key": VERSION_KEY, "value": {"version": uuid.uuid4().hex}},
+            ], on_conflict='key').execute()
+            self.invalidate()
             
             logger.info(f"Updated config key '{key}'")
             return True
@@ -9,15 +9,24 @@ async def только ухудшает (блокирует event loop)."
 Supabase Python SDK is synchronous - async wrappers only hurt performance.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
+from datetime import datetime, timezone
+import time
 import numpy as np
 import json
 
 from core.logging import get_logger
+from .aio import run
 from .base import get_supabase_client
 
 logger = get_logger(__name__)
 
+# Max face ids per in_() filter / rejected rows per INSERT
+IN_CHUNK_SIZE = 200
+
+# PostgREST / Postgres error codes for a function that doesn't exist
+MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
 
 class FacesRepository:
     """Repository for face-related database operations."""
@@ -188,7 +197,8 @@ class FacesRepository:
         gallery_id: str,
         photo_ids: List[str],
         rejected_by: str,
-        reason: str = None
+        reason: str = None,
+        gallery_ids: List[str] = None
     ) -> bool:
         """
         Save rejected face cluster to rejected_faces table.
@@ -200,6 +210,7 @@ class FacesRepository:
             photo_ids: Photo IDs where faces appear
             rejected_by: User ID who rejected the faces
             reason: Optional reason for rejection
+            gallery_ids: Per-descriptor gallery IDs (cross-gallery clusters), overrides gallery_id
             
         Returns:
             True if successful
@@ -207,19 +218,28 @@ class FacesRepository:
         logger.info(f"[Faces] Rejecting {len(descriptors)} faces from gallery {gallery_id}")
         
         try:
+            rows = []
             for i, descriptor in enumerate(descriptors):
-                photo_id = photo_ids[i] if i < len(photo_ids) else None
-                
                 # Convert numpy array to list if needed
                 descriptor_list = descriptor.tolist() if isinstance(descriptor, np.ndarray) else descriptor
                 
-                self.client.table("rejected_faces").insert({
+                rows.append({
                     "descriptor": descriptor_list,
-                    "gallery_id": gallery_id,
-                    "photo_id": photo_id,
+                    "gallery_id": gallery_ids[i] if gallery_ids and i < len(gallery_ids) else gallery_id,
+                    "photo_id": photo_ids[i] if i < len(photo_ids) else None,
                     "rejected_by": rejected_by,
                     "reason": reason
-                }).execute()
+                })
+            
+            # Bulk insert (one request per IN_CHUNK_SIZE rows)
+            from services.rejected_faces_index import get_rejected_faces_index
+            for i in range(0, len(rows), IN_CHUNK_SIZE):
+                response = self.client.table("rejected_faces").insert(rows[i:i + IN_CHUNK_SIZE]).execute()
+                inserted = response.data or []
+                get_rejected_faces_index().add(
+                    [row["id"] for row in inserted],
+                    [row["descriptor"] for row in rows[i:i + len(inserted)]]
+                )
             
             logger.info(f"[Faces] ✓ Successfully rejected {len(descriptors)} faces")
             return True
@@ -228,6 +248,60 @@ class FacesRepository:
             logger.error(f"[Faces] Error rejecting faces: {e}")
             return False
     
+    def reject_faces(
+        self,
+        face_ids: List[str],
+        rejected_by: str = None,
+        reason: str = None
+    ) -> Dict:
+        """
+        Reject faces: save their descriptors to rejected_faces, delete them from photo_faces.
+        Set-based: one select, one bulk insert and one delete per IN_CHUNK_SIZE faces.
+        
+        Returns:
+            Dict with deleted (face ids deleted from photo_faces),
+            indexed (deleted faces that had descriptors - to remove from the index),
+            rejected (number of descriptors saved)
+        """
+        face_ids = list(dict.fromkeys(face_ids))
+        faces = []
+        for i in range(0, len(face_ids), IN_CHUNK_SIZE):
+            response = self.client.table("photo_faces").select(
+                "id, photo_id, insightface_descriptor, gallery_images(gallery_id)"
+            ).in_("id", face_ids[i:i + IN_CHUNK_SIZE]).execute()
+            faces.extend(response.data or [])
+        
+        with_descriptor = [f for f in faces if f.get("insightface_descriptor")]
+        rejected = 0
+        if with_descriptor:
+            saved = self.reject_face_cluster(
+                descriptors=[
+                    json.loads(f["insightface_descriptor"])
+                    if isinstance(f["insightface_descriptor"], str) else f["insightface_descriptor"]
+                    for f in with_descriptor
+                ],
+                gallery_id=None,
+                photo_ids=[f["photo_id"] for f in with_descriptor],
+                rejected_by=rejected_by,
+                reason=reason,
+                gallery_ids=[(f.get("gallery_images") or {}).get("gallery_id") for f in with_descriptor]
+            )
+            if not saved:
+                raise RuntimeError("Failed to save rejected descriptors")
+            rejected = len(with_descriptor)
+        
+        deleted = []
+        for i in range(0, len(face_ids), IN_CHUNK_SIZE):
+            response = self.client.table("photo_faces").delete().in_(
+                "id", face_ids[i:i + IN_CHUNK_SIZE]
+            ).execute()
+            deleted.extend(row["id"] for row in (response.data or []))
+        
+        deleted_set = set(deleted)
+        indexed = [f["id"] for f in with_descriptor if f["id"] in deleted_set]
+        logger.info(f"[Faces] Rejected {len(deleted)} faces ({rejected} descriptors saved)")
+        return {"deleted": deleted, "indexed": indexed, "rejected": rejected}
+    
     # =========================================================================
     # Recognition Result Update
     # =========================================================================
@@ -254,7 +328,6 @@ class FacesRepository:
             True if successful
         """
         try:
-            from datetime import datetime, timezone
             update_data = {
                 "person_id": person_id,
                 "recognition_confidence": float(recognition_confidence),
@@ -272,6 +345,71 @@ class FacesRepository:
             logger.error(f"[Faces] Error updating recognition result: {e}")
             return False
     
+    def recognition_writer(
+        self,
+        chunk_size: int = 500,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> "RecognitionResultWriter":
+        """
+        Bulk writer for recognition results (see RecognitionResultWriter).
+
+        Usage:
+            with faces_repo.recognition_writer() as writer:
+                for face in faces:
+                    writer.add(face["id"], person_id, confidence)
+        """
+        return RecognitionResultWriter(self, chunk_size=chunk_size, on_progress=on_progress)
+    
+    def update_recognition_results(self, rows: List[Dict]) -> int:
+        """
+        Write recognition results for many faces in one request.
+
+        Only updates existing rows (update_recognition_results RPC,
+        UPDATE ... FROM unnest): faces deleted or rejected meanwhile are
+        skipped, never re-created. Rows have id, person_id,
+        recognition_confidence and optionally verified/verified_at
+        (omitted = keep stored values).
+
+        Returns:
+            Number of rows updated
+        """
+        if not rows:
+            return 0
+        try:
+            response = self.client.rpc("update_recognition_results", {
+                "p_ids": [row["id"] for row in rows],
+                "p_person_ids": [row["person_id"] for row in rows],
+                "p_confidences": [row["recognition_confidence"] for row in rows],
+                "p_verified": [row.get("verified") for row in rows],
+                "p_verified_at": [row.get("verified_at") for row in rows],
+            }).execute()
+            return response.data or 0
+        except Exception as rpc_error:
+            # Only fall back if the function isn't deployed yet
+            # (migrations/20261018_create_update_recognition_results.sql);
+            # other errors go to the caller's retry
+            if getattr(rpc_error, "code", None) not in MISSING_FUNCTION_CODES:
+                raise
+            logger.warning(f"[Faces] update_recognition_results RPC failed, upserting existing rows: {rpc_error}")
+
+        ids = [row["id"] for row in rows]
+        existing = {}
+        for i in range(0, len(ids), IN_CHUNK_SIZE):
+            response = self.client.table("photo_faces").select(
+                "id, photo_id"
+            ).in_("id", ids[i:i + IN_CHUNK_SIZE]).execute()
+            existing.update({face["id"]: face["photo_id"] for face in (response.data or [])})
+
+        # photo_id is NOT NULL for the (unused) insert path of the upsert
+        rows = [
+            {**row, "photo_id": existing[row["id"]]}
+            for row in rows if row["id"] in existing
+        ]
+        if not rows:
+            return 0
+        response = self.client.table("photo_faces").upsert(rows, on_conflict="id").execute()
+        return len(response.data) if response.data else 0
+    
     # =========================================================================
     # Exclusion from Index (for outlier detection)
     # =========================================================================
@@ -328,6 +466,9 @@ class FacesRepository:
         Check if face embedding matches any rejected face.
         High threshold (0.85) to avoid false positives.
         
+        Uses the in-memory RejectedFacesIndex (loaded once, refreshed incrementally).
+        For all faces of a photo use get_rejected_faces_index().split() instead.
+        
         Args:
             embedding: 512-dim numpy array from InsightFace
             similarity_threshold: Minimum similarity to consider match
@@ -335,40 +476,131 @@ class FacesRepository:
         Returns:
             True if face should be rejected
         """
-        logger.debug(f"[Faces] Checking if face is rejected (threshold={similarity_threshold})")
+        from services.rejected_faces_index import get_rejected_faces_index
         
         try:
-            response = self.client.table("rejected_faces").select("descriptor").execute()
-            
-            if not response.data:
-                return False
-            
-            embedding_norm = embedding / np.linalg.norm(embedding)
-            
-            for row in response.data:
-                descriptor = row["descriptor"]
-                
-                if isinstance(descriptor, list):
-                    rejected_embedding = np.array(descriptor, dtype=np.float32)
-                elif isinstance(descriptor, str):
-                    rejected_embedding = np.array(json.loads(descriptor), dtype=np.float32)
-                else:
-                    continue
-                
-                rejected_norm = rejected_embedding / np.linalg.norm(rejected_embedding)
-                similarity = float(np.dot(embedding_norm, rejected_norm))
-                
-                if similarity >= similarity_threshold:
-                    logger.info(f"[Faces] ✓ Face matches rejected face (similarity={similarity:.3f})")
-                    return True
-            
-            return False
-            
+            return get_rejected_faces_index().is_rejected(embedding, similarity_threshold)
         except Exception as e:
             logger.error(f"[Faces] Error checking rejected faces: {e}")
             return False
 
 
+class RecognitionResultWriter:
+    """
+    Accumulates recognition results and flushes them in chunks through a single
+    bulk update per chunk (instead of one UPDATE request per face).
+
+    Each chunk is retried with backoff; chunks that still fail are counted
+    in `failed` and logged, the rest of the run continues.
+
+    In async handlers use `async with`, add_async() and close_async(): flushes
+    (with their retry sleeps) then run in the Supabase thread pool.
+    """
+
+    def __init__(
+        self,
+        repository: FacesRepository,
+        chunk_size: int = 500,
+        max_retries: int = 3,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ):
+        self.repository = repository
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.on_progress = on_progress
+        self._pending: List[Dict] = []
+        self.added = 0
+        self.written = 0
+        self.failed = 0
+
+    def add(
+        self,
+        face_id: str,
+        person_id: Optional[str],
+        recognition_confidence: Optional[float],
+        verified: bool = False
+    ):
+        """Queue one result; flushes automatically when a chunk is full."""
+        if self._queue(face_id, person_id, recognition_confidence, verified):
+            self.flush()
+
+    async def add_async(
+        self,
+        face_id: str,
+        person_id: Optional[str],
+        recognition_confidence: Optional[float],
+        verified: bool = False
+    ):
+        """add() for async handlers - a full chunk is flushed off the event loop."""
+        if self._queue(face_id, person_id, recognition_confidence, verified):
+            await run(self.flush)
+
+    def _queue(
+        self,
+        face_id: str,
+        person_id: Optional[str],
+        recognition_confidence: Optional[float],
+        verified: bool
+    ) -> bool:
+        """Append one result. Returns True when a chunk is full."""
+        self._pending.append({
+            "id": face_id,
+            "person_id": person_id,
+            "recognition_confidence": float(recognition_confidence) if recognition_confidence is not None else None,
+            "verified": verified,
+            "verified_at": datetime.now(timezone.utc).isoformat() if verified else None,
+        })
+        self.added += 1
+        return len(self._pending) >= self.chunk_size
+
+    def flush(self) -> int:
+        """Write pending results. Returns number of rows written."""
+        if not self._pending:
+            return 0
+
+        chunk, self._pending = self._pending, []
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                written = self.repository.update_recognition_results(chunk)
+                self.written += written
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += len(chunk)
+                    logger.error(f"[Faces] Failed to write {len(chunk)} recognition results: {e}")
+                    written = 0
+                    break
+                delay = 0.5 * 2 ** (attempt - 1)
+                logger.warning(f"[Faces] Chunk write failed (attempt {attempt}/{self.max_retries}), retry in {delay}s: {e}")
+                time.sleep(delay)
+
+        logger.info(f"[Faces] Recognition results written: {self.written}/{self.added} ({self.failed} failed)")
+        if self.on_progress:
+            self.on_progress(self.written, self.added)
+        return written
+
+    def close(self) -> Dict[str, int]:
+        """Flush the remainder. Returns {written, failed}."""
+        self.flush()
+        return {"written": self.written, "failed": self.failed}
+
+    async def close_async(self) -> Dict[str, int]:
+        """close() off the event loop."""
+        return await run(self.close)
+
+    def __enter__(self) -> "RecognitionResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __aenter__(self) -> "RecognitionResultWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_async()
+
+
 # Singleton instance
 _faces_repository: FacesRepository = None
 
@@ -0,0 +1,157 @@
+"""
+Supabase Processing Queue Repository - photo_processing_queue table.
+
+Persistent queue of background detection/recognition jobs.
+Claims are atomic (conditional update on status='pending'), so a job is
+never taken twice even with several workers. A claimed job holds a lease:
+its updated_at is renewed when the worker starts on it, and only jobs whose
+lease expired (worker crashed) are returned to pending.
+"""
+
+from typing import List, Dict
+from datetime import datetime, timedelta, timezone
+
+from core.logging import get_logger
+from .base import get_supabase_client
+
+logger = get_logger(__name__)
+
+TABLE = "photo_processing_queue"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ProcessingQueueRepository:
+    """Repository for photo_processing_queue operations."""
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_supabase_client()
+        return self._client
+
+    def enqueue(self, photo_ids: List[str]) -> int:
+        """
+        Add photos to the queue (re-enqueue resets existing jobs to pending).
+
+        Returns:
+            Number of jobs queued
+        """
+        if not photo_ids:
+            return 0
+
+        now = _now()
+        rows = [
+            {
+                "photo_id": photo_id,
+                "status": "pending",
+                "attempts": 0,
+                "last_error": None,
+                "updated_at": now,
+            }
+            for photo_id in photo_ids
+        ]
+
+        result = self.client.table(TABLE).upsert(rows, on_conflict="photo_id").execute()
+        count = len(result.data) if result.data else 0
+        logger.info(f"[Queue] Enqueued {count} photos")
+        return count
+
+    def claim_pending(self, limit: int = 10) -> List[Dict]:
+        """
+        Take oldest pending jobs and mark them as processing.
+
+        The update only matches rows still pending; the rows it returns are
+        the jobs claimed by this call (others were taken concurrently).
+
+        Returns:
+            List of jobs with id, photo_id, attempts
+        """
+        result = self.client.table(TABLE).select(
+            "id"
+        ).eq("status", "pending").order("created_at").limit(limit).execute()
+
+        candidate_ids = [job["id"] for job in (result.data or [])]
+        if not candidate_ids:
+            return []
+
+        claimed = self.client.table(TABLE).update({
+            "status": "processing",
+            "updated_at": _now(),
+        }).in_("id", candidate_ids).eq("status", "pending").execute()
+        return [
+            {"id": job["id"], "photo_id": job["photo_id"], "attempts": job.get("attempts")}
+            for job in (claimed.data or [])
+        ]
+
+    def renew(self, job_id: str) -> bool:
+        """
+        Extend the lease of a claimed job.
+
+        Returns:
+            False if the job is no longer processing (lease expired and reset)
+        """
+        result = self.client.table(TABLE).update({
+            "updated_at": _now(),
+        }).eq("id", job_id).eq("status", "processing").execute()
+        return bool(result.data)
+
+    def mark_done(self, job_id: str, faces_count: int):
+        self.client.table(TABLE).update({
+            "status": "done",
+            "faces_count": faces_count,
+            "last_error": None,
+            "updated_at": _now(),
+        }).eq("id", job_id).execute()
+
+    def mark_failed(self, job_id: str, attempts: int, error: str, retry: bool):
+        """Record failure; job goes back to pending if retry is True."""
+        self.client.table(TABLE).update({
+            "status": "pending" if retry else "failed",
+            "attempts": attempts,
+            "last_error": error[:1000],
+            "updated_at": _now(),
+        }).eq("id", job_id).execute()
+
+    def reset_stale(self, lease_seconds: float) -> int:
+        """
+        Return jobs whose lease expired (worker crash/restart) to pending.
+
+        Jobs renewed within lease_seconds belong to a live worker and are kept.
+        """
+        expired_before = (datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)).isoformat()
+        result = self.client.table(TABLE).update({
+            "status": "pending",
+            "updated_at": _now(),
+        }).eq("status", "processing").lt("updated_at", expired_before).execute()
+        count = len(result.data) if result.data else 0
+        if count:
+            logger.info(f"[Queue] Reset {count} stale processing jobs to pending")
+        return count
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Job counts per status."""
+        counts = {}
+        for status in ("pending", "processing", "done", "failed"):
+            result = self.client.table(TABLE).select(
+                "id", count="exact"
+            ).eq("status", status).limit(1).execute()
+            counts[status] = result.count or 0
+        return counts
+
+
+# Singleton instance
+_processing_queue_repository: ProcessingQueueRepository = None
+
+
+def get_processing_queue_repository() -> ProcessingQueueRepository:
+    """Get shared ProcessingQueueRepository instance."""
+    global _processing_queue_repository
+    if _processing_queue_repository is None:
+        _processing_queue_repository = ProcessingQueueRepository()
+    return _processing_queue_repository
@@ -0,0 +1,149 @@
+"""
+Supabase Storage Objects Repository - storage_objects table.
+
+Content-addressed registry: sha256 of file content -> stored MinIO object.
+Photos reference objects via gallery_images.content_hash; ref_count is
+recomputed from those references (idempotent, never drifts). updated_at
+changes only when ref_count does, so for unreferenced objects it is the
+time they lost their last reference (orphan grace period).
+"""
+
+from collections import defaultdict
+from typing import List, Dict, Optional
+from datetime import datetime, timezone, timedelta
+
+from core.logging import get_logger
+from .base import get_supabase_client
+
+logger = get_logger(__name__)
+
+TABLE = "storage_objects"
+
+# Max hashes per in_() filter (keeps PostgREST URLs short)
+IN_CHUNK_SIZE = 200
+PAGE_SIZE = 1000
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class StorageObjectsRepository:
+    """Repository for storage_objects operations."""
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_supabase_client()
+        return self._client
+
+    def get_by_hash(self, sha256: str) -> Optional[Dict]:
+        result = self.client.table(TABLE).select("*").eq("sha256", sha256).execute()
+        return result.data[0] if result.data else None
+
+    def get_by_hashes(self, hashes: List[str]) -> Dict[str, Dict]:
+        """Registered objects by hash (sha256 -> row)."""
+        hashes = list(set(filter(None, hashes)))
+        rows = {}
+        for i in range(0, len(hashes), IN_CHUNK_SIZE):
+            result = self.client.table(TABLE).select("*").in_(
+                "sha256", hashes[i:i + IN_CHUNK_SIZE]
+            ).execute()
+            rows.update({row["sha256"]: row for row in (result.data or [])})
+        return rows
+
+    def get_by_urls(self, urls: List[str]) -> Dict[str, Dict]:
+        """Registered objects by URL (url -> row)."""
+        if not urls:
+            return {}
+        result = self.client.table(TABLE).select("*").in_("url", list(set(urls))).execute()
+        return {row["url"]: row for row in (result.data or [])}
+
+    def register(self, sha256: str, bucket: str, object_name: str, url: str, size: int) -> Dict:
+        """
+        Register object for content hash. If the hash is already registered
+        the existing (canonical) object wins.
+
+        Returns:
+            Canonical storage_objects row for the hash
+        """
+        self.client.table(TABLE).upsert({
+            "sha256": sha256,
+            "bucket": bucket,
+            "object_name": object_name,
+            "url": url,
+            "size": size,
+        }, on_conflict="sha256", ignore_duplicates=True).execute()
+        return self.get_by_hash(sha256)
+
+    def recount(self, hashes: List[str]) -> Dict[str, int]:
+        """
+        Recompute ref_count from gallery_images.content_hash references.
+        One reference query per IN_CHUNK_SIZE hashes, one update per distinct
+        count; only objects whose count changed are updated.
+
+        Returns:
+            Dict sha256 -> ref_count
+        """
+        hashes = list(set(filter(None, hashes)))
+        counts = {sha256: 0 for sha256 in hashes}
+
+        for i in range(0, len(hashes), IN_CHUNK_SIZE):
+            chunk = hashes[i:i + IN_CHUNK_SIZE]
+            offset = 0
+            while True:
+                result = self.client.table("gallery_images").select(
+                    "content_hash"
+                ).in_("content_hash", chunk).range(offset, offset + PAGE_SIZE - 1).execute()
+                rows = result.data or []
+                for row in rows:
+                    counts[row["content_hash"]] += 1
+                if len(rows) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+
+        stored = self.get_by_hashes(hashes)
+        by_count = defaultdict(list)
+        for sha256, count in counts.items():
+            if sha256 in stored and stored[sha256].get("ref_count") != count:
+                by_count[count].append(sha256)
+
+        now = _now()
+        for count, count_hashes in by_count.items():
+            for i in range(0, len(count_hashes), IN_CHUNK_SIZE):
+                self.client.table(TABLE).update({
+                    "ref_count": count,
+                    "updated_at": now,
+                }).in_("sha256", count_hashes[i:i + IN_CHUNK_SIZE]).execute()
+        return counts
+
+    def get_orphans(self, min_age_hours: float, limit: int = 500) -> List[Dict]:
+        """Objects with ref_count = 0 not touched for min_age_hours."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=min_age_hours)).isoformat()
+        result = self.client.table(TABLE).select("*").eq(
+            "ref_count", 0
+        ).lt("updated_at", cutoff).limit(limit).execute()
+        return result.data or []
+
+    def delete(self, sha256: str):
+        self.client.table(TABLE).delete().eq("sha256", sha256).execute()
+
+    def delete_many(self, hashes: List[str]):
+        hashes = list(set(filter(None, hashes)))
+        for i in range(0, len(hashes), IN_CHUNK_SIZE):
+            self.client.table(TABLE).delete().in_("sha256", hashes[i:i + IN_CHUNK_SIZE]).execute()
+
+
+# Singleton instance
+_storage_objects_repository: StorageObjectsRepository = None
+
+
+def get_storage_objects_repository() -> StorageObjectsRepository:
+    """Get shared StorageObjectsRepository instance."""
+    global _storage_objects_repository
+    if _storage_objects_repository is None:
+        _storage_objects_repository = StorageObjectsRepository()
+    return _storage_objects_repository
@@ -287,10 +287,12 @@ class TrainingRepository:
         face_id: str,
         descriptor: np.ndarray,
         det_score: float,
-        bbox: Dict
+        bbox: Dict,
+        kps: Optional[List] = None
     ) -> bool:
         """
         Update face descriptor and related fields.
+        kps (5-point landmarks) is stored when provided.
 
         Returns:
             True if successful
@@ -307,11 +309,15 @@ class TrainingRepository:
                 else:
                     bbox_clean[key] = value
 
-            self._client.table("photo_faces").update({
+            update_data = {
                 "insightface_descriptor": descriptor_list,
                 "insightface_det_score": det_score_float,
                 "insightface_bbox": bbox_clean
-            }).eq("id", face_id).execute()
+            }
+            if kps is not None:
+                update_data["insightface_kps"] = kps.tolist() if isinstance(kps, np.ndarray) else kps
+
+            self._client.table("photo_faces").update(update_data).eq("id", face_id).execute()
 
             return True
 
@@ -2,17 +2,24 @@
 Batch Recognition
 
 Batch recognition of photos without manual verification.
+
+Recognition runs in batches (one index query per batch) and results are
+written through FacesRepository.recognition_writer() in chunked bulk updates.
 """
 
 from typing import List, Dict, Optional
+import json
 import numpy as np
 
-from .dataset import download_photo, match_face_to_detected
+from .dataset import download_photo
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Faces per index query
+RECOGNITION_BATCH_SIZE = 500
+
 
 async def batch_recognize(
     gallery_ids: Optional[List[str]],
@@ -44,7 +51,7 @@ async def batch_recognize(
         
         # Query unverified faces using raw client
         query = supabase_service.client.table("photo_faces").select(
-            "id, photo_id, insightface_bbox, insightface_descriptor, "
+            "id, photo_id, insightface_bbox, insightface_kps, insightface_det_score, insightface_descriptor, exif_oriented, "
             "gallery_images(id, image_url, gallery_id)"
         ).or_("verified.is.null,verified.eq.false")
         
@@ -60,11 +67,12 @@ async def batch_recognize(
         recognized_count = 0
         unknown_count = 0
         
+        # Descriptors (extract from image if missing)
+        faces = []
+        embeddings = []
         for face_data in unverified_faces:
-            face_id = face_data['id']
             descriptor = face_data.get('insightface_descriptor')
             
-            # Extract descriptor if missing
             if not descriptor:
                 descriptor = await _extract_single_descriptor(
                     face_data=face_data,
@@ -72,36 +80,35 @@ async def batch_recognize(
                     supabase_service=supabase_service,
                     training_repo=training_repo
                 )
-                if not descriptor:
+                if descriptor is None:
                     continue
+            elif isinstance(descriptor, str):
+                descriptor = json.loads(descriptor)
             
-            # Recognize
-            descriptor_array = np.array(descriptor)
-            result = await face_service.recognize_face(
-                embedding=descriptor_array,
-                confidence_threshold=confidence_threshold
-            )
-            
-            if result and result[0]:
-                person_id, confidence = result
-                faces_repo.update_recognition_result(
-                    face_id=face_id,
-                    person_id=person_id,
-                    recognition_confidence=confidence,
-                    verified=False
+            faces.append(face_data)
+            embeddings.append(np.asarray(descriptor, dtype=np.float32))
+        
+        # Batched recognition + bulk result writes
+        async with faces_repo.recognition_writer() as writer:
+            for start in range(0, len(embeddings), RECOGNITION_BATCH_SIZE):
+                batch_faces = faces[start:start + RECOGNITION_BATCH_SIZE]
+                recognitions = await face_service.recognize_faces(
+                    embeddings[start:start + RECOGNITION_BATCH_SIZE],
+                    confidence_threshold=confidence_threshold
                 )
-                recognized_count += 1
-                logger.info(f"Recognized face {face_id} as {person_id} ({confidence:.2f})")
-            else:
-                faces_repo.update_recognition_result(
-                    face_id=face_id,
-                    person_id=None,
-                    recognition_confidence=0.0,
-                    verified=False
-                )
-                unknown_count += 1
-            
-            total_processed += 1
+                
+                for face_data, recognition in zip(batch_faces, recognitions):
+                    if recognition["person_id"]:
+                        await writer.add_async(
+                            face_data['id'], recognition["person_id"], recognition["confidence"], verified=False
+                        )
+                        recognized_count += 1
+                    else:
+                        await writer.add_async(face_data['id'], None, 0.0, verified=False)
+                        unknown_count += 1
+                    total_processed += 1
+                
+                logger.info(f"Progress: {total_processed}/{len(embeddings)} processed, {recognized_count} recognized")
         
         logger.info(f"Batch recognition completed: {recognized_count} recognized, {unknown_count} unknown")
         
@@ -128,6 +135,7 @@ async def _extract_single_descriptor(
 ) -> Optional[np.ndarray]:
     """
     Extract descriptor for a single face.
+    Uses stored bbox/kps - one recognition pass, no full-image detection.
     """
     try:
         photo = face_data.get('gallery_images')
@@ -136,33 +144,36 @@ async def _extract_single_descriptor(
         
         photo_url = photo['image_url']
         bbox = face_data['insightface_bbox']
-        
-        image = await download_photo(photo_url, supabase_client=supabase_service)
-        detected_faces = face_service.app.get(image)
-        
-        if not detected_faces:
+        if not bbox:
             return None
         
-        best_match, best_iou = match_face_to_detected(bbox, detected_faces)
+        # Faces stored before EXIF-aware decoding use raw orientation
+        image = await download_photo(
+            photo_url,
+            supabase_client=supabase_service,
+            apply_orientation=face_data.get('exif_oriented', True) is not False
+        )
+        result = face_service.extract_embedding_from_image(
+            image, bbox, face_data.get('insightface_kps')
+        )
+        
+        if result is None:
+            return None
         
-        if best_match and best_iou > 0.3:
-            descriptor = best_match.embedding
+        descriptor = result['embedding']
+        det_score = result['det_score']
+        if det_score is None:
+            det_score = face_data.get('insightface_det_score') or 0.0
 
-            await training_repo.update_face_descriptor(
-                face_id=face_data['id'],
-                descriptor=descriptor,
-                det_score=float(best_match.det_score),
-                bbox={
-                    'x': float(best_match.bbox[0]),
-                    'y': float(best_match.bbox[1]),
-                    'width': float(best_match.bbox[2] - best_match.bbox[0]),
-                    'height': float(best_match.bbox[3] - best_match.bbox[1])
-                }
-            )
+        await training_repo.update_face_descriptor(
+            face_id=face_data['id'],
+            descriptor=descriptor,
+            det_score=float(det_score),
+            bbox=bbox,
+            kps=result['kps']
+        )
 
-            return descriptor
-        
-        return None
+        return descriptor
         
     except Exception as e:
         logger.error(f"Failed to extract descriptor: {e}")
@@ -3,14 +3,12 @@ Dataset preparation for face recognition training.
 Handles loading verified faces and downloading photos.
 """
 
-import os
-import hashlib
 from typing import List, Dict, Optional
 import numpy as np
-import cv2
-import httpx
 import logging
 
+from infrastructure.storage import get_photo_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,45 +96,25 @@ async def prepare_dataset(
 
 async def download_photo(
     photo_url: str,
-    cache_dir: str = 'data/cache/photos',
-    supabase_client=None
+    cache_dir: str = None,
+    supabase_client=None,
+    apply_orientation: bool = True
 ) -> np.ndarray:
     """
     Download photo with caching.
     
+    Goes through the shared PhotoCache (LRU, byte budget).
+    cache_dir and supabase_client are kept for backward compatibility
+    and are ignored.
+    
     Args:
         photo_url: URL to download
-        cache_dir: Directory for caching photos
-        supabase_client: Optional client for cache lookup
+        apply_orientation: False for raw (pre-EXIF) orientation
     
     Returns:
         Image as numpy array (BGR format)
     """
-    # Check cache first
-    if supabase_client:
-        cached_path = supabase_client.get_cached_photo(photo_url)
-        if cached_path and os.path.exists(cached_path):
-            return cv2.imread(cached_path)
-    
-    # Download from URL
-    async with httpx.AsyncClient() as client:
-        response = await client.get(photo_url)
-        response.raise_for_status()
-        
-        # Save to cache
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        filename = hashlib.md5(photo_url.encode()).hexdigest() + '.jpg'
-        local_path = os.path.join(cache_dir, filename)
-        
-        with open(local_path, 'wb') as f:
-            f.write(response.content)
-        
-        # Update cache in supabase if available
-        if supabase_client and hasattr(supabase_client, 'save_photo_cache'):
-            supabase_client.save_photo_cache(photo_url, local_path)
-        
-        return cv2.imread(local_path)
+    return await get_photo_cache().download(photo_url, apply_orientation=apply_orientation)
 
 
 def calculate_iou(bbox1: Dict, bbox2) -> float:
@@ -5,8 +5,6 @@ Handles accuracy, precision, recall and distribution statistics.
 
 from typing import List, Dict
 import numpy as np
-import hnswlib
-from sklearn.model_selection import train_test_split
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,6 +37,10 @@ async def calculate_metrics(
             'note': 'Too few samples'
         }
     
+    # Heavy imports deferred until metrics are actually computed
+    import hnswlib
+    from sklearn.model_selection import train_test_split
+    
     # Split data
     indices = list(range(len(descriptors)))
     train_idx, test_idx = train_test_split(